@@ -1818,4 +1818,113 @@ INSERT INTO Reviews (order_id, customer_id, rating, comment, review_date) VALUES
 (273, 90, 5, 'Worth it banget!', '2025-08-23 20:43:00'),
 (232, 97, 3, 'Makanan enak, pelayanan ramah!', '2025-08-03 16:34:00'),
 (57, 55, 5, 'Best restaurant!', '2025-01-08 09:49:00'),
-(358, 57, 5, 'Harga sesuai kualitas', '2025-08-05 19:39:00');
\ No newline at end of file
+(358, 57, 5, 'Harga sesuai kualitas', '2025-08-05 19:39:00');
+
+-- VERSIONING
+-- Versi data per tabel untuk invalidasi cache (config.TableVersions). Setiap INSERT/UPDATE/DELETE
+-- menaikkan counter tabelnya; aplikasi cukup mem-poll tabel kecil ini.
+-- Counter dipecah ke 8 slot per tabel (config.VERSION_SLOTS) dan versi tabel = SUM(version):
+-- trigger per baris mengunci baris counter sampai commit, jadi dengan satu baris per tabel semua
+-- transaksi yang menulis tabel yang sama saling menunggu. Sekarang hanya koneksi dengan
+-- CONNECTION_ID() % 8 yang sama yang antre.
+-- Database lama: python cache.py setup-versions
+CREATE TABLE IF NOT EXISTS Data_Versions (
+    table_name VARCHAR(64) NOT NULL,
+    slot SMALLINT NOT NULL DEFAULT 0,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (table_name, slot)
+);
+
+INSERT IGNORE INTO Data_Versions (table_name) VALUES
+('Customers'),
+('Categories'),
+('Payment_Methods'),
+('Tables'),
+('Menu'),
+('Orders'),
+('Order_Details'),
+('Reservations'),
+('Reviews');
+
+CREATE TRIGGER customers_version_insert AFTER INSERT ON Customers FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Customers', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER customers_version_update AFTER UPDATE ON Customers FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Customers', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER customers_version_delete AFTER DELETE ON Customers FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Customers', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER categories_version_insert AFTER INSERT ON Categories FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Categories', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER categories_version_update AFTER UPDATE ON Categories FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Categories', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER categories_version_delete AFTER DELETE ON Categories FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Categories', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER payment_methods_version_insert AFTER INSERT ON Payment_Methods FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Payment_Methods', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER payment_methods_version_update AFTER UPDATE ON Payment_Methods FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Payment_Methods', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER payment_methods_version_delete AFTER DELETE ON Payment_Methods FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Payment_Methods', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER tables_version_insert AFTER INSERT ON Tables FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Tables', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER tables_version_update AFTER UPDATE ON Tables FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Tables', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER tables_version_delete AFTER DELETE ON Tables FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Tables', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER menu_version_insert AFTER INSERT ON Menu FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Menu', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER menu_version_update AFTER UPDATE ON Menu FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Menu', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER menu_version_delete AFTER DELETE ON Menu FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Menu', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER orders_version_insert AFTER INSERT ON Orders FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Orders', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER orders_version_update AFTER UPDATE ON Orders FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Orders', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER orders_version_delete AFTER DELETE ON Orders FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Orders', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER order_details_version_insert AFTER INSERT ON Order_Details FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Order_Details', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER order_details_version_update AFTER UPDATE ON Order_Details FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Order_Details', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER order_details_version_delete AFTER DELETE ON Order_Details FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Order_Details', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER reservations_version_insert AFTER INSERT ON Reservations FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Reservations', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER reservations_version_update AFTER UPDATE ON Reservations FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Reservations', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER reservations_version_delete AFTER DELETE ON Reservations FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Reservations', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER reviews_version_insert AFTER INSERT ON Reviews FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Reviews', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER reviews_version_update AFTER UPDATE ON Reviews FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Reviews', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+CREATE TRIGGER reviews_version_delete AFTER DELETE ON Reviews FOR EACH ROW
+    INSERT INTO Data_Versions (table_name, slot, version) VALUES ('Reviews', CONNECTION_ID() % 8, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1;
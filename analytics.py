@@ -0,0 +1,267 @@
+# analytics.py
+# Fungsi agregasi murni (tanpa Streamlit) untuk semua halaman dashboard dan API.
+# Input berupa DataFrame hasil data.load_table(), output berupa angka/DataFrame/Series.
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+def filter_date(df, date_col, start=None, end=None):
+    """Ambil baris dengan tanggal di antara start dan end (inklusif)"""
+    if df.empty or date_col not in df.columns or start is None or end is None:
+        return df
+    dates = df[date_col].dt.date
+    return df[(dates >= start) & (dates <= end)]
+
+def date_bounds(df, date_col):
+    """Tanggal paling awal dan paling akhir di sebuah tabel"""
+    if df.empty or date_col not in df.columns:
+        return None, None
+    return df[date_col].min().date(), df[date_col].max().date()
+
+# DASHBOARD
+
+def order_kpis(orders, details):
+    total_revenue = details['total_price'].sum() if not details.empty else 0
+    total_orders = len(orders)
+    return {
+        'total_orders': total_orders,
+        'total_revenue': total_revenue,
+        'avg_order_value': total_revenue / total_orders if total_orders > 0 else 0,
+    }
+
+def dashboard_kpis(data, start=None, end=None):
+    """Semua angka ringkasan di halaman Dashboard"""
+    # Tanpa data['details'] (mode perkiraan) angka order diisi dari sketch oleh pemanggil
+    kpis = {}
+    if data.get('details') is not None:
+        kpis = order_kpis(filter_date(data['orders'], 'order_date', start, end),
+                          filter_date(data['details'], 'order_date', start, end))
+    reviews = data['reviews']
+    kpis.update({
+        'total_reservations': len(data['reservations']),
+        'total_customers': len(data['customers']),
+        'total_menu': data['menu']['menu_id'].nunique(),
+        'total_tables': len(data['tables']),
+        'avg_rating': reviews['rating'].mean() if not reviews.empty else 0,
+    })
+    return kpis
+
+def branch_kpis(summary, start=None, end=None):
+    """Order, revenue dan rata-rata per order untuk setiap cabang plus total jaringan.
+    Rata-rata jaringan = total revenue / total order, bukan rata-rata dari rata-rata cabang."""
+    summary = filter_date(summary, 'order_date', start, end)
+    per_branch = summary.groupby('branch', sort=False).agg(orders=('orders', 'sum'), revenue=('revenue', 'sum'))
+    per_branch.loc['Semua Cabang'] = per_branch.sum()
+    per_branch = per_branch.astype({'orders': int, 'revenue': float})
+    per_branch['avg_order_value'] = (per_branch['revenue'] / per_branch['orders'].where(per_branch['orders'] > 0)).fillna(0)
+    return per_branch.reset_index()
+
+def top_menu(menu, n=5):
+    """Menu terlaris berdasarkan jumlah terjual"""
+    if menu.empty:
+        return pd.DataFrame(columns=['Menu', 'Terjual'])
+    top = menu.groupby('item_name')['total_ordered'].sum().sort_values(ascending=False).head(n).reset_index()
+    top.columns = ['Menu', 'Terjual']
+    return top
+
+def revenue_daily(details):
+    """Total pendapatan per hari (index = tanggal)"""
+    return details.groupby(details['order_date'].dt.date)['total_price'].sum()
+
+def value_distribution(df, column):
+    """Jumlah baris per nilai kolom, urut dari yang terbanyak"""
+    return df[column].value_counts()
+
+# PERBANDINGAN PERIODE
+# Angka periode terpilih dibandingkan dengan periode sebelumnya (panjang sama) dan periode yang
+# sama tahun lalu. Data dijumlah per hari sekali (satu groupby), lalu total setiap periode
+# diambil dari prefix sum harian, jadi tidak ada filter/groupby tambahan per periode.
+
+COMPARISON_WINDOWS = ['current', 'previous', 'last_year']
+
+def comparison_windows(start, end):
+    """Rentang (inklusif) untuk setiap periode; tahun lalu = mundur 52 minggu agar harinya sama"""
+    length = timedelta(days=(end - start).days + 1)
+    last_year = timedelta(weeks=52)
+    return {
+        'current': (start, end),
+        'previous': (start - length, start - timedelta(days=1)),
+        'last_year': (start - last_year, end - last_year),
+    }
+
+def daily_totals(df, date_col, **aggs):
+    """Agregat per hari (index = tanggal) dalam satu groupby; aggs seperti DataFrame.agg"""
+    if df.empty:
+        return pd.DataFrame(columns=list(aggs), dtype=float)
+    return df.groupby(df[date_col].dt.normalize()).agg(**aggs).sort_index()
+
+def window_totals(daily, start, end):
+    """Total kolom daily untuk setiap periode pembanding (baris = COMPARISON_WINDOWS)"""
+    windows = comparison_windows(start, end)
+    dates = daily.index.to_numpy(dtype='datetime64[D]')
+    starts = np.array([windows[w][0] for w in COMPARISON_WINDOWS], dtype='datetime64[D]')
+    ends = np.array([windows[w][1] for w in COMPARISON_WINDOWS], dtype='datetime64[D]')
+    values = daily.to_numpy(dtype=float)
+    cumulative = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)])
+    totals = cumulative[np.searchsorted(dates, ends, side='right')] - cumulative[np.searchsorted(dates, starts, side='left')]
+    return pd.DataFrame(totals, index=COMPARISON_WINDOWS, columns=daily.columns)
+
+def _ratio(numerator, denominator):
+    return (numerator / denominator.where(denominator > 0)).fillna(0)
+
+def order_comparison(orders, details, start, end):
+    """total_orders, total_revenue, avg_order_value untuk semua periode pembanding"""
+    daily = pd.concat([
+        daily_totals(orders, 'order_date', total_orders=('order_id', 'size')),
+        daily_totals(details, 'order_date', total_revenue=('total_price', 'sum')),
+    ], axis=1).fillna(0)
+    return order_window_totals(daily, start, end)
+
+def order_window_totals(daily, start, end):
+    """order_comparison() dari total harian yang sudah ada (mis. sketch harian mode perkiraan)"""
+    totals = window_totals(daily[['total_orders', 'total_revenue']], start, end)
+    totals['avg_order_value'] = _ratio(totals['total_revenue'], totals['total_orders'])
+    return totals
+
+def status_comparison(orders, start, end):
+    """Kunci order_status_counts() untuk semua periode pembanding"""
+    flags = orders[['order_date']].assign(
+        total=1,
+        completed=(orders['order_status'] == 'Completed').astype(int),
+        cancelled=(orders['order_status'] == 'Cancelled').astype(int),
+        dine_in=(orders['service_type'] == 'Dine In').astype(int),
+        take_away=(orders['service_type'] == 'Take Away').astype(int),
+    )
+    daily = daily_totals(flags, 'order_date', **{name: (name, 'sum') for name in
+                                                 ['total', 'completed', 'cancelled', 'dine_in', 'take_away']})
+    return window_totals(daily, start, end)
+
+def detail_comparison(details, start, end):
+    """Kunci detail_kpis() untuk semua periode pembanding (satu order selalu di satu tanggal,
+    jadi jumlah order unik per hari bisa dijumlahkan)"""
+    daily = daily_totals(
+        details.assign(quantity=pd.to_numeric(details['quantity'], errors='coerce')), 'order_date',
+        total_qty=('quantity', 'sum'),
+        total_revenue=('total_price', 'sum'),
+        total_transaksi=('order_id', 'nunique'),
+    )
+    totals = window_totals(daily, start, end)
+    totals['avg_per_order'] = _ratio(totals['total_revenue'], totals['total_transaksi'])
+    return totals
+
+def change_ratio(comparison, key, against='previous'):
+    """Perubahan relatif periode terpilih terhadap periode pembanding, None kalau pembandingnya 0"""
+    current, base = comparison.at['current', key], comparison.at[against, key]
+    return (current - base) / base if base else None
+
+# CATEGORIES / PAYMENT / TABLES
+
+def category_summary(categories):
+    summary = categories.groupby('category_name')['total_qty'].sum().reset_index()
+    summary = summary.sort_values('total_qty', ascending=False)
+    summary.columns = ['Kategori', 'Terjual']
+    return summary
+
+def payment_summary(payment):
+    summary = payment.groupby('method_name')['revenue'].sum().reset_index()
+    summary = summary.sort_values('revenue', ascending=False)
+    summary.columns = ['Metode', 'Revenue']
+    return summary
+
+def table_usage_summary(table_usage):
+    summary = table_usage.groupby(['table_number', 'capacity'])['times_used'].sum().reset_index()
+    summary['Meja'] = 'Meja ' + summary['table_number'].astype(str)
+    return summary.rename(columns={'times_used': 'Penggunaan'})
+
+# MENU
+
+def menu_summary(menu):
+    return menu.groupby(['menu_id', 'item_name', 'unit_price', 'category_name', 'member_only']).agg({
+        'total_ordered': 'sum'
+    }).reset_index().sort_values('total_ordered', ascending=False)
+
+def menu_access_counts(summary):
+    """Jumlah menu paket (member only) dan reguler"""
+    paket = len(summary[summary['member_only'] == 1])
+    reguler = len(summary[summary['member_only'] == 0])
+    return {'paket': paket, 'reguler': reguler, 'member': paket + reguler, 'guest': reguler}
+
+# ORDERS
+
+def order_status_counts(orders):
+    return {
+        'total': len(orders),
+        'completed': len(orders[orders['order_status'] == 'Completed']),
+        'cancelled': len(orders[orders['order_status'] == 'Cancelled']),
+        'dine_in': len(orders[orders['service_type'] == 'Dine In']),
+        'take_away': len(orders[orders['service_type'] == 'Take Away']),
+    }
+
+def orders_daily(orders):
+    daily = orders.groupby(orders['order_date'].dt.date).size().reset_index()
+    daily.columns = ['Tanggal', 'Jumlah']
+    return daily
+
+def orders_hourly(orders):
+    hourly = orders.groupby(pd.to_datetime(orders['order_time']).dt.hour).size().reset_index()
+    hourly.columns = ['Jam', 'Jumlah']
+    return hourly
+
+# ORDER DETAILS
+
+def detail_kpis(details):
+    return {
+        'total_qty': int(details['quantity'].sum()),
+        'total_revenue': details['total_price'].sum(),
+        'avg_per_order': details.groupby('order_id')['total_price'].sum().mean(),
+        'total_transaksi': details['order_id'].nunique(),
+    }
+
+def sample_total(values, groups, rate):
+    """Perkiraan total dari sampel order (Horvitz-Thompson) dan setengah lebar interval 95%"""
+    per_order = values.groupby(groups).sum().astype(float)
+    variance = (1 - rate) / rate ** 2 * (per_order ** 2).sum()
+    return per_order.sum() / rate, 1.96 * variance ** 0.5
+
+def sample_detail_kpis(sample, rate):
+    """detail_kpis() versi sampel: total diskalakan 1/rate, plus error bound"""
+    qty, qty_error = sample_total(sample['quantity'], sample['order_id'], rate)
+    revenue, revenue_error = sample_total(sample['total_price'], sample['order_id'], rate)
+    # Sama seperti detail_kpis: transaksi = order yang punya item (satu baris sampel = 1 per order)
+    orders, orders_error = sample_total((~sample['order_id'].duplicated()).astype(int), sample['order_id'], rate)
+    return {
+        'total_qty': qty,
+        'total_qty_error': qty_error,
+        'total_revenue': revenue,
+        'total_revenue_error': revenue_error,
+        'total_transaksi': orders,
+        'total_transaksi_error': orders_error,
+    }
+
+def top_products(details, n=10, scale=1):
+    top = details.groupby('item_name')['quantity'].sum().sort_values(ascending=False).head(n).reset_index()
+    top.columns = ['Menu', 'Qty']
+    if scale != 1:
+        top['Qty'] = (top['Qty'] * scale).round()
+    return top
+
+# REVIEWS
+
+def review_kpis(reviews):
+    rating_counts = reviews['rating'].value_counts().sort_index()
+    return {
+        'total_reviews': len(reviews),
+        'avg_rating': reviews['rating'].mean(),
+        'most_common': rating_counts.idxmax(),
+    }
+
+def rating_distribution(reviews):
+    counts = reviews['rating'].value_counts().sort_index().reset_index()
+    counts.columns = ['Rating', 'Jumlah']
+    return counts
+
+def rating_daily(reviews):
+    daily = reviews.groupby(reviews['review_date'].dt.date)['rating'].mean().reset_index()
+    daily.columns = ['Tanggal', 'Rating']
+    return daily
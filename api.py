@@ -0,0 +1,176 @@
+# api.py
+# API JSON ringan untuk kiosk, layar TV dan layanan lain.
+# Mendukung ETag/Last-Modified sehingga polling yang datanya belum berubah cukup dibalas 304.
+#
+# Jalankan: python api.py --port 8502
+# Contoh:   curl "http://localhost:8502/menu/top?start=2025-01-01&end=2025-01-31&n=5"
+import json
+import time
+import hashlib
+import decimal
+import argparse
+import datetime
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pandas as pd
+import analytics
+from cache import CACHE_TTL, get_backend
+from data import load_all
+from config import table_versions, VERSIONED_TABLES
+
+
+class DataStore:
+    """Menyimpan DataFrame di memori beserta versi datanya"""
+
+    def __init__(self, ttl=CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._loaded_at = 0
+        self.data = None
+        self.version = None
+        self.last_modified = 0
+        self._stamp = None
+
+    def get(self):
+        with self._lock:
+            # Dengan Data_Versions: muat ulang hanya kalau ada tabel yang berubah; tanpa itu pakai TTL
+            stamp = table_versions.stamp(VERSIONED_TABLES)
+            if stamp is not None:
+                stamp = (get_backend().get_version(), stamp)
+                stale = stamp != self._stamp
+            else:
+                stale = self.ttl > 0 and time.time() - self._loaded_at >= self.ttl
+            if self.data is None or stale:
+                self._reload()
+                self._stamp = stamp
+            return self.data, self.version, self.last_modified
+
+    def _reload(self):
+        data = load_all()
+        # Versi = sidik jari isi data; hanya berubah kalau datanya benar-benar berubah
+        fingerprint = hashlib.sha1(str(get_backend().get_version()).encode())
+        for name in sorted(data):
+            fingerprint.update(pd.util.hash_pandas_object(data[name].astype(str), index=False).values.tobytes())
+        version = fingerprint.hexdigest()[:16]
+        if version != self.version:
+            self.version = version
+            self.last_modified = int(time.time())
+        self.data = data
+        self._loaded_at = time.time()
+
+
+store = DataStore()
+
+# ROUTES
+
+def _records(df):
+    return df.to_dict(orient='records')
+
+def route_kpis(data, start, end, params):
+    return analytics.dashboard_kpis(data, start, end)
+
+def route_revenue_daily(data, start, end, params):
+    daily = analytics.revenue_daily(analytics.filter_date(data['details'], 'order_date', start, end))
+    return [{'date': day, 'revenue': value} for day, value in daily.items()]
+
+def route_menu_top(data, start, end, params):
+    n = int(params.get('n', 10))
+    return _records(analytics.top_menu(analytics.filter_date(data['menu'], 'order_date', start, end), n))
+
+def route_categories(data, start, end, params):
+    return _records(analytics.category_summary(analytics.filter_date(data['categories'], 'order_date', start, end)))
+
+def route_payment(data, start, end, params):
+    return _records(analytics.payment_summary(analytics.filter_date(data['payment'], 'order_date', start, end)))
+
+def route_orders(data, start, end, params):
+    return analytics.order_status_counts(analytics.filter_date(data['orders'], 'order_date', start, end))
+
+ROUTES = {
+    '/kpis': route_kpis,
+    '/revenue/daily': route_revenue_daily,
+    '/menu/top': route_menu_top,
+    '/categories': route_categories,
+    '/payment': route_payment,
+    '/orders/summary': route_orders,
+}
+
+def _json_default(value):
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if hasattr(value, 'item'):  # angka numpy
+        return value.item()
+    return str(value)
+
+def _parse_date(value):
+    return datetime.date.fromisoformat(value) if value else None
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        route = ROUTES.get(url.path.rstrip('/') or '/')
+        if route is None:
+            return self._send_json(404, {'error': 'endpoint tidak ditemukan', 'endpoints': sorted(ROUTES)})
+
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        try:
+            start, end = _parse_date(params.get('start')), _parse_date(params.get('end'))
+        except ValueError:
+            return self._send_json(400, {'error': 'format tanggal harus YYYY-MM-DD'})
+
+        data, version, last_modified = store.get()
+        etag = '"' + hashlib.sha1(f"{version}|{url.path}|{sorted(params.items())}".encode()).hexdigest()[:20] + '"'
+        headers = {
+            'ETag': etag,
+            'Last-Modified': formatdate(last_modified, usegmt=True),
+            'Cache-Control': 'no-cache',
+        }
+        if self._not_modified(etag, last_modified):
+            return self._send(304, b'', headers)
+
+        try:
+            body = route(data, start, end, params)
+        except ValueError as e:
+            return self._send_json(400, {'error': str(e)})
+        self._send_json(200, body, headers)
+
+    def _not_modified(self, etag, last_modified):
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match:
+            tags = [t.strip() for t in if_none_match.split(',')]
+            return '*' in tags or etag in tags or ('W/' + etag) in tags
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                return last_modified <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _send_json(self, status, body, headers=None):
+        payload = json.dumps(body, default=_json_default).encode('utf-8')
+        self._send(status, payload, dict(headers or {}, **{'Content-Type': 'application/json'}))
+
+    def _send(self, status, payload, headers):
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        if payload:
+            self.wfile.write(payload)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Restaurant Orders analytics API')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8502)
+    args = parser.parse_args()
+    print(f"API berjalan di http://{args.host}:{args.port} ({', '.join(sorted(ROUTES))})")
+    ThreadingHTTPServer((args.host, args.port), Handler).serve_forever()
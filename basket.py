@@ -0,0 +1,81 @@
+# basket.py
+# Analisis "sering dipesan bersama" (market basket) memakai matriks sparse order x menu.
+# Co-occurrence semua pasangan menu dihitung sekali lewat perkalian matriks X^T X,
+# bukan dengan loop pasangan per order.
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from analytics import filter_date
+
+MAX_CACHE = 32   # jumlah rentang tanggal yang hasilnya disimpan
+
+PAIR_COLUMNS = ['menu_a', 'menu_b', 'item_a', 'item_b', 'orders', 'support', 'confidence_ab', 'confidence_ba', 'lift']
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()   # cache dipakai bersama semua sesi Streamlit
+
+
+def incidence_matrix(details):
+    """Matriks biner order x menu_id (1 jika menu ada di order tersebut)"""
+    order_codes, _ = pd.factorize(details['order_id'])
+    menu_codes, menu_ids = pd.factorize(details['menu_id'], sort=True)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(details), dtype=np.int32), (order_codes, menu_codes)),
+        shape=(order_codes.max() + 1 if len(order_codes) else 0, len(menu_ids))
+    )
+    # Menu yang muncul dua kali di satu order tetap dihitung satu
+    matrix.data[:] = 1
+    return matrix, np.asarray(menu_ids)
+
+def co_occurrence(details, min_orders=2):
+    """Semua pasangan menu dengan support, confidence dan lift"""
+    if details.empty:
+        return pd.DataFrame(columns=PAIR_COLUMNS)
+    matrix, menu_ids = incidence_matrix(details)
+    n_orders = matrix.shape[0]
+    counts = (matrix.T @ matrix).tocoo()
+    item_orders = np.asarray((matrix.sum(axis=0))).ravel()
+
+    # Ambil pasangan i < j saja (matriks simetris)
+    keep = (counts.row < counts.col) & (counts.data >= min_orders)
+    a, b, together = counts.row[keep], counts.col[keep], counts.data[keep].astype(float)
+    if len(together) == 0:
+        return pd.DataFrame(columns=PAIR_COLUMNS)
+
+    names = details.drop_duplicates('menu_id').set_index('menu_id')['item_name']
+    pairs = pd.DataFrame({
+        'menu_a': menu_ids[a],
+        'menu_b': menu_ids[b],
+        'orders': together.astype(int),
+        'support': together / n_orders,
+        'confidence_ab': together / item_orders[a],
+        'confidence_ba': together / item_orders[b],
+        'lift': together * n_orders / (item_orders[a] * item_orders[b]),
+    })
+    pairs['item_a'] = names.reindex(pairs['menu_a']).values
+    pairs['item_b'] = names.reindex(pairs['menu_b']).values
+    return pairs[PAIR_COLUMNS].sort_values(['lift', 'orders'], ascending=False).reset_index(drop=True)
+
+def basket_pairs(details, start=None, end=None, min_orders=2, stamp=None):
+    """co_occurrence() untuk rentang tanggal tertentu, hasilnya di-cache per rentang.
+    stamp: versi data details (data.frame_stamp); tanpa stamp dipakai sidik jari isi data."""
+    subset = filter_date(details, 'order_date', start, end)[['order_id', 'menu_id', 'item_name']]
+    if stamp is None:
+        # Key cache = rentang + sidik jari isi data, jadi cache otomatis basi kalau data berubah
+        stamp = (len(subset), int(pd.util.hash_pandas_object(subset[['order_id', 'menu_id']], index=False).sum()))
+    key = (start, end, min_orders, stamp)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    result = co_occurrence(subset, min_orders)
+    with _cache_lock:
+        _cache[key] = result
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_CACHE:
+            _cache.popitem(last=False)
+    return result
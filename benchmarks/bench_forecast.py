@@ -0,0 +1,89 @@
+# benchmarks/bench_forecast.py
+# Benchmark fit model forecast permintaan dengan penjualan sintetis --items menu x --days hari:
+# fit penuh sekaligus (DemandModel.update), update bertahap satu hari (refresh tiap malam),
+# dan pembanding fit per menu dengan loop pandas.
+#
+#   python benchmarks/bench_forecast.py --items 300 --days 365
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import forecast
+
+OPEN_HOURS = np.arange(10, 23)
+
+
+def synthetic(items, days, seed):
+    """Baris (menu_id, order_date, order_hour, quantity) dengan pola hari x jam per menu"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2024-01-01', periods=days).date
+    popularity = rng.gamma(1.0, 1.0, items)
+    dow_shape = 1 + 0.5 * (np.arange(7) >= 4)
+    hour_shape = np.exp(-((OPEN_HOURS - 12.5) ** 2) / 4) + np.exp(-((OPEN_HOURS - 19) ** 2) / 3)
+    rate = (popularity[:, None, None] * dow_shape[None, :, None] * hour_shape[None, None, :])
+    weekday = np.array([d.weekday() for d in dates])
+    quantity = rng.poisson(rate[:, weekday, :])            # menu x hari x jam
+    item, day, hour = np.nonzero(quantity)
+    return pd.DataFrame({
+        'menu_id': item + 1,
+        'order_date': dates[day],
+        'order_hour': OPEN_HOURS[hour],
+        'quantity': quantity[item, day, hour],
+    })
+
+def per_item_fit(rows, alpha):
+    """Pembanding: EWMA per menu per (hari, jam) dengan groupby + loop"""
+    rows = rows.assign(dow=pd.to_datetime(rows['order_date']).dt.weekday)
+    days = pd.Series(sorted(rows['order_date'].unique()))
+    result = {}
+    for menu_id, group in rows.groupby('menu_id'):
+        grid = group.pivot_table(index='order_date', columns=['dow', 'order_hour'], values='quantity', aggfunc='sum')
+        grid = grid.reindex(days).fillna(0)
+        result[menu_id] = {dow: grid.loc[[d for d in days if d.weekday() == dow]].ewm(alpha=alpha).mean().iloc[-1]
+                           for dow in range(7)}
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark fit model forecast (data sintetis)')
+    parser.add_argument('--items', type=int, default=300)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--loop-items', type=int, default=30, help='menu untuk pembanding loop (lambat)')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rows = synthetic(args.items, args.days, args.seed)
+    last_day = rows['order_date'].max()
+    history, latest = rows[rows['order_date'] < last_day], rows[rows['order_date'] == last_day]
+    path = os.path.join(tempfile.mkdtemp(prefix='bench_forecast_'), 'model.pkl')
+
+    model = forecast.DemandModel(path=path)
+    started = time.perf_counter()
+    model.update(history)
+    full = time.perf_counter() - started
+    started = time.perf_counter()
+    model.update(latest)
+    incremental = time.perf_counter() - started
+
+    subset = rows[rows['menu_id'] <= args.loop_items]
+    started = time.perf_counter()
+    per_item_fit(subset, model.alpha)
+    loop = (time.perf_counter() - started) * args.items / args.loop_items
+
+    accuracy = model.accuracy_frame()
+    print(f"Baris: {len(rows):,} ({args.items} menu x {args.days} hari)")
+    print(f"Fit penuh (vektor):     {full * 1000:8.1f} ms")
+    print(f"Update 1 hari:          {incremental * 1000:8.1f} ms")
+    print(f"Loop per menu (perkiraan {args.items} menu dari {args.loop_items}): {loop * 1000:8.1f} ms")
+    if not accuracy.empty:
+        print(f"WAPE hari terakhir: {accuracy['wape'].iloc[-1]:.1%}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+# benchmarks/bench_intake.py
+# Benchmark penerimaan order: N terminal (thread) mengirim order bersamaan dan menunggu ack,
+# dibandingkan antara satu commit per order dan group commit (intake.OrderIntake).
+# Order benchmark ditulis ke database lalu dihapus lagi di akhir (kecuali --keep),
+# jadi jalankan terhadap database development/staging.
+#
+#   python benchmarks/bench_intake.py --terminals 16 --orders 50
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import run_statement
+from intake import OrderIntake, OrderRejected
+
+BENCH_GUEST = 'bench-intake'
+MODES = {
+    'satu commit/order': dict(batch_window_ms=0, max_batch=1),
+    'group commit': dict(),
+}
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(round(q / 100 * (len(values) - 1))), len(values) - 1)]
+
+def random_order(rng, dims):
+    menu = [menu_id for menu_id, (_, member_only) in dims.menu.items() if not member_only]
+    dine_in = rng.random() < 0.6
+    return {
+        'guest_name': BENCH_GUEST,
+        'service_type': 'Dine In' if dine_in else 'Take Away',
+        'table_id': rng.choice(sorted(dims.tables)) if dine_in else None,
+        'payment_id': rng.choice(sorted(dims.payments)),
+        'items': [{'menu_id': rng.choice(menu), 'quantity': rng.randint(1, 4)} for _ in range(rng.randint(1, 5))],
+    }
+
+def run_mode(settings, terminals, orders, seed):
+    intake = OrderIntake(**settings).start()
+    dims = intake.dimensions[0].current()
+    latencies, order_ids, errors = [], [], []
+    lock = threading.Lock()
+
+    def terminal(index):
+        rng = random.Random(seed * 1000 + index)
+        for _ in range(orders):
+            started = time.perf_counter()
+            try:
+                ack = intake.submit(random_order(rng, dims)).result(timeout=60)
+            except (OrderRejected, TimeoutError) as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - started)
+                order_ids.append(ack['order_id'])
+
+    threads = [threading.Thread(target=terminal, args=(i,)) for i in range(terminals)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    return {
+        'orders': len(order_ids),
+        'orders_per_second': len(order_ids) / wall if wall else 0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'errors': errors,
+        'metrics': intake.metrics(),
+    }, order_ids
+
+def cleanup(order_ids, chunk=1000):
+    for start in range(0, len(order_ids), chunk):
+        ids = order_ids[start:start + chunk]
+        placeholders = ', '.join(['%s'] * len(ids))
+        run_statement(f'DELETE FROM Order_Details WHERE order_id IN ({placeholders})', tuple(ids))
+        run_statement(f'DELETE FROM Orders WHERE order_id IN ({placeholders})', tuple(ids))
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark intake order (group commit)')
+    parser.add_argument('--terminals', type=int, default=16, help='jumlah terminal POS bersamaan')
+    parser.add_argument('--orders', type=int, default=50, help='order per terminal')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--keep', action='store_true', help='jangan hapus order benchmark')
+    args = parser.parse_args()
+
+    print(f"{args.terminals} terminal x {args.orders} order\n")
+    print(f"{'Mode':<20}{'order/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'batch rata2':>13}{'batch maks':>12}")
+    written = []
+    try:
+        for name, settings in MODES.items():
+            result, order_ids = run_mode(settings, args.terminals, args.orders, args.seed)
+            written.extend(order_ids)
+            m = result['metrics']
+            print(f"{name:<20}{result['orders_per_second']:>10.0f}{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}"
+                  f"{m['avg_batch']:>13}{m['max_batch']:>12}")
+            if result['errors']:
+                print(f"  {len(result['errors'])} order gagal, contoh: {result['errors'][0]}")
+    finally:
+        if not args.keep:
+            cleanup(written)
+            print(f"\n{len(written):,} order benchmark dihapus")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+# benchmarks/bench_load.py
+# Load test: N sesi Streamlit headless (AppTest) dijalankan bersamaan terhadap main.py,
+# masing-masing di proses sendiri dengan cache disk dan database yang sama. Setiap sesi berpindah halaman,
+# mengubah rentang tanggal dan menjalankan join di halaman Custom.
+# Hasil: throughput, latensi p50/p95 per halaman dan jumlah query ke database.
+#
+# Skenario setiap sesi ditentukan oleh --seed, jadi dua run dengan argumen sama
+# menjalankan langkah yang sama dan hasilnya bisa dibandingkan:
+#   python benchmarks/bench_load.py --sessions 8 --steps 30 --output load_before.json
+#   python benchmarks/bench_load.py --sessions 8 --steps 30 --compare load_before.json
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import multiprocessing
+import subprocess
+from datetime import timedelta
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ["Dashboard", "Customers", "Categories", "Payment Methods", "Tables", "Menu",
+         "Orders", "Order Details", "Reservations", "Reviews", "Custom"]
+JOINS = ["Orders + Customers", "Full Order Report", "Menu + Categories"]
+ACTIONS = ['page', 'page', 'date', 'custom_join']   # bobot: pindah halaman paling sering
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(int(round(q / 100 * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+
+class QueryCounter:
+    """Hitung query yang benar-benar dikirim ke database (run_query di config)"""
+
+    def __init__(self):
+        self.count = 0
+
+    def install(self):
+        import config
+        run_query = config.run_query
+
+        def counted(*args, **kwargs):
+            self.count += 1
+            return run_query(*args, **kwargs)
+
+        config.run_query = counted
+
+
+class Session:
+    """Satu pengguna: menjalankan langkah-langkah acak (tetap per seed) dan mencatat latensi rerun"""
+
+    def __init__(self, index, steps, seed, timeout, counter):
+        self.steps, self.timeout, self.counter = steps, timeout, counter
+        self.rng = random.Random(seed * 1000 + index)
+        self.samples, self.errors = [], []
+
+    def timed(self, page, action, func):
+        started = time.perf_counter()
+        at = func()
+        self.samples.append((page, action, time.perf_counter() - started))
+        if at.exception:
+            self.errors.append((page, action, str(at.exception[0].value)[:200]))
+        return at
+
+    def run(self, start_barrier):
+        from streamlit.testing.v1 import AppTest
+        at = AppTest.from_file(os.path.join(ROOT, 'main.py'), default_timeout=self.timeout)
+        at.run()   # render pertama (import + compile) tidak diukur
+        start_barrier.wait()
+        self.counter.count = 0
+        page = PAGES[0]
+        for _ in range(self.steps):
+            action = self.rng.choice(ACTIONS)
+            if action == 'page' or (action == 'date' and not at.sidebar.date_input):
+                page = self.rng.choice(PAGES)
+                at = self.timed(page, 'page', at.sidebar.radio[0].set_value(page).run)
+            elif action == 'date':
+                widget = at.sidebar.date_input[0]
+                first, last = widget.min, widget.max
+                start = first + timedelta(days=self.rng.randint(0, (last - first).days))
+                end = start + timedelta(days=self.rng.randint(0, (last - start).days))
+                at = self.timed(page, 'date', widget.set_value((start, end)).run)
+            else:
+                if page != "Custom":
+                    page = "Custom"
+                    at = self.timed(page, 'page', at.sidebar.radio[0].set_value(page).run)
+                mode = next(r for r in at.radio if r.label == "Mode Tampilan")
+                if mode.value != "Gabungkan Tabel":
+                    at = self.timed(page, 'custom_join', mode.set_value("Gabungkan Tabel").run)
+                join = next(s for s in at.selectbox if s.label == "Pilih Kombinasi Tabel")
+                at = self.timed(page, 'custom_join', join.set_value(self.rng.choice(JOINS)).run)
+
+def run_session(index, steps, seed, timeout, start_barrier, results):
+    """Dijalankan di proses terpisah untuk setiap sesi"""
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    counter = QueryCounter()
+    counter.install()
+    from gateway import query_metrics
+    session = Session(index, steps, seed, timeout, counter)
+    try:
+        session.run(start_barrier)
+    except Exception as e:
+        start_barrier.abort()
+        session.errors.append(('-', 'session', repr(e)[:200]))
+    metrics = query_metrics()
+    results.put({
+        'samples': session.samples,
+        'errors': session.errors,
+        'db_queries': counter.count,
+        'coalesced': metrics['coalesced'],
+        'rejected': metrics['rejected'],
+        'max_queue_depth': metrics['max_queue_depth'],
+    })
+
+
+def git_commit(root):
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=root, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+def summarize(samples, wall_seconds):
+    by_page = defaultdict(list)
+    by_action = defaultdict(list)
+    for page, action, elapsed in samples:
+        by_page[page].append(elapsed)
+        by_action[action].append(elapsed)
+
+    def stats(values):
+        return {
+            'count': len(values),
+            'p50_ms': round(percentile(values, 50) * 1000, 1),
+            'p95_ms': round(percentile(values, 95) * 1000, 1),
+            'max_ms': round(max(values) * 1000, 1),
+        }
+    return {
+        'reruns': len(samples),
+        'wall_seconds': round(wall_seconds, 2),
+        'throughput_rps': round(len(samples) / wall_seconds, 2) if wall_seconds else 0,
+        'overall': stats([s[2] for s in samples]),
+        'pages': {page: stats(values) for page, values in sorted(by_page.items())},
+        'actions': {action: stats(values) for action, values in sorted(by_action.items())},
+    }
+
+def print_report(result, previous=None):
+    def delta(new, old):
+        if old in (None, 0):
+            return ''
+        return f" ({(new - old) / old * 100:+.0f}%)"
+
+    s, old = result['summary'], (previous or {}).get('summary', {})
+    print(f"\nSesi: {result['sessions']} · langkah/sesi: {result['steps']} · seed: {result['seed']} · commit: {result['commit']}")
+    print(f"Rerun: {s['reruns']} dalam {s['wall_seconds']} s · throughput {s['throughput_rps']} rerun/s"
+          f"{delta(s['throughput_rps'], old.get('throughput_rps'))}")
+    q, old_q = result['queries'], (previous or {}).get('queries', {})
+    print(f"Query database: {q['db_queries']} ({q['db_queries_per_rerun']}/rerun)"
+          f"{delta(q['db_queries'], old_q.get('db_queries'))} · digabung gateway: {q['coalesced']}"
+          f" · antrian maks: {q['max_queue_depth']}")
+    print(f"\n{'Halaman':<16}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'maks ms':>10}")
+    old_pages = old.get('pages', {})
+    for page, p in s['pages'].items():
+        o = old_pages.get(page, {})
+        print(f"{page:<16}{p['count']:>6}{p['p50_ms']:>10}{p['p95_ms']:>10}{p['max_ms']:>10}"
+              f"{delta(p['p95_ms'], o.get('p95_ms'))}")
+    print(f"{'(semua)':<16}{s['overall']['count']:>6}{s['overall']['p50_ms']:>10}{s['overall']['p95_ms']:>10}{s['overall']['max_ms']:>10}"
+          f"{delta(s['overall']['p95_ms'], old.get('overall', {}).get('p95_ms'))}")
+    if result['errors']:
+        print(f"\nPeringatan: {len(result['errors'])} rerun error, contoh: {result['errors'][0]}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test sesi Streamlit bersamaan')
+    parser.add_argument('--sessions', type=int, default=4, help='jumlah sesi bersamaan')
+    parser.add_argument('--steps', type=int, default=20, help='langkah per sesi (setelah buka halaman)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--timeout', type=float, default=120, help='batas waktu satu rerun (detik)')
+    parser.add_argument('--cold', action='store_true', help='pakai cache kosong (RESTO_CACHE_DIR sementara)')
+    parser.add_argument('--output', help='simpan hasil (JSON) ke file ini')
+    parser.add_argument('--compare', help='bandingkan dengan hasil JSON sebelumnya')
+    args = parser.parse_args()
+
+    if args.cold:
+        os.environ['RESTO_CACHE_DIR'] = tempfile.mkdtemp(prefix='bench_load_')
+
+    # Streamlit AppTest memakai Runtime global per proses, jadi setiap sesi dijalankan di
+    # proses sendiri. Cache disk dan database dipakai bersama; gateway per proses.
+    ctx = multiprocessing.get_context('spawn')
+    barrier = ctx.Barrier(args.sessions + 1)
+    results = ctx.Queue()
+    processes = [ctx.Process(target=run_session, args=(i, args.steps, args.seed, args.timeout, barrier, results))
+                 for i in range(args.sessions)]
+    for process in processes:
+        process.start()
+    barrier.wait()
+    started = time.perf_counter()
+    outputs = [results.get() for _ in processes]
+    wall = time.perf_counter() - started
+    for process in processes:
+        process.join()
+
+    samples = [sample for out in outputs for sample in out['samples']]
+    db_queries = sum(out['db_queries'] for out in outputs)
+    result = {
+        'commit': git_commit(ROOT),
+        'python': platform.python_version(),
+        'sessions': args.sessions,
+        'steps': args.steps,
+        'seed': args.seed,
+        'cold_cache': args.cold,
+        'summary': summarize(samples, wall),
+        'queries': {
+            'db_queries': db_queries,
+            'db_queries_per_rerun': round(db_queries / len(samples), 2) if samples else 0,
+            'coalesced': sum(out['coalesced'] for out in outputs),
+            'rejected': sum(out['rejected'] for out in outputs),
+            'max_queue_depth': max(out['max_queue_depth'] for out in outputs),
+        },
+        'errors': [error for out in outputs for error in out['errors']],
+    }
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+    print_report(result, previous)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+
+if __name__ == '__main__':
+    main()
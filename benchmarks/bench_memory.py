@@ -0,0 +1,83 @@
+# benchmarks/bench_memory.py
+# Benchmark memori per halaman: peak RSS proses dan peak alokasi (tracemalloc) saat halaman dirender.
+# Setiap halaman diukur di proses Python baru.
+#
+# Jalankan dari root repo:
+#   python benchmarks/bench_memory.py --scale 50
+# Bandingkan dengan versi lain (mis. checkout lama lewat git worktree):
+#   python benchmarks/bench_memory.py --scale 50 --root ../restaurant-orders-lama
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ["Dashboard", "Customers", "Categories", "Payment Methods", "Tables", "Menu",
+         "Orders", "Order Details", "Reservations", "Reviews", "Custom"]
+
+# Script yang dijalankan di proses baru. --scale memperbanyak baris hasil view_*
+# supaya perbedaan alokasi terlihat walau database lokal kecil.
+PAGE_SCRIPT = '''
+import sys, json, resource, tracemalloc
+root, page, scale = sys.argv[1], sys.argv[2], int(sys.argv[3])
+sys.path.insert(0, root)
+
+import config
+
+def scaled(func):
+    return lambda *args, **kwargs: func(*args, **kwargs) * scale
+
+if scale > 1:
+    for name in dir(config):
+        if name.startswith('view_'):
+            setattr(config, name, scaled(getattr(config, name)))
+
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(root + '/main.py', default_timeout=600)
+at.run()
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+tracemalloc.start()
+at.sidebar.radio[0].set_value(page).run()
+_, peak = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+print(json.dumps({
+    'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    'rss_growth_mb': round((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024, 1),
+    'page_alloc_peak_mb': round(peak / 1024 / 1024, 1),
+    'error': bool(at.exception),
+}))
+'''
+
+def measure(root, page, scale):
+    env = dict(os.environ)
+    if scale > 1:
+        # Data yang diperbanyak tidak boleh masuk ke cache/statistik yang dipakai aplikasi
+        env['RESTO_CACHE_DIR'] = tempfile.mkdtemp(prefix='bench_memory_')
+    out = subprocess.run([sys.executable, '-c', PAGE_SCRIPT, root, page, str(scale)],
+                         cwd=root, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark memori per halaman')
+    parser.add_argument('--root', default=ROOT, help='folder aplikasi yang diukur')
+    parser.add_argument('--scale', type=int, default=1, help='kali lipat jumlah baris data')
+    parser.add_argument('--pages', nargs='*', default=PAGES)
+    parser.add_argument('--output', help='simpan hasil (JSON) ke file ini')
+    args = parser.parse_args()
+
+    root = os.path.abspath(args.root)
+    results = {}
+    print(f"{'Halaman':<16}{'peak RSS':>12}{'RSS naik':>12}{'alokasi':>12}")
+    for page in args.pages:
+        r = results[page] = measure(root, page, args.scale)
+        flag = '  (error)' if r['error'] else ''
+        print(f"{page:<16}{r['peak_rss_mb']:>9} MB{r['rss_growth_mb']:>9} MB{r['page_alloc_peak_mb']:>9} MB{flag}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'root': root, 'scale': args.scale, 'pages': results}, f, indent=2)
+
+if __name__ == '__main__':
+    main()
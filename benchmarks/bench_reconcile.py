@@ -0,0 +1,89 @@
+# benchmarks/bench_reconcile.py
+# Benchmark perbandingan rekonsiliasi Order_Details (tanpa database): --rows baris sintetis
+# dibandingkan per potongan --chunk-size dengan reconcile.compare, lalu ringkasan digabung
+# seperti Reconciliation. Pembanding: loop per baris dengan Decimal seperti skrip biasa.
+#
+#   python benchmarks/bench_reconcile.py --rows 2000000 --chunk-size 50000
+import os
+import sys
+import time
+import argparse
+import datetime
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import reconcile
+
+
+def synthetic_chunk(start_id, n, menus, days, mismatch_rate, rng):
+    """Baris seperti CHUNK_SQL: sebagian total_price memakai harga lama"""
+    menu_id = rng.integers(1, menus + 1, n)
+    price = (menu_id * 1000 + 15000).astype(np.int64) * 100
+    quantity = rng.integers(1, 6, n)
+    old_price = np.where(rng.random(n) < mismatch_rate, price - 200000, price)
+    dates = np.datetime64('2024-01-01') + rng.integers(0, days, n).astype('timedelta64[D]')
+    return list(zip(range(start_id, start_id + n), range(start_id, start_id + n), menu_id.tolist(),
+                    dates.astype(datetime.date).tolist(), quantity.tolist(),
+                    (quantity * old_price).tolist(), price.tolist()))
+
+def loop_compare(rows):
+    """Pembanding: satu baris per iterasi, Decimal, dict ringkasan"""
+    summary, mismatches = {}, []
+    for detail_id, order_id, menu_id, day, quantity, total, price in rows:
+        expected = Decimal(price) / 100 * quantity
+        actual = Decimal(total) / 100
+        entry = summary.setdefault((menu_id, day), [0, 0])
+        entry[0] += 1
+        if actual != expected:
+            entry[1] += 1
+            mismatches.append((detail_id, actual - expected))
+    return summary, mismatches
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark perbandingan rekonsiliasi (data sintetis)')
+    parser.add_argument('--rows', type=int, default=2000000)
+    parser.add_argument('--chunk-size', type=int, default=reconcile.CHUNK_SIZE)
+    parser.add_argument('--menus', type=int, default=300)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--mismatch-rate', type=float, default=0.02)
+    parser.add_argument('--loop-rows', type=int, default=200000, help='baris untuk pembanding loop (lambat)')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    job = reconcile.Reconciliation(output=None)
+    generate = compare = 0.0
+    for start in range(0, args.rows, args.chunk_size):
+        started = time.perf_counter()
+        rows = synthetic_chunk(start + 1, min(args.chunk_size, args.rows - start), args.menus, args.days,
+                               args.mismatch_rate, rng)
+        generate += time.perf_counter() - started
+        started = time.perf_counter()
+        report, summary = reconcile.compare(rows)
+        job._parts.append(pd.concat({'Pusat': summary}, names=['branch']))
+        if len(job._parts) >= reconcile.CONSOLIDATE_EVERY:
+            job._consolidate()
+        job.rows += len(rows)
+        job.mismatches += len(report)
+        compare += time.perf_counter() - started
+    started = time.perf_counter()
+    job._consolidate()
+    compare += time.perf_counter() - started
+
+    rows = synthetic_chunk(1, min(args.loop_rows, args.rows), args.menus, args.days, args.mismatch_rate, rng)
+    started = time.perf_counter()
+    loop_compare(rows)
+    loop_rate = len(rows) / (time.perf_counter() - started)
+
+    print(f"Baris: {job.rows:,} · selisih: {job.mismatches:,} · ringkasan menu x hari: {len(job.summary):,}")
+    print(f"Vektor per potongan {args.chunk_size:,}: {job.rows / compare:12,.0f} baris/detik ({compare:.2f} detik)")
+    print(f"Loop per baris:            {loop_rate:12,.0f} baris/detik")
+    print(f"(data sintetis dibuat dalam {generate:.2f} detik, tidak dihitung)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/bench_review_index.py
+# Benchmark indeks komentar review dengan --reviews komentar sintetis: bangun indeks penuh,
+# update bertahap satu hari, lalu pencarian kata kunci, term teratas per rating dan tren
+# dibandingkan dengan memindai ulang teks komentar (str.contains / tokenisasi ulang).
+#
+#   python benchmarks/bench_review_index.py --reviews 200000
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import review_index
+
+PHRASES = {
+    1: ["pelayanan lambat", "makanan dingin", "kurang bersih", "pesanan salah", "tidak enak"],
+    2: ["agak lama nunggunya", "porsi kecil", "kurang sesuai ekspektasi", "terlalu asin"],
+    3: ["lumayan", "harga sesuai", "biasa saja", "enak tapi agak mahal"],
+    4: ["makanan enak", "tempat nyaman", "pelayanan cepat", "harga sesuai kualitas"],
+    5: ["makanan enak pelayanan ramah", "worth it banget", "pasti order lagi", "menu favoritku"],
+}
+FILLER = ["tempat", "parkir", "musik", "porsi", "sambal", "minuman", "dessert", "kopi", "teh", "nasi"]
+
+
+def synthetic(n, days, seed):
+    rng = np.random.default_rng(seed)
+    rating = rng.choice([1, 2, 3, 4, 5], n, p=[0.05, 0.1, 0.2, 0.35, 0.3])
+    comments = [
+        f"{rng.choice(PHRASES[r])}, {rng.choice(FILLER)} {rng.choice(PHRASES[rng.integers(1, 6)])}"
+        for r in rating
+    ]
+    dates = pd.Timestamp('2024-01-01') + pd.to_timedelta(np.sort(rng.integers(0, days, n)), unit='D')
+    return pd.DataFrame({'review_id': np.arange(1, n + 1), 'rating': rating,
+                         'comment': comments, 'review_date': dates})
+
+def timed(fn, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return result, np.median(timings) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark indeks komentar review (data sintetis)')
+    parser.add_argument('--reviews', type=int, default=200000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--query', default='pelayanan ramah')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    reviews = synthetic(args.reviews, args.days, args.seed)
+    last_day = reviews['review_date'].max()
+    history, latest = reviews[reviews['review_date'] < last_day], reviews[reviews['review_date'] == last_day]
+    index = review_index.ReviewIndex(path=os.path.join(tempfile.mkdtemp(prefix='bench_review_'), 'index.pkl'))
+
+    started = time.perf_counter()
+    index.apply(history)
+    build = time.perf_counter() - started
+    started = time.perf_counter()
+    index.apply(latest)
+    incremental = time.perf_counter() - started
+
+    start, end = reviews['review_date'].quantile([0.5, 1.0])
+    words = args.query.split()
+    (_, found), search = timed(lambda: index.search(args.query, start, end))
+    _, top = timed(lambda: index.top_terms(start, end))
+    _, trend = timed(lambda: index.trend(words, start, end))
+
+    def scan_search():
+        in_range = reviews[reviews['review_date'].between(start, end)]
+        lower = in_range['comment'].str.lower()
+        return np.logical_and.reduce([lower.str.contains(w, regex=False) for w in words]).sum()
+
+    def scan_top():
+        in_range = reviews[reviews['review_date'].between(start, end)]
+        terms = review_index.tokenize(in_range['comment'])
+        return terms.explode().groupby(in_range['rating'].reindex(terms.explode().index)).value_counts()
+
+    scan_found, scan = timed(scan_search)
+    _, scan_top_ms = timed(scan_top, repeat=1)
+
+    print(f"Review: {len(reviews):,} · term: {len(index.terms):,} · posting: {len(index.post_rows):,}")
+    print(f"Bangun indeks:         {build * 1000:9.1f} ms")
+    print(f"Update 1 hari ({len(latest):,}): {incremental * 1000:9.1f} ms")
+    print(f"\n{'':<22}{'indeks':>10}{'pindai':>12}")
+    print(f"{'cari ' + repr(args.query):<22}{search:>8.2f}ms{scan:>10.1f}ms  ({found:,} vs {scan_found:,} cocok)")
+    print(f"{'term teratas/rating':<22}{top:>8.2f}ms{scan_top_ms:>10.1f}ms")
+    print(f"{'tren ' + str(len(words)) + ' kata':<22}{trend:>8.2f}ms")
+
+if __name__ == '__main__':
+    main()
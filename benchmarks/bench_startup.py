@@ -0,0 +1,80 @@
+# benchmarks/bench_startup.py
+# Benchmark startup: waktu import modul dan time-to-first-paint main.py.
+# Setiap pengukuran dijalankan di proses Python baru supaya import benar-benar dingin.
+#
+# Jalankan dari root repo:
+#   python benchmarks/bench_startup.py --runs 5
+#   python benchmarks/bench_startup.py --runs 5 --output bench_output.txt
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ['config', 'cache', 'gateway', 'data', 'analytics', 'pandas', 'plotly.express']
+
+# Script yang dijalankan di proses baru: render main.py sekali lewat AppTest.
+# first_paint = saat radio navigasi sidebar selesai digambar,
+# full_render = saat seluruh halaman selesai.
+PAINT_SCRIPT = '''
+import sys, time, json
+from streamlit.testing.v1 import AppTest
+from streamlit.delta_generator import DeltaGenerator
+
+marks = {}
+start = time.perf_counter()
+_radio = DeltaGenerator.radio
+
+def radio(self, *args, **kwargs):
+    result = _radio(self, *args, **kwargs)
+    marks.setdefault('first_paint', time.perf_counter() - start)
+    return result
+
+DeltaGenerator.radio = radio
+at = AppTest.from_file(sys.argv[1], default_timeout=300)
+at.run()
+marks['full_render'] = time.perf_counter() - start
+marks['error'] = bool(at.exception) or bool(at.error)
+print(json.dumps(marks))
+'''
+
+def import_time(module):
+    """Waktu import satu modul di interpreter baru (detik)"""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+def paint_time():
+    out = subprocess.run([sys.executable, '-c', PAINT_SCRIPT, os.path.join(ROOT, 'main.py')],
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def median_ms(values):
+    return round(statistics.median(values) * 1000, 1)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark startup Restaurant Orders Dashboard')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--output', help='simpan hasil (JSON) ke file ini')
+    args = parser.parse_args()
+
+    result = {'runs': args.runs, 'import_ms': {}, 'paint_ms': {}}
+    for module in MODULES:
+        result['import_ms'][module] = median_ms([import_time(module) for _ in range(args.runs)])
+        print(f"import {module:<15} {result['import_ms'][module]:>8} ms")
+
+    paints = [paint_time() for _ in range(args.runs)]
+    for key in ['first_paint', 'full_render']:
+        result['paint_ms'][key] = median_ms([p[key] for p in paints if key in p])
+        print(f"{key:<22} {result['paint_ms'][key]:>8} ms")
+    if any(p['error'] for p in paints):
+        print("Peringatan: halaman menampilkan error (database tidak tersedia?)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+# cache.py
+# Cache hasil query yang dipakai bersama oleh semua proses worker Streamlit.
+# Satu worker menjalankan query, worker lain tinggal membaca hasilnya.
+import os
+import time
+import pickle
+import hashlib
+import tempfile
+import re
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+try:
+    import fcntl
+except ImportError:  # Windows: lock antar proses tidak tersedia
+    fcntl = None
+
+# Pengaturan cache (bisa diubah lewat environment variable)
+CACHE_BACKEND = os.environ.get("RESTO_CACHE_BACKEND", "disk")   # "disk" atau "memory"
+CACHE_DIR = os.environ.get(
+    "RESTO_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+)
+CACHE_TTL = int(os.environ.get("RESTO_CACHE_TTL", "300"))       # detik, 0 = tanpa batas
+
+# Nama file entry cache: v<versi>_<nama query>_<hash>.pkl/.lock
+_ENTRY_NAME = re.compile(r"^v\d+_.*\.(pkl|lock)$")
+
+
+class DiskCache:
+    """Cache berbasis file lokal, dipakai bersama oleh semua proses di server yang sama"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key, ext=".pkl"):
+        return os.path.join(self.directory, key + ext)
+
+    def get(self, key):
+        try:
+            with open(self._path(key), "rb") as f:
+                return pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def set(self, key, entry):
+        # Tulis ke file sementara lalu rename supaya pembaca tidak melihat file setengah jadi
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._path(key))
+
+    @contextmanager
+    def lock(self, key):
+        """Lock antar proses per key, supaya query yang sama hanya dijalankan sekali"""
+        with open(self._path(key, ".lock"), "a") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def get_version(self):
+        try:
+            with open(self._path("_version", ""), "r") as f:
+                return int(f.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def bump_version(self):
+        with self.lock("_version"):
+            version = self.get_version() + 1
+            with open(self._path("_version", ""), "w") as f:
+                f.write(str(version))
+        self.prune(version)
+        return version
+
+    def discard(self, prefix, keep):
+        """Hapus entry dan lock berawalan prefix, kecuali yang berawalan keep"""
+        for name in os.listdir(self.directory):
+            if name.startswith(prefix) and not name.startswith(keep) and _ENTRY_NAME.match(name):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+
+    def prune(self, version):
+        """Hapus entry dan lock dari versi lama (file lain di folder cache tidak disentuh)"""
+        prefix = f"v{version}_"
+        for name in os.listdir(self.directory):
+            if _ENTRY_NAME.match(name) and not name.startswith(prefix):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+
+
+class MemoryCache:
+    """Pengganti lokal untuk cache jaringan (Redis/Memcached) dengan antarmuka yang sama.
+    Hanya berlaku di dalam satu proses, cocok untuk development dan satu worker."""
+
+    def __init__(self):
+        self._data = {}
+        self._locks = {}
+        self._guard = threading.Lock()
+        self._version = 0
+
+    def get(self, key):
+        return self._data.get(key)
+
+    def set(self, key, entry):
+        self._data[key] = entry
+
+    @contextmanager
+    def lock(self, key):
+        with self._guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            yield
+
+    def discard(self, prefix, keep):
+        with self._guard:
+            for key in [k for k in self._data if k.startswith(prefix) and not k.startswith(keep)]:
+                del self._data[key]
+
+    def get_version(self):
+        return self._version
+
+    def bump_version(self):
+        with self._guard:
+            self._version += 1
+            self._data.clear()
+        return self._version
+
+
+_backend = None
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = MemoryCache() if CACHE_BACKEND == "memory" else DiskCache(CACHE_DIR)
+    return _backend
+
+def make_key(name, args=(), kwargs=None, version=None, stamp=None):
+    """Key cache = nama query (+ stempel versi tabel) + parameter + versi data"""
+    if version is None:
+        version = get_backend().get_version()
+    raw = repr((args, sorted((kwargs or {}).items())))
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+    return f"{stamp_prefix(name, stamp, version)}_{digest}"
+
+def stamp_prefix(name, stamp=None, version=None):
+    """Awalan key untuk satu query; dengan stempel: v<versi>_<nama>@<hash stempel>"""
+    if version is None:
+        version = get_backend().get_version()
+    if stamp is None:
+        return f"v{version}_{name}"
+    return f"v{version}_{name}@{hashlib.sha1(repr(stamp).encode('utf-8')).hexdigest()[:12]}"
+
+def _fresh(entry, stamp=None):
+    # Dengan stempel versi tabel, entry berlaku sampai tabel sumbernya berubah (tanpa TTL)
+    if stamp is not None:
+        return entry is not None
+    return entry is not None and (CACHE_TTL <= 0 or time.time() - entry[0] < CACHE_TTL)
+
+def get_or_compute(name, compute, args=(), kwargs=None, stamp=None):
+    backend = get_backend()
+    version = backend.get_version()
+    key = make_key(name, args, kwargs, version, stamp)
+    entry = backend.get(key)
+    if _fresh(entry, stamp):
+        return entry[1]
+    with backend.lock(key):
+        # Cek ulang: mungkin worker lain sudah mengisi selama kita menunggu lock
+        entry = backend.get(key)
+        if _fresh(entry, stamp):
+            return entry[1]
+        value = compute()
+        backend.set(key, (time.time(), value))
+    if stamp is not None:
+        # Entry query ini dengan stempel lama tidak akan dipakai lagi
+        backend.discard(f"v{version}_{name}@", stamp_prefix(name, stamp, version) + "_")
+    return value
+
+def invalidate():
+    """Naikkan versi data; semua entry lama otomatis tidak dipakai lagi"""
+    return get_backend().bump_version()
+
+def shared_cache(name, stamp=None):
+    """Decorator untuk fungsi view_* agar hasilnya dipakai bersama antar worker.
+    stamp: fungsi tanpa argumen yang mengembalikan versi tabel sumber (None = pakai TTL)"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            current = stamp() if stamp is not None else None
+            return get_or_compute(name, lambda: func(*args, **kwargs), args, kwargs, current)
+        wrapper.stamp = stamp
+        return wrapper
+    return decorator
+
+
+if __name__ == "__main__":
+    # python cache.py invalidate                  -> paksa semua worker mengambil data baru
+    # python cache.py setup-versions [--dry-run]  -> buat Data_Versions + trigger di database lama
+    import sys
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command == "invalidate":
+        print(f"Versi data sekarang: {invalidate()}")
+    elif command == "setup-versions":
+        from config import setup_versions
+        for sql in setup_versions(dry_run="--dry-run" in sys.argv):
+            print(sql + ";")
+    else:
+        print("Pemakaian: python cache.py invalidate | setup-versions [--dry-run]")
@@ -0,0 +1,170 @@
+# charts.py
+# Palet warna dan fungsi pembuat grafik Plotly, dipakai halaman Streamlit dan generator laporan.
+# Spec JSON figure yang sudah dibuat disimpan di LRU per proses dengan key = hash isi data + parameter,
+# jadi rerun dengan agregat yang sama (mis. checkbox lain diubah) tidak membangun ulang grafik lewat
+# plotly.express. Yang dikembalikan adalah spec dict itu sendiri (st.plotly_chart dan pio.to_html
+# menerima dict), jadi cache hit tidak membangun Figure lagi. Dict ini dipakai bersama antar sesi
+# dan tidak boleh diubah; pemanggil yang perlu update_layout dll. memakai to_figure(spec).
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Color palette profesional
+COLORS = {
+    'primary': '#2E86AB',
+    'secondary': '#A23B72', 
+    'success': '#28A745',
+    'warning': '#F18F01',
+    'danger': '#C73E1D',
+    'info': '#17A2B8',
+    'palette': ['#2E86AB', '#A23B72', '#28A745', '#F18F01', '#C73E1D', '#17A2B8', '#6C757D', '#563D7C']
+}
+
+CHART_TEMPLATE = 'plotly_white'
+
+MAX_FIGURES = int(os.environ.get("RESTO_CHART_CACHE", "128"))   # spec figure yang disimpan per proses
+
+_figures = OrderedDict()
+_figures_lock = threading.Lock()
+_figure_stats = {'hits': 0, 'misses': 0}
+
+
+def _fingerprint(value):
+    """Hash cepat isi data (DataFrame/Series/array/list) atau repr untuk parameter biasa.
+    Index ikut di-hash: sebagian grafik memakai index sebagai label (mis. baris heatmap)."""
+    if isinstance(value, pd.DataFrame):
+        hashed = pd.util.hash_pandas_object(value, index=True).to_numpy()
+        return (f"df{value.shape}{list(value.columns)}{list(value.index.names)}:"
+                f"{hashlib.sha1(hashed.tobytes()).hexdigest()}")
+    if isinstance(value, pd.Series):
+        hashed = pd.util.hash_pandas_object(value, index=True).to_numpy()
+        return f"ser{len(value)}{value.dtype}{value.name!r}:{hashlib.sha1(hashed.tobytes()).hexdigest()}"
+    if isinstance(value, (pd.Index, np.ndarray, list, tuple)):
+        values = pd.Series(np.asarray(value))
+        hashed = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        return f"arr{len(values)}{values.dtype}:{hashlib.sha1(hashed.tobytes()).hexdigest()}"
+    return repr(value)
+
+def memoized_chart(func):
+    """Decorator: spec figure (dict) dengan data + parameter yang sama diambil dari LRU.
+    Hasilnya dipakai bersama, jangan diubah; pakai to_figure() kalau perlu mengubah grafik."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (func.__name__,
+               tuple(_fingerprint(arg) for arg in args),
+               tuple(sorted((name, _fingerprint(value)) for name, value in kwargs.items())))
+        with _figures_lock:
+            spec = _figures.get(key)
+            if spec is not None:
+                _figures.move_to_end(key)
+                _figure_stats['hits'] += 1
+            else:
+                _figure_stats['misses'] += 1
+        if spec is None:
+            spec = json.loads(func(*args, **kwargs).to_json())
+            with _figures_lock:
+                _figures[key] = spec
+                while len(_figures) > MAX_FIGURES:
+                    _figures.popitem(last=False)
+        return spec
+    return wrapper
+
+def to_figure(spec):
+    """Figure baru dari spec grafik, untuk pemanggil yang mengubah grafiknya"""
+    return go.Figure(spec)
+
+def chart_cache_info():
+    with _figures_lock:
+        return dict(_figure_stats, size=len(_figures), max_size=MAX_FIGURES)
+
+@memoized_chart
+def create_bar_chart_colored(data, x, y, title='', horizontal=False):
+    """Bar chart dengan warna berbeda per kategori"""
+    if horizontal:
+        fig = px.bar(data, y=x, x=y, orientation='h', color=x,
+                     color_discrete_sequence=COLORS['palette'], template=CHART_TEMPLATE)
+        fig.update_layout(yaxis={'categoryorder': 'total ascending'})
+    else:
+        fig = px.bar(data, x=x, y=y, color=x,
+                     color_discrete_sequence=COLORS['palette'], template=CHART_TEMPLATE)
+    fig.update_layout(showlegend=False, margin=dict(l=20, r=20, t=40, b=20),
+                      title=dict(text=title, x=0.5, font=dict(size=14)))
+    return fig
+
+@memoized_chart
+def create_bar_chart(data, x, y, title='', horizontal=False, color=None):
+    """Bar chart dengan satu warna"""
+    if horizontal:
+        fig = px.bar(data, y=x, x=y, orientation='h',
+                     color_discrete_sequence=[color or COLORS['primary']], template=CHART_TEMPLATE)
+        fig.update_layout(yaxis={'categoryorder': 'total ascending'})
+    else:
+        fig = px.bar(data, x=x, y=y,
+                     color_discrete_sequence=[color or COLORS['primary']], template=CHART_TEMPLATE)
+    fig.update_layout(showlegend=False, margin=dict(l=20, r=20, t=40, b=20),
+                      title=dict(text=title, x=0.5, font=dict(size=14)))
+    return fig
+
+@memoized_chart
+def create_pie_chart(values, names, title='', max_slices=6):
+    """Donut chart"""
+    df = pd.DataFrame({'names': names, 'values': values}).sort_values('values', ascending=False)
+    if len(df) > max_slices:
+        top = df.head(max_slices - 1)
+        others = pd.DataFrame({'names': ['Lainnya'], 'values': [df.iloc[max_slices-1:]['values'].sum()]})
+        df = pd.concat([top, others])
+    
+    fig = px.pie(df, values='values', names='names', hole=0.4,
+                 color_discrete_sequence=COLORS['palette'], template=CHART_TEMPLATE)
+    fig.update_layout(margin=dict(l=20, r=20, t=40, b=20),
+                      title=dict(text=title, x=0.5, font=dict(size=14)),
+                      legend=dict(orientation='h', yanchor='bottom', y=-0.2, xanchor='center', x=0.5))
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    return fig
+
+@memoized_chart
+def create_line_chart(x, y, title='', fill=False):
+    """Line/Area chart"""
+    if fill:
+        fig = px.area(x=x, y=y, template=CHART_TEMPLATE, color_discrete_sequence=[COLORS['primary']])
+    else:
+        fig = px.line(x=x, y=y, markers=True, template=CHART_TEMPLATE, color_discrete_sequence=[COLORS['primary']])
+    fig.update_layout(showlegend=False, margin=dict(l=20, r=20, t=40, b=20),
+                      title=dict(text=title, x=0.5, font=dict(size=14)), xaxis_title='', yaxis_title='')
+    return fig
+
+@memoized_chart
+def create_timeline_chart(data, start, end, y, color, title=''):
+    """Gantt chart (mis. jadwal pemakaian meja)"""
+    fig = px.timeline(data, x_start=start, x_end=end, y=y, color=color,
+                      color_discrete_sequence=COLORS['palette'], template=CHART_TEMPLATE)
+    fig.update_yaxes(categoryorder='category ascending', title='')
+    fig.update_layout(margin=dict(l=20, r=20, t=40, b=20), legend_title_text='',
+                      title=dict(text=title, x=0.5, font=dict(size=14)))
+    return fig
+
+@memoized_chart
+def create_heatmap_chart(data, title='', color_label=''):
+    """Heatmap dari DataFrame (baris x kolom), mis. menu x jam"""
+    fig = px.imshow(data, aspect='auto', color_continuous_scale='Blues', template=CHART_TEMPLATE,
+                    labels=dict(color=color_label))
+    fig.update_layout(margin=dict(l=20, r=20, t=40, b=20),
+                      title=dict(text=title, x=0.5, font=dict(size=14)))
+    return fig
+
+@memoized_chart
+def create_multi_line_chart(data, x, y, color, title=''):
+    """Line chart beberapa seri (data long-form, satu seri per nilai kolom color)"""
+    fig = px.line(data, x=x, y=y, color=color, markers=True,
+                  color_discrete_sequence=COLORS['palette'], template=CHART_TEMPLATE)
+    fig.update_layout(margin=dict(l=20, r=20, t=40, b=20), legend_title_text='',
+                      title=dict(text=title, x=0.5, font=dict(size=14)), xaxis_title='', yaxis_title='')
+    return fig
@@ -1,8 +1,17 @@
 # config.py
-import mysql.connector
+import os
+import json
+import time
+import threading
+import contextvars
+from functools import wraps
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from cache import shared_cache
+from gateway import single_flight, MAX_HEAVY_QUERIES, MAX_LIGHT_QUERIES
 
 # Koneksi ke database
-conn = mysql.connector.connect(
+DB_CONFIG = dict(
     host="localhost",
     port=3306,
     user="root",
@@ -10,82 +19,667 @@ conn = mysql.connector.connect(
     database="restaurant_orders"
 )
 
-# Cursor untuk execute query
-c = conn.cursor()
+# Multi cabang: setiap cabang punya database restaurant_orders sendiri.
+# Daftar cabang dibaca dari file JSON (lihat branches.example.json); tanpa file = satu cabang.
+BRANCHES_FILE = os.environ.get(
+    "RESTO_BRANCHES_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "branches.json")
+)
+
+def replicas_from_env():
+    """Replika baca untuk konfigurasi satu cabang, mis. RESTO_DB_REPLICAS=10.0.0.21:3306,10.0.0.22"""
+    replicas = []
+    for item in os.environ.get("RESTO_DB_REPLICAS", "").split(","):
+        host, _, port = item.strip().partition(":")
+        if host:
+            replicas.append(dict(host=host, port=int(port)) if port else dict(host=host))
+    return replicas
+
+def load_branches():
+    if os.path.exists(BRANCHES_FILE):
+        with open(BRANCHES_FILE) as f:
+            return [dict(DB_CONFIG, **branch) for branch in json.load(f)]
+    return [dict(DB_CONFIG, name="Pusat", replicas=replicas_from_env())]
+
+BRANCHES = load_branches()
+BRANCH_NAMES = [branch["name"] for branch in BRANCHES]
+
+# Id transaksi (order, detail, reservasi, review) hanya unik di dalam satu cabang.
+# Saat digabung, id cabang ke-i digeser i * BRANCH_ID_STRIDE (cabang pertama tidak berubah).
+BRANCH_ID_STRIDE = 10 ** 10
+
+# Cabang yang sedang dipakai run_query di thread/konteks ini (default: cabang pertama)
+_current_branch = contextvars.ContextVar("current_branch", default=0)
+
+# Pool koneksi: setiap query memakai koneksinya sendiri, aman dipakai antar sesi/thread.
+# Pool baru dibuat saat query pertama, jadi import config.py tidak membuka koneksi
+# dan aplikasi tetap bisa tampil walau database sedang tidak tersedia.
+# Ukuran pool = slot gerbang query (view_*) + cadangan untuk pemakai di luar gerbang
+# (poll Data_Versions, poller order_feed, intake, cek lag replika), karena mysql.connector
+# langsung melempar PoolError kalau pool habis, bukan menunggu.
+POOL_HEADROOM = int(os.environ.get("RESTO_POOL_HEADROOM", "4"))
+POOL_MAX_SIZE = 32   # batas pool_size mysql.connector
+
+_pools = {}
+_pool_locks = {}
+_pool_lock = threading.Lock()
+
+def _create_pool(index, replica=None):
+    from mysql.connector import pooling
+    settings = {k: v for k, v in BRANCHES[index].items() if k not in ("name", "replicas")}
+    if replica is not None:
+        # Replika mewarisi user/password/database cabangnya kecuali ditulis sendiri
+        settings.update(BRANCHES[index]["replicas"][replica])
+    return pooling.MySQLConnectionPool(
+        pool_name=f"restaurant_orders_{index}" + (f"_replica{replica}" if replica is not None else ""),
+        pool_size=min(MAX_HEAVY_QUERIES + MAX_LIGHT_QUERIES + POOL_HEADROOM, POOL_MAX_SIZE),
+        **settings
+    )
+
+def get_pool(branch=None, replica=None):
+    """Pool primary cabang (default cabang aktif), atau pool replika ke-replica cabang itu"""
+    index = _current_branch.get() if branch is None else branch
+    key = index if replica is None else (index, replica)
+    pool = _pools.get(key)
+    if pool is not None:
+        return pool
+    # Pool membuka koneksinya saat dibuat (bisa lama kalau server mati), jadi lock per pool:
+    # pemanggil pool lain yang sudah jadi tidak ikut menunggu
+    with _pool_lock:
+        lock = _pool_locks.setdefault(key, threading.Lock())
+    with lock:
+        if key not in _pools:
+            _pools[key] = _create_pool(index, replica)
+        return _pools[key]
+
+def _fetch_all(pool, sql, params=()):
+    conn = pool.get_connection()
+    try:
+        c = conn.cursor()
+        c.execute(sql, params)
+        rows = c.fetchall()
+        c.close()
+        return rows
+    finally:
+        conn.close()
+
+# Jalankan query dan ambil semua baris.
+# Di dalam view_* (replica_read) query dibaca dari replika cabang aktif kalau ada yang layak.
+def run_query(sql, params=()):
+    index = _current_branch.get()
+    replica = replica_router.pick(index) if _read_replica.get() else None
+    if replica is not None:
+        try:
+            return _fetch_all(get_pool(index, replica), sql, params)
+        except Exception:
+            replica_router.mark_down(index, replica)
+    return _fetch_all(get_pool(index), sql, params)
+
+# REPLIKA BACA
+# Cabang boleh punya replika baca: "replicas": [{"host": ..., "port": ...}] di branches.json
+# (setelan lain ikut cabangnya) atau RESTO_DB_REPLICAS untuk satu cabang. Hanya view_* analitik
+# yang dibaca dari replika, bergiliran (round-robin); penulisan, intake, order_feed, dedup dan
+# poll Data_Versions tetap ke primary.
+# Cek lag: dengan Data_Versions, replika layak kalau versinya sudah menyusul versi primary yang
+# terakhir di-poll (cache distempel versi itu, jadi tidak boleh diisi data yang lebih lama).
+# Tanpa Data_Versions dipakai Seconds_Behind_Source <= MAX_REPLICA_LAG. Replika yang tertinggal
+# atau error dilewati; kalau tidak ada yang layak, query jatuh ke primary.
+MAX_REPLICA_LAG = float(os.environ.get("RESTO_MAX_REPLICA_LAG", "5"))   # detik
+REPLICA_CHECK_INTERVAL = 2     # detik; hasil cek Seconds_Behind_Source disimpan selama ini
+REPLICA_RETRY_INTERVAL = 30    # detik sebelum replika yang error dicoba lagi
+
+_read_replica = contextvars.ContextVar("read_replica", default=False)
+
+def replica_read(func):
+    """Decorator: query di dalam func boleh dibaca dari replika (pasang di bawah fan_out)"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _read_replica.set(True)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _read_replica.reset(token)
+    return wrapper
+
+def _seconds_behind(pool):
+    """Seconds_Behind_Source replika; None kalau replikasi berhenti atau server bukan replika"""
+    conn = pool.get_connection()
+    try:
+        c = conn.cursor()
+        try:
+            c.execute('SHOW REPLICA STATUS')
+        except Exception:
+            c.execute('SHOW SLAVE STATUS')   # MySQL < 8.0.22
+        row = c.fetchone()
+        columns = [d[0] for d in c.description or ()]
+        c.close()
+    finally:
+        conn.close()
+    if row is None:
+        return None
+    status = dict(zip(columns, row))
+    lag = status.get('Seconds_Behind_Source', status.get('Seconds_Behind_Master'))
+    return None if lag is None else float(lag)
+
+
+class ReplicaRouter:
+    """Pilih replika baca per cabang (round-robin) yang lolos cek lag"""
+
+    def __init__(self):
+        self.status = {}            # (cabang, replika) -> keterangan cek terakhir
+        self._next = {}             # cabang -> giliran replika berikutnya
+        self._caught_up = {}        # (cabang, replika) -> versi primary yang sudah disusul
+        self._seconds = {}          # (cabang, replika) -> (waktu cek, lag detik)
+        self._down_until = {}
+        self._lock = threading.Lock()
+        self._stats = {'replica_reads': 0, 'primary_fallbacks': 0, 'lagging': 0, 'errors': 0}
+
+    def pick(self, index):
+        """Index replika untuk query berikutnya di cabang ini, atau None = pakai primary"""
+        replicas = BRANCHES[index].get("replicas") or []
+        if not replicas:
+            return None
+        with self._lock:
+            start = self._next.get(index, 0)
+            self._next[index] = (start + 1) % len(replicas)
+        for step in range(len(replicas)):
+            replica = (start + step) % len(replicas)
+            if self._usable(index, replica):
+                self._count('replica_reads')
+                return replica
+        self._count('primary_fallbacks')
+        return None
+
+    def mark_down(self, index, replica, error=None):
+        with self._lock:
+            self._down_until[(index, replica)] = time.time() + REPLICA_RETRY_INTERVAL
+            self._caught_up.pop((index, replica), None)
+            self._stats['errors'] += 1
+            self.status[(index, replica)] = f"error: {error}" if error else "error"
+
+    def metrics(self):
+        with self._lock:
+            return dict(self._stats, replicas=sum(len(b.get("replicas") or []) for b in BRANCHES))
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _usable(self, index, replica):
+        key = (index, replica)
+        if self._down_until.get(key, 0) > time.time():
+            return False
+        pool = get_pool(index, replica)
+        try:
+            primary = table_versions.branch_versions(index)
+            if primary is not None:
+                behind = self._versions_behind(key, pool, primary)
+                self.status[key] = f"{behind} tabel tertinggal"
+            else:
+                lag = self._lag_seconds(key, pool)
+                behind = lag is None or lag > MAX_REPLICA_LAG
+                self.status[key] = "replikasi berhenti" if lag is None else f"lag {lag:.0f} s"
+        except Exception as e:
+            self.mark_down(index, replica, e)
+            return False
+        if behind:
+            self._count('lagging')
+        return not behind
+
+    def _versions_behind(self, key, pool, primary):
+        """Jumlah tabel yang versinya di replika masih di bawah versi primary"""
+        if self._caught_up.get(key) == primary:
+            return 0
+        replica = dict(_fetch_all(pool, VERSIONS_SQL))
+        behind = sum(1 for table, version in primary.items() if replica.get(table, -1) < version)
+        if not behind:
+            self._caught_up[key] = primary
+        return behind
+
+    def _lag_seconds(self, key, pool):
+        checked_at, lag = self._seconds.get(key, (0, None))
+        if time.time() - checked_at >= REPLICA_CHECK_INTERVAL:
+            lag = _seconds_behind(pool)
+            self._seconds[key] = (time.time(), lag)
+        return lag
+
+replica_router = ReplicaRouter()
+
+def replica_metrics():
+    return replica_router.metrics()
+
+# FAN-OUT KE SEMUA CABANG
+
+def branch_value(value):
+    """Ambil nilai untuk cabang aktif kalau value berupa tuple per cabang"""
+    return value[_current_branch.get()] if isinstance(value, tuple) else value
+
+@contextmanager
+def on_branch(index):
+    """run_query/run_statement di dalam blok ini memakai cabang index (untuk skrip per cabang)"""
+    token = _current_branch.set(index)
+    try:
+        yield index
+    finally:
+        _current_branch.reset(token)
+
+def current_branch():
+    return _current_branch.get()
+
+def _run_on_branch(index, func, args, kwargs):
+    with on_branch(index):
+        return func(*args, **kwargs)
+
+def _merge_sum(results, keys, sums, order_by=None):
+    """Jumlahkan kolom sums untuk baris dengan kolom keys yang sama"""
+    merged = {}
+    for rows in results:
+        for row in rows:
+            key = tuple(row[i] for i in keys)
+            if key not in merged:
+                merged[key] = list(row)
+            else:
+                for i in sums:
+                    merged[key][i] += row[i]
+    rows = [tuple(row) for row in merged.values()]
+    if order_by is not None:
+        rows.sort(key=lambda row: row[order_by], reverse=True)
+    return rows
+
+def _merge_concat(results, ids, order_by):
+    """Gabungkan baris semua cabang; id transaksi diberi namespace cabang"""
+    rows = []
+    for index, branch_rows in enumerate(results):
+        offset = index * BRANCH_ID_STRIDE
+        for row in branch_rows:
+            if offset:
+                row = tuple(v + offset if i in ids and v is not None else v for i, v in enumerate(row))
+            rows.append(row)
+    if len(results) > 1:
+        rows.sort(key=lambda row: (row[order_by] is not None, row[order_by]), reverse=True)
+    return rows
+
+def fan_out(mode, keys=(), sums=(), ids=(), order_by=None):
+    """Decorator: jalankan view_* di semua cabang secara paralel lalu gabungkan hasilnya.
+    mode 'sum'    : agregat (sum/count) dijumlahkan per keys
+    mode 'concat' : baris detail digabung, kolom ids diberi namespace cabang
+    mode 'label'  : setiap baris diberi nama cabang di kolom pertama (untuk angka per cabang)
+    Data master (menu, meja, customer) sama di semua cabang, jadi cukup dibaca dari cabang pertama."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if len(BRANCHES) == 1 and mode != 'label':
+                return func(*args, **kwargs)
+            # Total waktu = cabang paling lambat, bukan jumlah semua cabang
+            with ThreadPoolExecutor(max_workers=len(BRANCHES)) as executor:
+                futures = [executor.submit(_run_on_branch, i, func, args, kwargs) for i in range(len(BRANCHES))]
+                results = [future.result() for future in futures]
+            if mode == 'sum':
+                return _merge_sum(results, keys, sums, order_by)
+            if mode == 'concat':
+                return _merge_concat(results, ids, order_by)
+            return [(BRANCH_NAMES[i],) + tuple(row) for i, rows in enumerate(results) for row in rows]
+        return wrapper
+    return decorator
+
+# Jalankan perintah yang mengubah data/struktur (INSERT/UPDATE/ALTER) lalu commit
+def run_statement(sql, params=()):
+    conn = get_pool().get_connection()
+    try:
+        c = conn.cursor()
+        c.execute(sql, params)
+        rowcount = c.rowcount
+        c.close()
+        conn.commit()
+        return rowcount
+    finally:
+        conn.close()
+
+# Klausa WHERE untuk rentang tanggal (end inklusif); dipakai agar MySQL hanya membaca partisi yang perlu.
+# keyword='AND' untuk menyambung kondisi ON di LEFT JOIN (baris master tanpa order tetap ada).
+def date_range_clause(column, start=None, end=None, keyword="WHERE"):
+    conditions, params = [], []
+    if start is not None:
+        conditions.append(f"{column} >= %s")
+        params.append(start)
+    if end is not None:
+        conditions.append(f"{column} < %s + INTERVAL 1 DAY")
+        params.append(end)
+    return (f"{keyword} " + " AND ".join(conditions) if conditions else ""), tuple(params)
+
+# Order_Details.order_time hanya ada setelah `python partitions.py setup` (diisi trigger dari Orders).
+# Kondisi pada o.order_time hanya memangkas partisi Orders; supaya partisi Order_Details juga
+# dipangkas, view yang membaca Order_Details memberi rentang yang sama pada od.order_time.
+# Cek dengan EXPLAIN PARTITIONS (MySQL 5.7) atau kolom partitions di EXPLAIN (8.0).
+_detail_order_time = {}   # cabang -> Order_Details punya kolom order_time
+
+def detail_range_clause(start=None, end=None, keyword="AND"):
+    """date_range_clause untuk od.order_time, kosong kalau kolomnya belum ada di cabang aktif"""
+    if start is None and end is None:
+        return "", ()
+    branch = current_branch()
+    if branch not in _detail_order_time:
+        try:
+            _detail_order_time[branch] = bool(run_query('''
+                SELECT 1 FROM information_schema.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'Order_Details' AND COLUMN_NAME = 'order_time'
+            '''))
+        except Exception:
+            return "", ()
+    if not _detail_order_time[branch]:
+        return "", ()
+    return date_range_clause('od.order_time', start, end, keyword)
+
+# Baris dari arsip partisi lama (file parquet) dengan kolom yang sama seperti hasil view_name.
+# Bulan yang diarsipkan sudah tidak ada di MySQL, jadi setiap view yang membaca Orders/Order_Details
+# menggabungkan hasilnya dengan arsip; file hanya dibaca kalau rentang tanggal membutuhkannya.
+# Arsip disimpan per cabang, jadi di dalam fan_out setiap cabang hanya membaca arsipnya sendiri.
+def archived_rows(view_name, *args):
+    from partitions import ARCHIVE_DIR, read_archive
+    if not os.path.isdir(ARCHIVE_DIR):
+        return []
+    return read_archive(view_name, *args)
+
+# VERSI DATA
+# Tabel Data_Versions berisi satu counter per tabel dasar yang dinaikkan trigger setiap
+# INSERT/UPDATE/DELETE (bagian VERSIONING di Database.sql, atau setup_versions() untuk database lama).
+# Cache view_* memakai versi tabel sumbernya sebagai bagian key, jadi hasil lama dipakai terus
+# sampai tabelnya benar-benar berubah. Tanpa tabel Data_Versions cache kembali memakai TTL.
+# Catatan: TRUNCATE dan LOAD DATA tanpa trigger tidak tercatat; jalankan `python cache.py invalidate`.
+#
+# Biaya lock: trigger FOR EACH ROW mengunci baris counter sampai transaksinya commit. Dengan satu
+# baris per tabel, semua transaksi yang menulis Orders/Order_Details antre di baris yang sama.
+# Karena itu counter dipecah ke VERSION_SLOTS baris per tabel (slot = CONNECTION_ID() % VERSION_SLOTS);
+# hanya koneksi dengan slot sama yang saling menunggu. Versi tabel = SUM(version) semua slotnya,
+# tetap naik setiap ada perubahan. Setiap baris yang berubah tetap menambah satu UPDATE ke transaksi.
+VERSIONED_TABLES = [
+    'Customers', 'Categories', 'Payment_Methods', 'Tables', 'Menu',
+    'Orders', 'Order_Details', 'Reservations', 'Reviews'
+]
+VERSION_POLL_INTERVAL = float(os.environ.get("RESTO_VERSION_POLL", "2"))   # detik
+VERSION_RETRY_INTERVAL = 60   # detik sebelum mencoba lagi kalau Data_Versions belum ada
+VERSION_SLOTS = 8             # baris counter per tabel; sama dengan angka di trigger Database.sql
+
+def version_setup_statements(migrate=False):
+    """SQL Data_Versions + trigger. migrate=True untuk Data_Versions lama (satu baris per tabel):
+    baris lamanya menjadi slot 0 sehingga versi tidak mundur."""
+    statements = [
+        "CREATE TABLE IF NOT EXISTS Data_Versions ("
+        "table_name VARCHAR(64) NOT NULL, "
+        "slot SMALLINT NOT NULL DEFAULT 0, "
+        "version BIGINT NOT NULL DEFAULT 0, "
+        "updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP, "
+        "PRIMARY KEY (table_name, slot))",
+    ]
+    if migrate:
+        statements.append("ALTER TABLE Data_Versions ADD COLUMN slot SMALLINT NOT NULL DEFAULT 0 AFTER table_name, "
+                          "DROP PRIMARY KEY, ADD PRIMARY KEY (table_name, slot)")
+    statements.append(
+        "INSERT IGNORE INTO Data_Versions (table_name) VALUES "
+        + ", ".join(f"('{table}')" for table in VERSIONED_TABLES)
+    )
+    for table in VERSIONED_TABLES:
+        for event in ['INSERT', 'UPDATE', 'DELETE']:
+            trigger = f"{table.lower()}_version_{event.lower()}"
+            statements += [
+                f"DROP TRIGGER IF EXISTS {trigger}",
+                f"CREATE TRIGGER {trigger} AFTER {event} ON {table} FOR EACH ROW "
+                f"INSERT INTO Data_Versions (table_name, slot, version) "
+                f"VALUES ('{table}', CONNECTION_ID() % {VERSION_SLOTS}, 1) "
+                f"ON DUPLICATE KEY UPDATE version = version + 1",
+            ]
+    return statements
+
+def _versions_need_slots():
+    """True kalau cabang aktif masih punya Data_Versions lama tanpa kolom slot"""
+    columns = [row[0] for row in run_query('''
+        SELECT COLUMN_NAME FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'Data_Versions'
+    ''')]
+    return bool(columns) and 'slot' not in columns
+
+def setup_versions(dry_run=False):
+    """Buat (atau migrasikan) Data_Versions + trigger di semua cabang; kembalikan SQL yang dijalankan"""
+    executed = []
+    for index in range(len(BRANCHES)):
+        statements = version_setup_statements(migrate=_run_on_branch(index, _versions_need_slots, (), {}))
+        if not dry_run:
+            for sql in statements:
+                _run_on_branch(index, run_statement, (sql,), {})
+        executed += [sql for sql in statements if sql not in executed]
+    return executed
+
+# Query poll: satu baris per tabel per cabang (jumlah semua slot)
+VERSIONS_SQL = 'SELECT table_name, CAST(SUM(version) AS SIGNED) FROM Data_Versions GROUP BY table_name'
+
+@fan_out('label')
+def view_data_versions():
+    return run_query(VERSIONS_SQL)
+
+
+class TableVersions:
+    """Versi tabel dasar semua cabang; di-poll paling sering sekali per interval per proses"""
+
+    def __init__(self, interval=VERSION_POLL_INTERVAL):
+        self.interval = interval
+        self.versions = None        # {(cabang, tabel): versi}, None = Data_Versions tidak tersedia
+        self._next_poll = 0
+        self._lock = threading.Lock()
+
+    def current(self):
+        with self._lock:
+            if time.time() >= self._next_poll:
+                try:
+                    rows = view_data_versions()
+                    self.versions = {(branch, table): version for branch, table, version in rows}
+                    self._next_poll = time.time() + self.interval
+                except Exception:
+                    self.versions = None
+                    self._next_poll = time.time() + VERSION_RETRY_INTERVAL
+            return self.versions
+
+    def branch_versions(self, index):
+        """{tabel: versi} satu cabang dari poll terakhir, None kalau Data_Versions tidak tersedia"""
+        versions = self.current()
+        if versions is None:
+            return None
+        return {table: version for (branch, table), version in versions.items() if branch == BRANCH_NAMES[index]}
+
+    def stamp(self, tables):
+        versions = self.current()
+        if versions is None:
+            return None
+        return tuple(versions.get((branch, table)) for branch in BRANCH_NAMES for table in tables)
+
+table_versions = TableVersions()
+
+def table_stamp(*tables):
+    """Fungsi stempel untuk shared_cache: berubah hanya kalau salah satu tabel berubah"""
+    return lambda: table_versions.stamp(tables)
+
+# Versi tabel dan jumlah baris dengan id > after_id per cabang, dibaca dalam satu statement
+# (satu snapshot InnoDB). Store bertahap memakainya untuk membedakan INSERT dari UPDATE/DELETE:
+# kalau versi naik lebih banyak dari jumlah baris baru, ada baris lama yang berubah.
+@fan_out('label')
+def view_table_changes(table, id_column, after_id=0):
+    if table not in VERSIONED_TABLES:
+        raise ValueError(f"Tabel tidak dikenal: {table}")
+    # after_id boleh berupa tuple per cabang
+    return run_query(f'''
+        SELECT (SELECT CAST(SUM(version) AS SIGNED) FROM Data_Versions WHERE table_name = %s) as version,
+               (SELECT COUNT(*) FROM {table} WHERE {id_column} > %s) as inserted,
+               (SELECT COALESCE(MAX({id_column}), 0) FROM {table}) as max_id
+    ''', (table, branch_value(after_id)))
 
 # Fungsi ambil data customers dengan total spending
+@shared_cache('view_customers', stamp=table_stamp('Customers', 'Orders', 'Order_Details'))
+@single_flight('view_customers')
+@fan_out('sum', keys=(0,), sums=(4,), order_by=4)
+@replica_read
 def view_customers():
-    c.execute('''
-        SELECT c.*, COALESCE(SUM(od.total_price), 0) as total_spending
+    rows = run_query('''
+        SELECT c.customer_id, c.customer_name, c.email, c.phone,
+               COALESCE(SUM(od.total_price), 0) as total_spending
         FROM Customers c
         LEFT JOIN Orders o ON c.customer_id = o.customer_id
         LEFT JOIN Order_Details od ON o.order_id = od.order_id
         GROUP BY c.customer_id
         ORDER BY total_spending DESC
     ''')
-    return c.fetchall()
+    return _merge_sum([rows, archived_rows('view_customers')], keys=(0,), sums=(4,), order_by=4)
+
+# Fungsi ambil nama dan kategori menu (tanpa agregasi penjualan, mis. untuk label forecast)
+@shared_cache('view_menu_names', stamp=table_stamp('Menu', 'Categories'))
+@single_flight('view_menu_names', heavy=False)
+@replica_read
+def view_menu_names():
+    return run_query('''
+        SELECT m.menu_id, m.item_name, c.category_name
+        FROM Menu m
+        LEFT JOIN Categories c ON m.category_id = c.category_id
+        ORDER BY m.menu_id ASC
+    ''')
+
+# Fungsi ambil data master customer (tanpa agregasi)
+@shared_cache('view_customer_list', stamp=table_stamp('Customers'))
+@single_flight('view_customer_list', heavy=False)
+@replica_read
+def view_customer_list():
+    return run_query('SELECT customer_id, customer_name, email, phone FROM Customers ORDER BY customer_id ASC')
+
+# Fungsi ambil total belanja per order setelah order_id tertentu (untuk update statistik customer)
+@single_flight('view_order_totals')
+@fan_out('concat', ids=(0,), order_by=0)
+@replica_read
+def view_order_totals(after_order_id=0):
+    # after_order_id boleh berupa tuple high-water mark per cabang
+    return run_query('''
+        SELECT o.order_id, o.customer_id, o.order_time,
+               COALESCE(SUM(od.total_price), 0) as order_total
+        FROM Orders o
+        LEFT JOIN Order_Details od ON o.order_id = od.order_id
+        WHERE o.order_id > %s
+        GROUP BY o.order_id
+        ORDER BY o.order_id ASC
+    ''', (branch_value(after_order_id),)) + archived_rows('view_order_totals', branch_value(after_order_id))
+
+# Fungsi ambil review setelah review_id tertentu (untuk indeks komentar review)
+@single_flight('view_review_texts')
+@fan_out('concat', ids=(0,), order_by=0)
+@replica_read
+def view_review_texts(after_review_id=0):
+    # after_review_id boleh berupa tuple high-water mark per cabang
+    return run_query('''
+        SELECT review_id, rating, comment, review_date
+        FROM Reviews
+        WHERE review_id > %s
+        ORDER BY review_id ASC
+    ''', (branch_value(after_review_id),))
+
+# Fungsi ambil jumlah terjual per menu per tanggal per jam (untuk model forecast permintaan)
+@single_flight('view_item_hourly')
+@fan_out('sum', keys=(0, 1, 2), sums=(3,))
+@replica_read
+def view_item_hourly(start=None, end=None):
+    where, params = date_range_clause('o.order_time', start, end)
+    detail, detail_params = detail_range_clause(start, end)
+    where = (where + f" {detail} AND" if where else "WHERE") + " o.order_status <> 'Cancelled'"
+    return run_query(f'''
+        SELECT od.menu_id, DATE(o.order_time) as order_date,
+               HOUR(o.order_time) as order_hour, SUM(od.quantity) as quantity
+        FROM Order_Details od
+        JOIN Orders o ON od.order_id = o.order_id
+        {where}
+        GROUP BY od.menu_id, DATE(o.order_time), HOUR(o.order_time)
+    ''', params + detail_params) + archived_rows('view_item_hourly', start, end)
 
 # Fungsi ambil data categories dengan total quantity
-def view_categories():
-    c.execute('''
+@shared_cache('view_categories', stamp=table_stamp('Categories', 'Menu', 'Order_Details', 'Orders'))
+@single_flight('view_categories')
+@fan_out('sum', keys=(0, 3), sums=(2,))
+@replica_read
+def view_categories(start=None, end=None):
+    on, params = date_range_clause('o.order_time', start, end, 'AND')
+    detail, detail_params = detail_range_clause(start, end)
+    return run_query(f'''
         SELECT c.category_id, c.category_name, 
                COALESCE(SUM(od.quantity), 0) as total_qty,
                DATE(o.order_time) as order_date
         FROM Categories c
         LEFT JOIN Menu m ON c.category_id = m.category_id
-        LEFT JOIN Order_Details od ON m.menu_id = od.menu_id
-        LEFT JOIN Orders o ON od.order_id = o.order_id
+        LEFT JOIN (Order_Details od JOIN Orders o ON od.order_id = o.order_id {on} {detail})
+               ON m.menu_id = od.menu_id
         GROUP BY c.category_id, DATE(o.order_time)
-    ''')
-    return c.fetchall()
+    ''', params + detail_params) + archived_rows('view_categories', start, end)
 
 # Fungsi ambil data payment methods dengan revenue
-def view_payment_methods():
-    c.execute('''
+@shared_cache('view_payment_methods', stamp=table_stamp('Payment_Methods', 'Orders', 'Order_Details'))
+@single_flight('view_payment_methods')
+@fan_out('sum', keys=(0, 3), sums=(2,))
+@replica_read
+def view_payment_methods(start=None, end=None):
+    on, params = date_range_clause('o.order_time', start, end, 'AND')
+    detail, detail_params = detail_range_clause(start, end)
+    return run_query(f'''
         SELECT p.payment_id, p.method_name, 
                COALESCE(SUM(od.total_price), 0) as revenue,
                DATE(o.order_time) as order_date
         FROM Payment_Methods p
-        LEFT JOIN Orders o ON p.payment_id = o.payment_id
-        LEFT JOIN Order_Details od ON o.order_id = od.order_id
+        LEFT JOIN Orders o ON p.payment_id = o.payment_id {on}
+        LEFT JOIN Order_Details od ON o.order_id = od.order_id {detail}
         GROUP BY p.payment_id, DATE(o.order_time)
-    ''')
-    return c.fetchall()
+    ''', params + detail_params) + archived_rows('view_payment_methods', start, end)
 
 # Fungsi ambil data tables
+@shared_cache('view_tables', stamp=table_stamp('Tables'))
+@single_flight('view_tables', heavy=False)
+@replica_read
 def view_tables():
-    c.execute('SELECT * FROM Tables ORDER BY table_id ASC')
-    return c.fetchall()
+    return run_query('SELECT * FROM Tables ORDER BY table_id ASC')
 
 # Fungsi ambil data penggunaan meja
-def view_table_usage():
-    c.execute('''
+@shared_cache('view_table_usage', stamp=table_stamp('Tables', 'Orders'))
+@single_flight('view_table_usage')
+@fan_out('sum', keys=(0, 4), sums=(3,))
+@replica_read
+def view_table_usage(start=None, end=None):
+    on, params = date_range_clause('o.order_time', start, end, 'AND')
+    return run_query(f'''
         SELECT t.table_id, t.table_number, t.capacity, 
                COUNT(o.order_id) as times_used,
                DATE(o.order_time) as order_date
         FROM Tables t
-        LEFT JOIN Orders o ON t.table_id = o.table_id
+        LEFT JOIN Orders o ON t.table_id = o.table_id {on}
         GROUP BY t.table_id, DATE(o.order_time)
-    ''')
-    return c.fetchall()
+    ''', params) + archived_rows('view_table_usage', start, end)
 
 # Fungsi ambil data menu dengan total ordered
-def view_menu():
-    c.execute('''
+@shared_cache('view_menu', stamp=table_stamp('Menu', 'Categories', 'Order_Details', 'Orders'))
+@single_flight('view_menu')
+@fan_out('sum', keys=(0, 6), sums=(5,))
+@replica_read
+def view_menu(start=None, end=None):
+    on, params = date_range_clause('o.order_time', start, end, 'AND')
+    detail, detail_params = detail_range_clause(start, end)
+    return run_query(f'''
         SELECT m.menu_id, m.item_name, m.unit_price, m.member_only,
                c.category_name, COALESCE(SUM(od.quantity), 0) as total_ordered,
                DATE(o.order_time) as order_date
         FROM Menu m
         LEFT JOIN Categories c ON m.category_id = c.category_id
-        LEFT JOIN Order_Details od ON m.menu_id = od.menu_id
-        LEFT JOIN Orders o ON od.order_id = o.order_id
+        LEFT JOIN (Order_Details od JOIN Orders o ON od.order_id = o.order_id {on} {detail})
+               ON m.menu_id = od.menu_id
         GROUP BY m.menu_id, DATE(o.order_time)
-    ''')
-    return c.fetchall()
+    ''', params + detail_params) + archived_rows('view_menu', start, end)
 
 # Fungsi ambil data orders lengkap
-def view_orders():
-    c.execute('''
+@shared_cache('view_orders', stamp=table_stamp('Orders', 'Payment_Methods', 'Tables', 'Customers'))
+@single_flight('view_orders')
+@fan_out('concat', ids=(0,), order_by=7)
+@replica_read
+def view_orders(start=None, end=None):
+    where, params = date_range_clause('o.order_time', start, end)
+    return run_query(f'''
         SELECT o.order_id, o.customer_id, o.guest_name, o.service_type,
                o.table_id, o.payment_id, o.order_status, o.order_time,
                p.method_name, t.table_number, c.customer_name,
@@ -94,26 +688,60 @@ def view_orders():
         LEFT JOIN Payment_Methods p ON o.payment_id = p.payment_id
         LEFT JOIN Tables t ON o.table_id = t.table_id
         LEFT JOIN Customers c ON o.customer_id = c.customer_id
+        {where}
         ORDER BY o.order_time DESC
-    ''')
-    return c.fetchall()
+    ''', params) + archived_rows('view_orders', start, end)
 
 # Fungsi ambil data order details lengkap
-def view_order_details():
-    c.execute('''
+@shared_cache('view_order_details', stamp=table_stamp('Order_Details', 'Menu', 'Orders'))
+@single_flight('view_order_details')
+@fan_out('concat', ids=(0, 1), order_by=8)
+@replica_read
+def view_order_details(start=None, end=None):
+    where, params = date_range_clause('o.order_time', start, end)
+    detail, detail_params = detail_range_clause(start, end)
+    return run_query(f'''
         SELECT od.order_detail_id, od.order_id, od.menu_id, od.quantity,
                od.total_price, od.request_note, m.item_name, m.unit_price,
                DATE(o.order_time) as order_date
         FROM Order_Details od
         JOIN Menu m ON od.menu_id = m.menu_id
         JOIN Orders o ON od.order_id = o.order_id
+        {where} {detail}
         ORDER BY o.order_time DESC
-    ''')
-    return c.fetchall()
+    ''', params + detail_params) + archived_rows('view_order_details', start, end)
+
+# Sampel order details untuk mode perkiraan: order dipilih lewat hash order_id
+# (semua item satu order ikut terpilih), rate = fraksi order yang diambil.
+# Rentang tanggal tetap dipakai supaya MySQL hanya membaca partisi yang perlu.
+SAMPLE_RATE = 0.1
+SAMPLE_HASH = 2654435761   # pengali hash order_id (Knuth), sama dengan sampel arsip
+
+@shared_cache('view_order_details_sample', stamp=table_stamp('Order_Details', 'Menu', 'Orders'))
+@single_flight('view_order_details_sample')
+@fan_out('concat', ids=(0, 1), order_by=8)
+@replica_read
+def view_order_details_sample(start=None, end=None, rate=SAMPLE_RATE):
+    where, params = date_range_clause('o.order_time', start, end, keyword="AND")
+    detail, detail_params = detail_range_clause(start, end)
+    return run_query(f'''
+        SELECT od.order_detail_id, od.order_id, od.menu_id, od.quantity,
+               od.total_price, od.request_note, m.item_name, m.unit_price,
+               DATE(o.order_time) as order_date
+        FROM Order_Details od
+        JOIN Menu m ON od.menu_id = m.menu_id
+        JOIN Orders o ON od.order_id = o.order_id
+        WHERE MOD(od.order_id * {SAMPLE_HASH}, 10000) < %s {where} {detail}
+        ORDER BY o.order_time DESC
+    ''', (int(rate * 10000),) + params + detail_params) + archived_rows('view_order_details_sample', start, end, rate)
 
 # Fungsi ambil data reservations lengkap
+@shared_cache('view_reservations', stamp=table_stamp('Reservations', 'Tables', 'Customers'))
+@single_flight('view_reservations')
+@fan_out('concat', ids=(0,), order_by=3)
+@replica_read
 def view_reservations():
-    c.execute('''
+    return run_query('''
         SELECT r.reservation_id, r.customer_id, r.table_id, r.reservation_date,
                r.check_in, r.check_out, r.party_size, r.status, r.special_request,
                t.table_number, t.capacity, c.customer_name
@@ -122,16 +750,50 @@ def view_reservations():
         JOIN Customers c ON r.customer_id = c.customer_id
         ORDER BY r.reservation_date DESC
     ''')
-    return c.fetchall()
 
 # Fungsi ambil data reviews lengkap
+@shared_cache('view_reviews', stamp=table_stamp('Reviews', 'Orders', 'Customers'))
+@single_flight('view_reviews')
+@fan_out('concat', ids=(0, 1), order_by=4)
+@replica_read
 def view_reviews():
-    c.execute('''
+    # LEFT JOIN: review untuk order yang sudah diarsipkan tetap ada, nama customer-nya dari arsip
+    rows = run_query('''
         SELECT r.review_id, r.order_id, r.rating, r.comment, r.review_date,
                c.customer_name
         FROM Reviews r
-        JOIN Orders o ON r.order_id = o.order_id
+        LEFT JOIN Orders o ON r.order_id = o.order_id
         LEFT JOIN Customers c ON o.customer_id = c.customer_id
         ORDER BY r.review_date DESC
     ''')
-    return c.fetchall()
+    missing = {row[1] for row in rows if row[5] is None}
+    names = dict(archived_rows('view_reviews', missing)) if missing else {}
+    return [row[:5] + (names.get(row[1]),) if row[5] is None else row for row in rows]
+
+# Fungsi ambil jumlah order dan revenue per hari untuk setiap cabang
+@shared_cache('view_branch_summary', stamp=table_stamp('Orders', 'Order_Details'))
+@single_flight('view_branch_summary')
+@fan_out('label')
+@replica_read
+def view_branch_summary(start=None, end=None):
+    where, params = date_range_clause('o.order_time', start, end)
+    detail, detail_params = detail_range_clause(start, end)
+    return run_query(f'''
+        SELECT DATE(o.order_time) as order_date,
+               COUNT(DISTINCT o.order_id) as orders,
+               COALESCE(SUM(od.total_price), 0) as revenue
+        FROM Orders o
+        LEFT JOIN Order_Details od ON o.order_id = od.order_id {detail}
+        {where}
+        GROUP BY DATE(o.order_time)
+    ''', detail_params + params) + archived_rows('view_branch_summary', start, end)
+
+# Fungsi ambil tanggal order pertama dan terakhir setiap cabang (batas pilihan tanggal di halaman).
+# MIN/MAX(order_time) memindai seluruh Orders, jadi di-cache dengan TTL, bukan versi tabel
+# (yang berubah di setiap order baru).
+@shared_cache('view_order_bounds')
+@single_flight('view_order_bounds')
+@fan_out('label')
+@replica_read
+def view_order_bounds():
+    return run_query('SELECT DATE(MIN(order_time)), DATE(MAX(order_time)) FROM Orders')
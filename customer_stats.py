@@ -0,0 +1,254 @@
+# customer_stats.py
+# Statistik per customer (lifetime spend, jumlah order, kunjungan pertama/terakhir, skor RFM)
+# yang disimpan di disk dan di-update bertahap: hanya order baru yang diambil dari database.
+#
+# Order dalam REFOLD_WINDOW terakhir belum dianggap final (item bisa menyusul setelah header
+# order, status/harga masih bisa diedit): order itu dibaca ulang setiap refresh dan digabung
+# saat tabel dibuat, high-water mark hanya maju melewati order yang lebih lama. Perubahan pada
+# order lama terdeteksi dari Data_Versions dan memicu rebuild penuh: UPDATE/DELETE di Order_Details
+# (harga, item), Orders (customer_id, order_time, order dihapus) dan Customers (customer dihapus).
+# Data_Versions tidak tahu baris mana yang berubah, jadi update status order juga memicu rebuild;
+# paling sering sekali per REFRESH_INTERVAL.
+import os
+import time
+import pickle
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+from cache import CACHE_DIR, get_backend
+from config import view_order_totals, view_table_changes, BRANCHES, BRANCH_NAMES, BRANCH_ID_STRIDE
+
+STATS_FILE = os.path.join(CACHE_DIR, 'customer_stats.pkl')
+REFRESH_INTERVAL = 30   # detik minimal antar pengecekan order baru
+REFOLD_WINDOW = pd.Timedelta(days=1)   # order semuda ini dibaca ulang setiap refresh
+NO_NEW_ROWS = 2 ** 62   # after_id untuk baseline pertama: cukup versi dan id terbesar
+# Tabel sumber statistik yang perubahannya (selain INSERT) memicu rebuild
+WATCHED_TABLES = [('Orders', 'order_id'), ('Order_Details', 'order_detail_id'), ('Customers', 'customer_id')]
+
+# Kategori spending (batas kanan inklusif, sama seperti pd.cut sebelumnya)
+SPENDING_EDGES = np.array([100000, 500000, 1000000, 5000000])
+SPENDING_LABELS = np.array(['< 100rb', '100rb-500rb', '500rb-1jt', '1jt-5jt', '> 5jt'])
+
+STATS_COLUMNS = ['lifetime_spend', 'order_count', 'first_visit', 'last_visit']
+ORDER_COLUMNS = ['order_id', 'customer_id', 'order_time', 'order_total']
+
+
+def spending_segment(values):
+    """Label kategori spending untuk banyak nilai sekaligus (pengganti pd.cut)"""
+    return SPENDING_LABELS[np.searchsorted(SPENDING_EDGES, np.asarray(values, dtype=float), side='left')]
+
+def advance_high_water(last_order_ids, order_ids):
+    """High-water mark per cabang setelah order_ids (id gabungan cabang) diproses"""
+    # order_id hasil gabungan cabang = cabang * BRANCH_ID_STRIDE + id lokal
+    branch, local_id = np.divmod(np.asarray(order_ids, dtype='int64'), BRANCH_ID_STRIDE)
+    latest = pd.Series(local_id).groupby(branch).max()
+    return tuple(max(last, int(latest.get(i, 0))) for i, last in enumerate(last_order_ids))
+
+def split_settled(orders, cutoff):
+    """Pisahkan order final dari order di jendela re-fold. Per cabang, order final = semua order
+    dengan id di bawah order pertama yang waktunya >= cutoff, jadi high-water mark tidak melompati
+    order yang masih bisa berubah."""
+    if orders.empty:
+        return orders, orders
+    order_ids = orders['order_id'].to_numpy(dtype='int64')
+    branch = order_ids // BRANCH_ID_STRIDE
+    recent = (pd.to_datetime(orders['order_time']) >= cutoff).to_numpy()
+    first_recent = pd.Series(order_ids[recent]).groupby(branch[recent]).min()
+    bound = pd.Series(branch).map(first_recent).fillna(np.inf).to_numpy()
+    settled = order_ids < bound
+    return orders[settled], orders[~settled]
+
+def detect_changes(baseline, table, id_column):
+    """(ada UPDATE/DELETE sejak baseline, baseline baru). baseline = tuple per cabang
+    (versi Data_Versions, id terbesar); None kalau Data_Versions tidak tersedia."""
+    if baseline is not None and len(baseline) != len(BRANCHES):
+        baseline = None
+    after = tuple(max_id for _, max_id in baseline) if baseline is not None else NO_NEW_ROWS
+    try:
+        rows = view_table_changes(table, id_column, after)
+    except Exception:
+        return False, None
+    current = {branch: (int(version), int(inserted), int(max_id))
+               for branch, version, inserted, max_id in rows if version is not None}
+    if set(current) != set(BRANCH_NAMES):
+        return False, None
+    # Baris dengan id lama yang baru commit (transaksi yang masih jalan saat baseline dibuat)
+    # juga terhitung sebagai perubahan; rebuild-nya tidak perlu, tapi hasilnya tetap benar
+    modified = baseline is not None and any(
+        current[name][0] - baseline[i][0] > current[name][1] for i, name in enumerate(BRANCH_NAMES))
+    return modified, tuple((current[name][0], current[name][2]) for name in BRANCH_NAMES)
+
+def detect_table_changes(baselines, tables):
+    """detect_changes untuk beberapa tabel: (ada yang berubah, {tabel: baseline baru})"""
+    baselines = baselines if isinstance(baselines, dict) else {}
+    modified, current = False, {}
+    for table, id_column in tables:
+        changed, current[table] = detect_changes(baselines.get(table), table, id_column)
+        modified = modified or changed
+    return modified, current
+
+def summarize_orders(orders):
+    """Statistik per customer dari baris order (ORDER_COLUMNS); order guest dilewati"""
+    orders = orders[orders['customer_id'].notna()]
+    if orders.empty:
+        return pd.DataFrame(columns=STATS_COLUMNS, index=pd.Index([], name='customer_id'))
+    return orders.assign(
+        order_total=pd.to_numeric(orders['order_total'], errors='coerce').fillna(0).astype(float),
+        order_time=pd.to_datetime(orders['order_time'])
+    ).groupby(orders['customer_id'].astype(int)).agg(
+        lifetime_spend=('order_total', 'sum'),
+        order_count=('order_id', 'count'),
+        first_visit=('order_time', 'min'),
+        last_visit=('order_time', 'max'),
+    )
+
+def combine_stats(old, new):
+    """Gabungkan dua tabel statistik per customer"""
+    if new.empty:
+        return old
+    if old.empty:
+        return new
+    old = old.reindex(old.index.union(new.index))
+    new = new.reindex(old.index)
+    merged = pd.DataFrame(index=old.index)
+    merged['lifetime_spend'] = old['lifetime_spend'].fillna(0) + new['lifetime_spend'].fillna(0)
+    merged['order_count'] = (old['order_count'].fillna(0) + new['order_count'].fillna(0)).astype(int)
+    merged['first_visit'] = pd.concat([old['first_visit'], new['first_visit']], axis=1).min(axis=1)
+    merged['last_visit'] = pd.concat([old['last_visit'], new['last_visit']], axis=1).max(axis=1)
+    return merged
+
+def quintile_score(values, reverse=False):
+    """Skor 1-5 berdasarkan kuintil; reverse=True berarti nilai kecil mendapat skor tinggi"""
+    # Pakai persentil rank (nilai kembar mendapat rank rata-rata), bukan batas kuantil,
+    # supaya banyak customer dengan nilai sama (mis. 1 order) tidak terlempar ke skor 5
+    pct = pd.Series(np.asarray(values, dtype=float)).rank(method='average', pct=True).to_numpy()
+    score = np.clip(np.ceil(pct * 5), 1, 5).astype(int)
+    return 6 - score if reverse else score
+
+def rfm_scores(stats, reference=None):
+    """Tambahkan kolom recency_days, skor R/F/M dan segmen ke tabel statistik"""
+    stats = stats.copy()
+    if stats.empty:
+        for col in ['recency_days', 'r_score', 'f_score', 'm_score']:
+            stats[col] = pd.Series(dtype=int)
+        stats['segment'] = pd.Series(dtype=object)
+        return stats
+    reference = pd.Timestamp(reference) if reference is not None else stats['last_visit'].max()
+    stats['recency_days'] = (reference - stats['last_visit']).dt.days
+    r = quintile_score(stats['recency_days'], reverse=True)
+    f = quintile_score(stats['order_count'])
+    m = quintile_score(stats['lifetime_spend'])
+    stats['r_score'], stats['f_score'], stats['m_score'] = r, f, m
+    stats['segment'] = np.select(
+        [(r >= 4) & (f >= 4), f >= 4, (r <= 2) & (f >= 3), (r >= 4) & (f <= 2)],
+        ['Champion', 'Loyal', 'Berisiko', 'Baru'],
+        default='Pasif'
+    )
+    return stats
+
+
+class CustomerStats:
+    """Store statistik customer dengan high-water mark order_id per cabang"""
+
+    def __init__(self, path=STATS_FILE):
+        self.path = path
+        self.reset()
+        self.baseline = None        # {tabel: (versi, id terbesar) per cabang} dari Data_Versions
+        self._mtime = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+
+    def reset(self):
+        self.stats = summarize_orders(pd.DataFrame(columns=ORDER_COLUMNS))
+        self.last_order_ids = (0,) * len(BRANCHES)
+        self.recent = pd.DataFrame(columns=ORDER_COLUMNS)   # order di jendela re-fold
+
+    def apply(self, orders):
+        """Gabungkan order final (order_id, customer_id, order_time, order_total) ke statistik"""
+        if orders.empty:
+            return
+        self.last_order_ids = advance_high_water(self.last_order_ids, orders['order_id'])
+        self.stats = combine_stats(self.stats, summarize_orders(orders))
+
+    def refresh(self, force=False):
+        """Ambil order baru sejak update terakhir lalu simpan ke disk"""
+        with self._lock:
+            if not force and time.time() - self._checked_at < REFRESH_INTERVAL:
+                return self
+            # Lock antar proses supaya hanya satu worker yang meng-update file
+            with get_backend().lock('customer_stats'):
+                self._load()
+                modified, self.baseline = detect_table_changes(self.baseline, WATCHED_TABLES)
+                if modified:
+                    self.reset()
+                orders = pd.DataFrame(view_order_totals(self.last_order_ids), columns=ORDER_COLUMNS)
+                settled, self.recent = split_settled(orders, pd.Timestamp.now() - REFOLD_WINDOW)
+                self.apply(settled)
+                self._save()
+            self._checked_at = time.time()
+        return self
+
+    def remap(self, mapping):
+        """Gabungkan statistik customer yang di-merge (customer_id lama -> customer_id yang dipertahankan)"""
+        with self._lock, get_backend().lock('customer_stats'):
+            self._load()
+            self.recent = self.recent.assign(customer_id=self.recent['customer_id'].replace(mapping))
+            if self.stats.empty:
+                self._save()
+                return self
+            target = self.stats.index.to_series().replace(mapping).to_numpy()
+            self.stats = self.stats.groupby(target).agg(
+                lifetime_spend=('lifetime_spend', 'sum'),
+                order_count=('order_count', 'sum'),
+                first_visit=('first_visit', 'min'),
+                last_visit=('last_visit', 'max'),
+            ).rename_axis('customer_id')
+            self._save()
+        return self
+
+    def table(self, reference=None):
+        """Statistik lengkap (termasuk order di jendela re-fold) dengan skor RFM"""
+        return rfm_scores(combine_stats(self.stats, summarize_orders(self.recent)), reference)
+
+    def _load(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+        with open(self.path, 'rb') as f:
+            state = pickle.load(f)
+        self.stats, self._mtime = state['stats'], mtime
+        # File lama menyimpan satu high-water mark (sebelum multi cabang)
+        last = state.get('last_order_ids', (state.get('last_order_id', 0),))
+        self.last_order_ids = tuple(last[i] if i < len(last) else 0 for i in range(len(BRANCHES)))
+        self.recent = state.get('recent', pd.DataFrame(columns=ORDER_COLUMNS))
+        self.baseline = state.get('baseline')
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump({'stats': self.stats, 'last_order_ids': self.last_order_ids,
+                         'recent': self.recent, 'baseline': self.baseline}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path)
+        self._mtime = os.path.getmtime(self.path)
+
+
+_store = None
+
+def get_stats():
+    global _store
+    if _store is None:
+        _store = CustomerStats()
+    return _store.refresh()
+
+def load_customers(customers):
+    """Data customer + total spending dari store statistik (pengganti agregasi penuh view_customers)"""
+    stats = get_stats().table()
+    df = customers.merge(stats, left_on='customer_id', right_index=True, how='left')
+    df['total_spending'] = df['lifetime_spend'].fillna(0)
+    df['order_count'] = df['order_count'].fillna(0).astype(int)
+    return df.sort_values('total_spending', ascending=False, kind='stable').reset_index(drop=True)
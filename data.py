@@ -0,0 +1,141 @@
+# data.py
+# Memuat hasil view_* menjadi DataFrame, dipakai bersama oleh dashboard Streamlit dan API
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+from config import *
+from cache import get_backend
+from customer_stats import load_customers
+
+# Copy-on-write: hasil filter/slice berbagi memori dengan frame dasar dan baru disalin
+# saat ada kolom yang diubah, jadi halaman tidak perlu .copy() seluruh tabel.
+# Frame dasar hasil load_table() dianggap read-only. Di pandas >= 3.0 CoW selalu aktif.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+# Nama kolom untuk setiap hasil view_*
+COLUMNS = {
+    'customers': ['customer_id', 'customer_name', 'email', 'phone', 'total_spending'],
+    'categories': ['category_id', 'category_name', 'total_qty', 'order_date'],
+    'payment': ['payment_id', 'method_name', 'revenue', 'order_date'],
+    'tables': ['table_id', 'table_number', 'capacity', 'location', 'status'],
+    'table_usage': ['table_id', 'table_number', 'capacity', 'times_used', 'order_date'],
+    'menu': ['menu_id', 'item_name', 'unit_price', 'member_only', 'category_name', 'total_ordered', 'order_date'],
+    'menu_names': ['menu_id', 'item_name', 'category_name'],
+    'orders': [
+        'order_id', 'customer_id', 'guest_name', 'service_type', 'table_id',
+        'payment_id', 'order_status', 'order_time', 'method_name', 'table_number',
+        'customer_name', 'order_date'
+    ],
+    'details': [
+        'order_detail_id', 'order_id', 'menu_id', 'quantity', 'total_price',
+        'request_note', 'item_name', 'unit_price', 'order_date'
+    ],
+    'reservations': [
+        'reservation_id', 'customer_id', 'table_id', 'reservation_date',
+        'check_in', 'check_out', 'party_size', 'status', 'special_request',
+        'table_number', 'capacity', 'customer_name'
+    ],
+    'reviews': ['review_id', 'order_id', 'rating', 'comment', 'review_date', 'customer_name'],
+    'branch_summary': ['branch', 'order_date', 'orders', 'revenue'],
+}
+COLUMNS['details_sample'] = COLUMNS['details']
+
+LOADERS = {
+    'customers': view_customer_list,
+    'categories': view_categories,
+    'payment': view_payment_methods,
+    'tables': view_tables,
+    'table_usage': view_table_usage,
+    'menu': view_menu,
+    'menu_names': view_menu_names,
+    'orders': view_orders,
+    'details': view_order_details,
+    'details_sample': view_order_details_sample,
+    'reservations': view_reservations,
+    'reviews': view_reviews,
+    'branch_summary': view_branch_summary,
+}
+
+# Kolom tanggal yang perlu diubah ke datetime
+DATE_COLUMNS = {
+    'categories': 'order_date',
+    'payment': 'order_date',
+    'table_usage': 'order_date',
+    'menu': 'order_date',
+    'orders': 'order_date',
+    'details': 'order_date',
+    'details_sample': 'order_date',
+    'reservations': 'reservation_date',
+    'reviews': 'review_date',
+    'branch_summary': 'order_date',
+}
+
+# Tabel per tanggal order: view-nya menerima rentang (start, end) supaya MySQL hanya membaca
+# partisi yang perlu dan file arsip hanya dibaca kalau rentangnya mencapai bulan yang diarsipkan.
+# Tanpa rentang (None, None) = seluruh riwayat, termasuk arsip.
+RANGED_TABLES = {'categories', 'payment', 'table_usage', 'menu', 'orders', 'details', 'details_sample',
+                 'branch_summary'}
+
+# Frame per proses yang dipakai ulang selama versi tabel sumbernya (Data_Versions) tidak berubah,
+# jadi rerun halaman tidak membaca cache disk maupun membangun DataFrame lagi.
+# 'customers' tidak ikut karena total spending-nya dari store statistik yang di-update sendiri.
+MAX_FRAMES = 32   # kombinasi tabel x rentang tanggal yang disimpan
+_frames = OrderedDict()
+_frames_lock = threading.Lock()
+
+def frame_stamp(name):
+    """Versi frame load_table(name): berubah kalau tabel sumbernya berubah, None tanpa Data_Versions"""
+    stamp = getattr(LOADERS[name], 'stamp', None) if name != 'customers' else None
+    current = stamp() if stamp is not None else None
+    # `python cache.py invalidate` (versi cache global) juga memaksa muat ulang
+    return (get_backend().get_version(), current) if current is not None else None
+
+def load_table(name, start=None, end=None):
+    """Ambil satu tabel sebagai DataFrame dengan kolom tanggal sudah diformat.
+    start/end (inklusif) membatasi tabel per tanggal order; tabel lain selalu dimuat utuh."""
+    if name not in RANGED_TABLES:
+        start = end = None
+    key = (name, start, end)
+    current = frame_stamp(name)
+    if current is not None:
+        with _frames_lock:
+            cached = _frames.get(key)
+            if cached is not None and cached[0] == current:
+                _frames.move_to_end(key)
+                return cached[1]
+    df = _build_table(name, start, end)
+    if current is not None:
+        with _frames_lock:
+            _frames[key] = (current, df)
+            _frames.move_to_end(key)
+            while len(_frames) > MAX_FRAMES:
+                _frames.popitem(last=False)
+    return df
+
+def _build_table(name, start=None, end=None):
+    if name == 'customers':
+        # Total spending diambil dari store statistik customer, bukan agregasi penuh di MySQL
+        return load_customers(pd.DataFrame(LOADERS[name](), columns=COLUMNS[name][:4]))
+    rows = LOADERS[name](start, end) if name in RANGED_TABLES else LOADERS[name]()
+    df = pd.DataFrame(rows, columns=COLUMNS[name])
+    date_col = DATE_COLUMNS.get(name)
+    if date_col and not df.empty:
+        df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
+    return df
+
+def history_bounds():
+    """(tanggal order pertama termasuk arsip, tanggal order pertama di MySQL, tanggal order terakhir).
+    Semua None kalau belum ada order sama sekali."""
+    from partitions import archive_bounds
+    rows = [row for row in view_order_bounds() if row[1] is not None]
+    live_first = min(pd.Timestamp(row[1]).date() for row in rows) if rows else None
+    last = max(pd.Timestamp(row[2]).date() for row in rows) if rows else None
+    archive_first, archive_last = archive_bounds()
+    if live_first is None:
+        return archive_first, archive_first, archive_last
+    return min(live_first, archive_first or live_first), live_first, last
+
+def load_all():
+    return {name: load_table(name) for name in LOADERS}
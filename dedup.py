@@ -0,0 +1,304 @@
+# dedup.py
+# Deteksi customer ganda (nama bebas dari POS seperti "Mary Vega DDS" vs "mary vega") dan
+# penggabungannya. Perbandingan semua pasangan tidak mungkin untuk ratusan ribu customer,
+# jadi kandidat hanya diambil dari blok yang kuncinya sama (fonetik nama, email, telepon),
+# lalu kemiripan nama dihitung sekaligus untuk semua kandidat lewat matriks sparse trigram.
+#
+# Pemakaian:
+#   python dedup.py propose [--threshold 0.85] [--output usulan.csv]
+#   python dedup.py apply [--threshold 0.85] [--batch-size 500] [--dry-run]
+#
+# Saat apply, customer_id di Orders, Reservations dan Reviews diarahkan ke customer yang
+# dipertahankan (customer_id terkecil di grupnya) per batch dalam satu transaksi, lalu baris
+# Customers yang ganda dihapus. Baris yang dihapus disimpan dulu ke file CSV log.
+# Data customer sama di semua cabang, jadi setiap batch dijalankan di setiap cabang (satu
+# transaksi per cabang). Batch aman diulang: kalau satu cabang gagal, jalankan apply lagi.
+# Order yang sudah diarsipkan partitions.py tidak ada di MySQL; merge-nya dicatat di peta merge
+# arsip cabang (partitions.record_customer_merges) dan diterapkan saat arsip dibaca.
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from cache import invalidate
+from config import BRANCHES, BRANCH_NAMES, run_query, get_pool
+from customer_stats import CustomerStats
+from partitions import record_customer_merges
+
+THRESHOLD = 0.85      # skor minimal agar dua customer dianggap sama
+MAX_BLOCK = 200       # blok lebih besar dari ini dilewati (kunci terlalu umum, mis. "S530")
+BATCH_SIZE = 500      # customer ganda per transaksi saat apply
+NGRAM = 3
+CONFLICT_PENALTY = 0.1   # email/telepon terisi tapi berbeda
+
+BLOCK_KEYS = ['phonetic', 'email', 'phone']
+MERGE_TABLES = ['Orders', 'Reservations', 'Reviews']
+CUSTOMER_COLUMNS = ['customer_id', 'customer_name', 'email', 'phone']
+
+# Gelar/akhiran nama yang sering ikut tertulis di POS
+NAME_AFFIXES = ['mr', 'mrs', 'ms', 'miss', 'dr', 'md', 'dds', 'dvm', 'phd', 'jr', 'sr', 'ii', 'iii', 'iv']
+AFFIX_PATTERN = r'\b(?:' + '|'.join(NAME_AFFIXES) + r')\b'
+
+SOUNDEX_CODES = {c: d for d, letters in {'1': 'bfpv', '2': 'cgjkqsxz', '3': 'dt', '4': 'l', '5': 'mn', '6': 'r'}.items()
+                 for c in letters}
+
+
+# NORMALISASI & KUNCI BLOK
+
+def normalize_names(names):
+    names = names.fillna('').str.lower().str.replace(r'[^a-z\s]', ' ', regex=True)
+    names = names.str.replace(AFFIX_PATTERN, ' ', regex=True)
+    return names.str.split().str.join(' ')
+
+def normalize_emails(emails):
+    """Alamat email lengkap huruf kecil. Titik dan +tag hanya dibuang untuk Gmail (yang memang
+    mengabaikannya); di provider lain alamat dengan titik bisa milik orang yang berbeda."""
+    parts = emails.fillna('').str.lower().str.strip().str.extract(r'^([^@\s]+)@([^@\s]+)$')
+    local, domain = parts[0], parts[1].replace('googlemail.com', 'gmail.com')
+    gmail = (domain == 'gmail.com').to_numpy()
+    local = local.mask(gmail, local.str.replace(r'\+.*$', '', regex=True).str.replace('.', '', regex=False))
+    return (local + '@' + domain).where(local.str.len() > 0)
+
+def normalize_phones(phones):
+    """9 digit terakhir (0812... dan +62812... jadi sama)"""
+    digits = phones.fillna('').astype(str).str.replace(r'\D', '', regex=True)
+    return digits.str[-9:].where(digits.str.len() >= 7)
+
+def soundex(token):
+    if not token:
+        return ''
+    code, last = token[0].upper(), SOUNDEX_CODES.get(token[0], '')
+    for char in token[1:]:
+        digit = SOUNDEX_CODES.get(char, '')
+        if digit and digit != last:
+            code += digit
+            if len(code) == 4:
+                break
+        if char not in 'hw':
+            last = digit
+    return code.ljust(4, '0')
+
+def phonetic_keys(names):
+    """Soundex nama depan + nama belakang; soundex dihitung sekali per token unik"""
+    tokens = names.str.split()
+    first, last = tokens.str[0].fillna(''), tokens.str[-1].fillna('')
+    codes = {token: soundex(token) for token in pd.unique(pd.concat([first, last]))}
+    keys = first.map(codes) + last.map(codes)
+    return keys.where(keys.str.len() > 0)
+
+def blocking_keys(customers):
+    names = normalize_names(customers['customer_name'])
+    return pd.DataFrame({
+        'name': names,
+        'phonetic': phonetic_keys(names),
+        'email': normalize_emails(customers['email']),
+        'phone': normalize_phones(customers['phone']),
+    }, index=customers.index)
+
+
+# KANDIDAT & SKOR
+
+def candidate_pairs(keys, max_block=MAX_BLOCK):
+    """Pasangan posisi baris (a < b) yang berbagi minimal satu kunci blok"""
+    frames, skipped = [], 0
+    position = pd.Series(np.arange(len(keys)), index=keys.index)
+    for column in BLOCK_KEYS:
+        block = pd.DataFrame({'key': keys[column], 'pos': position}).dropna()
+        sizes = block.groupby('key')['pos'].transform('size')
+        skipped += int((sizes > max_block).sum())
+        block = block[(sizes > 1) & (sizes <= max_block)]
+        pairs = block.merge(block, on='key')
+        frames.append(pairs.loc[pairs['pos_x'] < pairs['pos_y'], ['pos_x', 'pos_y']])
+    pairs = pd.concat(frames).drop_duplicates()
+    return pairs['pos_x'].to_numpy(), pairs['pos_y'].to_numpy(), skipped
+
+def ngram_matrix(strings, n=NGRAM):
+    """Matriks sparse baris = string, kolom = trigram karakter; baris dinormalisasi (L2)"""
+    grams = [[s[i:i + n] for i in range(len(s) - n + 1)] for s in (' ' + strings + ' ')]
+    lengths = np.fromiter((len(g) for g in grams), dtype=np.int64, count=len(grams))
+    codes, _ = pd.factorize(pd.Series([g for row in grams for g in row], dtype=object))
+    matrix = sparse.csr_matrix(
+        (np.ones(len(codes)), (np.repeat(np.arange(len(grams)), lengths), codes)),
+        shape=(len(grams), codes.max() + 1 if len(codes) else 0)
+    )
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    return sparse.diags(1 / np.where(norms > 0, norms, 1)) @ matrix
+
+def score_pairs(keys, a, b):
+    """Skor kemiripan 0..1 untuk semua kandidat sekaligus.
+    Nama = cosine trigram. Email atau telepon sama menaikkan skor setengah jalan ke 1;
+    kalau keduanya terisi tapi berbeda (dan tidak ada yang sama), skor dikurangi CONFLICT_PENALTY."""
+    matrix = ngram_matrix(keys['name'])
+    name = np.asarray(matrix[a].multiply(matrix[b]).sum(axis=1)).ravel()
+    contact = np.zeros(len(a), dtype=bool)
+    conflict = np.zeros(len(a), dtype=bool)
+    for column in ['email', 'phone']:
+        values = keys[column].to_numpy()
+        filled = pd.notna(values[a]) & pd.notna(values[b])
+        contact |= filled & (values[a] == values[b])
+        conflict |= filled & (values[a] != values[b])
+    score = np.where(contact, 0.5 + 0.5 * name, np.where(conflict, name - CONFLICT_PENALTY, name))
+    return name, contact, score
+
+def find_duplicates(customers, threshold=THRESHOLD, max_block=MAX_BLOCK):
+    """Usulan merge: DataFrame (customer_id, keep_id, skor, ...) + statistik proses"""
+    started = time.perf_counter()
+    customers = customers.reset_index(drop=True)
+    keys = blocking_keys(customers)
+    a, b, skipped = candidate_pairs(keys, max_block)
+    blocked = time.perf_counter()
+    name, contact, score = score_pairs(keys, a, b)
+    match = score >= threshold
+    scored = time.perf_counter()
+
+    # Grup = komponen terhubung dari pasangan yang cocok; customer_id terkecil dipertahankan
+    n = len(customers)
+    graph = sparse.coo_matrix((np.ones(int(match.sum())), (a[match], b[match])), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+    ids = customers['customer_id'].to_numpy()
+    keep = pd.Series(ids).groupby(labels).transform('min').to_numpy()
+    best = pd.Series(np.concatenate([score[match], score[match]]),
+                     index=np.concatenate([a[match], b[match]])).groupby(level=0).max()
+    dup = np.flatnonzero(ids != keep)
+    proposals = pd.DataFrame({
+        'customer_id': ids[dup],
+        'customer_name': customers['customer_name'].to_numpy()[dup],
+        'keep_id': keep[dup],
+        'score': best.reindex(dup).round(3).to_numpy(),
+    })
+    proposals = proposals.merge(customers[['customer_id', 'customer_name']].rename(
+        columns={'customer_id': 'keep_id', 'customer_name': 'keep_name'}), on='keep_id')
+    proposals = proposals.sort_values(['keep_id', 'customer_id']).reset_index(drop=True)
+
+    all_pairs = n * (n - 1) // 2
+    stats = {
+        'customers': n,
+        'all_pairs': all_pairs,
+        'candidate_pairs': len(a),
+        'reduction': 1 - len(a) / all_pairs if all_pairs else 0.0,
+        'skipped_oversized': skipped,
+        'matched_pairs': int(match.sum()),
+        'contact_matches': int((contact & match).sum()),
+        'duplicates': len(proposals),
+        'groups': proposals['keep_id'].nunique(),
+        'block_seconds': blocked - started,
+        'score_seconds': scored - blocked,
+        'total_seconds': time.perf_counter() - started,
+    }
+    stats['pairs_per_second'] = len(a) / stats['score_seconds'] if stats['score_seconds'] else 0.0
+    stats['customers_per_second'] = n / stats['total_seconds'] if stats['total_seconds'] else 0.0
+    return proposals, stats
+
+
+# DATABASE
+
+def load_customer_rows():
+    return pd.DataFrame(run_query('SELECT customer_id, customer_name, email, phone FROM Customers ORDER BY customer_id'),
+                        columns=CUSTOMER_COLUMNS)
+
+def merge_batch(mapping, branch=None):
+    """Arahkan ulang customer_id ganda -> keep_id di semua tabel satu cabang lalu hapus customernya
+    (satu transaksi)"""
+    case = ' '.join(['WHEN %s THEN %s'] * len(mapping))
+    case_params = [value for pair in mapping.items() for value in pair]
+    ids = list(mapping)
+    placeholders = ', '.join(['%s'] * len(ids))
+    conn = get_pool(branch).get_connection()
+    try:
+        c = conn.cursor()
+        moved = {}
+        for table in MERGE_TABLES:
+            c.execute(f'UPDATE {table} SET customer_id = CASE customer_id {case} END '
+                      f'WHERE customer_id IN ({placeholders})', tuple(case_params + ids))
+            moved[table] = c.rowcount
+        c.execute(f'DELETE FROM Customers WHERE customer_id IN ({placeholders})', tuple(ids))
+        moved['Customers'] = c.rowcount
+        c.close()
+        conn.commit()
+        return moved
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+def apply_merges(proposals, batch_size=BATCH_SIZE):
+    """Jalankan merge per batch di semua cabang; jumlah baris yang diubah dijumlahkan antar cabang"""
+    totals = dict.fromkeys(MERGE_TABLES + ['Customers'], 0)
+    mapping = dict(zip(proposals['customer_id'].astype(int), proposals['keep_id'].astype(int)))
+    items = list(mapping.items())
+    stats = CustomerStats()
+    for start in range(0, len(items), batch_size):
+        batch = dict(items[start:start + batch_size])
+        # Cabang pertama terakhir: usulan dibaca dari Customers cabang pertama, jadi kalau cabang lain
+        # gagal, customer gandanya masih ada di sana dan apply ulang menghasilkan usulan yang sama
+        for index in reversed(range(len(BRANCHES))):
+            try:
+                # Peta arsip dicatat sebelum customer dihapus: kalau merge gagal, apply ulang mencatat
+                # batch yang sama lagi, sebaliknya order arsip tidak akan pernah ikut pindah
+                record_customer_merges(batch, index)
+                moved = merge_batch(batch, index)
+            except Exception as e:
+                raise RuntimeError(f"Merge gagal di cabang {BRANCH_NAMES[index]} (batch mulai baris {start}); "
+                                   "jalankan apply lagi untuk melanjutkan, batch yang sudah jalan aman diulang") from e
+            for table, count in moved.items():
+                totals[table] += count
+        # Statistik customer disimpan bertahap per customer_id, jadi ikut digabung (bukan dihitung ulang);
+        # per batch, supaya batch yang sudah masuk tetap tergabung walau batch berikutnya gagal
+        stats.remap(batch)
+    return totals
+
+def print_stats(stats):
+    print(f"Customer: {stats['customers']:,} · semua pasangan: {stats['all_pairs']:,}")
+    print(f"Kandidat dari blok: {stats['candidate_pairs']:,} (berkurang {stats['reduction']:.4%})"
+          f" · baris di blok terlalu besar: {stats['skipped_oversized']:,}")
+    print(f"Pasangan cocok: {stats['matched_pairs']:,} ({stats['contact_matches']:,} dengan email/telepon sama)"
+          f" -> {stats['duplicates']:,} customer ganda dalam {stats['groups']:,} grup")
+    print(f"Waktu: blok {stats['block_seconds']:.2f} s · skor {stats['score_seconds']:.2f} s"
+          f" ({stats['pairs_per_second']:,.0f} pasangan/s) · total {stats['total_seconds']:.2f} s"
+          f" ({stats['customers_per_second']:,.0f} customer/s)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Deteksi dan penggabungan customer ganda')
+    sub = parser.add_subparsers(dest='command', required=True)
+    propose = sub.add_parser('propose', help='tampilkan usulan merge')
+    propose.add_argument('--output', help='simpan usulan merge ke CSV')
+    apply = sub.add_parser('apply', help='gabungkan customer ganda di database')
+    apply.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    apply.add_argument('--dry-run', action='store_true', help='hanya tampilkan usulan')
+    apply.add_argument('--log', default=f"dedup_{time.strftime('%Y%m%d_%H%M%S')}.csv",
+                       help='CSV baris customer yang digabung (untuk audit/undo)')
+    for p in [propose, apply]:
+        p.add_argument('--threshold', type=float, default=THRESHOLD, help='skor minimal (0..1)')
+        p.add_argument('--max-block', type=int, default=MAX_BLOCK, help='ukuran blok maksimal')
+    args = parser.parse_args()
+
+    customers = load_customer_rows()
+    proposals, stats = find_duplicates(customers, args.threshold, args.max_block)
+    print_stats(stats)
+    if proposals.empty:
+        print("Tidak ada customer ganda.")
+        return
+    print()
+    print(proposals.head(20).to_string(index=False))
+    if args.command == 'propose' or args.dry_run:
+        if getattr(args, 'output', None):
+            proposals.to_csv(args.output, index=False)
+            print(f"\n{len(proposals):,} usulan disimpan ke {args.output}")
+        return
+
+    customers[customers['customer_id'].isin(proposals['customer_id'])].merge(
+        proposals[['customer_id', 'keep_id', 'score']], on='customer_id').to_csv(args.log, index=False)
+    started = time.perf_counter()
+    totals = apply_merges(proposals, args.batch_size)
+    elapsed = time.perf_counter() - started
+    invalidate()
+    print(f"\nDigabung dalam {elapsed:.2f} s: " + ', '.join(f"{table} {count:,}" for table, count in totals.items()))
+    print(f"Log customer yang dihapus: {args.log}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+# forecast.py
+# Forecast permintaan per menu per jam untuk persiapan dapur. Model musiman hari x jam:
+# untuk setiap (menu, hari dalam minggu, jam) disimpan rata-rata eksponensial (EWMA) jumlah
+# terjual pada hari-hari buka sebelumnya; jam tanpa penjualan ikut dihitung sebagai 0.
+# Semua menu di-fit sekaligus dengan operasi array (np.add.at), bukan loop per menu.
+#
+# Model disimpan di disk dan di-update bertahap: hanya hari lengkap (sampai kemarin) yang belum
+# masuk model yang dibaca dari database. Sebelum hari baru dimasukkan, forecast model untuk hari
+# itu dibandingkan dengan penjualan sebenarnya (WAPE) sebagai catatan akurasi.
+#
+#   python forecast.py refresh [--rebuild]   # jalankan tiap malam, mis. cron 0 1 * * *
+#   python forecast.py status
+import os
+import sys
+import time
+import pickle
+import argparse
+import tempfile
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from cache import CACHE_DIR, get_backend
+from config import view_item_hourly
+
+MODEL_FILE = os.path.join(CACHE_DIR, 'demand_model.pkl')
+MODEL_FORMAT = 1
+ALPHA = float(os.environ.get("RESTO_FORECAST_ALPHA", "0.3"))   # bobot minggu terbaru
+REFRESH_INTERVAL = 600   # detik minimal antar pengecekan hari baru dari halaman
+MAX_ACCURACY_DAYS = 90   # catatan akurasi harian yang disimpan
+HOURS = 24
+
+DAY_NAMES = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
+
+
+class DemandModel:
+    """EWMA musiman (hari x jam) untuk semua menu sekaligus"""
+
+    def __init__(self, path=MODEL_FILE, alpha=ALPHA):
+        self.path = path
+        self.alpha = alpha
+        self.menu_ids = np.empty(0, dtype=np.int64)
+        self.sums = np.zeros((0, 7, HOURS))   # jumlah terbobot per (menu, hari, jam)
+        self.weights = np.zeros(7)            # total bobot per hari; forecast = sums / weights
+        self.last_date = None                 # hari lengkap terakhir yang sudah masuk model
+        self.days_fitted = 0
+        self.accuracy = {}                    # tanggal -> (WAPE, terjual, forecast)
+        self._mtime = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+
+    # FIT
+
+    def update(self, rows):
+        """Masukkan hari-hari baru (DataFrame menu_id, order_date, order_hour, quantity).
+        Hari tanpa penjualan sama sekali dianggap tutup dan tidak ikut."""
+        if rows.empty:
+            return
+        rows = rows.assign(order_date=pd.to_datetime(rows['order_date']).dt.date,
+                           quantity=pd.to_numeric(rows['quantity']).astype(float))
+        self._add_menus(rows['menu_id'].unique())
+        if self.weights.any():
+            self._record_accuracy(rows)
+
+        days = np.array(sorted(rows['order_date'].unique()))
+        dow = np.array([day.weekday() for day in days])
+        # Urutan hari baru di antara hari baru lain dengan hari-dalam-minggu yang sama:
+        # hari terbaru bobotnya alpha, yang seminggu sebelumnya alpha * (1 - alpha), dst.
+        new_per_dow = np.bincount(dow, minlength=7)
+        rank = pd.Series(dow).groupby(dow).cumcount().to_numpy()
+        day_weight = self.alpha * (1 - self.alpha) ** (new_per_dow[dow] - rank - 1)
+
+        decay = (1 - self.alpha) ** new_per_dow
+        self.sums *= decay[None, :, None]
+        self.weights = self.weights * decay + np.bincount(dow, weights=day_weight, minlength=7)
+
+        day_index = pd.Index(days).get_indexer(rows['order_date'])
+        item_index = pd.Index(self.menu_ids).get_indexer(rows['menu_id'])
+        np.add.at(self.sums, (item_index, dow[day_index], rows['order_hour'].to_numpy(int)),
+                  day_weight[day_index] * rows['quantity'].to_numpy())
+        self.last_date = days[-1] if self.last_date is None else max(self.last_date, days[-1])
+        self.days_fitted += len(days)
+
+    def _add_menus(self, menu_ids):
+        new = np.setdiff1d(np.asarray(menu_ids, dtype=np.int64), self.menu_ids)
+        if len(new):
+            self.menu_ids = np.concatenate([self.menu_ids, new])
+            self.sums = np.concatenate([self.sums, np.zeros((len(new), 7, HOURS))])
+
+    def _record_accuracy(self, rows):
+        """WAPE forecast (model sebelum update) terhadap penjualan sebenarnya per hari baru"""
+        for day, group in rows.groupby('order_date'):
+            if not self.weights[day.weekday()]:
+                continue
+            predicted = self.matrix(day)
+            actual = np.zeros_like(predicted)
+            np.add.at(actual, (pd.Index(self.menu_ids).get_indexer(group['menu_id']), group['order_hour'].to_numpy(int)),
+                      group['quantity'].to_numpy())
+            total = actual.sum()
+            wape = float(np.abs(predicted - actual).sum() / total) if total else float('nan')
+            self.accuracy[day] = (wape, float(total), float(predicted.sum()))
+        for day in sorted(self.accuracy)[:-MAX_ACCURACY_DAYS]:
+            del self.accuracy[day]
+
+    # FORECAST
+
+    def matrix(self, day):
+        """Forecast (menu x jam) untuk satu tanggal, urutan baris = menu_ids"""
+        dow = day.weekday()
+        if not self.weights[dow]:
+            return np.zeros((len(self.menu_ids), HOURS))
+        return self.sums[:, dow, :] / self.weights[dow]
+
+    def forecast(self, day):
+        """Forecast satu tanggal: DataFrame menu_id x jam (0..23)"""
+        return pd.DataFrame(self.matrix(day), index=pd.Index(self.menu_ids, name='menu_id'), columns=range(HOURS))
+
+    def accuracy_frame(self):
+        days = sorted(self.accuracy)
+        return pd.DataFrame([self.accuracy[day] for day in days], columns=['wape', 'actual', 'forecast'],
+                            index=pd.to_datetime(days))
+
+    # REFRESH + PENYIMPANAN
+
+    def refresh(self, force=False, today=None):
+        """Masukkan hari lengkap yang belum ada di model (sampai kemarin) lalu simpan"""
+        with self._lock:
+            if not force and time.time() - self._checked_at < REFRESH_INTERVAL:
+                return self
+            yesterday = (today or date.today()) - timedelta(days=1)
+            with get_backend().lock('demand_model'):
+                self._load()
+                if self.last_date is None or self.last_date < yesterday:
+                    start = self.last_date + timedelta(days=1) if self.last_date is not None else None
+                    rows = view_item_hourly(start, yesterday)
+                    self.update(pd.DataFrame(rows, columns=['menu_id', 'order_date', 'order_hour', 'quantity']))
+                    # Hari tanpa order tetap dianggap selesai supaya tidak dibaca ulang
+                    self.last_date = yesterday
+                    self._save()
+            self._checked_at = time.time()
+        return self
+
+    def _load(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+        with open(self.path, 'rb') as f:
+            state = pickle.load(f)
+        if state.get('format') != MODEL_FORMAT or state.get('alpha') != self.alpha:
+            return   # model lama/alpha lain: fit ulang dari awal
+        for key in ['menu_ids', 'sums', 'weights', 'last_date', 'days_fitted', 'accuracy']:
+            setattr(self, key, state[key])
+        self._mtime = mtime
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        state = {key: getattr(self, key) for key in ['alpha', 'menu_ids', 'sums', 'weights', 'last_date', 'days_fitted', 'accuracy']}
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(dict(state, format=MODEL_FORMAT), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path)
+        self._mtime = os.path.getmtime(self.path)
+
+
+_model = None
+
+def get_model():
+    global _model
+    if _model is None:
+        _model = DemandModel()
+    return _model.refresh()
+
+def item_forecast(model, day, menu):
+    """Forecast per menu untuk satu tanggal, dengan nama dan kategori dari tabel menu"""
+    hourly = model.forecast(day)
+    names = menu.drop_duplicates('menu_id').set_index('menu_id')[['item_name', 'category_name']]
+    summary = names.reindex(hourly.index)
+    # Menu yang sudah dihapus tetap tampil dengan id-nya
+    summary = summary.assign(
+        item_name=summary['item_name'].fillna('Menu ' + summary.index.to_series().astype(str)),
+        total=hourly.sum(axis=1),
+        peak_hour=hourly.idxmax(axis=1),
+        peak=hourly.max(axis=1),
+    )
+    return summary.sort_values('total', ascending=False), hourly
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Model forecast permintaan menu per jam')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('refresh', help='masukkan hari lengkap yang belum ada di model')
+    p.add_argument('--rebuild', action='store_true', help='buang model lama dan fit ulang dari awal')
+    sub.add_parser('status', help='ringkasan model dan akurasi terakhir')
+    args = parser.parse_args()
+
+    if args.command == 'refresh':
+        if args.rebuild and os.path.exists(MODEL_FILE):
+            os.remove(MODEL_FILE)
+        started = time.perf_counter()
+        before = DemandModel()
+        before._load()
+        model = DemandModel().refresh(force=True)
+        print(f"{model.days_fitted - before.days_fitted:,} hari baru · {len(model.menu_ids):,} menu"
+              f" · model sampai {model.last_date} · {time.perf_counter() - started:.2f} detik")
+    else:
+        model = DemandModel()
+        model._load()
+        if model.last_date is None:
+            print("Belum ada model; jalankan `python forecast.py refresh`")
+            return
+        print(f"Model sampai {model.last_date} · {model.days_fitted:,} hari · {len(model.menu_ids):,} menu · alpha {model.alpha}")
+        accuracy = model.accuracy_frame().tail(7)
+        for day, row in accuracy.iterrows():
+            print(f"{day.date()}  WAPE {row['wape']:.1%}  terjual {row['actual']:,.0f}  forecast {row['forecast']:,.0f}")
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,114 @@
+# gateway.py
+# Gerbang query: menggabungkan query identik yang sedang berjalan (single-flight)
+# dan membatasi jumlah query berat yang jalan bersamaan (admission control).
+import os
+import time
+import threading
+from functools import wraps
+
+# Batas query yang boleh jalan bersamaan ke MySQL
+MAX_HEAVY_QUERIES = int(os.environ.get("RESTO_MAX_HEAVY_QUERIES", "2"))
+MAX_LIGHT_QUERIES = int(os.environ.get("RESTO_MAX_LIGHT_QUERIES", "2"))
+QUEUE_TIMEOUT = float(os.environ.get("RESTO_QUEUE_TIMEOUT", "60"))   # detik menunggu di antrian
+
+
+class QueryRejected(Exception):
+    """Query ditolak karena terlalu lama menunggu di antrian"""
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class QueryGateway:
+    def __init__(self, max_heavy, max_light):
+        self._slots = {
+            True: threading.BoundedSemaphore(max_heavy),
+            False: threading.BoundedSemaphore(max_light),
+        }
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._stats = {
+            "queue_depth": 0,       # query yang sedang menunggu slot
+            "max_queue_depth": 0,
+            "running": 0,           # query yang sedang jalan di database
+            "executed": 0,
+            "coalesced": 0,         # query yang menumpang hasil query lain
+            "rejected": 0,
+            "wait_seconds": 0.0,
+        }
+
+    def run(self, key, func, heavy=True):
+        """Jalankan func sekali untuk semua pemanggil dengan key yang sama"""
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._inflight[key] = call
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._admit(func, heavy)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.done.set()
+        return call.result
+
+    def _admit(self, func, heavy):
+        slots = self._slots[heavy]
+        with self._lock:
+            self._stats["queue_depth"] += 1
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self._stats["queue_depth"])
+        start = time.perf_counter()
+        acquired = slots.acquire(timeout=QUEUE_TIMEOUT)
+        with self._lock:
+            self._stats["queue_depth"] -= 1
+            self._stats["wait_seconds"] += time.perf_counter() - start
+            if not acquired:
+                self._stats["rejected"] += 1
+            else:
+                self._stats["running"] += 1
+        if not acquired:
+            raise QueryRejected("Database sedang sibuk, coba beberapa saat lagi")
+        try:
+            return func()
+        finally:
+            slots.release()
+            with self._lock:
+                self._stats["running"] -= 1
+                self._stats["executed"] += 1
+
+    def metrics(self):
+        with self._lock:
+            return dict(self._stats, inflight=len(self._inflight))
+
+
+gateway = QueryGateway(MAX_HEAVY_QUERIES, MAX_LIGHT_QUERIES)
+
+def single_flight(name, heavy=True):
+    """Decorator untuk fungsi view_* agar lewat gerbang query"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (name, args, tuple(sorted(kwargs.items())))
+            return gateway.run(key, lambda: func(*args, **kwargs), heavy=heavy)
+        return wrapper
+    return decorator
+
+def query_metrics():
+    return gateway.metrics()
@@ -0,0 +1,391 @@
+# intake.py
+# Layanan penerimaan order dari terminal POS. Order divalidasi terhadap tabel dimensi
+# (Menu, Tables, Payment_Methods) yang di-cache di memori, lalu masuk antrian. Satu thread
+# penulis mengambil semua order yang menunggu (maks BATCH_WINDOW_MS) dan menyimpannya dalam
+# satu transaksi (group commit): satu commit/fsync untuk banyak order, bukan satu per order.
+# Setiap pemanggil menerima acknowledgement sendiri (order_id) lewat Future.
+# Order masuk ke database cabang yang disebut di "branch" (nama cabang, default cabang pertama);
+# dimensi divalidasi per cabang dan satu batch ditulis dengan satu transaksi per cabang.
+#
+# Jalankan: python intake.py --port 8503
+# Contoh:   curl -X POST localhost:8503/orders -d '{"service_type": "Dine In", "table_id": 2,
+#             "payment_id": 1, "guest_name": "Budi", "items": [{"menu_id": 1, "quantity": 2}]}'
+#           (opsional: "branch": "Pusat", "order_time": "2024-01-01 12:00:00")
+import os
+import json
+import time
+import queue
+import argparse
+import datetime
+import threading
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import BRANCHES, BRANCH_NAMES, run_query, get_pool, on_branch, table_versions
+
+BATCH_WINDOW_MS = float(os.environ.get("RESTO_INTAKE_WINDOW_MS", "5"))   # tunggu order lain maks sekian ms
+MAX_BATCH = int(os.environ.get("RESTO_INTAKE_MAX_BATCH", "200"))         # order per transaksi
+MAX_PENDING = int(os.environ.get("RESTO_INTAKE_MAX_PENDING", "5000"))    # panjang antrian maksimal
+SUBMIT_TIMEOUT = 2.0       # detik menunggu tempat di antrian sebelum order ditolak
+DIMENSION_TTL = 60         # detik; dipakai kalau Data_Versions tidak tersedia
+MAX_QUANTITY = 100
+
+SERVICE_TYPES = ('Dine In', 'Take Away')
+DIMENSION_TABLES = ('Menu', 'Tables', 'Payment_Methods')
+
+ORDER_SQL = ('INSERT INTO Orders (customer_id, guest_name, service_type, table_id, payment_id, order_status, order_time) '
+             "VALUES (%s, %s, %s, %s, %s, 'Pending', %s)")
+# Kolom baris Orders yang dicocokkan ulang setelah INSERT multi-baris (urutan sama dengan ORDER_SQL)
+ORDER_CHECK_COLUMNS = 'customer_id, guest_name, service_type, table_id, payment_id'
+DETAIL_SQL = ('INSERT INTO Order_Details (order_id, menu_id, quantity, total_price, request_note) '
+              'VALUES (%s, %s, %s, %s, %s)')
+
+
+class OrderRejected(Exception):
+    """Order tidak valid atau antrian penuh"""
+
+
+class Dimensions:
+    """Menu (harga, member only), meja dan metode pembayaran satu cabang di memori.
+    Dimuat ulang kalau versi tabelnya berubah (atau setelah DIMENSION_TTL tanpa Data_Versions)."""
+
+    def __init__(self, branch=0):
+        self.branch = branch
+        self.menu = {}
+        self.tables = set()
+        self.payments = set()
+        self._stamp = None
+        self._loaded_at = 0
+        self._lock = threading.Lock()
+
+    def current(self):
+        stamp = table_versions.stamp(DIMENSION_TABLES)
+        with self._lock:
+            stale = stamp != self._stamp if stamp is not None else time.time() - self._loaded_at >= DIMENSION_TTL
+            if stale or not self.menu:
+                with on_branch(self.branch):
+                    self._load()
+                self._stamp, self._loaded_at = stamp, time.time()
+            return self
+
+    def _load(self):
+        self.menu = {menu_id: (float(price), bool(member_only)) for menu_id, price, member_only
+                     in run_query('SELECT menu_id, unit_price, member_only FROM Menu')}
+        self.tables = {row[0] for row in run_query('SELECT table_id FROM Tables')}
+        self.payments = {row[0] for row in run_query('SELECT payment_id FROM Payment_Methods')}
+
+def _object(value, what):
+    if not isinstance(value, dict):
+        raise OrderRejected(f"{what} harus objek JSON")
+    return value
+
+def _text_or_none(order, key):
+    value = order.get(key)
+    if value in (None, ''):
+        return None
+    if not isinstance(value, str):
+        raise OrderRejected(f"{key} harus teks")
+    return value
+
+def _int_or_none(order, key):
+    value = order.get(key)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise OrderRejected(f"{key} harus angka")
+
+def _order_time(order):
+    """order_time dari terminal sebagai 'YYYY-MM-DD HH:MM:SS' (waktu lokal), default sekarang"""
+    value = _text_or_none(order, 'order_time')
+    if value is None:
+        return datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    try:
+        parsed = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        raise OrderRejected("order_time harus berformat YYYY-MM-DD HH:MM:SS")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed.strftime('%Y-%m-%d %H:%M:%S')
+
+def order_branch(order):
+    """Indeks cabang tujuan dari nama cabang di "branch"; tanpa branch = cabang pertama"""
+    name = _text_or_none(_object(order, 'order'), 'branch')
+    if name is None:
+        return 0
+    if name not in BRANCH_NAMES:
+        raise OrderRejected(f"branch {name} tidak ada")
+    return BRANCH_NAMES.index(name)
+
+def validate(order, dims):
+    """Order siap tulis: (baris Orders, [baris Order_Details tanpa order_id], total) atau OrderRejected"""
+    order = _object(order, 'order')
+    service_type = order.get('service_type', 'Dine In')
+    if service_type not in SERVICE_TYPES:
+        raise OrderRejected(f"service_type harus salah satu dari {', '.join(SERVICE_TYPES)}")
+    customer_id = _int_or_none(order, 'customer_id')
+    table_id = _int_or_none(order, 'table_id')
+    payment_id = _int_or_none(order, 'payment_id')
+    if service_type == 'Dine In' and table_id is None:
+        raise OrderRejected("order Dine In wajib memakai table_id")
+    if table_id is not None and table_id not in dims.tables:
+        raise OrderRejected(f"table_id {table_id} tidak ada")
+    if payment_id is not None and payment_id not in dims.payments:
+        raise OrderRejected(f"payment_id {payment_id} tidak ada")
+
+    items = order.get('items') or []
+    if not isinstance(items, list):
+        raise OrderRejected("items harus list")
+    if not items:
+        raise OrderRejected("order tanpa item")
+    details, total = [], 0.0
+    for item in items:
+        item = _object(item, 'item')
+        menu_id, quantity = _int_or_none(item, 'menu_id'), _int_or_none(item, 'quantity')
+        if menu_id not in dims.menu:
+            raise OrderRejected(f"menu_id {menu_id} tidak ada")
+        if quantity is None or not 0 < quantity <= MAX_QUANTITY:
+            raise OrderRejected(f"quantity harus 1..{MAX_QUANTITY}")
+        price, member_only = dims.menu[menu_id]
+        if member_only and customer_id is None:
+            raise OrderRejected(f"menu_id {menu_id} khusus member (customer_id wajib)")
+        # Harga dihitung di server dari Menu, bukan dari terminal
+        details.append((menu_id, quantity, round(price * quantity, 2), _text_or_none(item, 'note')))
+        total += price * quantity
+
+    row = (customer_id, _text_or_none(order, 'guest_name'), service_type, table_id, payment_id, _order_time(order))
+    return row, details, round(total, 2)
+
+def parse_orders(body):
+    """Body POST /orders -> (banyak?, [order]); satu order atau {"orders": [...]} sekaligus.
+    Isi tiap order diperiksa validate, jadi order yang bukan objek ditolak per order."""
+    if isinstance(body, dict) and 'orders' not in body:
+        return False, [body]
+    orders = body.get('orders') if isinstance(body, dict) else body
+    if not isinstance(orders, list):
+        raise OrderRejected("orders harus list")
+    return True, orders
+
+
+class _Pending:
+    def __init__(self, branch, row, details, total):
+        self.branch = branch
+        self.row, self.details, self.total = row, details, total
+        self.future = Future()
+        self.queued_at = time.perf_counter()
+
+
+class OrderIntake:
+    """Antrian order + satu thread penulis dengan group commit"""
+
+    def __init__(self, batch_window_ms=BATCH_WINDOW_MS, max_batch=MAX_BATCH, max_pending=MAX_PENDING):
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch = max_batch
+        self.dimensions = [Dimensions(index) for index in range(len(BRANCHES))]
+        self._queue = queue.Queue(max_pending)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._id_step = {}         # cabang -> @@auto_increment_increment, dibaca sekali
+        self._stats = {
+            'accepted': 0,
+            'rejected': 0,
+            'written': 0,
+            'failed': 0,
+            'batches': 0,
+            'max_batch': 0,
+            'retried_batches': 0,   # batch gagal yang diulang per order
+        }
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='order-intake', daemon=True)
+                self._thread.start()
+        return self
+
+    def submit(self, order):
+        """Validasi lalu antrikan satu order; Future berisi ack {'order_id', 'total', ...}"""
+        try:
+            branch = order_branch(order)
+            pending = _Pending(branch, *validate(order, self.dimensions[branch].current()))
+            self._queue.put(pending, timeout=SUBMIT_TIMEOUT)
+        except queue.Full:
+            self._count('rejected')
+            raise OrderRejected("antrian order penuh, coba lagi")
+        except OrderRejected:
+            self._count('rejected')
+            raise
+        self._count('accepted')
+        return pending.future
+
+    def submit_many(self, orders):
+        """Antrikan banyak order; hasil per order: Future atau OrderRejected"""
+        results = []
+        for order in orders:
+            try:
+                results.append(self.submit(order))
+            except OrderRejected as e:
+                results.append(e)
+        return results
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self._stats, queue_depth=self._queue.qsize())
+        stats['avg_batch'] = round(stats['written'] / stats['batches'], 2) if stats['batches'] else 0
+        return stats
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    # PENULIS
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.batch_window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch):
+        # Order cabang lain ada di database lain: satu transaksi per cabang
+        groups = {}
+        for pending in batch:
+            groups.setdefault(pending.branch, []).append(pending)
+        for group in groups.values():
+            self._write_branch(group)
+
+    def _write_branch(self, batch):
+        try:
+            order_ids = self._commit(batch)
+        except Exception:
+            # Satu order bermasalah (mis. customer_id tidak ada) tidak boleh menggagalkan order lain
+            self._count('retried_batches')
+            for pending in batch:
+                try:
+                    self._ack(pending, self._commit([pending])[0], 1)
+                except Exception as e:
+                    self._count('failed')
+                    pending.future.set_exception(OrderRejected(f"order gagal disimpan: {e}"))
+            return
+        for pending, order_id in zip(batch, order_ids):
+            self._ack(pending, order_id, len(batch))
+        with self._lock:
+            self._stats['batches'] += 1
+            self._stats['max_batch'] = max(self._stats['max_batch'], len(batch))
+
+    def _ack(self, pending, order_id, batch_size):
+        self._count('written')
+        pending.future.set_result({
+            'order_id': order_id,
+            'total': pending.total,
+            'items': len(pending.details),
+            'batch_size': batch_size,
+            'latency_ms': round((time.perf_counter() - pending.queued_at) * 1000, 2),
+        })
+
+    def _commit(self, batch):
+        """Semua order di batch (satu cabang) dalam satu transaksi; kembalikan order_id sesuai urutan batch"""
+        branch = batch[0].branch
+        conn = get_pool(branch).get_connection()
+        try:
+            c = conn.cursor()
+            order_ids = self._insert_orders(c, [pending.row for pending in batch], branch)
+            c.executemany(DETAIL_SQL, [(order_id,) + detail for pending, order_id in zip(batch, order_ids)
+                                       for detail in pending.details])
+            c.close()
+            conn.commit()
+            return order_ids
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _insert_orders(self, c, rows, branch=0):
+        """INSERT Orders sekaligus (executemany -> satu INSERT multi-baris); order_id per baris.
+        lastrowid adalah id baris pertama; id berikutnya berurutan dengan langkah
+        auto_increment_increment selama tidak ada INSERT ... SELECT / LOAD DATA ke Orders yang
+        berjalan bersamaan. Karena itu id dicek ulang di transaksi yang sama; kalau tidak cocok
+        batch dibatalkan dan _write mengulang per order."""
+        c.executemany(ORDER_SQL, rows)
+        first_id = c.lastrowid
+        if len(rows) == 1:
+            return [first_id]
+        if branch not in self._id_step:
+            c.execute('SELECT @@auto_increment_increment')
+            self._id_step[branch] = int(c.fetchone()[0])
+        order_ids = [first_id + i * self._id_step[branch] for i in range(len(rows))]
+        c.execute(f"SELECT order_id, {ORDER_CHECK_COLUMNS} FROM Orders "
+                  f"WHERE order_id IN ({', '.join(['%s'] * len(order_ids))})", order_ids)
+        stored = {row[0]: tuple(row[1:]) for row in c.fetchall()}
+        if any(stored.get(order_id) != row[:5] for order_id, row in zip(order_ids, rows)):
+            raise RuntimeError("order_id INSERT multi-baris tidak berurutan")
+        return order_ids
+
+
+_intake = None
+_intake_lock = threading.Lock()
+
+def get_intake():
+    """Layanan intake bersama untuk seluruh proses (thread penulis dibuat sekali)"""
+    global _intake
+    with _intake_lock:
+        if _intake is None:
+            _intake = OrderIntake().start()
+    return _intake
+
+# HTTP
+
+class Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        if self.path.rstrip('/') != '/orders':
+            return self._send_json(404, {'error': 'endpoint tidak ditemukan'})
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        except ValueError:
+            return self._send_json(400, {'error': 'body harus JSON'})
+        try:
+            many, orders = parse_orders(body)
+        except OrderRejected as e:
+            return self._send_json(400, {'error': str(e)})
+        acks = []
+        for result in get_intake().submit_many(orders):
+            if isinstance(result, OrderRejected):
+                acks.append({'ok': False, 'error': str(result)})
+                continue
+            try:
+                acks.append(dict(result.result(timeout=30), ok=True))
+            except Exception as e:
+                acks.append({'ok': False, 'error': str(e)})
+        status = 200 if all(ack['ok'] for ack in acks) else 207 if any(ack['ok'] for ack in acks) else 400
+        self._send_json(status, acks if many else acks[0])
+
+    def do_GET(self):
+        if self.path.rstrip('/') != '/metrics':
+            return self._send_json(404, {'error': 'endpoint tidak ditemukan'})
+        self._send_json(200, get_intake().metrics())
+
+    def _send_json(self, status, body):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Layanan penerimaan order (group commit)')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8503)
+    args = parser.parse_args()
+    get_intake()
+    print(f"Intake order berjalan di http://{args.host}:{args.port} (POST /orders, GET /metrics)")
+    ThreadingHTTPServer((args.host, args.port), Handler).serve_forever()
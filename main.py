@@ -1,104 +1,101 @@
 # Import library
+# Hanya library ringan yang di-import di awal supaya sidebar langsung tampil.
+# pandas, plotly dan modul data di-import di bagian LOAD DATA (setelah sidebar digambar).
+import os
+import time
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 from config import *
+from gateway import query_metrics
 
 # Setup halaman
 st.set_page_config(page_title="Restaurant Orders Dashboard", layout="wide")
 
-# Color palette profesional
-COLORS = {
-    'primary': '#2E86AB',
-    'secondary': '#A23B72', 
-    'success': '#28A745',
-    'warning': '#F18F01',
-    'danger': '#C73E1D',
-    'info': '#17A2B8',
-    'palette': ['#2E86AB', '#A23B72', '#28A745', '#F18F01', '#C73E1D', '#17A2B8', '#6C757D', '#563D7C']
+# Tabel yang dibutuhkan setiap halaman (hanya ini yang dimuat saat halaman dibuka)
+PAGE_TABLES = {
+    "Dashboard": ['orders', 'details', 'menu', 'reservations', 'customers', 'tables', 'reviews'],
+    "Customers": ['customers', 'orders', 'details'],
+    "Categories": ['categories'],
+    "Payment Methods": ['payment'],
+    "Tables": ['table_usage', 'tables', 'reservations', 'orders'],
+    "Menu": ['menu', 'details'],
+    "Orders": ['orders'],
+    "Antrian Dapur": [],   # dibaca dari change feed, bukan dari view_*
+    "Forecast": ['menu_names'],  # angka forecast dari model di forecast.py, menu hanya untuk nama
+    "Order Details": ['details'],
+    "Reservations": ['reservations'],
+    "Reviews": ['reviews'],
+    "Custom": ['customers', 'categories', 'payment', 'tables', 'table_usage', 'menu',
+               'orders', 'details', 'reservations', 'reviews'],
 }
-
-CHART_TEMPLATE = 'plotly_white'
-
-# Load semua data
-df_customers = pd.DataFrame(view_customers(), columns=[
-    'customer_id', 'customer_name', 'email', 'phone', 'total_spending'
-])
-
-df_categories = pd.DataFrame(view_categories(), columns=[
-    'category_id', 'category_name', 'total_qty', 'order_date'
-])
-
-df_payment = pd.DataFrame(view_payment_methods(), columns=[
-    'payment_id', 'method_name', 'revenue', 'order_date'
-])
-
-df_tables = pd.DataFrame(view_tables(), columns=[
-    'table_id', 'table_number', 'capacity', 'location', 'status'
-])
-
-df_table_usage = pd.DataFrame(view_table_usage(), columns=[
-    'table_id', 'table_number', 'capacity', 'times_used', 'order_date'
-])
-
-df_menu = pd.DataFrame(view_menu(), columns=[
-    'menu_id', 'item_name', 'unit_price', 'member_only', 'category_name', 'total_ordered', 'order_date'
-])
-
-df_orders = pd.DataFrame(view_orders(), columns=[
-    'order_id', 'customer_id', 'guest_name', 'service_type', 'table_id', 
-    'payment_id', 'order_status', 'order_time', 'method_name', 'table_number', 
-    'customer_name', 'order_date'
-])
-
-df_details = pd.DataFrame(view_order_details(), columns=[
-    'order_detail_id', 'order_id', 'menu_id', 'quantity', 'total_price',
-    'request_note', 'item_name', 'unit_price', 'order_date'
-])
-
-df_reservations = pd.DataFrame(view_reservations(), columns=[
-    'reservation_id', 'customer_id', 'table_id', 'reservation_date',
-    'check_in', 'check_out', 'party_size', 'status', 'special_request',
-    'table_number', 'capacity', 'customer_name'
-])
-
-df_reviews = pd.DataFrame(view_reviews(), columns=[
-    'review_id', 'order_id', 'rating', 'comment', 'review_date', 'customer_name'
-])
-
-# Format tanggal
-for df in [df_categories, df_payment, df_table_usage, df_menu, df_orders, df_details]:
-    if 'order_date' in df.columns and not df.empty:
-        df['order_date'] = pd.to_datetime(df['order_date'], errors='coerce')
-
-if not df_reservations.empty:
-    df_reservations['reservation_date'] = pd.to_datetime(df_reservations['reservation_date'], errors='coerce')
-
-if not df_reviews.empty:
-    df_reviews['review_date'] = pd.to_datetime(df_reviews['review_date'], errors='coerce')
+# Tabel pengganti di mode perkiraan (None = tidak dimuat, angkanya diambil dari sketch harian)
+APPROX_SOURCES = {
+    "Dashboard": {'details': None},
+    "Order Details": {'details': 'details_sample'},
+}
+# Angka per cabang hanya ditampilkan kalau ada lebih dari satu cabang
+if len(BRANCHES) > 1:
+    PAGE_TABLES["Dashboard"].append('branch_summary')
+# Key filter tanggal order setiap halaman: tabel per tanggal order dimuat sebatas rentang ini,
+# jadi arsip partisi lama hanya dibaca kalau rentang yang dipilih mencapainya
+DATE_KEYS = {
+    "Dashboard": 'dashboard_date',
+    "Customers": 'customers_date',
+    "Categories": 'date_categories',
+    "Payment Methods": 'date_payment',
+    "Tables": 'date_tables',
+    "Menu": 'date_menu',
+    "Orders": 'date_orders',
+    "Order Details": 'date_details',
+    "Custom": 'custom_date',
+}
+# Halaman dengan perbandingan periode: data dimuat sejak awal periode pembanding (tahun lalu)
+COMPARISON_PAGES = {"Dashboard", "Orders", "Order Details"}
 
 # HELPER FUNCTIONS
 
 def format_rupiah(value):
     return f"Rp {value:,.0f}".replace(",", ".")
 
-def filter_by_date_sidebar(df, date_col, key_prefix):
-    """Filter tanggal di sidebar dengan tombol reset"""
-    if df.empty or date_col not in df.columns:
+def default_range():
+    """Rentang awal filter tanggal order: seluruh data di MySQL (arsip dibaca kalau dipilih)"""
+    return (live_first_day, last_day)
+
+def page_load_range(page):
+    """Rentang tanggal order yang dimuat untuk halaman, dari filter tanggal halaman itu"""
+    key = DATE_KEYS.get(page)
+    if key is None or last_day is None:
+        return None, None
+    if key not in st.session_state:
+        st.session_state[key] = default_range()
+    selected = st.session_state[key]
+    start, end = selected if len(selected) == 2 else default_range()
+    if page in COMPARISON_PAGES:
+        start = min(window_start for window_start, _ in analytics.comparison_windows(start, end).values())
+    return start, end
+
+def filter_by_date_sidebar(df, date_col, key_prefix, order_dates=False):
+    """Filter tanggal di sidebar dengan tombol reset.
+    order_dates=True: batas pilihan = seluruh riwayat order (termasuk arsip), bukan isi df,
+    karena df hanya berisi rentang yang dimuat."""
+    if order_dates and last_day is not None:
+        min_date, max_date = first_day, last_day
+        reset_range = default_range()
+    elif df.empty or date_col not in df.columns:
         return df
-    
-    min_date = df[date_col].min().date()
-    max_date = df[date_col].max().date()
+    else:
+        min_date = df[date_col].min().date()
+        max_date = df[date_col].max().date()
+        reset_range = (min_date, max_date)
     
     st.sidebar.markdown("**Filter Tanggal**")
     
     # Inisialisasi session state jika belum ada
     if f"date_{key_prefix}" not in st.session_state:
-        st.session_state[f"date_{key_prefix}"] = (min_date, max_date)
+        st.session_state[f"date_{key_prefix}"] = reset_range
     
     # Tombol reset
     if st.sidebar.button("Reset Tanggal", key=f"reset_{key_prefix}"):
-        st.session_state[f"date_{key_prefix}"] = (min_date, max_date)
+        st.session_state[f"date_{key_prefix}"] = reset_range
         st.rerun()
     
     date_range = st.sidebar.date_input(
@@ -110,67 +107,30 @@ def filter_by_date_sidebar(df, date_col, key_prefix):
     
     if len(date_range) == 2:
         start, end = date_range
-        return df[(df[date_col].dt.date >= start) & (df[date_col].dt.date <= end)]
+        return analytics.filter_date(df, date_col, start, end)
     return df
 
+def selected_range(key_prefix):
+    """Rentang tanggal yang dipilih di filter_by_date_sidebar, (None, None) kalau belum lengkap"""
+    date_range = st.session_state.get(f"date_{key_prefix}", ())
+    return date_range if len(date_range) == 2 else (None, None)
+
+def metric_with_delta(label, value, comparison, key, fmt="{:,.0f}".format, delta_color="normal"):
+    """st.metric dengan delta vs periode sebelumnya; angka periode pembanding di tooltip"""
+    delta, help_text = None, None
+    if comparison is not None:
+        change = analytics.change_ratio(comparison, key)
+        delta = f"{change:+.1%} vs periode lalu" if change is not None else None
+        last_year = analytics.change_ratio(comparison, key, 'last_year')
+        help_text = (f"Periode sebelumnya: {fmt(comparison.at['previous', key])}  \n"
+                     f"Tahun lalu (hari sama): {fmt(comparison.at['last_year', key])}"
+                     + (f" ({last_year:+.1%})" if last_year is not None else ""))
+    st.metric(label, value, delta=delta, delta_color=delta_color, help=help_text)
+
 def download_csv(df, filename, label):
     csv = df.to_csv(index=False).encode('utf-8')
     st.download_button(label=label, data=csv, file_name=filename, mime='text/csv')
 
-# CHART FUNCTIONS
-
-def create_bar_chart_colored(data, x, y, title='', horizontal=False):
-    """Bar chart dengan warna berbeda per kategori"""
-    if horizontal:
-        fig = px.bar(data, y=x, x=y, orientation='h', color=x,
-                     color_discrete_sequence=COLORS['palette'], template=CHART_TEMPLATE)
-        fig.update_layout(yaxis={'categoryorder': 'total ascending'})
-    else:
-        fig = px.bar(data, x=x, y=y, color=x,
-                     color_discrete_sequence=COLORS['palette'], template=CHART_TEMPLATE)
-    fig.update_layout(showlegend=False, margin=dict(l=20, r=20, t=40, b=20),
-                      title=dict(text=title, x=0.5, font=dict(size=14)))
-    return fig
-
-def create_bar_chart(data, x, y, title='', horizontal=False, color=None):
-    """Bar chart dengan satu warna"""
-    if horizontal:
-        fig = px.bar(data, y=x, x=y, orientation='h',
-                     color_discrete_sequence=[color or COLORS['primary']], template=CHART_TEMPLATE)
-        fig.update_layout(yaxis={'categoryorder': 'total ascending'})
-    else:
-        fig = px.bar(data, x=x, y=y,
-                     color_discrete_sequence=[color or COLORS['primary']], template=CHART_TEMPLATE)
-    fig.update_layout(showlegend=False, margin=dict(l=20, r=20, t=40, b=20),
-                      title=dict(text=title, x=0.5, font=dict(size=14)))
-    return fig
-
-def create_pie_chart(values, names, title='', max_slices=6):
-    """Donut chart"""
-    df = pd.DataFrame({'names': names, 'values': values}).sort_values('values', ascending=False)
-    if len(df) > max_slices:
-        top = df.head(max_slices - 1)
-        others = pd.DataFrame({'names': ['Lainnya'], 'values': [df.iloc[max_slices-1:]['values'].sum()]})
-        df = pd.concat([top, others])
-    
-    fig = px.pie(df, values='values', names='names', hole=0.4,
-                 color_discrete_sequence=COLORS['palette'], template=CHART_TEMPLATE)
-    fig.update_layout(margin=dict(l=20, r=20, t=40, b=20),
-                      title=dict(text=title, x=0.5, font=dict(size=14)),
-                      legend=dict(orientation='h', yanchor='bottom', y=-0.2, xanchor='center', x=0.5))
-    fig.update_traces(textposition='inside', textinfo='percent+label')
-    return fig
-
-def create_line_chart(x, y, title='', fill=False):
-    """Line/Area chart"""
-    if fill:
-        fig = px.area(x=x, y=y, template=CHART_TEMPLATE, color_discrete_sequence=[COLORS['primary']])
-    else:
-        fig = px.line(x=x, y=y, markers=True, template=CHART_TEMPLATE, color_discrete_sequence=[COLORS['primary']])
-    fig.update_layout(showlegend=False, margin=dict(l=20, r=20, t=40, b=20),
-                      title=dict(text=title, x=0.5, font=dict(size=14)), xaxis_title='', yaxis_title='')
-    return fig
-
 # DASHBOARD
 def tampilkan_dashboard():
     st.title("Dashboard Utama")
@@ -178,15 +138,15 @@ def tampilkan_dashboard():
     
     st.sidebar.markdown("**Filter Tanggal**")
     
-    if not df_orders.empty:
-        min_date = df_orders['order_date'].min().date()
-        max_date = df_orders['order_date'].max().date()
+    if last_day is not None:
+        # Batas pilihan = seluruh riwayat order termasuk arsip; df_orders hanya rentang yang dimuat
+        min_date, max_date = first_day, last_day
         
         if 'dashboard_date' not in st.session_state:
-            st.session_state['dashboard_date'] = (min_date, max_date)
+            st.session_state['dashboard_date'] = default_range()
         
         if st.sidebar.button("Reset Tanggal", key="reset_dashboard"):
-            st.session_state['dashboard_date'] = (min_date, max_date)
+            st.session_state['dashboard_date'] = default_range()
             st.rerun()
         
         date_range = st.sidebar.date_input(
@@ -199,7 +159,7 @@ def tampilkan_dashboard():
         if len(date_range) == 2:
             start_date, end_date = date_range
         else:
-            start_date, end_date = min_date, max_date
+            start_date, end_date = default_range()
     else:
         start_date, end_date = None, None
     
@@ -217,46 +177,61 @@ def tampilkan_dashboard():
         if st.sidebar.checkbox(viz_name, value=default, key=f"viz_{viz_name}"):
             selected_viz.append(viz_name)
     
-    # Filter data berdasarkan tanggal
-    if start_date and end_date:
-        df_orders_filtered = df_orders[(df_orders['order_date'].dt.date >= start_date) & 
-                                        (df_orders['order_date'].dt.date <= end_date)]
-        df_details_filtered = df_details[(df_details['order_date'].dt.date >= start_date) & 
-                                          (df_details['order_date'].dt.date <= end_date)]
-        df_menu_filtered = df_menu[(df_menu['order_date'].dt.date >= start_date) & 
-                                    (df_menu['order_date'].dt.date <= end_date)]
-    else:
-        df_orders_filtered = df_orders
-        df_details_filtered = df_details
-        df_menu_filtered = df_menu
-    
-    # Hitung metrics
-    total_revenue = df_details_filtered['total_price'].sum() if not df_details_filtered.empty else 0
-    total_orders = len(df_orders_filtered)
-    avg_order_value = total_revenue / total_orders if total_orders > 0 else 0
+    # Agregat dan grafik dari bundle laporan kalau tersedia
+    report = page_report("Dashboard", data, start_date, end_date)
+    kpis = report['kpis']
+    comparison = report.get('comparison')
+    if mode_perkiraan:
+        approx = approx_kpis(start_date, end_date)
+        kpis.update({key: approx[key] for key in ['total_orders', 'total_revenue', 'avg_order_value']})
+        if start_date is not None:
+            comparison = analytics.order_window_totals(get_sketches().daily_totals(), start_date, end_date)
     
     # Metrics
     st.markdown("### Ringkasan Statistik")
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Total Order", f"{total_orders:,}")
+        metric_with_delta("Total Order", f"{kpis['total_orders']:,}", comparison, 'total_orders')
     with col2:
-        st.metric("Total Revenue", format_rupiah(total_revenue))
+        metric_with_delta("Total Revenue", format_rupiah(kpis['total_revenue']), comparison, 'total_revenue', format_rupiah)
     with col3:
-        st.metric("Rata-rata/Order", format_rupiah(avg_order_value))
+        metric_with_delta("Rata-rata/Order", format_rupiah(kpis['avg_order_value']), comparison, 'avg_order_value', format_rupiah)
     with col4:
-        st.metric("Total Reservasi", f"{len(df_reservations):,}")
+        st.metric("Total Reservasi", f"{kpis['total_reservations']:,}")
     
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Total Customer", f"{len(df_customers):,}")
+        st.metric("Total Customer", f"{kpis['total_customers']:,}")
     with col2:
-        st.metric("Total Menu", f"{df_menu['menu_id'].nunique():,}")
+        st.metric("Total Menu", f"{kpis['total_menu']:,}")
     with col3:
-        st.metric("Total Meja", f"{len(df_tables):,}")
+        st.metric("Total Meja", f"{kpis['total_tables']:,}")
     with col4:
-        avg_rating = df_reviews['rating'].mean() if not df_reviews.empty else 0
-        st.metric("Rating", f"{avg_rating:.1f}/5")
+        st.metric("Rating", f"{kpis['avg_rating']:.1f}/5")
+    
+    if mode_perkiraan:
+        st.markdown("### Perkiraan")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Customer Unik", f"≈ {approx['distinct_customers']:,.0f}")
+            st.caption(f"± {approx['distinct_customers_error']:,.0f} (95%)")
+        for col, q, label in [(col2, 0.5, "Median Nilai Order"), (col3, 0.9, "P90 Nilai Order")]:
+            value, low, high = approx['order_value_quantiles'][q]
+            with col:
+                st.metric(label, f"≈ {format_rupiah(value)}")
+                st.caption(f"95%: {format_rupiah(low)} – {format_rupiah(high)}")
+        st.caption("Total order, revenue dan rata-rata/order tetap tepat (dijumlah dari ringkasan harian).")
+    
+    if df_branch_summary is not None:
+        st.markdown("### Per Cabang")
+        branches = analytics.branch_kpis(df_branch_summary, start_date, end_date)
+        table = pd.DataFrame({
+            'Cabang': branches['branch'],
+            'Total Order': branches['orders'].astype(int),
+            'Revenue': branches['revenue'].apply(format_rupiah),
+            'Rata-rata/Order': branches['avg_order_value'].apply(format_rupiah),
+        })
+        st.dataframe(table, use_container_width=True, hide_index=True)
     
     st.markdown("---")
     
@@ -275,40 +250,15 @@ def tampilkan_dashboard():
     else:
         cols = st.columns(2)
     
-    col_idx = 0
+    figures = dict(report['figures'])
+    if mode_perkiraan:
+        daily = get_sketches().revenue_daily(start_date, end_date)
+        figures["Trend Pendapatan"] = create_line_chart(daily.index, daily.values, 'Trend Pendapatan Harian', fill=True) if not daily.empty else None
     
-    if "Top Menu Terlaris" in selected_viz:
+    for col_idx, viz_name in enumerate(selected_viz):
         with cols[col_idx % len(cols)]:
-            if not df_menu_filtered.empty:
-                top_menu = df_menu_filtered.groupby('item_name')['total_ordered'].sum().sort_values(ascending=False).head(5).reset_index()
-                top_menu.columns = ['Menu', 'Terjual']
-                fig = create_bar_chart(top_menu, 'Menu', 'Terjual', 'Top 5 Menu Terlaris', horizontal=True, color=COLORS['primary'])
-                st.plotly_chart(fig, use_container_width=True)
-        col_idx += 1
-    
-    if "Trend Pendapatan" in selected_viz:
-        with cols[col_idx % len(cols)]:
-            if not df_details_filtered.empty:
-                daily = df_details_filtered.groupby(df_details_filtered['order_date'].dt.date)['total_price'].sum()
-                fig = create_line_chart(daily.index, daily.values, 'Trend Pendapatan Harian', fill=True)
-                st.plotly_chart(fig, use_container_width=True)
-        col_idx += 1
-    
-    if "Tipe Layanan" in selected_viz:
-        with cols[col_idx % len(cols)]:
-            if not df_orders_filtered.empty:
-                service = df_orders_filtered['service_type'].value_counts()
-                fig = create_pie_chart(service.values, service.index, 'Distribusi Tipe Layanan')
-                st.plotly_chart(fig, use_container_width=True)
-        col_idx += 1
-    
-    if "Metode Pembayaran" in selected_viz:
-        with cols[col_idx % len(cols)]:
-            if not df_orders_filtered.empty:
-                payment = df_orders_filtered['method_name'].value_counts()
-                fig = create_pie_chart(payment.values, payment.index, 'Distribusi Pembayaran')
-                st.plotly_chart(fig, use_container_width=True)
-        col_idx += 1
+            if figures[viz_name] is not None:
+                st.plotly_chart(figures[viz_name], use_container_width=True)
 
 # CUSTOMERS
 def tampilkan_customers():
@@ -317,15 +267,15 @@ def tampilkan_customers():
     
     # Filter tanggal berdasarkan orders
     st.sidebar.markdown("**Filter Tanggal**")
-    if not df_orders.empty:
-        min_date = df_orders['order_date'].min().date()
-        max_date = df_orders['order_date'].max().date()
+    if last_day is not None:
+        # Batas pilihan = seluruh riwayat order termasuk arsip; df_orders hanya rentang yang dimuat
+        min_date, max_date = first_day, last_day
         
         if 'customers_date' not in st.session_state:
-            st.session_state['customers_date'] = (min_date, max_date)
+            st.session_state['customers_date'] = default_range()
         
         if st.sidebar.button("Reset Tanggal", key="reset_customers_date"):
-            st.session_state['customers_date'] = (min_date, max_date)
+            st.session_state['customers_date'] = default_range()
             st.rerun()
         
         date_range = st.sidebar.date_input(
@@ -337,25 +287,25 @@ def tampilkan_customers():
         if len(date_range) == 2:
             start_date, end_date = date_range
         else:
-            start_date, end_date = min_date, max_date
+            start_date, end_date = default_range()
         
-        # Hitung spending per customer dalam rentang tanggal
-        orders_filtered = df_orders[(df_orders['order_date'].dt.date >= start_date) & 
-                                    (df_orders['order_date'].dt.date <= end_date)]
-        details_filtered = df_details[(df_details['order_date'].dt.date >= start_date) & 
-                                      (df_details['order_date'].dt.date <= end_date)]
-        
-        # Join untuk hitung spending
-        spending_data = orders_filtered.merge(details_filtered[['order_id', 'total_price']], on='order_id', how='left')
-        spending_by_customer = spending_data.groupby('customer_id')['total_price'].sum().reset_index()
-        spending_by_customer.columns = ['customer_id', 'filtered_spending']
-        
-        # Gabung dengan data customer
-        df_cust = df_customers.merge(spending_by_customer, on='customer_id', how='left')
-        df_cust['filtered_spending'] = pd.to_numeric(df_cust['filtered_spending'], errors='coerce').fillna(0)
+        if start_date <= min_date and end_date >= max_date:
+            # Seluruh riwayat: pakai lifetime spend dari store statistik customer (tanpa merge ulang)
+            df_cust = df_customers.assign(filtered_spending=df_customers['total_spending'])
+        else:
+            # Hitung spending per customer dalam rentang tanggal
+            orders_filtered = analytics.filter_date(df_orders, 'order_date', start_date, end_date)
+            details_filtered = analytics.filter_date(df_details, 'order_date', start_date, end_date)
+            
+            # Join untuk hitung spending
+            spending_data = orders_filtered.merge(details_filtered[['order_id', 'total_price']], on='order_id', how='left')
+            spending_by_customer = spending_data.groupby('customer_id')['total_price'].sum().reset_index()
+            spending_by_customer.columns = ['customer_id', 'filtered_spending']
+            
+            # Gabung dengan data customer
+            df_cust = df_customers.merge(spending_by_customer, on='customer_id', how='left')
     else:
-        df_cust = df_customers.copy()
-        df_cust['filtered_spending'] = 0.0
+        df_cust = df_customers.assign(filtered_spending=0.0)
     
     df_cust['total_spending'] = pd.to_numeric(df_cust['total_spending'], errors='coerce').fillna(0)
     df_cust['filtered_spending'] = pd.to_numeric(df_cust['filtered_spending'], errors='coerce').fillna(0)
@@ -373,7 +323,7 @@ def tampilkan_customers():
     
     # Filter pencarian
     search = st.text_input("Cari customer (nama/email/telepon)")
-    filtered = df_cust.copy()
+    filtered = df_cust
     if search:
         filtered = filtered[
             filtered['customer_name'].str.contains(search, case=False, na=False) |
@@ -386,7 +336,7 @@ def tampilkan_customers():
     
     with col1:
         # Top 10 Customer by Spending
-        top10 = filtered.nlargest(10, 'filtered_spending')[['customer_name', 'filtered_spending']].copy()
+        top10 = filtered.nlargest(10, 'filtered_spending')[['customer_name', 'filtered_spending']]
         top10.columns = ['Customer', 'Spending']
         top10 = top10[top10['Spending'] > 0]  # Hanya yang ada spending
         
@@ -398,13 +348,11 @@ def tampilkan_customers():
     
     with col2:
         # Distribusi spending dalam kategori
-        df_spending = filtered[filtered['filtered_spending'] > 0].copy()
+        df_spending = filtered[filtered['filtered_spending'] > 0]
         if not df_spending.empty:
             # Buat kategori spending
-            bins = [0, 100000, 500000, 1000000, 5000000, float('inf')]
-            labels = ['< 100rb', '100rb-500rb', '500rb-1jt', '1jt-5jt', '> 5jt']
-            df_spending['kategori'] = pd.cut(df_spending['filtered_spending'], bins=bins, labels=labels)
-            kategori_count = df_spending['kategori'].value_counts().reindex(labels).fillna(0)
+            kategori = spending_segment(df_spending['filtered_spending'].values)
+            kategori_count = pd.Series(kategori).value_counts().reindex(SPENDING_LABELS).fillna(0)
             
             fig = px.bar(x=kategori_count.index, y=kategori_count.values,
                         title='Distribusi Spending Customer',
@@ -418,8 +366,8 @@ def tampilkan_customers():
     
     # Tabel
     st.subheader("Daftar Customer")
-    display = filtered[['customer_id', 'customer_name', 'email', 'phone', 'filtered_spending']].copy()
-    display.columns = ['ID', 'Nama', 'Email', 'Telepon', 'Total Spending']
+    display = filtered[['customer_id', 'customer_name', 'email', 'phone', 'filtered_spending', 'segment']]
+    display.columns = ['ID', 'Nama', 'Email', 'Telepon', 'Total Spending', 'Segmen RFM']
     display['Total Spending'] = display['Total Spending'].apply(format_rupiah)
     st.dataframe(display, use_container_width=True, hide_index=True)
     download_csv(filtered, 'customers.csv', 'Download CSV')
@@ -430,11 +378,9 @@ def tampilkan_categories():
     st.title("Kategori Menu")
     st.caption("Analisis penjualan berdasarkan kategori")
     
-    filtered = filter_by_date_sidebar(df_categories.copy(), 'order_date', 'categories')
+    filtered = filter_by_date_sidebar(df_categories, 'order_date', 'categories', order_dates=True)
     
-    cat_summary = filtered.groupby('category_name')['total_qty'].sum().reset_index()
-    cat_summary = cat_summary.sort_values('total_qty', ascending=False)
-    cat_summary.columns = ['Kategori', 'Terjual']
+    cat_summary = analytics.category_summary(filtered)
     
     # Metrics
     col1, col2 = st.columns(2)
@@ -461,11 +407,11 @@ def tampilkan_payment():
     st.title("Metode Pembayaran")
     st.caption("Analisis revenue berdasarkan metode pembayaran")
     
-    filtered = filter_by_date_sidebar(df_payment.copy(), 'order_date', 'payment')
+    filter_by_date_sidebar(df_payment, 'order_date', 'payment', order_dates=True)
+    start, end = selected_range('payment')
     
-    pay_summary = filtered.groupby('method_name')['revenue'].sum().reset_index()
-    pay_summary = pay_summary.sort_values('revenue', ascending=False)
-    pay_summary.columns = ['Metode', 'Revenue']
+    report = page_report("Payment Methods", data, start, end)
+    pay_summary = report['summary']
     
     # Metrics dinamis
     cols = st.columns(len(pay_summary) if len(pay_summary) <= 5 else 5)
@@ -476,11 +422,9 @@ def tampilkan_payment():
     # Visualisasi
     col1, col2 = st.columns([3, 2])
     with col1:
-        fig = create_bar_chart_colored(pay_summary, 'Metode', 'Revenue', 'Revenue per Metode', horizontal=True)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(report['figures']['bar'], use_container_width=True)
     with col2:
-        fig = create_pie_chart(pay_summary['Revenue'].values, pay_summary['Metode'].values, 'Proporsi Revenue')
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(report['figures']['pie'], use_container_width=True)
     
     download_csv(pay_summary, 'payment_methods.csv', 'Download CSV')
 
@@ -490,10 +434,8 @@ def tampilkan_tables():
     st.title("Data Meja")
     st.caption("Informasi dan frekuensi penggunaan meja")
     
-    filtered = filter_by_date_sidebar(df_table_usage.copy(), 'order_date', 'tables')
-    usage_summary = filtered.groupby(['table_number', 'capacity'])['times_used'].sum().reset_index()
-    usage_summary['Meja'] = 'Meja ' + usage_summary['table_number'].astype(str)
-    usage_summary = usage_summary.rename(columns={'times_used': 'Penggunaan'})
+    filtered = filter_by_date_sidebar(df_table_usage, 'order_date', 'tables', order_dates=True)
+    usage_summary = analytics.table_usage_summary(filtered)
     
     # Metrics - berdasarkan data yang sudah difilter
     col1, col2, col3 = st.columns(3)
@@ -515,15 +457,59 @@ def tampilkan_tables():
         st.subheader("Info Meja")
         st.dataframe(df_tables[['table_number', 'capacity', 'location', 'status']], use_container_width=True, hide_index=True)
     
+    tampilkan_usulan_meja()
+    
     download_csv(df_tables, 'tables.csv', 'Download CSV')
 
+def tampilkan_usulan_meja():
+    """Usulan penempatan reservasi + walk-in untuk satu tanggal (lihat seating.py)"""
+    st.subheader("Usulan Penempatan Meja")
+    dates = pd.concat([df_reservations['reservation_date'], df_orders['order_date']]).dropna()
+    default = dates.max().date() if not dates.empty else pd.Timestamp.today().date()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        plan_date = st.date_input("Tanggal", value=default, key="seating_date")
+    with col2:
+        walk_in_party = st.number_input("Orang per Walk-in", 1, 20, WALK_IN_PARTY, key="seating_party")
+    with col3:
+        walk_in_minutes = st.number_input("Lama Walk-in (menit)", 15, 240, WALK_IN_MINUTES, step=15, key="seating_minutes")
+    
+    plan, summary = seating_plan(df_tables, df_reservations, df_orders, plan_date,
+                                 walk_in_party=walk_in_party, walk_in_minutes=walk_in_minutes)
+    if summary is None:
+        st.info("Tidak ada reservasi atau order Dine In pada tanggal ini")
+        return
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Rombongan Duduk", f"{summary['seated']} / {summary['parties']}")
+    with col2:
+        st.metric("Tamu Duduk", f"{summary['seated_covers']} / {summary['covers']} orang")
+    with col3:
+        st.metric("Kursi Terbuang", f"{summary['wasted_seats']:,}",
+                  delta=f"{summary['wasted_seats'] - summary['current_wasted_seats']:+,} vs saat ini", delta_color="inverse")
+    with col4:
+        st.metric("Pindah Meja", f"{summary['moved']:,}", help="Rombongan yang diusulkan pindah dari meja yang tercatat")
+    
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        schedule = plan_timeline(plan, plan_date)
+        if not schedule.empty:
+            fig = create_timeline_chart(schedule, 'Mulai', 'Selesai', 'Meja', 'kind', f'Jadwal Meja {plan_date}')
+            st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        display = plan[['arrival', 'seated', 'name', 'party_size', 'table_number', 'wasted']]
+        display.columns = ['Datang', 'Duduk', 'Nama', 'Orang', 'Meja', 'Sisa Kursi']
+        st.dataframe(display, use_container_width=True, hide_index=True)
+    st.caption(f"Rata-rata tunggu {summary['avg_wait']:.0f} menit · dihitung dalam {summary['elapsed_ms']} ms")
+
 # MENU
 
 def tampilkan_menu():
     st.title("Data Menu")
     st.caption("Daftar menu dan performa penjualan")
     
-    filtered = filter_by_date_sidebar(df_menu.copy(), 'order_date', 'menu')
+    filtered = filter_by_date_sidebar(df_menu, 'order_date', 'menu', order_dates=True)
     
     # Filter tambahan
     st.sidebar.markdown("**Filter Akses Menu**")
@@ -539,22 +525,27 @@ def tampilkan_menu():
         filtered = filtered[filtered['member_only'] == 0]
     
     # Filter harga
+    price_filtered = False
     if not filtered.empty:
-        filtered['unit_price'] = pd.to_numeric(filtered['unit_price'], errors='coerce')
+        filtered = filtered.assign(unit_price=pd.to_numeric(filtered['unit_price'], errors='coerce'))
         min_p, max_p = float(filtered['unit_price'].min()), float(filtered['unit_price'].max())
         if min_p < max_p:
             price_range = st.sidebar.slider("Rentang Harga", min_p, max_p, (min_p, max_p), key="price_range")
             filtered = filtered[filtered['unit_price'].between(*price_range)]
+            price_filtered = price_range != (min_p, max_p)
     
-    menu_summary = filtered.groupby(['menu_id', 'item_name', 'unit_price', 'category_name', 'member_only']).agg({
-        'total_ordered': 'sum'
-    }).reset_index().sort_values('total_ordered', ascending=False)
+    # Bundle laporan hanya berlaku untuk tampilan tanpa filter tambahan
+    if menu_filter == "Semua Menu" and not price_filtered:
+        report = page_report("Menu", data, *selected_range('menu'))
+    else:
+        report = build_menu({'menu': filtered}, None, None)
+    menu_summary = report['summary']
     
-    # Hitung jumlah menu
-    paket_count = len(menu_summary[menu_summary['member_only'] == 1])  # Menu paket (member only)
-    reguler_count = len(menu_summary[menu_summary['member_only'] == 0])  # Menu reguler
-    total_menu_member = paket_count + reguler_count  # Member bisa akses semua
-    total_menu_guest = reguler_count  # Guest hanya reguler
+    # Hitung jumlah menu (member bisa akses semua, guest hanya reguler)
+    access = report['access']
+    paket_count = access['paket']
+    total_menu_member = access['member']
+    total_menu_guest = access['guest']
     
     # Metrics
     col1, col2, col3, col4 = st.columns(4)
@@ -571,21 +562,29 @@ def tampilkan_menu():
     st.info(f"Member dapat mengakses semua {total_menu_member} menu (termasuk {paket_count} paket). Guest hanya dapat mengakses {total_menu_guest} menu reguler.")
     
     # Visualisasi
-    top10 = menu_summary.head(10)[['item_name', 'total_ordered']].copy()
-    top10.columns = ['Menu', 'Terjual']
-    
     col1, col2 = st.columns([3, 2])
     with col1:
-        fig = create_bar_chart(top10, 'Menu', 'Terjual', 'Top 10 Menu Terlaris', horizontal=True)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(report['figures']['top10'], use_container_width=True)
     with col2:
-        cat_sales = menu_summary.groupby('category_name')['total_ordered'].sum()
-        fig = create_pie_chart(cat_sales.values, cat_sales.index, 'Distribusi per Kategori')
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(report['figures']['categories'], use_container_width=True)
+    
+    # Menu yang sering dipesan bersama
+    st.subheader("Sering Dipesan Bersama")
+    date_range = st.session_state.get('date_menu', ())
+    start, end = date_range if len(date_range) == 2 else (None, None)
+    pairs = basket_pairs(df_details, start, end, stamp=frame_stamp('details'))
+    if not pairs.empty:
+        top_pairs = pairs.head(10)
+        top_pairs['Pasangan'] = top_pairs['item_a'] + ' + ' + top_pairs['item_b']
+        pairs_display = top_pairs[['Pasangan', 'orders', 'support', 'confidence_ab', 'confidence_ba', 'lift']]
+        pairs_display.columns = ['Pasangan Menu', 'Jumlah Order', 'Support', 'Confidence A→B', 'Confidence B→A', 'Lift']
+        st.dataframe(pairs_display.round(3), use_container_width=True, hide_index=True)
+    else:
+        st.info("Belum ada pasangan menu yang dipesan bersama dalam rentang waktu ini.")
     
     # Tabel
     st.subheader("Daftar Menu")
-    display = menu_summary[['item_name', 'unit_price', 'category_name', 'member_only', 'total_ordered']].copy()
+    display = menu_summary[['item_name', 'unit_price', 'category_name', 'member_only', 'total_ordered']]
     display.columns = ['Menu', 'Harga', 'Kategori', 'Akses', 'Terjual']
     display['Harga'] = display['Harga'].apply(format_rupiah)
     display['Akses'] = display['Akses'].map({1: 'Member Only', 0: 'Semua'})
@@ -598,56 +597,52 @@ def tampilkan_orders():
     st.title("Data Orders")
     st.caption("Riwayat dan analisis pesanan")
     
-    filtered = filter_by_date_sidebar(df_orders.copy(), 'order_date', 'orders')
+    filtered = filter_by_date_sidebar(df_orders, 'order_date', 'orders', order_dates=True)
     
     # Metrics
-    completed = len(filtered[filtered['order_status'] == 'Completed'])
-    cancelled = len(filtered[filtered['order_status'] == 'Cancelled'])
-    dine_in = len(filtered[filtered['service_type'] == 'Dine In'])
-    take_away = len(filtered[filtered['service_type'] == 'Take Away'])
+    counts = analytics.order_status_counts(filtered)
+    start_date, end_date = selected_range('orders')
+    comparison = analytics.status_comparison(df_orders, start_date, end_date) if start_date is not None else None
     
     col1, col2, col3, col4, col5 = st.columns(5)
     with col1:
-        st.metric("Total Order", f"{len(filtered):,}")
+        metric_with_delta("Total Order", f"{counts['total']:,}", comparison, 'total')
     with col2:
-        st.metric("Completed", f"{completed:,}")
+        metric_with_delta("Completed", f"{counts['completed']:,}", comparison, 'completed')
     with col3:
-        st.metric("Cancelled", f"{cancelled:,}")
+        metric_with_delta("Cancelled", f"{counts['cancelled']:,}", comparison, 'cancelled', delta_color="inverse")
     with col4:
-        st.metric("Dine In", f"{dine_in:,}")
+        metric_with_delta("Dine In", f"{counts['dine_in']:,}", comparison, 'dine_in')
     with col5:
-        st.metric("Take Away", f"{take_away:,}")
+        metric_with_delta("Take Away", f"{counts['take_away']:,}", comparison, 'take_away')
     
     if not filtered.empty:
         # Trend + Distribusi Jam
         col1, col2 = st.columns(2)
         with col1:
-            daily = filtered.groupby(filtered['order_date'].dt.date).size().reset_index()
-            daily.columns = ['Tanggal', 'Jumlah']
+            daily = analytics.orders_daily(filtered)
             fig = create_line_chart(daily['Tanggal'], daily['Jumlah'], 'Jumlah Order per Hari')
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
-            filtered['hour'] = pd.to_datetime(filtered['order_time']).dt.hour
-            hourly = filtered.groupby('hour').size().reset_index()
-            hourly.columns = ['Jam', 'Jumlah']
+            hourly = analytics.orders_hourly(filtered)
             fig = create_bar_chart(hourly, 'Jam', 'Jumlah', 'Total Order per Jam (Akumulasi)', color=COLORS['info'])
             st.plotly_chart(fig, use_container_width=True)
         
         # Pie charts
         col1, col2 = st.columns(2)
         with col1:
-            service = filtered['service_type'].value_counts()
+            service = analytics.value_distribution(filtered, 'service_type')
             fig = create_pie_chart(service.values, service.index, 'Tipe Layanan')
             st.plotly_chart(fig, use_container_width=True)
         with col2:
-            status = filtered['order_status'].value_counts()
+            status = analytics.value_distribution(filtered, 'order_status')
             fig = create_pie_chart(status.values, status.index, 'Status Order')
             st.plotly_chart(fig, use_container_width=True)
     
     # Tabel
     st.subheader("Daftar Orders")
-    display = filtered[['order_id', 'customer_name', 'guest_name', 'service_type', 'order_status', 'method_name', 'order_time']].copy()
+    display = filtered[['order_id', 'customer_name', 'guest_name', 'service_type', 'order_status', 'method_name', 'order_time']]
     display['Nama'] = display.apply(lambda r: r['customer_name'] if pd.notna(r['customer_name']) and r['customer_name'] != '' else r['guest_name'], axis=1)
     display['Tipe'] = display.apply(lambda r: 'Member' if pd.notna(r['customer_name']) and r['customer_name'] != '' else 'Guest', axis=1)
     display = display[['order_id', 'Nama', 'Tipe', 'service_type', 'order_status', 'method_name', 'order_time']]
@@ -655,48 +650,149 @@ def tampilkan_orders():
     st.dataframe(display, use_container_width=True, hide_index=True)
     download_csv(filtered, 'orders.csv', 'Download CSV')
 
+# ANTRIAN DAPUR
+
+# Interval fragment membaca antrian dari feed (snapshot di memori, tanpa query ke database).
+# Fragment selesai setiap putaran, jadi sesi yang membuka halaman tidak menahan thread script.
+LIVE_REFRESH = float(os.environ.get("RESTO_LIVE_REFRESH", 2))
+
+def tampilkan_antrian():
+    st.title("Antrian Dapur")
+    st.caption("Order Pending secara live dari change feed semua cabang")
+    antrian_live(get_feed())
+
+def render_order_card(order):
+    """Kartu satu order di antrian dapur"""
+    place = f"Meja {order['table_number']}" if order['table_number'] is not None else order['service_type']
+    # Id lokal cabang seperti di kasir; nama cabang hanya ditampilkan kalau lebih dari satu cabang
+    order_id = order['order_id'] % BRANCH_ID_STRIDE
+    branch = f"{order['branch']} · " if len(BRANCHES) > 1 else ""
+    with st.container(border=True, key=f"order_{order['order_id']}"):
+        st.markdown(f"**{branch}#{order_id}** · {place} · {order['name'] or '-'} · "
+                    f"masuk {pd.Timestamp(order['order_time']):%H:%M}")
+        st.markdown("\n".join(f"- {item}" for item in order['items']) or "_Belum ada item_")
+
+@st.fragment(run_every=LIVE_REFRESH)
+def antrian_live(feed):
+    """Gambar antrian dari snapshot feed; kartu dengan key yang sama tidak dibuat ulang di browser"""
+    _, orders = feed.snapshot()
+    for order in orders:
+        render_order_card(order)
+    note = f" · feed error: {feed.error}" if feed.error else ""
+    st.caption(f"{len(orders)} order di antrian · diperbarui {time.strftime('%H:%M:%S')}{note}")
+
+# FORECAST
+
+def tampilkan_forecast():
+    st.title("Forecast Permintaan")
+    st.caption("Perkiraan porsi per menu per jam untuk persiapan dapur (model musiman hari x jam)")
+    
+    try:
+        model = get_model()
+    except Exception as e:
+        st.error(f"Model forecast belum dapat diperbarui: {e}")
+        return
+    if model.last_date is None or not model.weights.any():
+        st.info("Belum ada data penjualan untuk model forecast")
+        return
+    
+    tomorrow = pd.Timestamp.today().date() + pd.Timedelta(days=1)
+    target = st.sidebar.date_input("Tanggal Forecast", value=tomorrow, key="forecast_date")
+    st.sidebar.caption(f"Model sampai {model.last_date} · {model.days_fitted:,} hari buka")
+    
+    summary, hourly = item_forecast(model, target, data['menu_names'])
+    by_hour = hourly.sum(axis=0)
+    accuracy = model.accuracy_frame()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Porsi", f"{summary['total'].sum():,.0f}")
+    with col2:
+        st.metric("Jam Tersibuk", f"{by_hour.idxmax()}:00")
+    with col3:
+        st.metric("Menu Teratas", summary['item_name'].iloc[0] if summary['total'].iloc[0] > 0 else "-")
+    with col4:
+        recent = accuracy['wape'].tail(7).mean() if not accuracy.empty else None
+        st.metric("Error 7 Hari (WAPE)", f"{recent:.0%}" if recent is not None else "-",
+                  help="Selisih absolut forecast vs penjualan sebenarnya dibagi total penjualan")
+    
+    st.caption(f"{DAY_NAMES[target.weekday()]}, {target}")
+    col1, col2 = st.columns(2)
+    with col1:
+        top = summary.head(10)[['item_name', 'total']]
+        top.columns = ['Menu', 'Porsi']
+        fig = create_bar_chart(top, 'Menu', 'Porsi', 'Top 10 Menu (forecast)', horizontal=True, color=COLORS['success'])
+        st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        fig = create_line_chart(by_hour.index, by_hour.values, 'Porsi per Jam (forecast)', fill=True)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Hanya jam buka (jam yang pernah ada penjualan) yang ditampilkan
+    hours = [h for h in hourly.columns if by_hour[h] > 0]
+    grid = hourly.loc[summary.index[summary['total'] > 0], hours]
+    grid.index = summary.loc[grid.index, 'item_name']
+    grid.columns = [f"{h:02d}" for h in hours]
+    if not grid.empty:
+        fig = create_heatmap_chart(grid.round(1), 'Porsi per Menu per Jam', 'Porsi')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    st.subheader("Kebutuhan Persiapan")
+    display = summary[['item_name', 'category_name', 'total', 'peak_hour', 'peak']].reset_index()
+    display.columns = ['Menu ID', 'Menu', 'Kategori', 'Porsi', 'Jam Puncak', 'Porsi Jam Puncak']
+    display = display.round({'Porsi': 1, 'Porsi Jam Puncak': 1})
+    st.dataframe(display, use_container_width=True, hide_index=True)
+    
+    if not accuracy.empty:
+        fig = create_line_chart(accuracy.index, accuracy['wape'].values, 'Error Forecast Harian (WAPE)')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    download_csv(display, f'forecast_{target}.csv', 'Download CSV')
+
 # ORDER DETAILS
 
 def tampilkan_details():
     st.title("Order Details")
     st.caption("Detail item per pesanan dan analisis revenue")
     
-    filtered = filter_by_date_sidebar(df_details.copy(), 'order_date', 'details')
+    filtered = filter_by_date_sidebar(df_details, 'order_date', 'details', order_dates=True)
+    
+    if mode_perkiraan:
+        tampilkan_details_perkiraan(filtered)
+        return
     
     if not filtered.empty:
-        total_qty = int(filtered['quantity'].sum())
-        total_revenue = filtered['total_price'].sum()
-        avg_per_order = filtered.groupby('order_id')['total_price'].sum().mean()
-        total_transaksi = filtered['order_id'].nunique()
+        kpis = analytics.detail_kpis(filtered)
+        start_date, end_date = selected_range('details')
+        comparison = analytics.detail_comparison(df_details, start_date, end_date) if start_date is not None else None
         
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Total Item Order", f"{total_qty:,}")
+            metric_with_delta("Total Item Order", f"{kpis['total_qty']:,}", comparison, 'total_qty')
         with col2:
-            st.metric("Total Revenue", format_rupiah(total_revenue))
+            metric_with_delta("Total Revenue", format_rupiah(kpis['total_revenue']), comparison, 'total_revenue', format_rupiah)
         with col3:
-            st.metric("Avg per Order", format_rupiah(avg_per_order))
+            metric_with_delta("Avg per Order", format_rupiah(kpis['avg_per_order']), comparison, 'avg_per_order', format_rupiah)
         with col4:
-            st.metric("Total Transaksi", f"{total_transaksi:,}")
+            metric_with_delta("Total Transaksi", f"{kpis['total_transaksi']:,}", comparison, 'total_transaksi')
         
         # Visualisasi
         col1, col2 = st.columns(2)
         with col1:
-            daily = filtered.groupby(filtered['order_date'].dt.date)['total_price'].sum()
+            daily = analytics.revenue_daily(filtered)
             fig = create_line_chart(daily.index, daily.values, 'Trend Revenue Harian', fill=True)
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
-            top_products = filtered.groupby('item_name')['quantity'].sum().sort_values(ascending=False).head(10).reset_index()
-            top_products.columns = ['Menu', 'Qty']
+            top_products = analytics.top_products(filtered, 10)
             fig = create_bar_chart(top_products, 'Menu', 'Qty', 'Top 10 Produk Terlaris', horizontal=True, color=COLORS['success'])
             st.plotly_chart(fig, use_container_width=True)
     
     # Tabel
     st.subheader("Detail Pesanan")
     if not filtered.empty:
-        display = filtered[['order_id', 'item_name', 'quantity', 'unit_price', 'total_price', 'request_note']].copy()
-        display['subtotal'] = display['quantity'] * pd.to_numeric(display['unit_price'], errors='coerce')
+        display = filtered[['order_id', 'item_name', 'quantity', 'unit_price', 'request_note']]
+        # Subtotal hanya dihitung untuk tabel yang ditampilkan, frame dasar tidak diubah
+        display = display.assign(subtotal=display['quantity'] * pd.to_numeric(display['unit_price'], errors='coerce'))
         display = display[['order_id', 'item_name', 'quantity', 'unit_price', 'subtotal', 'request_note']]
         display.columns = ['Order ID', 'Menu', 'Qty', 'Harga Satuan', 'Total', 'Request']
         display['Harga Satuan'] = display['Harga Satuan'].apply(format_rupiah)
@@ -704,13 +800,64 @@ def tampilkan_details():
         st.dataframe(display, use_container_width=True, hide_index=True)
     download_csv(filtered, 'order_details.csv', 'Download CSV')
 
+def tampilkan_details_perkiraan(sample):
+    """Order Details dari sampel order + sketch harian, dengan error bound"""
+    date_range = st.session_state.get('date_details', ())
+    start_date, end_date = date_range if len(date_range) == 2 else (None, None)
+    st.info(f"Mode perkiraan: item dihitung dari sampel {SAMPLE_RATE:.0%} order. "
+            "Matikan mode perkiraan untuk angka tepat dan ekspor akuntansi.")
+    
+    approx = approx_kpis(start_date, end_date)
+    if not sample.empty:
+        kpis = analytics.sample_detail_kpis(sample, SAMPLE_RATE)
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Total Item Order", f"≈ {kpis['total_qty']:,.0f}")
+            st.caption(f"± {kpis['total_qty_error']:,.0f} (95%)")
+        with col2:
+            st.metric("Total Revenue", format_rupiah(approx['total_revenue']))
+        with col3:
+            # Per order yang punya item, sama dengan mode tepat
+            avg = approx['total_revenue'] / kpis['total_transaksi'] if kpis['total_transaksi'] else 0
+            st.metric("Avg per Order", f"≈ {format_rupiah(avg)}")
+        with col4:
+            st.metric("Total Transaksi", f"≈ {kpis['total_transaksi']:,.0f}")
+            st.caption(f"± {kpis['total_transaksi_error']:,.0f} (95%)")
+        
+        col1, col2 = st.columns(2)
+        for col, q, label in [(col1, 0.5, "Median Nilai Order"), (col2, 0.9, "P90 Nilai Order")]:
+            value, low, high = approx['order_value_quantiles'][q]
+            with col:
+                st.metric(label, f"≈ {format_rupiah(value)}")
+                st.caption(f"95%: {format_rupiah(low)} – {format_rupiah(high)}")
+        
+        # Visualisasi
+        col1, col2 = st.columns(2)
+        with col1:
+            daily = get_sketches().revenue_daily(start_date, end_date)
+            fig = create_line_chart(daily.index, daily.values, 'Trend Revenue Harian', fill=True)
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            top_products = analytics.top_products(sample, 10, scale=1 / SAMPLE_RATE)
+            fig = create_bar_chart(top_products, 'Menu', 'Qty', 'Top 10 Produk Terlaris (perkiraan)', horizontal=True, color=COLORS['success'])
+            st.plotly_chart(fig, use_container_width=True)
+    
+    st.subheader("Detail Pesanan (sampel)")
+    if not sample.empty:
+        display = sample[['order_id', 'item_name', 'quantity', 'unit_price', 'request_note']]
+        display.columns = ['Order ID', 'Menu', 'Qty', 'Harga Satuan', 'Request']
+        display['Harga Satuan'] = display['Harga Satuan'].apply(format_rupiah)
+        st.dataframe(display, use_container_width=True, hide_index=True)
+
 # RESERVATIONS
 
 def tampilkan_reservations():
     st.title("Reservations")
     st.caption("Manajemen reservasi meja")
     
-    filtered = filter_by_date_sidebar(df_reservations.copy(), 'reservation_date', 'reservations')
+    filtered = filter_by_date_sidebar(df_reservations, 'reservation_date', 'reservations')
     
     if not filtered.empty:
         def extract_hour(val):
@@ -721,11 +868,11 @@ def tampilkan_reservations():
                 return int(time_part.split(':')[0])
             except: return 0
         
-        filtered['check_in_hour'] = filtered['check_in'].apply(extract_hour)
+        check_in_hour = filtered['check_in'].apply(extract_hour)
         
         table_counts = filtered['table_number'].value_counts()
         top_table = table_counts.idxmax()
-        top_hour = filtered['check_in_hour'].value_counts().idxmax()
+        top_hour = check_in_hour.value_counts().idxmax()
         avg_party = filtered['party_size'].mean()
         
         col1, col2, col3, col4 = st.columns(4)
@@ -748,7 +895,7 @@ def tampilkan_reservations():
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
-            hour_count = filtered['check_in_hour'].value_counts().sort_index().reset_index()
+            hour_count = check_in_hour.value_counts().sort_index().reset_index()
             hour_count.columns = ['Jam', 'Jumlah']
             fig = create_bar_chart(hour_count, 'Jam', 'Jumlah', 'Distribusi Jam Check-in', color=COLORS['info'])
             st.plotly_chart(fig, use_container_width=True)
@@ -757,7 +904,7 @@ def tampilkan_reservations():
     st.subheader("Daftar Reservasi")
     if not filtered.empty:
         display = filtered[['reservation_id', 'customer_name', 'table_number', 'reservation_date', 
-                           'check_in', 'check_out', 'party_size', 'status']].copy()
+                           'check_in', 'check_out', 'party_size', 'status']]
         # Format check_in dan check_out sebagai jam detail (HH:MM:SS)
         def format_time(val):
             try:
@@ -778,44 +925,78 @@ def tampilkan_reservations():
 
 # REVIEWS
 
+def tampilkan_analisis_komentar(start, end):
+    """Cari kata kunci, term teratas per rating dan tren kata kunci dari indeks komentar (review_index.py)"""
+    st.subheader("Analisis Komentar")
+    index = get_review_index()
+    
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        query = st.text_input("Cari Kata Kunci", key="review_query", placeholder="mis. pelayanan ramah")
+    with col2:
+        ratings = st.multiselect("Rating", RATINGS, default=RATINGS, key="review_ratings")
+    if query:
+        review_ids, total = index.search(query, start, end, ratings)
+        st.caption(f"{total:,} review memuat \"{query}\"")
+        if total:
+            found = df_reviews.set_index('review_id').reindex(review_ids).reset_index()
+            display = found[['review_id', 'customer_name', 'rating', 'comment', 'review_date']]
+            display.columns = ['ID', 'Customer', 'Rating', 'Komentar', 'Tanggal']
+            st.dataframe(display, use_container_width=True, hide_index=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        top = index.top_terms(start, end, n=5)
+        if not top.empty:
+            display = top.assign(share=top['share'].map('{:.0%}'.format), lift=top['lift'].map('{:.1f}x'.format))
+            display.columns = ['Rating', 'Term', 'Review', 'Porsi', 'Lift']
+            st.markdown("**Term Teratas per Rating**")
+            st.dataframe(display, use_container_width=True, hide_index=True)
+            st.caption("Lift = porsi review di rating itu dibanding porsi di semua rating")
+    with col2:
+        default = [term for term in top.drop_duplicates('term')['term'].head(3)] if not top.empty else []
+        keywords = st.text_input("Tren Kata Kunci (pisahkan dengan koma)", ', '.join(default), key="review_trend")
+        keywords = [k.strip() for k in keywords.split(',') if k.strip()]
+        freq = 'W' if start is None or end is None or (pd.Timestamp(end) - pd.Timestamp(start)).days > 60 else 'D'
+        trend = index.trend(keywords, start, end, freq=freq)
+        if not trend.empty:
+            st.plotly_chart(create_multi_line_chart(trend, 'date', 'reviews', 'term', 'Tren Kata Kunci'), use_container_width=True)
+        elif keywords:
+            st.info("Kata kunci belum pernah muncul pada periode ini")
+
 def tampilkan_reviews():
     st.title("Reviews")
     st.caption("Ulasan dan rating dari pelanggan")
     
-    filtered = filter_by_date_sidebar(df_reviews.copy(), 'review_date', 'reviews')
+    filtered = filter_by_date_sidebar(df_reviews, 'review_date', 'reviews')
+    start, end = selected_range('reviews')
     
     if not filtered.empty:
-        avg_rating = filtered['rating'].mean()
-        total_reviews = len(filtered)
-        rating_counts = filtered['rating'].value_counts().sort_index()
-        most_common = rating_counts.idxmax()
+        report = page_report("Reviews", data, start, end)
+        kpis = report['kpis']
         
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Total Review", f"{total_reviews:,}")
+            st.metric("Total Review", f"{kpis['total_reviews']:,}")
         with col2:
-            st.metric("Rata-rata Rating", f"{avg_rating:.2f}/5")
+            st.metric("Rata-rata Rating", f"{kpis['avg_rating']:.2f}/5")
         with col3:
-            st.metric("Rating Terbanyak", f"{most_common} Bintang")
+            st.metric("Rating Terbanyak", f"{kpis['most_common']} Bintang")
         
         # Visualisasi
         col1, col2 = st.columns(2)
         with col1:
-            rating_count = filtered['rating'].value_counts().sort_index().reset_index()
-            rating_count.columns = ['Rating', 'Jumlah']
-            fig = create_bar_chart(rating_count, 'Rating', 'Jumlah', 'Distribusi Rating', color=COLORS['warning'])
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(report['figures']['distribution'], use_container_width=True)
         
         with col2:
-            daily_rating = filtered.groupby(filtered['review_date'].dt.date)['rating'].mean().reset_index()
-            daily_rating.columns = ['Tanggal', 'Rating']
-            fig = create_line_chart(daily_rating['Tanggal'], daily_rating['Rating'], 'Trend Rating Harian')
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(report['figures']['daily'], use_container_width=True)
+        
+        tampilkan_analisis_komentar(start, end)
     
     # Tabel
     st.subheader("Daftar Review")
     if not filtered.empty:
-        display = filtered[['review_id', 'order_id', 'customer_name', 'rating', 'comment', 'review_date']].copy()
+        display = filtered[['review_id', 'order_id', 'customer_name', 'rating', 'comment', 'review_date']]
         display.columns = ['ID', 'Order ID', 'Customer', 'Rating', 'Komentar', 'Tanggal']
         st.dataframe(display, use_container_width=True, hide_index=True)
     download_csv(filtered, 'reviews.csv', 'Download CSV')
@@ -827,15 +1008,15 @@ def tampilkan_custom():
     st.caption("Pilih tabel, kolom, dan gabungkan data sesuai kebutuhan")
     
     st.sidebar.markdown("**Filter Tanggal**")
-    if not df_orders.empty:
-        min_date = df_orders['order_date'].min().date()
-        max_date = df_orders['order_date'].max().date()
+    if last_day is not None:
+        # Batas pilihan = seluruh riwayat order termasuk arsip; df_orders hanya rentang yang dimuat
+        min_date, max_date = first_day, last_day
         
         if 'custom_date' not in st.session_state:
-            st.session_state['custom_date'] = (min_date, max_date)
+            st.session_state['custom_date'] = default_range()
         
         if st.sidebar.button("Reset Tanggal", key="reset_custom"):
-            st.session_state['custom_date'] = (min_date, max_date)
+            st.session_state['custom_date'] = default_range()
             st.rerun()
         
         date_range = st.sidebar.date_input(
@@ -847,7 +1028,7 @@ def tampilkan_custom():
         if len(date_range) == 2:
             start_date, end_date = date_range
         else:
-            start_date, end_date = min_date, max_date
+            start_date, end_date = default_range()
     else:
         start_date, end_date = None, None
     
@@ -884,7 +1065,7 @@ def tampilkan_custom():
         
         for tabel_name in selected_tables:
             info = tabel_info[tabel_name]
-            df = info["df"].copy()
+            df = info["df"]
             date_col = info["date_col"]
             
             if date_col and start_date and end_date and date_col in df.columns:
@@ -1012,7 +1193,7 @@ def tampilkan_custom():
                 )
                 
                 if selected_cols:
-                    df_display = df_joined[selected_cols].copy()
+                    df_display = df_joined[selected_cols]
                     
                     # Search
                     search = st.text_input("Cari data", key="join_search")
@@ -1053,6 +1234,8 @@ halaman = st.sidebar.radio(
         "Tables",
         "Menu",
         "Orders",
+        "Antrian Dapur",
+        "Forecast",
         "Order Details",
         "Reservations",
         "Reviews",
@@ -1063,6 +1246,69 @@ halaman = st.sidebar.radio(
 
 st.sidebar.markdown("---")
 
+# Mode perkiraan untuk rentang sangat panjang: angka dari sketch harian dan sampel order.
+# Mode tepat tetap dipakai untuk ekspor akuntansi.
+mode_perkiraan = False
+if halaman in APPROX_SOURCES:
+    mode_perkiraan = st.sidebar.toggle(
+        "Mode perkiraan (cepat)",
+        key="approx_mode",
+        help="Pakai sketch harian dan sampel order. Matikan untuk angka tepat dan ekspor."
+    )
+    st.sidebar.markdown("---")
+
+# LOAD DATA
+# Sidebar sudah tampil; sekarang import library berat lalu muat data halaman aktif satu per satu
+import pandas as pd
+import plotly.express as px
+from charts import *
+import analytics
+from data import load_table, frame_stamp, history_bounds
+from customer_stats import spending_segment, SPENDING_LABELS
+from basket import basket_pairs
+from sketches import approx_kpis, get_sketches
+from reports import page_report, build_menu
+from order_feed import get_feed
+from seating import seating_plan, plan_timeline, WALK_IN_PARTY, WALK_IN_MINUTES
+from forecast import get_model, item_forecast, DAY_NAMES
+from review_index import get_review_index, RATINGS
+
+placeholder = st.empty()
+with placeholder.container():
+    st.title(halaman)
+    progress = st.progress(0, text="Memuat data...")
+
+data = {}
+try:
+    first_day, live_first_day, last_day = history_bounds()
+    load_start, load_end = page_load_range(halaman)
+    sources = {name: name for name in PAGE_TABLES[halaman]}
+    if mode_perkiraan:
+        sources.update(APPROX_SOURCES[halaman])
+    tables = [(name, source) for name, source in sources.items() if source]
+    for i, (name, source) in enumerate(tables):
+        progress.progress(i / len(tables), text=f"Memuat data {name}...")
+        data[name] = load_table(source, load_start, load_end)
+except Exception as e:
+    placeholder.empty()
+    st.error(f"Database belum dapat dihubungi: {str(e)}")
+    if st.button("Coba lagi"):
+        st.rerun()
+    st.stop()
+placeholder.empty()
+
+df_customers = data.get('customers')
+df_categories = data.get('categories')
+df_payment = data.get('payment')
+df_tables = data.get('tables')
+df_table_usage = data.get('table_usage')
+df_menu = data.get('menu')
+df_orders = data.get('orders')
+df_details = data.get('details')
+df_reservations = data.get('reservations')
+df_reviews = data.get('reviews')
+df_branch_summary = data.get('branch_summary')
+
 # Render halaman
 if halaman == "Dashboard":
     tampilkan_dashboard()
@@ -1078,6 +1324,10 @@ elif halaman == "Menu":
     tampilkan_menu()
 elif halaman == "Orders":
     tampilkan_orders()
+elif halaman == "Antrian Dapur":
+    tampilkan_antrian()
+elif halaman == "Forecast":
+    tampilkan_forecast()
 elif halaman == "Order Details":
     tampilkan_details()
 elif halaman == "Reservations":
@@ -1087,4 +1337,14 @@ elif halaman == "Reviews":
 elif halaman == "Custom":
     tampilkan_custom()
 
+# Status antrian query ke database
+with st.sidebar.expander("Status Query"):
+    metrics = query_metrics()
+    st.caption(f"Antrian: {metrics['queue_depth']} (maks {metrics['max_queue_depth']}) · Berjalan: {metrics['running']}")
+    st.caption(f"Dieksekusi: {metrics['executed']} · Digabung: {metrics['coalesced']} · Ditolak: {metrics['rejected']}")
+    replicas = replica_metrics()
+    if replicas['replicas']:
+        st.caption(f"Baca replika: {replicas['replica_reads']} · Ke primary: {replicas['primary_fallbacks']}"
+                   f" · Tertinggal: {replicas['lagging']} · Error: {replicas['errors']}")
+
 st.sidebar.caption("© 2025 Restaurant Order Management")
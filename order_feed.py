@@ -0,0 +1,234 @@
+# order_feed.py
+# Change feed untuk halaman Antrian Dapur. Satu thread per proses server membaca perubahan
+# order semua cabang sekali per POLL_INTERVAL dan menyimpan antrian di memori; semua sesi yang
+# membuka halaman membaca snapshot-nya tanpa query sendiri ke database.
+# Sesi tidak menerima diff: fragment Streamlit selalu mengirim ulang semua elemennya setiap
+# putaran (elemen yang tidak digambar ulang dihapus), jadi diff per sesi tidak menghemat apa pun.
+# Kartu diberi key order_id sehingga browser hanya memperbarui kartu yang isinya berubah.
+#
+# Sumber perubahan (per cabang):
+#   - tabel Order_Changes yang diisi trigger (setelah `python order_feed.py setup`), atau
+#   - tanpa tabel itu: high-water mark order_id + cek ulang order yang masih Pending.
+# Id order diberi namespace cabang seperti fan_out (cabang ke-i digeser i * BRANCH_ID_STRIDE).
+#
+# Pemakaian:
+#   python order_feed.py setup [--dry-run]   # buat tabel Order_Changes dan trigger-nya di semua cabang
+#   python order_feed.py prune --hours 24    # hapus catatan perubahan lama
+import os
+import time
+import argparse
+import threading
+
+from config import BRANCHES, BRANCH_NAMES, BRANCH_ID_STRIDE, run_query, run_statement, on_branch
+
+POLL_INTERVAL = float(os.environ.get("RESTO_FEED_INTERVAL", 1.0))   # detik
+MAX_CHANGES = 500          # baris Order_Changes per poll
+
+QUEUE_STATUS = 'Pending'
+
+ORDER_SQL = '''
+    SELECT o.order_id, o.order_time, o.service_type, o.order_status,
+           t.table_number, COALESCE(c.customer_name, o.guest_name) as name
+    FROM Orders o
+    LEFT JOIN Tables t ON o.table_id = t.table_id
+    LEFT JOIN Customers c ON o.customer_id = c.customer_id
+    WHERE {where}
+'''
+ITEMS_SQL = '''
+    SELECT od.order_id, od.quantity, m.item_name, od.request_note
+    FROM Order_Details od
+    JOIN Menu m ON od.menu_id = m.menu_id
+    WHERE od.order_id IN ({ids})
+    ORDER BY od.order_detail_id
+'''
+ORDER_COLUMNS = ['order_id', 'order_time', 'service_type', 'order_status', 'table_number', 'name']
+
+# Trigger pencatat perubahan: (nama, event, tabel, order_id yang dicatat).
+# UPDATE Order_Details mencatat order lama dan baru kalau item dipindah ke order lain.
+CHANGE_TRIGGERS = [
+    ('orders_change_insert', 'INSERT', 'Orders', ['NEW.order_id']),
+    ('orders_change_update', 'UPDATE', 'Orders', ['NEW.order_id']),
+    ('orders_change_delete', 'DELETE', 'Orders', ['OLD.order_id']),
+    ('order_details_change_insert', 'INSERT', 'Order_Details', ['NEW.order_id']),
+    ('order_details_change_update', 'UPDATE', 'Order_Details', ['NEW.order_id', 'OLD.order_id']),
+    ('order_details_change_delete', 'DELETE', 'Order_Details', ['OLD.order_id']),
+]
+
+
+def setup_statements():
+    """Tabel Order_Changes + trigger; trigger lama di-drop dulu, jadi setup aman diulang
+    (mis. untuk menambah trigger baru di database yang sudah di-setup)"""
+    statements = [
+        "CREATE TABLE IF NOT EXISTS Order_Changes ("
+        "change_id BIGINT AUTO_INCREMENT PRIMARY KEY, "
+        "order_id INT NOT NULL, "
+        "changed_at DATETIME DEFAULT CURRENT_TIMESTAMP, "
+        "INDEX idx_changed_at (changed_at))",
+    ]
+    for name, event, table, order_ids in CHANGE_TRIGGERS:
+        statements.append(f"DROP TRIGGER IF EXISTS {name}")
+        statements.append(f"CREATE TRIGGER {name} AFTER {event} ON {table} FOR EACH ROW "
+                          f"INSERT INTO Order_Changes (order_id) VALUES "
+                          + ", ".join(f"({order_id})" for order_id in order_ids))
+    return statements
+
+def placeholders(values):
+    return ', '.join(['%s'] * len(values))
+
+
+class OrderFeed:
+    """Antrian order Pending semua cabang yang di-update oleh satu thread poll per proses"""
+
+    def __init__(self, interval=POLL_INTERVAL):
+        self.interval = interval
+        self.version = 0            # naik setiap ada order yang berubah
+        self.orders = {}            # order_id (ber-namespace cabang) -> baris order Pending
+        self.polled_at = None
+        self.error = None
+        # Per cabang: mode sumber perubahan (None = belum bootstrap) dan cursor-nya,
+        # change_id (mode tabel) atau order_id lokal (mode high-water mark) terakhir
+        self.use_change_table = [None] * len(BRANCHES)
+        self._cursors = [0] * len(BRANCHES)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='order-feed', daemon=True)
+                self._thread.start()
+        return self
+
+    # SESI
+
+    def snapshot(self):
+        """Versi saat ini dan semua order di antrian (urut waktu masuk)"""
+        with self._lock:
+            return self.version, sorted(self.orders.values(), key=lambda o: (o['order_time'], o['order_id']))
+
+    # POLL
+
+    def _run(self):
+        while True:
+            errors = []
+            for index in range(len(BRANCHES)):
+                try:
+                    with on_branch(index):
+                        if self.use_change_table[index] is None:
+                            self._bootstrap(index)
+                        else:
+                            self._poll(index)
+                except Exception as e:
+                    # Cabang yang gagal tidak menghentikan antrian cabang lain
+                    errors.append(f"{BRANCH_NAMES[index]}: {e}" if len(BRANCHES) > 1 else str(e))
+            self.error = "; ".join(errors) or None
+            if not errors:
+                self.polled_at = time.time()
+            time.sleep(self.interval)
+
+    def _bootstrap(self, index=0):
+        """Snapshot awal cabang: semua order Pending + posisi awal cursor"""
+        try:
+            cursor = run_query('SELECT COALESCE(MAX(change_id), 0) FROM Order_Changes')[0][0]
+            use_change_table = True
+        except Exception:
+            cursor = run_query('SELECT COALESCE(MAX(order_id), 0) FROM Orders')[0][0]
+            use_change_table = False
+        rows = self._fetch(index, f"o.order_status = '{QUEUE_STATUS}'")
+        self._apply(rows, set())
+        self._cursors[index], self.use_change_table[index] = cursor, use_change_table
+
+    def _poll(self, index=0):
+        offset = index * BRANCH_ID_STRIDE
+        if self.use_change_table[index]:
+            changes = run_query('SELECT change_id, order_id FROM Order_Changes WHERE change_id > %s '
+                                'ORDER BY change_id LIMIT %s', (self._cursors[index], MAX_CHANGES))
+            if not changes:
+                return
+            ids = sorted({order_id for _, order_id in changes})
+            # Order yang dihapus tidak ikut hasil fetch, jadi keluar antrian
+            self._apply(self._fetch(index, f"o.order_id IN ({placeholders(ids)})", ids),
+                        {order_id + offset for order_id in ids})
+            self._cursors[index] = changes[-1][0]
+        else:
+            # Tanpa tabel perubahan: order baru di atas high-water mark + cek ulang order yang masih di antrian
+            active = sorted(order_id - offset for order_id in self.orders if order_id // BRANCH_ID_STRIDE == index)
+            where = "o.order_id > %s" + (f" OR o.order_id IN ({placeholders(active)})" if active else "")
+            rows = self._fetch(index, where, [self._cursors[index]] + active)
+            self._apply(rows, {order_id + offset for order_id in active})
+            if rows:
+                self._cursors[index] = max(self._cursors[index], max(row['order_id'] - offset for row in rows))
+
+    def _fetch(self, index, where, params=()):
+        """Order cabang index beserta itemnya; order_id diberi namespace cabang"""
+        orders = [dict(zip(ORDER_COLUMNS, row)) for row in run_query(ORDER_SQL.format(where=where), tuple(params))]
+        if not orders:
+            return []
+        ids = [order['order_id'] for order in orders]
+        items = {}
+        for order_id, quantity, item_name, note in run_query(ITEMS_SQL.format(ids=placeholders(ids)), tuple(ids)):
+            items.setdefault(order_id, []).append(f"{quantity}x {item_name}" + (f" ({note})" if note else ""))
+        for order in orders:
+            order['items'] = tuple(items.get(order['order_id'], ()))
+            order['order_id'] += index * BRANCH_ID_STRIDE
+            order['branch'] = BRANCH_NAMES[index]
+        return orders
+
+    def _apply(self, rows, checked):
+        """Gabungkan hasil fetch; versi hanya naik kalau ada order yang isinya benar-benar berubah.
+        checked = order_id yang ikut dicek; yang tidak ada di rows dianggap keluar antrian."""
+        rows = {row['order_id']: row for row in rows}
+        updates = {}
+        for order_id in checked | set(rows):
+            row = rows.get(order_id)
+            new = row if row is not None and row['order_status'] == QUEUE_STATUS else None
+            if new != self.orders.get(order_id):
+                updates[order_id] = new
+        if not updates:
+            return
+        with self._lock:
+            self.version += 1
+            for order_id, row in updates.items():
+                if row is None:
+                    self.orders.pop(order_id, None)
+                else:
+                    self.orders[order_id] = row
+
+
+_feed = None
+_feed_lock = threading.Lock()
+
+def get_feed():
+    """Feed bersama untuk seluruh proses (thread poll dibuat sekali)"""
+    global _feed
+    with _feed_lock:
+        if _feed is None:
+            _feed = OrderFeed().start()
+    return _feed
+
+def main():
+    parser = argparse.ArgumentParser(description='Change feed order untuk Antrian Dapur')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('setup', help='buat tabel Order_Changes dan trigger')
+    p.add_argument('--dry-run', action='store_true', help='hanya tampilkan SQL')
+    p = sub.add_parser('prune', help='hapus catatan perubahan lama')
+    p.add_argument('--hours', type=int, default=24)
+    args = parser.parse_args()
+
+    if args.command == 'setup':
+        for sql in setup_statements():
+            print(sql + ";")
+        if not args.dry_run:
+            for index in range(len(BRANCHES)):
+                with on_branch(index):
+                    for sql in setup_statements():
+                        run_statement(sql)
+    else:
+        for index, name in enumerate(BRANCH_NAMES):
+            with on_branch(index):
+                removed = run_statement('DELETE FROM Order_Changes WHERE changed_at < NOW() - INTERVAL %s HOUR',
+                                        (args.hours,))
+            print(f"{name}: {removed:,} catatan perubahan dihapus")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,477 @@
+# partitions.py
+# Manajemen partisi bulanan untuk Orders dan Order_Details, plus arsip partisi lama
+# ke file kolumnar terkompresi (parquet/zstd).
+#
+# Pemakaian:
+#   python partitions.py setup [--ahead 3] [--dry-run]   # ubah tabel jadi RANGE partition per bulan
+#   python partitions.py rotate [--ahead 3]              # siapkan partisi bulan-bulan berikutnya
+#   python partitions.py archive --before 2025-01        # arsipkan & drop partisi sebelum bulan ini
+#   python partitions.py archive --before 2025-01 --branch Pusat   # hanya cabang ini (boleh berulang)
+#   python partitions.py status
+#
+# Arsip ditulis per cabang di ARCHIVE_DIR/<nama cabang>/<tabel>/<YYYY-MM>.parquet, karena id order
+# hanya unik di dalam satu cabang; setiap cabang di fan_out membaca arsipnya sendiri.
+# File parquet tidak pernah diubah. Customer yang digabung dedup.py setelah order-nya diarsipkan
+# dicatat di ARCHIVE_DIR/<nama cabang>/customer_merges.json (customer_id lama -> yang dipertahankan)
+# dan diterapkan saat arsip Orders dibaca.
+#
+# Catatan MySQL: tabel InnoDB yang dipartisi tidak boleh punya foreign key dan kolom partisi
+# harus ada di setiap unique key. Karena itu setup akan:
+#   - menghapus foreign key dari/ke Orders dan Order_Details (index-nya tetap ada),
+#   - mengubah primary key menjadi (order_id, order_time) dan (order_detail_id, order_time),
+#   - menambah kolom Order_Details.order_time (diisi trigger dari Orders saat insert).
+import os
+import json
+import argparse
+import datetime
+import tempfile
+
+from config import BRANCHES, BRANCH_NAMES, run_query, run_statement, on_branch, current_branch
+
+ARCHIVE_DIR = os.environ.get(
+    "RESTO_ARCHIVE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "archive")
+)
+PARTITIONED_TABLES = ['Orders', 'Order_Details']
+FUTURE_PARTITION = 'pfuture'
+
+# Kolom hasil view_* yang bisa dibaca dari arsip
+ORDER_VIEW_COLUMNS = [
+    'order_id', 'customer_id', 'guest_name', 'service_type', 'table_id', 'payment_id',
+    'order_status', 'order_time', 'method_name', 'table_number', 'customer_name', 'order_date'
+]
+DETAIL_VIEW_COLUMNS = [
+    'order_detail_id', 'order_id', 'menu_id', 'quantity', 'total_price',
+    'request_note', 'item_name', 'unit_price', 'order_date'
+]
+
+
+def month_start(day):
+    return datetime.date(day.year, day.month, 1)
+
+def next_month(day):
+    return datetime.date(day.year + (day.month == 12), day.month % 12 + 1, 1)
+
+def partition_name(month):
+    return f"p{month:%Y%m}"
+
+def partition_clause(month):
+    return f"PARTITION {partition_name(month)} VALUES LESS THAN (TO_DAYS('{next_month(month):%Y-%m-%d}'))"
+
+def months_between(first, last):
+    month = month_start(first)
+    while month <= last:
+        yield month
+        month = next_month(month)
+
+# STATUS
+
+def existing_partitions(table):
+    """Daftar bulan yang sudah punya partisi (tanpa pfuture)"""
+    rows = run_query('''
+        SELECT PARTITION_NAME FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+        ORDER BY PARTITION_ORDINAL_POSITION
+    ''', (table,))
+    months = []
+    for (name,) in rows:
+        if name != FUTURE_PARTITION:
+            months.append(datetime.date(int(name[1:5]), int(name[5:7]), 1))
+    return months
+
+def foreign_keys(table):
+    """Foreign key milik tabel ini dan foreign key tabel lain yang menunjuk ke tabel ini"""
+    return run_query('''
+        SELECT TABLE_NAME, CONSTRAINT_NAME FROM information_schema.REFERENTIAL_CONSTRAINTS
+        WHERE CONSTRAINT_SCHEMA = DATABASE() AND (TABLE_NAME = %s OR REFERENCED_TABLE_NAME = %s)
+    ''', (table, table))
+
+# SETUP
+
+def setup_statements(ahead=3, today=None):
+    today = today or datetime.date.today()
+    first = run_query('SELECT MIN(order_time) FROM Orders')[0][0] or today
+    months = list(months_between(first.date() if isinstance(first, datetime.datetime) else first,
+                                 month_start(today)))
+    for _ in range(ahead):
+        months.append(next_month(months[-1]))
+    partitions = ",\n    ".join([partition_clause(m) for m in months] +
+                                [f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN MAXVALUE"])
+
+    statements = []
+    seen = set()
+    for table in PARTITIONED_TABLES:
+        for owner, constraint in foreign_keys(table):
+            if (owner, constraint) not in seen:
+                seen.add((owner, constraint))
+                statements.append(f"ALTER TABLE {owner} DROP FOREIGN KEY {constraint}")
+    statements += [
+        "ALTER TABLE Orders MODIFY order_time DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, "
+        "DROP PRIMARY KEY, ADD PRIMARY KEY (order_id, order_time)",
+        "ALTER TABLE Order_Details ADD COLUMN order_time DATETIME NULL",
+        "UPDATE Order_Details od JOIN Orders o ON od.order_id = o.order_id SET od.order_time = o.order_time",
+        "ALTER TABLE Order_Details MODIFY order_time DATETIME NOT NULL, "
+        "DROP PRIMARY KEY, ADD PRIMARY KEY (order_detail_id, order_time)",
+        "CREATE TRIGGER order_details_order_time BEFORE INSERT ON Order_Details FOR EACH ROW "
+        "SET NEW.order_time = COALESCE(NEW.order_time, "
+        "(SELECT order_time FROM Orders WHERE order_id = NEW.order_id LIMIT 1))",
+    ]
+    for table in PARTITIONED_TABLES:
+        statements.append(f"ALTER TABLE {table} PARTITION BY RANGE (TO_DAYS(order_time)) (\n    {partitions}\n)")
+    return statements
+
+# ROTATE
+
+def rotate_statements(ahead=3, today=None):
+    """Pecah pfuture supaya partisi untuk `ahead` bulan ke depan sudah tersedia"""
+    target = month_start(today or datetime.date.today())
+    for _ in range(ahead):
+        target = next_month(target)
+    statements = []
+    for table in PARTITIONED_TABLES:
+        existing = existing_partitions(table)
+        if not existing:
+            raise RuntimeError(f"{table} belum dipartisi, jalankan 'python partitions.py setup' dulu")
+        missing = list(months_between(next_month(existing[-1]), target))
+        if missing:
+            parts = ", ".join([partition_clause(m) for m in missing] +
+                              [f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN MAXVALUE"])
+            statements.append(f"ALTER TABLE {table} REORGANIZE PARTITION {FUTURE_PARTITION} INTO ({parts})")
+    return statements
+
+# ARCHIVE
+
+def branch_archive_dir(branch=None):
+    """Folder arsip cabang (default cabang aktif)"""
+    return os.path.join(ARCHIVE_DIR, BRANCH_NAMES[current_branch() if branch is None else branch])
+
+def archive_path(table, month, branch=None):
+    return os.path.join(branch_archive_dir(branch), table.lower(), f"{month:%Y-%m}.parquet")
+
+def archive_partition(table, month):
+    """Simpan isi satu partisi ke parquet lalu drop partisinya"""
+    import pandas as pd
+
+    name = partition_name(month)
+    cursor_rows = run_query(f"SELECT * FROM {table} PARTITION ({name})")
+    columns = [row[0] for row in run_query('''
+        SELECT COLUMN_NAME FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s ORDER BY ORDINAL_POSITION
+    ''', (table,))]
+    df = pd.DataFrame(cursor_rows, columns=columns)
+
+    path = archive_path(table, month)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    df.to_parquet(tmp, compression="zstd", index=False)
+    # Pastikan arsip bisa dibaca ulang dan jumlah barisnya sama sebelum data di MySQL dihapus
+    if len(pd.read_parquet(tmp)) != len(df):
+        os.remove(tmp)
+        raise RuntimeError(f"Arsip {path} tidak valid, partisi {table}.{name} tidak dihapus")
+    os.replace(tmp, path)
+    run_statement(f"ALTER TABLE {table} DROP PARTITION {name}")
+    return len(df)
+
+def archive_before(cutoff):
+    """Arsipkan semua partisi yang seluruh isinya sebelum bulan cutoff"""
+    archived = []
+    # Order_Details dulu, supaya detail tidak pernah tertinggal tanpa order-nya
+    for table in reversed(PARTITIONED_TABLES):
+        for month in existing_partitions(table):
+            if next_month(month) <= cutoff:
+                archived.append((table, month, archive_partition(table, month)))
+    return archived
+
+def archived_months(table, branch=None):
+    folder = os.path.join(branch_archive_dir(branch), table.lower())
+    if not os.path.isdir(folder):
+        return []
+    return sorted(datetime.date(int(f[:4]), int(f[5:7]), 1) for f in os.listdir(folder) if f.endswith('.parquet'))
+
+def merges_path(branch=None):
+    return os.path.join(branch_archive_dir(branch), 'customer_merges.json')
+
+_merges = {}   # path -> (mtime, {customer_id lama: customer_id dipertahankan})
+
+def customer_merges(branch=None):
+    """Peta merge customer untuk arsip cabang (kosong kalau belum pernah ada merge)"""
+    path = merges_path(branch)
+    try:
+        mtime = os.path.getmtime(path)
+    except FileNotFoundError:
+        return {}
+    cached = _merges.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path) as f:
+            cached = _merges[path] = (mtime, {int(old): new for old, new in json.load(f).items()})
+    return cached[1]
+
+def record_customer_merges(mapping, branch=None):
+    """Tambahkan merge (customer_id lama -> keep_id) ke peta arsip cabang. Merge berantai
+    (A -> B lalu B -> C) langsung diselesaikan ke tujuan akhirnya. Tanpa arsip tidak ada yang dicatat:
+    arsip yang dibuat sesudahnya sudah berisi customer_id baru dari MySQL."""
+    if not os.path.isdir(branch_archive_dir(branch)):
+        return
+    mapping = {int(old): int(new) for old, new in mapping.items()}
+    merged = {old: mapping.get(new, new) for old, new in customer_merges(branch).items()}
+    merged.update(mapping)
+    path = merges_path(branch)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump({str(old): new for old, new in merged.items()}, f)
+    os.replace(tmp, path)
+
+def archive_bounds():
+    """(tanggal pertama, tanggal terakhir) bulan-bulan di arsip semua cabang, (None, None) kalau belum ada arsip"""
+    months = sorted(m for index in range(len(BRANCHES)) for m in archived_months('Orders', index))
+    if not months:
+        return None, None
+    return months[0], next_month(months[-1]) - datetime.timedelta(days=1)
+
+def _read_months(table, start=None, end=None, columns=None, filters=None):
+    """Gabungan file arsip yang bulannya beririsan dengan rentang start..end"""
+    import pandas as pd
+
+    months = [m for m in archived_months(table)
+              if (start is None or next_month(m) > start) and (end is None or m <= end)]
+    if not months:
+        return None
+    if columns is not None:
+        columns = list(dict.fromkeys(columns + ['order_time']))
+    df = pd.concat([pd.read_parquet(archive_path(table, m), columns=columns, filters=filters) for m in months],
+                   ignore_index=True)
+    df['order_time'] = pd.to_datetime(df['order_time'])
+    merges = customer_merges()
+    if merges and 'customer_id' in df.columns:
+        df['customer_id'] = df['customer_id'].replace(merges)
+    if start is not None:
+        df = df[df['order_time'] >= pd.Timestamp(start)]
+    if end is not None:
+        df = df[df['order_time'] < pd.Timestamp(end) + pd.Timedelta(days=1)]
+    return df
+
+def _master(sql, columns):
+    """Data master (sama di semua cabang) untuk melengkapi baris arsip"""
+    import pandas as pd
+    return pd.DataFrame(run_query(sql), columns=columns)
+
+def _order_totals(orders, start=None, end=None, filters=None):
+    """Order arsip + total_price semua itemnya (0 kalau tanpa item), seperti LEFT JOIN Order_Details"""
+    details = _read_months('Order_Details', start, end, ['order_id', 'total_price'], filters)
+    if details is None or details.empty:
+        return orders.assign(order_total=0.0)
+    totals = details.groupby('order_id')['total_price'].sum().astype(float).rename('order_total')
+    return orders.merge(totals, left_on='order_id', right_index=True, how='left').fillna({'order_total': 0.0})
+
+def _by_date(df):
+    return df['order_time'].dt.date.rename('order_date')
+
+def _rows(df, columns):
+    """DataFrame -> list tuple seperti hasil run_query (NULL = None, id tetap integer)"""
+    if df.empty:
+        return []
+    if 'order_date' in columns and 'order_date' not in df.columns:
+        df = df.assign(order_date=df['order_time'].dt.date)
+    # Kolom id yang boleh NULL terbaca sebagai float; kembalikan ke integer seperti hasil MySQL
+    df = df.astype({col: 'Int64' for col in columns if col.endswith('_id')})[columns].astype(object)
+    return list(df.where(df.notna(), None).itertuples(index=False, name=None))
+
+def _archive_orders(start=None, end=None):
+    orders = _read_months('Orders', start, end)
+    if orders is None or orders.empty:
+        return []
+    df = orders.merge(_master('SELECT payment_id, method_name FROM Payment_Methods', ['payment_id', 'method_name']),
+                      on='payment_id', how='left') \
+               .merge(_master('SELECT table_id, table_number FROM Tables', ['table_id', 'table_number']),
+                      on='table_id', how='left') \
+               .merge(_master('SELECT customer_id, customer_name FROM Customers', ['customer_id', 'customer_name']),
+                      on='customer_id', how='left')
+    return _rows(df.sort_values('order_time', ascending=False), ORDER_VIEW_COLUMNS)
+
+def _archive_order_details(start=None, end=None):
+    details = _read_months('Order_Details', start, end)
+    if details is None or details.empty:
+        return []
+    menu = _master('SELECT menu_id, item_name, unit_price FROM Menu', ['menu_id', 'item_name', 'unit_price'])
+    df = details.merge(menu, on='menu_id', how='left')
+    return _rows(df.sort_values('order_time', ascending=False), DETAIL_VIEW_COLUMNS)
+
+def _archive_order_details_sample(start=None, end=None, rate=0.1):
+    import numpy as np
+    from config import SAMPLE_HASH
+    details = _read_months('Order_Details', start, end)
+    if details is None or details.empty:
+        return []
+    # Hash sama dengan MOD(order_id * SAMPLE_HASH, 10000) di MySQL, jadi order yang sama terpilih
+    bucket = (details['order_id'].to_numpy(dtype='uint64') * np.uint64(SAMPLE_HASH)) % np.uint64(10000)
+    details = details[bucket < int(rate * 10000)]
+    menu = _master('SELECT menu_id, item_name, unit_price FROM Menu', ['menu_id', 'item_name', 'unit_price'])
+    df = details.merge(menu, on='menu_id', how='left')
+    return _rows(df.sort_values('order_time', ascending=False), DETAIL_VIEW_COLUMNS)
+
+def _archive_order_totals(after_order_id=0):
+    # Filter parquet memakai statistik row group, jadi file yang semua id-nya lebih kecil dilewati
+    filters = [('order_id', '>', after_order_id)]
+    orders = _read_months('Orders', columns=['order_id', 'customer_id'], filters=filters)
+    if orders is None or orders.empty:
+        return []
+    df = _order_totals(orders, filters=filters).sort_values('order_id')
+    return _rows(df, ['order_id', 'customer_id', 'order_time', 'order_total'])
+
+def _archive_customers():
+    orders = _read_months('Orders', columns=['order_id', 'customer_id'])
+    if orders is None or orders.empty:
+        return []
+    spending = _order_totals(orders.dropna(subset=['customer_id'])).groupby('customer_id')['order_total'].sum()
+    customers = _master('SELECT customer_id, customer_name, email, phone FROM Customers',
+                        ['customer_id', 'customer_name', 'email', 'phone'])
+    df = customers.merge(spending.rename('total_spending'), left_on='customer_id', right_index=True)
+    return _rows(df, ['customer_id', 'customer_name', 'email', 'phone', 'total_spending'])
+
+def _item_quantities(start=None, end=None):
+    """Quantity per menu per tanggal dari arsip Order_Details"""
+    details = _read_months('Order_Details', start, end, ['menu_id', 'quantity'])
+    if details is None or details.empty:
+        return None
+    return details.groupby(['menu_id', _by_date(details)])['quantity'].sum().reset_index()
+
+def _archive_categories(start=None, end=None):
+    sold = _item_quantities(start, end)
+    if sold is None:
+        return []
+    menu = _master('SELECT menu_id, category_id FROM Menu', ['menu_id', 'category_id'])
+    categories = _master('SELECT category_id, category_name FROM Categories', ['category_id', 'category_name'])
+    df = sold.merge(menu, on='menu_id').merge(categories, on='category_id') \
+             .groupby(['category_id', 'category_name', 'order_date'], as_index=False)['quantity'].sum()
+    return _rows(df.rename(columns={'quantity': 'total_qty'}), ['category_id', 'category_name', 'total_qty', 'order_date'])
+
+def _archive_menu(start=None, end=None):
+    sold = _item_quantities(start, end)
+    if sold is None:
+        return []
+    menu = _master(
+        'SELECT m.menu_id, m.item_name, m.unit_price, m.member_only, c.category_name '
+        'FROM Menu m LEFT JOIN Categories c ON m.category_id = c.category_id',
+        ['menu_id', 'item_name', 'unit_price', 'member_only', 'category_name'])
+    df = sold.merge(menu, on='menu_id').rename(columns={'quantity': 'total_ordered'})
+    return _rows(df, ['menu_id', 'item_name', 'unit_price', 'member_only', 'category_name', 'total_ordered', 'order_date'])
+
+def _archive_payment_methods(start=None, end=None):
+    orders = _read_months('Orders', start, end, ['order_id', 'payment_id'])
+    if orders is None or orders.empty:
+        return []
+    df = _order_totals(orders, start, end)
+    df = df.groupby(['payment_id', _by_date(df)])['order_total'].sum().rename('revenue').reset_index()
+    df = df.merge(_master('SELECT payment_id, method_name FROM Payment_Methods', ['payment_id', 'method_name']),
+                  on='payment_id')
+    return _rows(df, ['payment_id', 'method_name', 'revenue', 'order_date'])
+
+def _archive_table_usage(start=None, end=None):
+    orders = _read_months('Orders', start, end, ['order_id', 'table_id'])
+    if orders is None or orders.empty:
+        return []
+    df = orders.groupby(['table_id', _by_date(orders)]).size().rename('times_used').reset_index()
+    df = df.merge(_master('SELECT table_id, table_number, capacity FROM Tables', ['table_id', 'table_number', 'capacity']),
+                  on='table_id')
+    return _rows(df, ['table_id', 'table_number', 'capacity', 'times_used', 'order_date'])
+
+def _archive_item_hourly(start=None, end=None):
+    details = _read_months('Order_Details', start, end, ['order_id', 'menu_id', 'quantity'])
+    if details is None or details.empty:
+        return []
+    orders = _read_months('Orders', start, end, ['order_id', 'order_status'])
+    if orders is not None:
+        details = details[~details['order_id'].isin(orders.loc[orders['order_status'] == 'Cancelled', 'order_id'])]
+    df = details.groupby(['menu_id', _by_date(details), details['order_time'].dt.hour.rename('order_hour')])['quantity'] \
+                .sum().reset_index()
+    return _rows(df, ['menu_id', 'order_date', 'order_hour', 'quantity'])
+
+def _archive_branch_summary(start=None, end=None):
+    orders = _read_months('Orders', start, end, ['order_id'])
+    if orders is None or orders.empty:
+        return []
+    df = _order_totals(orders, start, end)
+    df = df.groupby(_by_date(df)).agg(orders=('order_id', 'nunique'), revenue=('order_total', 'sum')).reset_index()
+    return _rows(df, ['order_date', 'orders', 'revenue'])
+
+def _archive_review_customers(order_ids):
+    """(order_id, customer_name) untuk review yang order-nya sudah diarsipkan"""
+    orders = _read_months('Orders', columns=['order_id', 'customer_id'],
+                          filters=[('order_id', 'in', list(order_ids))])
+    if orders is None or orders.empty:
+        return []
+    df = orders.merge(_master('SELECT customer_id, customer_name FROM Customers', ['customer_id', 'customer_name']),
+                      on='customer_id', how='left')
+    return _rows(df, ['order_id', 'customer_name'])
+
+# Pembaca arsip per view_*; hasilnya berkolom sama dengan query view tersebut
+ARCHIVE_VIEWS = {
+    'view_orders': _archive_orders,
+    'view_order_details': _archive_order_details,
+    'view_order_details_sample': _archive_order_details_sample,
+    'view_order_totals': _archive_order_totals,
+    'view_customers': _archive_customers,
+    'view_categories': _archive_categories,
+    'view_menu': _archive_menu,
+    'view_payment_methods': _archive_payment_methods,
+    'view_table_usage': _archive_table_usage,
+    'view_item_hourly': _archive_item_hourly,
+    'view_branch_summary': _archive_branch_summary,
+    'view_reviews': _archive_review_customers,
+}
+
+def read_archive(view_name, *args):
+    """Baris arsip untuk view_name (argumen sama dengan view-nya)"""
+    if view_name not in ARCHIVE_VIEWS:
+        raise ValueError(f"{view_name} tidak punya arsip")
+    return ARCHIVE_VIEWS[view_name](*args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Partisi bulanan Orders / Order_Details')
+    sub = parser.add_subparsers(dest='command', required=True)
+    for name in ['setup', 'rotate']:
+        p = sub.add_parser(name)
+        p.add_argument('--ahead', type=int, default=3, help='jumlah bulan ke depan yang disiapkan')
+        p.add_argument('--dry-run', action='store_true', help='hanya tampilkan SQL')
+    p = sub.add_parser('archive')
+    p.add_argument('--before', required=True, help='bulan YYYY-MM; partisi sebelum bulan ini diarsipkan')
+    for p in sub.choices.values():
+        p.add_argument('--branch', action='append', choices=BRANCH_NAMES, help='hanya cabang ini (boleh berulang)')
+    sub.add_parser('status')
+    args = parser.parse_args()
+    branches = [BRANCH_NAMES.index(name) for name in args.branch] if getattr(args, 'branch', None) \
+        else range(len(BRANCHES))
+
+    if args.command in ('setup', 'rotate'):
+        for index in branches:
+            with on_branch(index):
+                print(f"-- {BRANCH_NAMES[index]}")
+                statements = setup_statements(args.ahead) if args.command == 'setup' else rotate_statements(args.ahead)
+                for sql in statements:
+                    print(sql + ";")
+                    if not args.dry_run:
+                        run_statement(sql)
+                if not statements:
+                    print("Partisi sudah lengkap.")
+    elif args.command == 'archive':
+        cutoff = datetime.date.fromisoformat(args.before + "-01")
+        for index in branches:
+            with on_branch(index):
+                for table, month, rows in archive_before(cutoff):
+                    print(f"{BRANCH_NAMES[index]} {table} {month:%Y-%m}: {rows:,} baris -> {archive_path(table, month)}")
+        # Drop partisi tidak menaikkan Data_Versions; cache view lama harus dibuang manual
+        from cache import invalidate
+        invalidate()
+    else:
+        for index, name in enumerate(BRANCH_NAMES):
+            with on_branch(index):
+                for table in PARTITIONED_TABLES:
+                    live = existing_partitions(table)
+                    print(f"{name} {table}: {len(live)} partisi aktif "
+                          f"({live[0]:%Y-%m} s/d {live[-1]:%Y-%m})" if live else f"{name} {table}: belum dipartisi")
+                    print(f"  arsip: {', '.join(f'{m:%Y-%m}' for m in archived_months(table)) or '-'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+# reconcile.py
+# Rekonsiliasi harga Order_Details: total_price yang tersimpan dibandingkan dengan
+# quantity x unit_price Menu saat ini untuk seluruh riwayat, per cabang, termasuk partisi
+# yang sudah diarsipkan partitions.py ke parquet (dibaca setelah tabel MySQL-nya).
+# Detail yang menu_id-nya tidak ada di Menu (kind orphan_menu) atau order-nya tidak ada di
+# Orders (kind orphan_order) selalu masuk laporan; baris orphan_menu tidak punya harga
+# seharusnya, jadi tidak ikut dihitung di expected/total/difference ringkasan.
+#
+# Data dibaca per potongan dengan keyset pagination (order_detail_id > id terakhir, LIMIT n),
+# jadi memori tetap sebatas beberapa potongan walau tabelnya ratusan juta baris, dan setiap
+# query pendek (memakai primary key, tanpa OFFSET). Satu thread membaca potongan berikutnya
+# sementara potongan sebelumnya dibandingkan. Harga dihitung dalam sen (integer) supaya tidak
+# ada selisih pembulatan float; perbandingan dan ringkasan dilakukan sekaligus per potongan.
+#
+# Hasil di folder --output:
+#   mismatches.csv      baris yang selisih (ditulis bertahap per potongan)
+#   summary_menu.csv    per menu: baris, baris selisih, total seharusnya/tersimpan, selisih
+#   summary_day.csv     per tanggal, kolom sama
+#   summary_menu_day.csv per menu per tanggal
+#
+#   python reconcile.py run [--chunk-size 50000] [--tolerance 0] [--output reconcile] [--branch Pusat]
+import os
+import sys
+import time
+import queue
+import argparse
+import threading
+
+import numpy as np
+import pandas as pd
+
+from config import BRANCHES, BRANCH_NAMES, BRANCH_ID_STRIDE, get_pool
+from partitions import archive_path, archived_months
+
+CHUNK_SIZE = 50000
+PREFETCH = 2            # potongan yang boleh antre menunggu dibandingkan
+CONSOLIDATE_EVERY = 20  # potongan ringkasan yang ditampung sebelum digabung
+PROGRESS_INTERVAL = 5   # detik antar baris progres
+
+CHUNK_SQL = '''
+    SELECT od.order_detail_id, od.order_id, od.menu_id, DATE(o.order_time) as order_date, od.quantity,
+           CAST(ROUND(od.total_price * 100) AS SIGNED) as total_cents,
+           CAST(ROUND(m.unit_price * 100) AS SIGNED) as price_cents
+    FROM Order_Details od
+    LEFT JOIN Menu m ON od.menu_id = m.menu_id
+    LEFT JOIN Orders o ON od.order_id = o.order_id
+    WHERE od.order_detail_id > %s
+    ORDER BY od.order_detail_id
+    LIMIT %s
+'''
+CHUNK_COLUMNS = ['order_detail_id', 'order_id', 'menu_id', 'order_date', 'quantity', 'total_cents', 'price_cents']
+MISMATCH_COLUMNS = ['branch', 'order_detail_id', 'order_id', 'menu_id', 'order_date', 'quantity',
+                    'unit_price', 'expected_price', 'total_price', 'difference', 'implied_unit_price', 'kind']
+SUMMARY_COLUMNS = ['rows', 'mismatches', 'orphans', 'expected_price', 'total_price', 'difference']
+PRICE_SQL = 'SELECT menu_id, CAST(ROUND(unit_price * 100) AS SIGNED) FROM Menu'
+ARCHIVE_COLUMNS = ['order_detail_id', 'order_id', 'menu_id', 'quantity', 'total_price', 'order_time']
+
+
+def fetch_chunks(branch, chunk_size, out, stop):
+    """Thread pembaca: kirim potongan (list baris) ke out sampai habis, lalu None"""
+    try:
+        conn = get_pool(branch).get_connection()
+        try:
+            last_id = 0
+            while not stop.is_set():
+                c = conn.cursor()
+                c.execute(CHUNK_SQL, (last_id, chunk_size))
+                rows = c.fetchall()
+                c.close()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                out.put(rows)
+            c = conn.cursor()
+            c.execute(PRICE_SQL)
+            prices = dict(c.fetchall())
+            c.close()
+        finally:
+            conn.close()
+        for month in archived_months('Order_Details', branch):
+            for rows in archive_chunks(branch, month, prices, chunk_size):
+                if stop.is_set():
+                    return
+                out.put(rows)
+        out.put(None)
+    except Exception as e:
+        out.put(e)
+
+def archive_chunks(branch, month, prices, chunk_size):
+    """Potongan baris seperti CHUNK_SQL dari parquet arsip satu bulan; harga dari Menu saat ini.
+    Orders dan Order_Details bulan yang sama diarsipkan bersama, jadi order-nya dicari di arsip Orders bulan itu."""
+    details = pd.read_parquet(archive_path('Order_Details', month, branch), columns=ARCHIVE_COLUMNS)
+    details = details.sort_values('order_detail_id', ignore_index=True)
+    orders_path = archive_path('Orders', month, branch)
+    order_ids = pd.read_parquet(orders_path, columns=['order_id'])['order_id'] if os.path.exists(orders_path) else []
+    order_date = pd.to_datetime(details['order_time']).dt.date.astype(object)
+    frame = pd.DataFrame({
+        'order_detail_id': details['order_detail_id'], 'order_id': details['order_id'],
+        'menu_id': details['menu_id'], 'order_date': order_date.where(details['order_id'].isin(order_ids), None),
+        'quantity': details['quantity'],
+        'total_cents': (details['total_price'].astype(float) * 100).round().astype(np.int64),
+        'price_cents': details['menu_id'].map(prices).astype('Int64'),
+    }, columns=CHUNK_COLUMNS).astype(object)
+    frame = frame.where(frame.notna(), None)
+    for start in range(0, len(frame), chunk_size):
+        yield list(frame.iloc[start:start + chunk_size].itertuples(index=False, name=None))
+
+def _dates(values):
+    """Kolom tanggal (date dari MySQL, string dari driver lain) -> datetime64[D].
+    Satu potongan hanya berisi sedikit tanggal, jadi cukup nilai uniknya yang dikonversi."""
+    lookup = {}
+    codes = np.fromiter((lookup.setdefault(value, len(lookup)) for value in values), np.int64, len(values))
+    # NULL (order tidak ada) -> NaT
+    return np.array(['NaT' if value is None else str(value) for value in lookup], dtype='datetime64[D]')[codes]
+
+def _nullable_cents(values):
+    """Kolom sen yang bisa NULL (menu_id tidak ada di Menu, LEFT JOIN) -> (int64 dengan 0, mask NULL)"""
+    try:
+        values = np.array(values, dtype=np.int64)
+        return values, np.zeros(len(values), dtype=bool)
+    except TypeError:
+        values = np.array(values, dtype=object)
+        missing = pd.isna(values)
+        return np.where(missing, 0, values).astype(np.int64), missing
+
+def compare(rows, tolerance_cents=0):
+    """Bandingkan satu potongan: (baris selisih untuk laporan, ringkasan per menu per tanggal)"""
+    columns = list(zip(*rows))
+    detail_id, order_id, menu_id, quantity, total = (
+        np.array(columns[CHUNK_COLUMNS.index(name)], dtype=np.int64)
+        for name in ['order_detail_id', 'order_id', 'menu_id', 'quantity', 'total_cents'])
+    price, no_menu = _nullable_cents(columns[CHUNK_COLUMNS.index('price_cents')])
+    order_date = _dates(columns[CHUNK_COLUMNS.index('order_date')])
+    no_order = np.isnat(order_date)
+    priced_total = np.where(no_menu, 0, total)
+    expected = quantity * price
+    difference = priced_total - expected
+    orphan = no_menu | no_order
+    mismatch = (np.abs(difference) > tolerance_cents) | orphan
+
+    summary = pd.DataFrame({
+        'menu_id': menu_id, 'order_date': order_date,
+        'rows': 1, 'mismatches': mismatch.astype(np.int64), 'orphans': orphan.astype(np.int64),
+        'expected_price': expected, 'total_price': priced_total, 'difference': difference,
+    }).groupby(['menu_id', 'order_date'], dropna=not no_order.any()).sum()
+
+    q, t = quantity[mismatch], total[mismatch]
+    safe_q = np.where(q > 0, q, 1)
+    known = ~no_menu[mismatch]
+    # Total habis dibagi quantity: kemungkinan besar harga satuan lama (harga menu sudah berubah)
+    kind = np.select([no_menu[mismatch], no_order[mismatch], q <= 0, t % safe_q == 0],
+                     ['orphan_menu', 'orphan_order', 'quantity', 'price_changed'], 'other')
+    report = pd.DataFrame({
+        'order_detail_id': detail_id[mismatch], 'order_id': order_id[mismatch],
+        'menu_id': menu_id[mismatch], 'order_date': order_date[mismatch],
+        'quantity': q, 'unit_price': np.where(known, price[mismatch] / 100, np.nan),
+        'expected_price': np.where(known, expected[mismatch] / 100, np.nan), 'total_price': t / 100,
+        'difference': np.where(known, difference[mismatch] / 100, np.nan),
+        'implied_unit_price': np.where(q > 0, t / safe_q / 100, np.nan), 'kind': kind,
+    })
+    return report, summary
+
+
+class Reconciliation:
+    """Jalankan rekonsiliasi per cabang dan kumpulkan ringkasannya"""
+
+    def __init__(self, output, chunk_size=CHUNK_SIZE, tolerance=0.0):
+        self.output = output
+        self.chunk_size = chunk_size
+        self.tolerance_cents = int(round(tolerance * 100))
+        self.rows = 0
+        self.mismatches = 0
+        self.summary = None       # per (branch, menu_id, order_date)
+        self._parts = []
+        self._started = None
+
+    def run(self, branches):
+        os.makedirs(self.output, exist_ok=True)
+        self._started = time.perf_counter()
+        report_path = os.path.join(self.output, 'mismatches.csv')
+        with open(report_path, 'w', newline='') as report_file:
+            pd.DataFrame(columns=MISMATCH_COLUMNS).to_csv(report_file, index=False)
+            for index in branches:
+                self._run_branch(index, report_file)
+        self._consolidate()
+        self._write_summaries()
+        return self
+
+    def _run_branch(self, index, report_file):
+        chunks, stop = queue.Queue(maxsize=PREFETCH), threading.Event()
+        reader = threading.Thread(target=fetch_chunks, args=(index, self.chunk_size, chunks, stop), daemon=True)
+        reader.start()
+        last_progress = time.perf_counter()
+        try:
+            while True:
+                rows = chunks.get()
+                if rows is None:
+                    break
+                if isinstance(rows, Exception):
+                    raise rows
+                report, summary = compare(rows, self.tolerance_cents)
+                if not report.empty:
+                    # Id transaksi digeser per cabang seperti fan_out, supaya unik di laporan gabungan
+                    shift = index * BRANCH_ID_STRIDE
+                    report[['order_detail_id', 'order_id']] += shift
+                    report.insert(0, 'branch', BRANCH_NAMES[index])
+                    report.to_csv(report_file, header=False, index=False)
+                self._parts.append(pd.concat({BRANCH_NAMES[index]: summary}, names=['branch']))
+                if len(self._parts) >= CONSOLIDATE_EVERY:
+                    self._consolidate()
+                self.rows += len(rows)
+                self.mismatches += len(report)
+                if time.perf_counter() - last_progress >= PROGRESS_INTERVAL:
+                    print(self.progress(BRANCH_NAMES[index]), flush=True)
+                    last_progress = time.perf_counter()
+        finally:
+            stop.set()
+            # Kosongkan antrean supaya thread pembaca tidak tertahan di put()
+            while reader.is_alive():
+                try:
+                    chunks.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+    def _consolidate(self):
+        """Gabungkan potongan ringkasan; ukurannya dibatasi jumlah menu x tanggal, bukan jumlah baris"""
+        if not self._parts:
+            return
+        parts = self._parts if self.summary is None else [self.summary] + self._parts
+        self.summary = pd.concat(parts).groupby(level=[0, 1, 2], dropna=False).sum()
+        self._parts = []
+
+    def _write_summaries(self):
+        summary = self.summary if self.summary is not None else pd.DataFrame(
+            columns=SUMMARY_COLUMNS, index=pd.MultiIndex.from_arrays([[], [], []], names=['branch', 'menu_id', 'order_date']))
+        money = ['expected_price', 'total_price', 'difference']
+        for name, levels in [('menu', ['branch', 'menu_id']), ('day', ['branch', 'order_date']),
+                             ('menu_day', ['branch', 'menu_id', 'order_date'])]:
+            table = summary.groupby(level=levels, dropna=False).sum()
+            table[money] = table[money] / 100
+            table.to_csv(os.path.join(self.output, f'summary_{name}.csv'))
+
+    def rate(self):
+        elapsed = time.perf_counter() - self._started
+        return self.rows / elapsed if elapsed else 0.0
+
+    def progress(self, branch=''):
+        return (f"{time.strftime('%H:%M:%S')} {branch} {self.rows:,} baris · {self.mismatches:,} selisih"
+                f" · {self.rate():,.0f} baris/detik")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rekonsiliasi total_price Order_Details dengan harga Menu')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('run', help='bandingkan seluruh riwayat (termasuk arsip) dan tulis laporan')
+    p.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='baris per query')
+    p.add_argument('--tolerance', type=float, default=0.0, help='selisih (rupiah) yang masih dianggap cocok')
+    p.add_argument('--output', default='reconcile', help='folder laporan')
+    p.add_argument('--branch', action='append', choices=BRANCH_NAMES, help='hanya cabang ini (boleh berulang)')
+    args = parser.parse_args()
+
+    branches = [BRANCH_NAMES.index(name) for name in args.branch] if args.branch else range(len(BRANCHES))
+    job = Reconciliation(args.output, args.chunk_size, args.tolerance).run(branches)
+    elapsed = time.perf_counter() - job._started
+    orphans = int(job.summary['orphans'].sum()) if job.summary is not None else 0
+    print(f"Selesai: {job.rows:,} baris · {job.mismatches:,} selisih ({job.mismatches / max(job.rows, 1):.2%})"
+          f" · {orphans:,} tanpa menu/order"
+          f" · {elapsed:.1f} detik · {job.rate():,.0f} baris/detik")
+    if job.summary is not None and job.mismatches:
+        top = job.summary.groupby(level=['branch', 'menu_id']).sum()
+        top = top[top['mismatches'] > 0].sort_values('mismatches', ascending=False).head(10)
+        print("\nMenu dengan selisih terbanyak:")
+        for (branch, menu_id), row in top.iterrows():
+            print(f"  {branch} menu {menu_id}: {row['mismatches']:,} baris, selisih Rp {row['difference'] / 100:,.0f}")
+    print(f"\nLaporan: {os.path.abspath(args.output)}")
+
+if __name__ == '__main__':
+    sys.exit(main())
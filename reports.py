@@ -0,0 +1,272 @@
+# reports.py
+# Bundle laporan siap saji untuk halaman Dashboard, Menu, Payment Methods dan Reviews.
+# Generator dijalankan di luar jam sibuk (mis. cron jam 05:00) dan menghitung agregat + JSON
+# grafik Plotly untuk periode standar di beberapa proses worker sekaligus. Hasilnya disimpan
+# di disk per versi cache; halaman memakai bundle kalau rentang tanggal yang dipilih sama.
+#
+#   python reports.py generate --workers 4
+#   python reports.py status
+#
+# Contoh crontab:
+#   0 5 * * * cd /srv/restaurant-orders && python reports.py generate
+import os
+import sys
+import json
+import time
+import pickle
+import hashlib
+import argparse
+import tempfile
+from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+import analytics
+from cache import CACHE_DIR, get_backend
+from charts import COLORS, create_bar_chart, create_bar_chart_colored, create_pie_chart, create_line_chart
+
+REPORT_DIR = os.environ.get("RESTO_REPORT_DIR", os.path.join(CACHE_DIR, "reports"))
+BUNDLE_FORMAT = 2   # naikkan kalau isi bundle berubah, bundle lama otomatis diabaikan
+
+# Tabel yang dibutuhkan setiap laporan dan kolom tanggal yang menentukan rentang halaman
+REPORT_TABLES = {
+    "Dashboard": ['orders', 'details', 'menu', 'reservations', 'customers', 'tables', 'reviews'],
+    "Menu": ['menu'],
+    "Payment Methods": ['payment'],
+    "Reviews": ['reviews'],
+}
+RANGE_SOURCE = {
+    "Dashboard": ('orders', 'order_date'),
+    "Menu": ('menu', 'order_date'),
+    "Payment Methods": ('payment', 'order_date'),
+    "Reviews": ('reviews', 'review_date'),
+}
+PERIODS = ['harian', 'mingguan', 'bulanan', 'semua']
+# Halaman yang datanya dimuat sejak awal periode pembanding (bagian dari main.COMPARISON_PAGES)
+COMPARISON_REPORTS = {"Dashboard"}
+
+
+# BUILDER: agregat + grafik satu halaman untuk satu rentang tanggal
+
+def build_dashboard(data, start, end):
+    orders = analytics.filter_date(data['orders'], 'order_date', start, end)
+    menu = analytics.filter_date(data['menu'], 'order_date', start, end)
+    details = data.get('details')
+    figures = dict.fromkeys(["Top Menu Terlaris", "Trend Pendapatan", "Tipe Layanan", "Metode Pembayaran"])
+    if not menu.empty:
+        top_menu = analytics.top_menu(menu, 5)
+        figures["Top Menu Terlaris"] = create_bar_chart(top_menu, 'Menu', 'Terjual', 'Top 5 Menu Terlaris', horizontal=True, color=COLORS['primary'])
+    if details is not None:
+        details = analytics.filter_date(details, 'order_date', start, end)
+        if not details.empty:
+            daily = analytics.revenue_daily(details)
+            figures["Trend Pendapatan"] = create_line_chart(daily.index, daily.values, 'Trend Pendapatan Harian', fill=True)
+    if not orders.empty:
+        service = analytics.value_distribution(orders, 'service_type')
+        figures["Tipe Layanan"] = create_pie_chart(service.values, service.index, 'Distribusi Tipe Layanan')
+        payment = analytics.value_distribution(orders, 'method_name')
+        figures["Metode Pembayaran"] = create_pie_chart(payment.values, payment.index, 'Distribusi Pembayaran')
+    comparison = None
+    if details is not None and start is not None:
+        # Data tidak difilter: periode pembanding ada di luar rentang terpilih
+        comparison = analytics.order_comparison(data['orders'], data['details'], start, end)
+    return {'kpis': analytics.dashboard_kpis(data, start, end), 'figures': figures, 'comparison': comparison}
+
+def build_menu(data, start, end):
+    menu = analytics.filter_date(data['menu'], 'order_date', start, end)
+    if not menu.empty:
+        menu = menu.assign(unit_price=pd.to_numeric(menu['unit_price'], errors='coerce'))
+    summary = analytics.menu_summary(menu)
+    top10 = summary.head(10)[['item_name', 'total_ordered']]
+    top10.columns = ['Menu', 'Terjual']
+    cat_sales = summary.groupby('category_name')['total_ordered'].sum()
+    return {
+        'summary': summary,
+        'access': analytics.menu_access_counts(summary),
+        'figures': {
+            'top10': create_bar_chart(top10, 'Menu', 'Terjual', 'Top 10 Menu Terlaris', horizontal=True),
+            'categories': create_pie_chart(cat_sales.values, cat_sales.index, 'Distribusi per Kategori'),
+        },
+    }
+
+def build_payment(data, start, end):
+    summary = analytics.payment_summary(analytics.filter_date(data['payment'], 'order_date', start, end))
+    return {
+        'summary': summary,
+        'figures': {
+            'bar': create_bar_chart_colored(summary, 'Metode', 'Revenue', 'Revenue per Metode', horizontal=True),
+            'pie': create_pie_chart(summary['Revenue'].values, summary['Metode'].values, 'Proporsi Revenue'),
+        },
+    }
+
+def build_reviews(data, start, end):
+    reviews = analytics.filter_date(data['reviews'], 'review_date', start, end)
+    if reviews.empty:
+        return {'kpis': None, 'figures': {}}
+    rating_count = analytics.rating_distribution(reviews)
+    daily_rating = analytics.rating_daily(reviews)
+    return {
+        'kpis': analytics.review_kpis(reviews),
+        'figures': {
+            'distribution': create_bar_chart(rating_count, 'Rating', 'Jumlah', 'Distribusi Rating', color=COLORS['warning']),
+            'daily': create_line_chart(daily_rating['Tanggal'], daily_rating['Rating'], 'Trend Rating Harian'),
+        },
+    }
+
+BUILDERS = {
+    "Dashboard": build_dashboard,
+    "Menu": build_menu,
+    "Payment Methods": build_payment,
+    "Reviews": build_reviews,
+}
+
+
+# PENYIMPANAN BUNDLE
+
+def fingerprint(data):
+    """Sidik jari data halaman. Bundle hanya dipakai kalau sidik jarinya sama dengan data yang sedang dimuat.
+    Tabel dengan stempel Data_Versions memakai stempelnya (berubah di setiap INSERT/UPDATE/DELETE,
+    jadi edit status, koreksi harga dan merge customer ikut terdeteksi); tabel lain di-hash isinya."""
+    from data import LOADERS, frame_stamp
+    digest = hashlib.sha1()
+    for name in sorted(data):
+        stamp = frame_stamp(name) if name in LOADERS else None
+        digest.update(f"{name}:{stamp!r}|".encode())
+        if stamp is None:
+            digest.update(pd.util.hash_pandas_object(data[name].astype(str), index=False).values.tobytes())
+    return digest.hexdigest()
+
+def bundle_path(page, start, end, version=None):
+    version = get_backend().get_version() if version is None else version
+    slug = page.lower().replace(' ', '_')
+    return os.path.join(REPORT_DIR, f"v{version}", slug, f"{start}_{end}.pkl")
+
+def save_bundle(page, start, end, report, data_fingerprint):
+    """Simpan laporan (spec grafik sebagai JSON Plotly) secara atomik"""
+    bundle = dict(report, figures={name: json.dumps(fig) if fig is not None else None
+                                   for name, fig in report['figures'].items()})
+    bundle.update(format=BUNDLE_FORMAT, fingerprint=data_fingerprint, generated_at=time.time())
+    path = bundle_path(page, start, end)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        pickle.dump(bundle, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    return path
+
+def load_bundle(page, start, end, data_fingerprint):
+    """Bundle yang cocok dengan rentang dan data saat ini, atau None"""
+    try:
+        with open(bundle_path(page, start, end), 'rb') as f:
+            bundle = pickle.load(f)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        return None
+    if bundle.get('format') != BUNDLE_FORMAT or bundle.get('fingerprint') != data_fingerprint:
+        return None
+    # st.plotly_chart menerima dict, jadi grafik tidak perlu dibangun ulang lewat plotly.express
+    bundle['figures'] = {name: json.loads(spec) if spec is not None else None
+                         for name, spec in bundle['figures'].items()}
+    return bundle
+
+def page_report(page, data, start, end):
+    """Laporan halaman: dari bundle kalau ada, kalau tidak dihitung langsung"""
+    data = {name: data[name] for name in REPORT_TABLES[page] if data.get(name) is not None}
+    bundle = load_bundle(page, start, end, fingerprint(data))
+    if bundle is not None:
+        return bundle
+    return BUILDERS[page](data, start, end)
+
+
+# GENERATOR
+
+def page_load_range(page, start, end):
+    """Rentang tanggal order yang dimuat halaman untuk rentang pilihan start-end (main.page_load_range).
+    Generator memuat potongan yang sama, jadi tanpa Data_Versions sidik jari bundle cocok dengan halaman."""
+    from data import RANGED_TABLES
+    if RANGE_SOURCE[page][0] not in RANGED_TABLES:
+        return None, None
+    if page in COMPARISON_REPORTS:
+        start = min(window_start for window_start, _ in analytics.comparison_windows(start, end).values())
+    return start, end
+
+def period_range(period, first, last):
+    """Rentang tanggal (inklusif) untuk periode standar, berakhir di tanggal data terakhir"""
+    if period == 'harian':
+        start = last
+    elif period == 'mingguan':
+        start = last - timedelta(days=6)
+    elif period == 'bulanan':
+        start = last.replace(day=1)
+    else:
+        start = first
+    return max(start, first), last
+
+def generate_page(page):
+    """Dijalankan di proses worker: muat data halaman per periode lalu simpan bundle-nya"""
+    from data import RANGED_TABLES, load_table, history_bounds
+    table, date_col = RANGE_SOURCE[page]
+    if table in RANGED_TABLES:
+        # 'semua' = rentang awal filter tanggal order halaman: data di MySQL tanpa arsip (main.default_range)
+        _, first, last = history_bounds()
+    else:
+        first, last = analytics.date_bounds(load_table(table), date_col)
+    if first is None:
+        return page, []
+    written = []
+    for period in PERIODS:
+        start, end = period_range(period, first, last)
+        load_start, load_end = page_load_range(page, start, end)
+        data = {name: load_table(name, load_start, load_end) for name in REPORT_TABLES[page]}
+        save_bundle(page, start, end, BUILDERS[page](data, start, end), fingerprint(data))
+        written.append((period, start, end))
+    return page, written
+
+def generate(pages, workers):
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(generate_page, page) for page in pages]
+        for future in as_completed(futures):
+            page, written = future.result()
+            for period, start, end in written:
+                print(f"{page:<16} {period:<9} {start} s/d {end}")
+    prune()
+    print(f"Selesai dalam {time.perf_counter() - started:.1f} detik")
+
+def prune():
+    """Hapus bundle dari versi cache lama"""
+    current = f"v{get_backend().get_version()}"
+    if not os.path.isdir(REPORT_DIR):
+        return
+    for name in os.listdir(REPORT_DIR):
+        if name != current and name.startswith('v'):
+            for root, dirs, files in os.walk(os.path.join(REPORT_DIR, name), topdown=False):
+                for file in files:
+                    os.remove(os.path.join(root, file))
+                os.rmdir(root)
+
+def status():
+    root = os.path.join(REPORT_DIR, f"v{get_backend().get_version()}")
+    if not os.path.isdir(root):
+        print("Belum ada bundle untuk versi cache ini")
+        return
+    for slug in sorted(os.listdir(root)):
+        for file in sorted(os.listdir(os.path.join(root, slug))):
+            generated = os.path.getmtime(os.path.join(root, slug, file))
+            print(f"{slug:<16} {file[:-4]:<24} {time.strftime('%Y-%m-%d %H:%M', time.localtime(generated))}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Bundle laporan siap saji')
+    sub = parser.add_subparsers(dest='command', required=True)
+    gen = sub.add_parser('generate', help='hitung ulang bundle semua periode standar')
+    gen.add_argument('--workers', type=int, default=os.cpu_count())
+    gen.add_argument('--pages', nargs='*', default=list(BUILDERS), choices=list(BUILDERS))
+    sub.add_parser('status', help='daftar bundle versi cache saat ini')
+    args = parser.parse_args()
+    if args.command == 'generate':
+        generate(args.pages, args.workers)
+    else:
+        status()
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,283 @@
+# review_index.py
+# Indeks kata untuk komentar review. Setiap komentar di-tokenisasi sekali saat review baru masuk;
+# hasilnya disimpan sebagai:
+#   - inverted index: posting (term, baris review) yang diurutkan per term, untuk pencarian kata kunci,
+#   - jumlah review per (term, tanggal, rating), untuk top term per rating dan tren kata kunci.
+# Query apa pun (rentang tanggal, rating) hanya membaca array ini, tidak memindai teks komentar lagi.
+# Term = kata (huruf saja, huruf kecil, tanpa stopword) dan pasangan dua kata berurutan.
+# Store di-update bertahap dari view_review_texts dengan high-water mark review_id per cabang
+# seperti sketches.py. Review yang diubah/dihapus, atau yang commit terlambat dengan id di bawah
+# high-water mark, terdeteksi dari Data_Versions (seperti customer_stats.py) dan memicu rebuild penuh.
+import os
+import re
+import sys
+import time
+import pickle
+import argparse
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from cache import CACHE_DIR, get_backend
+from config import view_review_texts, BRANCHES
+from customer_stats import advance_high_water, detect_changes
+
+INDEX_FILE = os.path.join(CACHE_DIR, 'review_index.pkl')
+INDEX_FORMAT = 2
+REFRESH_INTERVAL = 30   # detik minimal antar pengecekan review baru
+
+TOKEN_PATTERN = r"[^\W\d_]+"
+MIN_TOKEN_LENGTH = 2
+# Kata sambung/ganti yang terlalu umum; kata sentimen (tidak, kurang, agak, lama) sengaja tidak dibuang
+STOPWORDS = frozenset('''
+    yang dan di ke dari ini itu untuk dengan juga atau pada sih nya ya kok deh dong aja saja
+    saya aku kami kita kamu mereka dia ada adalah akan sudah udah lagi jadi karena buat bisa
+    the and or a an is are was were be been it its to of for in on at with this that these
+    i we you my our me us they very so
+'''.split())
+RATINGS = [1, 2, 3, 4, 5]
+
+
+def tokenize(comments):
+    """Term unik setiap komentar (Series berisi list): kata + pasangan dua kata berurutan"""
+    words = comments.fillna('').astype(str).str.lower().str.findall(TOKEN_PATTERN)
+
+    def terms(tokens):
+        kept = [t if len(t) >= MIN_TOKEN_LENGTH and t not in STOPWORDS else None for t in tokens]
+        bigrams = [f"{a} {b}" for a, b in zip(kept, kept[1:]) if a and b]
+        return list(dict.fromkeys([t for t in kept if t] + bigrams))
+
+    return words.map(terms)
+
+
+class ReviewIndex:
+    """Inverted index + jumlah term per hari per rating, di-update bertahap"""
+
+    def __init__(self, path=INDEX_FILE):
+        self.path = path
+        self.reset()
+        self.baseline = None    # (versi, review_id terbesar) per cabang dari Data_Versions
+        self._mtime = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+
+    def reset(self):
+        self.terms = []                                       # term_id -> term
+        self.review_ids = np.empty(0, dtype=np.int64)         # baris -> review_id
+        self.dates = np.empty(0, dtype='datetime64[D]')       # baris -> tanggal review
+        self.ratings = np.empty(0, dtype=np.int8)             # baris -> rating
+        self.post_terms = np.empty(0, dtype=np.int32)         # posting (term_id, baris), urut term_id
+        self.post_rows = np.empty(0, dtype=np.int64)
+        self.offsets = np.zeros(1, dtype=np.int64)            # posting term t = [offsets[t], offsets[t+1])
+        self.term_days = pd.Series(dtype=np.int64, index=pd.MultiIndex.from_arrays(
+            [np.empty(0, dtype=np.int32), np.empty(0, dtype='datetime64[ns]'), np.empty(0, dtype=np.int8)],
+            names=['term_id', 'date', 'rating']))             # review yang memuat term per hari per rating
+        self.last_review_ids = (0,) * len(BRANCHES)
+        self._vocab = {}
+
+    # BUILD
+
+    def apply(self, reviews):
+        """Tambahkan review baru (review_id, rating, comment, review_date) ke indeks"""
+        if reviews.empty:
+            return
+        self.last_review_ids = advance_high_water(self.last_review_ids, reviews['review_id'])
+        reviews = reviews.reset_index(drop=True)
+        first_row = len(self.review_ids)
+        dates = pd.to_datetime(reviews['review_date']).to_numpy(dtype='datetime64[D]')
+        ratings = pd.to_numeric(reviews['rating'], errors='coerce').fillna(0).to_numpy(dtype=np.int8)
+        self.review_ids = np.concatenate([self.review_ids, reviews['review_id'].to_numpy(dtype=np.int64)])
+        self.dates = np.concatenate([self.dates, dates])
+        self.ratings = np.concatenate([self.ratings, ratings])
+
+        exploded = tokenize(reviews['comment']).explode().dropna()
+        if exploded.empty:
+            return
+        for term in pd.unique(exploded.to_numpy()):
+            if term not in self._vocab:
+                self._vocab[term] = len(self.terms)
+                self.terms.append(term)
+        term_ids = exploded.map(self._vocab).to_numpy(dtype=np.int32)
+        positions = exploded.index.to_numpy()
+        self._merge_postings(term_ids, first_row + positions)
+
+        counts = pd.Series(1, index=pd.MultiIndex.from_arrays(
+            [term_ids, dates[positions].astype('datetime64[ns]'), ratings[positions]],
+            names=['term_id', 'date', 'rating'])).groupby(level=[0, 1, 2]).sum()
+        self.term_days = self.term_days.add(counts, fill_value=0).astype(np.int64).sort_index()
+
+    def _merge_postings(self, term_ids, rows):
+        terms = np.concatenate([self.post_terms, term_ids])
+        rows = np.concatenate([self.post_rows, rows])
+        order = np.argsort(terms, kind='stable')   # baris tetap urut di dalam satu term
+        self.post_terms, self.post_rows = terms[order], rows[order]
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(self.post_terms, minlength=len(self.terms)))])
+
+    # QUERY
+
+    def term_ids(self, query):
+        """term_id untuk kata di query (None kalau ada kata yang tidak pernah muncul)"""
+        words = tokenize(pd.Series([query])).iloc[0]
+        words = [w for w in words if ' ' not in w] or words
+        ids = [self._vocab.get(w) for w in words]
+        return None if not ids or None in ids else ids
+
+    def _rows(self, term_id):
+        return self.post_rows[self.offsets[term_id]:self.offsets[term_id + 1]]
+
+    def search(self, query, start=None, end=None, ratings=None, limit=100):
+        """review_id yang memuat semua kata di query (terbaru dulu) dan jumlah total yang cocok"""
+        ids = self.term_ids(query)
+        if ids is None:
+            return np.empty(0, dtype=np.int64), 0
+        # Mulai dari posting terpendek supaya irisan tetap kecil
+        ids.sort(key=lambda t: self.offsets[t + 1] - self.offsets[t])
+        rows = self._rows(ids[0])
+        for term_id in ids[1:]:
+            rows = np.intersect1d(rows, self._rows(term_id), assume_unique=True)
+        mask = self._row_filter(rows, start, end, ratings)
+        rows = rows[mask]
+        rows = rows[np.argsort(self.dates[rows], kind='stable')[::-1]]
+        return self.review_ids[rows[:limit]], len(rows)
+
+    def _row_filter(self, rows, start, end, ratings):
+        mask = np.ones(len(rows), dtype=bool)
+        if start is not None:
+            mask &= self.dates[rows] >= np.datetime64(start, 'D')
+        if end is not None:
+            mask &= self.dates[rows] <= np.datetime64(end, 'D')
+        if ratings is not None:
+            mask &= np.isin(self.ratings[rows], list(ratings))
+        return mask
+
+    def _range(self, start=None, end=None):
+        counts = self.term_days
+        dates = counts.index.get_level_values('date')
+        mask = np.ones(len(counts), dtype=bool)
+        if start is not None:
+            mask &= dates >= pd.Timestamp(start)
+        if end is not None:
+            mask &= dates <= pd.Timestamp(end)
+        return counts[mask]
+
+    def reviews_per_rating(self, start=None, end=None):
+        mask = self._row_filter(np.arange(len(self.review_ids)), start, end, None)
+        return pd.Series(self.ratings[mask]).value_counts().reindex(RATINGS, fill_value=0)
+
+    def top_terms(self, start=None, end=None, n=10, min_reviews=2):
+        """Term terbanyak per rating: rating, term, review, share (proporsi review di rating itu)
+        dan lift (share di rating itu / share di semua rating)"""
+        counts = self._range(start, end).groupby(level=['rating', 'term_id']).sum()
+        if counts.empty:
+            return pd.DataFrame(columns=['rating', 'term', 'reviews', 'share', 'lift'])
+        per_rating = self.reviews_per_rating(start, end)
+        overall = counts.groupby(level='term_id').sum() / max(per_rating.sum(), 1)
+        table = counts.rename('reviews').reset_index()
+        table = table[table['reviews'] >= min_reviews]
+        table['share'] = table['reviews'] / per_rating.reindex(table['rating']).to_numpy()
+        table['lift'] = table['share'] / overall.reindex(table['term_id']).to_numpy()
+        table['term'] = np.asarray(self.terms, dtype=object)[table['term_id']]
+        table = table.sort_values(['rating', 'reviews', 'lift'], ascending=[True, False, False])
+        return table.groupby('rating').head(n)[['rating', 'term', 'reviews', 'share', 'lift']].reset_index(drop=True)
+
+    def trend(self, keywords, start=None, end=None, freq='D'):
+        """Jumlah review per periode yang memuat setiap kata kunci (long-form: date, term, reviews)"""
+        counts = self._range(start, end)
+        frames = []
+        for keyword in keywords:
+            term_id = self._vocab.get(keyword.strip().lower())
+            if term_id is None or term_id not in counts.index.get_level_values('term_id'):
+                continue
+            daily = counts.xs(term_id, level='term_id').groupby(level='date').sum()
+            daily = daily.resample(freq).sum() if freq != 'D' else daily
+            frames.append(pd.DataFrame({'date': daily.index, 'term': keyword.strip().lower(), 'reviews': daily.values}))
+        if not frames:
+            return pd.DataFrame(columns=['date', 'term', 'reviews'])
+        return pd.concat(frames, ignore_index=True)
+
+    # REFRESH + PENYIMPANAN
+
+    def refresh(self, force=False):
+        """Ambil review baru sejak update terakhir lalu simpan ke disk"""
+        with self._lock:
+            if not force and time.time() - self._checked_at < REFRESH_INTERVAL:
+                return self
+            with get_backend().lock('review_index'):
+                self._load()
+                baseline = self.baseline
+                modified, self.baseline = detect_changes(baseline, 'Reviews', 'review_id')
+                if modified:
+                    self.reset()
+                rows = view_review_texts(self.last_review_ids)
+                if rows:
+                    self.apply(pd.DataFrame(rows, columns=['review_id', 'rating', 'comment', 'review_date']))
+                if rows or modified or self.baseline != baseline:
+                    self._save()
+            self._checked_at = time.time()
+        return self
+
+    STATE = ['terms', 'review_ids', 'dates', 'ratings', 'post_terms', 'post_rows', 'offsets', 'term_days',
+             'last_review_ids', 'baseline']
+
+    def _load(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+        with open(self.path, 'rb') as f:
+            state = pickle.load(f)
+        if state.get('format') != INDEX_FORMAT or len(state['last_review_ids']) != len(BRANCHES):
+            return   # format lama atau jumlah cabang berubah: bangun ulang
+        for key in self.STATE:
+            setattr(self, key, state[key])
+        self._vocab = {term: i for i, term in enumerate(self.terms)}
+        self._mtime = mtime
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        state = {key: getattr(self, key) for key in self.STATE}
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(dict(state, format=INDEX_FORMAT), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path)
+        self._mtime = os.path.getmtime(self.path)
+
+
+_index = None
+
+def get_review_index():
+    global _index
+    if _index is None:
+        _index = ReviewIndex()
+    return _index.refresh()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Indeks kata komentar review')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('refresh', help='tambahkan review baru ke indeks')
+    sub.add_parser('rebuild', help='bangun ulang indeks dari semua review')
+    p = sub.add_parser('search', help='cari review berdasarkan kata kunci')
+    p.add_argument('query')
+    p.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    if args.command == 'rebuild' and os.path.exists(INDEX_FILE):
+        os.remove(INDEX_FILE)
+    started = time.perf_counter()
+    index = ReviewIndex().refresh(force=True)
+    if args.command == 'search':
+        started = time.perf_counter()
+        review_ids, total = index.search(args.query, limit=args.limit)
+        print(f"{total:,} review cocok ({(time.perf_counter() - started) * 1000:.2f} ms): "
+              + ', '.join(map(str, review_ids)))
+        return
+    print(f"{len(index.review_ids):,} review · {len(index.terms):,} term · {len(index.post_rows):,} posting"
+          f" · {time.perf_counter() - started:.2f} detik")
+
+if __name__ == '__main__':
+    sys.exit(main())
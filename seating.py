@@ -0,0 +1,186 @@
+# seating.py
+# Usulan penempatan meja untuk satu tanggal: reservasi + walk-in (order Dine In tanpa reservasi).
+# Sweep waktu: rombongan diproses menurut jam datang; di setiap titik waktu (ada rombongan datang
+# atau meja kosong lagi) semua meja yang kosong dipasangkan dengan rombongan yang menunggu lewat
+# min-cost matching (scipy linear_sum_assignment). Urutan prioritas biaya:
+#   1. reservasi sebelum walk-in,
+#   2. jumlah orang yang duduk (rombongan besar didahulukan kalau meja kurang),
+#   3. kursi terbuang sekecil mungkin (meja besar tetap tersedia untuk rombongan besar),
+#   4. meja yang sudah dipesan reservasi dipertahankan kalau sama baiknya.
+# Rombongan yang belum dapat meja menunggu sampai MAX_WAIT menit, setelah itu dicatat tidak duduk.
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import linear_sum_assignment
+
+MAX_WAIT = 15            # menit rombongan boleh menunggu meja
+WALK_IN_MINUTES = 60     # lama duduk walk-in (order tidak mencatat jam selesai)
+WALK_IN_PARTY = 2        # jumlah orang walk-in (order tidak mencatat jumlah tamu)
+UNAVAILABLE = ('Maintenance',)
+
+# Bobot biaya; setiap tingkat harus lebih besar dari jumlah maksimum tingkat di bawahnya
+RESERVED_WEIGHT = 10 ** 6
+COVER_WEIGHT = 10 ** 3
+BOOKED_TABLE_BONUS = 0.5
+INFEASIBLE = 10 ** 12
+
+PLAN_COLUMNS = ['party', 'kind', 'name', 'party_size', 'arrival', 'seated', 'end', 'wait',
+                'table_id', 'table_number', 'capacity', 'wasted', 'booked_table']
+
+
+def _minutes(values):
+    """Kolom TIME (timedelta dari MySQL atau teks 'HH:MM:SS') -> menit sejak tengah malam"""
+    return (pd.to_timedelta(values.astype(str), errors='coerce').dt.total_seconds() // 60).to_numpy()
+
+def _clock(minutes):
+    minutes = int(minutes)
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+def parties_for_date(reservations, orders, date, walk_in_party=WALK_IN_PARTY, walk_in_minutes=WALK_IN_MINUTES):
+    """Rombongan satu tanggal: reservasi yang tidak batal + order Dine In tanpa reservasi"""
+    date = pd.Timestamp(date)
+    res = reservations[(reservations['reservation_date'] == date) & (reservations['status'] != 'Cancelled')]
+    start, end = _minutes(res['check_in']), _minutes(res['check_out'])
+    booked = pd.DataFrame({
+        'party': 'R' + res['reservation_id'].astype(str),
+        'kind': 'Reservasi',
+        'name': res['customer_name'].to_numpy(),
+        'party_size': res['party_size'].to_numpy(int),
+        'start': start,
+        'duration': np.where(end > start, end - start, walk_in_minutes),
+        'booked_table': res['table_id'].to_numpy(),
+    })
+
+    # Order pelanggan yang punya reservasi hari itu adalah order reservasinya sendiri
+    dine_in = orders[(orders['order_date'] == date) & (orders['service_type'] == 'Dine In')
+                     & ~orders['customer_id'].isin(res['customer_id'])]
+    order_time = pd.to_datetime(dine_in['order_time'])
+    walk_ins = pd.DataFrame({
+        'party': 'W' + dine_in['order_id'].astype(str),
+        'kind': 'Walk-in',
+        'name': dine_in['customer_name'].fillna(dine_in['guest_name']).to_numpy(),
+        'party_size': walk_in_party,
+        'start': (order_time.dt.hour * 60 + order_time.dt.minute).to_numpy(),
+        'duration': walk_in_minutes,
+        'booked_table': dine_in['table_id'].to_numpy(),
+    })
+    parties = pd.concat([booked, walk_ins], ignore_index=True)
+    return parties[parties['start'].notna()].reset_index(drop=True)
+
+def _match(sizes, reserved, booked, table_ids, capacity):
+    """Pasangan (rombongan, meja) dengan biaya minimum; pasangan yang tidak muat dibuang"""
+    waste = capacity[None, :] - sizes[:, None]
+    cost = (waste
+            - COVER_WEIGHT * sizes[:, None]
+            - RESERVED_WEIGHT * reserved[:, None]
+            - BOOKED_TABLE_BONUS * (booked[:, None] == table_ids[None, :])).astype(float)
+    cost[waste < 0] = INFEASIBLE
+    rows, cols = linear_sum_assignment(cost)
+    keep = cost[rows, cols] < INFEASIBLE
+    return rows[keep], cols[keep]
+
+def assign_tables(tables, parties, max_wait=MAX_WAIT):
+    """Sweep waktu + matching per titik waktu. Kembalikan parties dengan kolom
+    table_index (-1 = tidak duduk) dan seated (menit)"""
+    n = len(parties)
+    capacity = tables['capacity'].to_numpy(int)
+    table_ids = tables['table_id'].to_numpy()
+    free_at = np.full(len(tables), -np.inf)
+
+    order = np.lexsort((parties['kind'].to_numpy() != 'Reservasi', parties['start'].to_numpy()))
+    start = parties['start'].to_numpy(float)
+    duration = parties['duration'].to_numpy(float)
+    sizes = parties['party_size'].to_numpy(int)
+    reserved = (parties['kind'] == 'Reservasi').to_numpy()
+    booked = pd.to_numeric(parties['booked_table'], errors='coerce').fillna(-1).to_numpy()
+
+    table_index = np.full(n, -1)
+    seated = np.full(n, np.nan)
+    waiting = np.empty(0, dtype=int)
+    arrived = 0
+    now = start[order[0]] if n else 0
+    while arrived < n or len(waiting):
+        while arrived < n and start[order[arrived]] <= now:
+            arrived += 1
+        waiting = np.union1d(waiting, order[:arrived][np.isnan(seated[order[:arrived]])])
+        waiting = waiting[start[waiting] + max_wait >= now]   # yang lewat batas tunggu pergi
+
+        free = np.flatnonzero(free_at <= now)
+        if len(waiting) and len(free):
+            rows, cols = _match(sizes[waiting], reserved[waiting], booked[waiting], table_ids[free], capacity[free])
+            parties_idx, tables_idx = waiting[rows], free[cols]
+            table_index[parties_idx] = tables_idx
+            seated[parties_idx] = now
+            free_at[tables_idx] = now + duration[parties_idx]
+            waiting = np.setdiff1d(waiting, parties_idx)
+
+        # Titik waktu berikutnya: rombongan datang, meja kosong (kalau ada yang menunggu) atau batas tunggu
+        candidates = [start[order[arrived]]] if arrived < n else []
+        if len(waiting):
+            released = free_at[free_at > now]
+            if len(released):
+                candidates.append(released.min())
+            candidates.append((start[waiting] + max_wait).min() + 1)
+        if not candidates:
+            break
+        now = min(candidates)
+    return parties.assign(table_index=table_index, seated=seated)
+
+def seating_plan(tables, reservations, orders, date, max_wait=MAX_WAIT,
+                 walk_in_party=WALK_IN_PARTY, walk_in_minutes=WALK_IN_MINUTES):
+    """Usulan penempatan satu tanggal: (DataFrame rencana, ringkasan)"""
+    started = time.perf_counter()
+    tables = tables[~tables['status'].isin(UNAVAILABLE)].reset_index(drop=True)
+    parties = parties_for_date(reservations, orders, date, walk_in_party, walk_in_minutes)
+    if parties.empty or tables.empty:
+        return pd.DataFrame(columns=PLAN_COLUMNS), None
+    result = assign_tables(tables, parties, max_wait)
+
+    placed = result['table_index'].to_numpy()
+    ok = placed >= 0
+    table = tables.reindex(np.where(ok, placed, 0))
+    capacity = np.where(ok, table['capacity'].to_numpy(), np.nan)
+    table_id = np.where(ok, table['table_id'].to_numpy(), np.nan)
+    end = result['seated'] + result['duration']
+    plan = pd.DataFrame({
+        'party': result['party'],
+        'kind': result['kind'],
+        'name': result['name'],
+        'party_size': result['party_size'],
+        'arrival': result['start'].map(_clock),
+        'seated': result['seated'].map(_clock, na_action='ignore'),
+        'end': end.map(_clock, na_action='ignore'),
+        'wait': result['seated'] - result['start'],
+        'table_id': table_id,
+        'table_number': np.where(ok, table['table_number'].to_numpy(), None),
+        'capacity': capacity,
+        'wasted': capacity - result['party_size'],
+        'booked_table': result['booked_table'],
+    })
+
+    # Kursi terbuang penempatan saat ini (meja yang tercatat di reservasi/order) sebagai pembanding
+    booked = pd.to_numeric(result['booked_table'], errors='coerce')
+    current_wasted = booked.map(tables.set_index('table_id')['capacity']) - result['party_size']
+    summary = {
+        'parties': len(plan),
+        'seated': int(ok.sum()),
+        'covers': int(result['party_size'].sum()),
+        'seated_covers': int(result['party_size'][ok].sum()),
+        'wasted_seats': int(np.nansum(plan['wasted'])),
+        'current_wasted_seats': int(current_wasted.clip(lower=0).sum()),
+        'moved': int((ok & booked.notna().to_numpy() & (table_id != booked.to_numpy())).sum()),
+        'avg_wait': float(plan['wait'].mean()) if ok.any() else 0.0,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+    return plan.sort_values(['arrival', 'party']).reset_index(drop=True), summary
+
+def plan_timeline(plan, date):
+    """Baris rencana yang dapat meja, dengan waktu mulai/selesai sebagai datetime (untuk grafik)"""
+    seated = plan[plan['table_number'].notna()]
+    day = pd.Timestamp(date)
+    return seated.assign(
+        Mulai=day + pd.to_timedelta(seated['seated'] + ':00'),
+        Selesai=day + pd.to_timedelta(seated['end'] + ':00'),
+        Meja='Meja ' + seated['table_number'].astype(str),
+    )
@@ -0,0 +1,302 @@
+# sketches.py
+# Ringkasan perkiraan (sketch) per hari untuk mode perkiraan di Dashboard dan Order Details:
+# jumlah order dan revenue (tepat), HyperLogLog untuk customer unik, t-digest untuk nilai order.
+# Sketch setiap hari bisa digabung (merge), jadi rentang multi-tahun cukup menggabungkan
+# beberapa ratus sketch kecil tanpa membaca ulang Order_Details.
+# Store di-update bertahap dari view_order_totals seperti customer_stats: order di jendela
+# re-fold dibaca ulang setiap refresh, perubahan Order_Details lama memicu rebuild penuh.
+import os
+import time
+import pickle
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+from cache import CACHE_DIR, get_backend
+from config import view_order_totals, BRANCHES
+from customer_stats import (advance_high_water, split_settled, detect_changes,
+                            REFOLD_WINDOW, ORDER_COLUMNS)
+
+SKETCH_FILE = os.path.join(CACHE_DIR, 'daily_sketches.pkl')
+REFRESH_INTERVAL = 30   # detik minimal antar pengecekan order baru
+
+HLL_PRECISION = 12      # 4096 register, standard error 1.04 / sqrt(4096) = 1.6%
+TDIGEST_COMPRESSION = 100
+Z_95 = 1.96
+
+
+class HyperLogLog:
+    """Perkiraan jumlah nilai unik; merge = maksimum register"""
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, values):
+        values = pd.Series(values).dropna()
+        if values.empty:
+            return
+        hashes = pd.util.hash_array(values.astype(str).to_numpy())
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        # Sisa bit (64 - precision) dipakai untuk menghitung posisi bit 1 pertama.
+        # Digeser ke bawah 2^52 supaya konversi ke float tetap tepat.
+        rest = ((hashes << np.uint64(self.precision)) >> np.uint64(self.precision)).astype(np.float64)
+        _, bit_length = np.frexp(rest)
+        rank = (64 - self.precision - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(int)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting untuk jumlah kecil
+            estimate = m * np.log(m / zeros)
+        return float(estimate)
+
+    def error_bound(self, estimate):
+        """Setengah lebar interval 95%"""
+        return float(Z_95 * 1.04 / np.sqrt(len(self.registers)) * estimate)
+
+
+class TDigest:
+    """Perkiraan persentil dari centroid (mean, bobot); merge = gabung centroid lalu kompres"""
+
+    def __init__(self, compression=TDIGEST_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def total(self):
+        return float(self.weights.sum())
+
+    def add(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.min, self.max = min(self.min, values.min()), max(self.max, values.max())
+        self._compress(np.concatenate([self.means, values]),
+                       np.concatenate([self.weights, np.ones(len(values))]))
+
+    def merge(self, other):
+        if other.total:
+            self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+            self._compress(np.concatenate([self.means, other.means]),
+                           np.concatenate([self.weights, other.weights]))
+        return self
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        q = (np.cumsum(weights) - weights / 2) / weights.sum()
+        # Skala k1: centroid kecil di ekor distribusi, besar di tengah
+        bucket = np.floor(self.compression / np.pi * np.arcsin(2 * q - 1)).astype(np.int64)
+        _, start = np.unique(bucket, return_index=True)
+        sums = np.add.reduceat(weights, start)
+        self.means = np.add.reduceat(means * weights, start) / sums
+        self.weights = sums
+
+    def quantile(self, q):
+        if not self.total:
+            return float('nan')
+        centers = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0], centers, [self.total]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(q * self.total, positions, values))
+
+    def rank_error(self, q):
+        """Perkiraan error rank pada persentil q (setengah lebar centroid skala k1)"""
+        return np.pi * np.sqrt(q * (1 - q)) / (2 * self.compression) + 1 / max(self.total, 1)
+
+
+class DaySketch:
+    """Semua ringkasan untuk satu hari"""
+
+    def __init__(self):
+        self.orders = 0
+        self.revenue = 0.0
+        self.customers = HyperLogLog()
+        self.order_values = TDigest()
+
+    def add(self, orders):
+        self.orders += len(orders)
+        self.revenue += float(orders['order_total'].sum())
+        # customer_id bisa float kalau ada order guest (NULL); samakan dulu ke int supaya hash konsisten
+        self.customers.add(orders['customer_id'].dropna().astype('int64'))
+        self.order_values.add(orders['order_total'])
+
+    def merge(self, other):
+        self.orders += other.orders
+        self.revenue += other.revenue
+        self.customers.merge(other.customers)
+        self.order_values.merge(other.order_values)
+        return self
+
+
+def sketch_days(orders):
+    """Sketch per tanggal dari baris order (ORDER_COLUMNS)"""
+    if orders.empty:
+        return {}
+    orders = orders.assign(
+        order_total=pd.to_numeric(orders['order_total'], errors='coerce').fillna(0).astype(float),
+        order_date=pd.to_datetime(orders['order_time']).dt.date
+    )
+    days = {}
+    for day, group in orders.groupby('order_date'):
+        days[day] = DaySketch()
+        days[day].add(group)
+    return days
+
+
+class DailySketches:
+    """Store sketch per hari dengan high-water mark order_id per cabang"""
+
+    def __init__(self, path=SKETCH_FILE):
+        self.path = path
+        self.reset()
+        self.baseline = None        # (versi, order_detail_id terbesar) per cabang dari Data_Versions
+        self._mtime = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+
+    def reset(self):
+        self.days = {}
+        self.last_order_ids = (0,) * len(BRANCHES)
+        self.recent = pd.DataFrame(columns=ORDER_COLUMNS)   # order di jendela re-fold
+        self._all_days = None
+
+    def apply(self, orders):
+        """Tambahkan order final (order_id, customer_id, order_time, order_total) ke sketch harian"""
+        if orders.empty:
+            return
+        self.last_order_ids = advance_high_water(self.last_order_ids, orders['order_id'])
+        for day, sketch in sketch_days(orders).items():
+            self.days.setdefault(day, DaySketch()).merge(sketch)
+        self._all_days = None
+
+    def refresh(self, force=False):
+        """Ambil order baru sejak update terakhir lalu simpan ke disk"""
+        with self._lock:
+            if not force and time.time() - self._checked_at < REFRESH_INTERVAL:
+                return self
+            with get_backend().lock('daily_sketches'):
+                self._load()
+                modified, self.baseline = detect_changes(self.baseline, 'Order_Details', 'order_detail_id')
+                if modified:
+                    self.reset()
+                orders = pd.DataFrame(view_order_totals(self.last_order_ids), columns=ORDER_COLUMNS)
+                settled, self.recent = split_settled(orders, pd.Timestamp.now() - REFOLD_WINDOW)
+                self.apply(settled)
+                self._all_days = None
+                self._save()
+            self._checked_at = time.time()
+        return self
+
+    def all_days(self):
+        """Sketch per hari termasuk order di jendela re-fold (sketch tersimpan tidak diubah)"""
+        if self._all_days is None:
+            days = dict(self.days)
+            for day, sketch in sketch_days(self.recent).items():
+                days[day] = DaySketch().merge(self.days[day]).merge(sketch) if day in self.days else sketch
+            self._all_days = days
+        return self._all_days
+
+    def date_bounds(self):
+        days = self.all_days()
+        if not days:
+            return None, None
+        return min(days), max(days)
+
+    def combined(self, start=None, end=None):
+        """Gabungan sketch semua hari di rentang (inklusif)"""
+        days = [s for day, s in self.all_days().items()
+                if (start is None or day >= start) and (end is None or day <= end)]
+        total = DaySketch()
+        if not days:
+            return total
+        # Gabung sekaligus (satu kali kompres t-digest), bukan hari per hari
+        total.orders = sum(s.orders for s in days)
+        total.revenue = sum(s.revenue for s in days)
+        total.customers.registers = np.maximum.reduce([s.customers.registers for s in days])
+        digest = total.order_values
+        digest.min = min(s.order_values.min for s in days)
+        digest.max = max(s.order_values.max for s in days)
+        if any(s.order_values.total for s in days):
+            digest._compress(np.concatenate([s.order_values.means for s in days]),
+                             np.concatenate([s.order_values.weights for s in days]))
+        return total
+
+    def revenue_daily(self, start=None, end=None):
+        daily = pd.Series({day: s.revenue for day, s in self.all_days().items()
+                           if (start is None or day >= start) and (end is None or day <= end)}, dtype=float)
+        return daily.sort_index()
+
+    def daily_totals(self):
+        """Jumlah order dan revenue per hari (tepat), index = tanggal"""
+        all_days = self.all_days()
+        days = sorted(all_days)
+        return pd.DataFrame({
+            'total_orders': [all_days[day].orders for day in days],
+            'total_revenue': [all_days[day].revenue for day in days],
+        }, index=pd.to_datetime(days))
+
+    def _load(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+        with open(self.path, 'rb') as f:
+            state = pickle.load(f)
+        self.days, self.last_order_ids, self._mtime = state['days'], state['last_order_ids'], mtime
+        self.recent = state.get('recent', pd.DataFrame(columns=ORDER_COLUMNS))
+        self.baseline = state.get('baseline')
+        self._all_days = None
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump({'days': self.days, 'last_order_ids': self.last_order_ids,
+                         'recent': self.recent, 'baseline': self.baseline}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path)
+        self._mtime = os.path.getmtime(self.path)
+
+
+_store = None
+
+def get_sketches():
+    global _store
+    if _store is None:
+        _store = DailySketches()
+    return _store.refresh()
+
+def approx_kpis(start=None, end=None, quantiles=(0.5, 0.9)):
+    """Angka ringkasan dari sketch: nilai + setengah lebar interval 95% (0 = tepat)"""
+    sketch = get_sketches().combined(start, end)
+    customers = sketch.customers.count()
+    kpis = {
+        'total_orders': sketch.orders,
+        'total_revenue': sketch.revenue,
+        'avg_order_value': sketch.revenue / sketch.orders if sketch.orders else 0,
+        'distinct_customers': customers,
+        'distinct_customers_error': sketch.customers.error_bound(customers),
+        'order_value_quantiles': {},
+    }
+    digest = sketch.order_values
+    for q in quantiles:
+        error = digest.rank_error(q)
+        kpis['order_value_quantiles'][q] = (
+            digest.quantile(q), digest.quantile(max(q - error, 0)), digest.quantile(min(q + error, 1))
+        )
+    return kpis
@@ -0,0 +1,230 @@
+# snapshot.py
+# Snapshot HTML statis halaman Dashboard untuk layar dinding dan pemilik yang hanya melihat
+# "hari ini" dan "bulan ini". File HTML berisi KPI + grafik Plotly dan bisa disajikan sebagai
+# file biasa (nginx, atau `serve` di bawah), jadi penonton pasif tidak membuka sesi Streamlit
+# dan tidak memuat data sama sekali.
+#
+# Snapshot hanya dibuat ulang kalau versi data berubah: dengan Data_Versions cukup membandingkan
+# stempel tabel sumber (tanpa memuat data); tanpa itu dibandingkan sidik jari data yang dimuat.
+#
+#   python snapshot.py render [--force] [--cdn]   # sekali (mis. cron tiap menit)
+#   python snapshot.py watch --interval 30        # loop, render setiap ada perubahan
+#   python snapshot.py serve --port 8504          # sajikan folder snapshot
+import os
+import sys
+import json
+import time
+import html
+import argparse
+import tempfile
+from datetime import date
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import plotly.io as pio
+
+import analytics
+from cache import CACHE_DIR, get_backend
+from data import LOADERS, load_table
+from reports import REPORT_TABLES, build_dashboard, fingerprint
+
+SNAPSHOT_DIR = os.environ.get("RESTO_SNAPSHOT_DIR", os.path.join(CACHE_DIR, "snapshots"))
+SNAPSHOT_FORMAT = 1      # naikkan kalau isi/tata letak HTML berubah
+REFRESH_SECONDS = 60     # browser memuat ulang file sesering ini
+PERIODS = {
+    'today': "Hari Ini",
+    'month': "Bulan Ini",
+}
+TABLES = REPORT_TABLES["Dashboard"]
+STATE_FILE = 'snapshots.json'
+
+
+def period_range(period, today):
+    if period == 'today':
+        return today, today
+    return today.replace(day=1), today
+
+def _rupiah(value):
+    return f"Rp {value:,.0f}".replace(",", ".")
+
+def data_stamp():
+    """Stempel versi tabel sumber Dashboard, None kalau Data_Versions tidak tersedia"""
+    stamps = [getattr(LOADERS[name], 'stamp', lambda: None)() for name in TABLES]
+    if any(stamp is None for stamp in stamps):
+        return None
+    return [get_backend().get_version(), stamps]
+
+
+# RENDER
+
+KPI_ROWS = [
+    ('total_orders', "Total Order", "{:,}".format),
+    ('total_revenue', "Total Revenue", _rupiah),
+    ('avg_order_value', "Rata-rata/Order", _rupiah),
+    ('total_reservations', "Total Reservasi", "{:,}".format),
+    ('total_customers', "Total Customer", "{:,}".format),
+    ('total_menu', "Total Menu", "{:,}".format),
+    ('total_tables', "Total Meja", "{:,}".format),
+    ('avg_rating', "Rating", "{:.1f}/5".format),
+]
+
+PAGE = '''<!DOCTYPE html>
+<html lang="id">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<meta http-equiv="refresh" content="{refresh}">
+<title>{title}</title>
+<style>
+body {{ font-family: -apple-system, "Segoe UI", Roboto, sans-serif; margin: 0; padding: 16px; background: #f7f8fa; color: #222; }}
+h1 {{ font-size: 1.5rem; margin: 0 0 4px; }}
+.caption {{ color: #6c757d; font-size: .85rem; margin-bottom: 16px; }}
+.kpis {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(160px, 1fr)); gap: 12px; margin-bottom: 16px; }}
+.kpi {{ background: #fff; border-radius: 8px; padding: 12px 16px; box-shadow: 0 1px 2px rgba(0,0,0,.08); }}
+.kpi .label {{ font-size: .8rem; color: #6c757d; }}
+.kpi .value {{ font-size: 1.5rem; font-weight: 600; }}
+.kpi .delta {{ font-size: .8rem; }}
+.up {{ color: #28A745; }} .down {{ color: #C73E1D; }}
+.charts {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(420px, 1fr)); gap: 12px; }}
+.chart {{ background: #fff; border-radius: 8px; padding: 8px; box-shadow: 0 1px 2px rgba(0,0,0,.08); }}
+nav a {{ margin-right: 12px; }}
+</style>
+</head>
+<body>
+<nav>{nav}</nav>
+<h1>{title}</h1>
+<div class="caption">{caption}</div>
+<div class="kpis">{kpis}</div>
+<div class="charts">{charts}</div>
+</body>
+</html>
+'''
+
+def _kpi_card(label, value, change=None):
+    delta = ''
+    if change is not None:
+        delta = f'<div class="delta {"up" if change >= 0 else "down"}">{change:+.1%} vs periode lalu</div>'
+    return (f'<div class="kpi"><div class="label">{html.escape(label)}</div>'
+            f'<div class="value">{html.escape(value)}</div>{delta}</div>')
+
+def render_html(period, report, start, end, cdn=False):
+    """Satu file HTML mandiri: KPI, delta vs periode lalu dan grafik Dashboard"""
+    kpis, comparison = report['kpis'], report.get('comparison')
+    cards = []
+    for key, label, fmt in KPI_ROWS:
+        change = analytics.change_ratio(comparison, key) if comparison is not None and key in comparison.columns else None
+        cards.append(_kpi_card(label, fmt(kpis.get(key, 0)), change))
+
+    charts = []
+    plotlyjs = 'cdn' if cdn else True   # JS Plotly disisipkan sekali di grafik pertama
+    for fig in report['figures'].values():
+        if fig is None:
+            continue
+        charts.append(f'<div class="chart">{pio.to_html(fig, full_html=False, include_plotlyjs=plotlyjs)}</div>')
+        plotlyjs = False
+    if not charts:
+        charts.append('<div class="chart">Belum ada order pada periode ini.</div>')
+
+    nav = ' '.join(f'<a href="{name}.html">{html.escape(label)}</a>' for name, label in PERIODS.items())
+    caption = (f"{start} s/d {end} · diperbarui {time.strftime('%Y-%m-%d %H:%M:%S')}"
+               if start != end else f"{start} · diperbarui {time.strftime('%Y-%m-%d %H:%M:%S')}")
+    return PAGE.format(refresh=REFRESH_SECONDS, title=f"Dashboard {PERIODS[period]}", nav=nav,
+                       caption=html.escape(caption), kpis=''.join(cards), charts=''.join(charts))
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, path)
+
+
+# SNAPSHOT
+
+class Snapshots:
+    """Render snapshot setiap periode kalau versi data (atau tanggalnya) berubah"""
+
+    def __init__(self, directory=SNAPSHOT_DIR, cdn=False):
+        self.directory = directory
+        self.cdn = cdn
+        self.state = self._load_state()
+
+    def render(self, force=False, today=None):
+        """Kembalikan daftar periode yang dirender ulang"""
+        today = today or date.today()
+        stamp = data_stamp()
+        keys = {period: self._key(stamp, *period_range(period, today)) for period in PERIODS}
+        if stamp is not None and not force and all(self.state.get(p) == key for p, key in keys.items()):
+            return []   # tidak ada tabel yang berubah: tidak perlu memuat data
+
+        data = {name: load_table(name) for name in TABLES}
+        if stamp is None:
+            data_fingerprint = fingerprint(data)
+            keys = {period: self._key(data_fingerprint, *period_range(period, today)) for period in PERIODS}
+        rendered = []
+        for period in PERIODS:
+            if not force and self.state.get(period) == keys[period]:
+                continue
+            start, end = period_range(period, today)
+            report = build_dashboard(data, start, end)
+            _write(os.path.join(self.directory, f"{period}.html"), render_html(period, report, start, end, self.cdn))
+            self.state[period] = keys[period]
+            rendered.append(period)
+        if not os.path.exists(os.path.join(self.directory, 'index.html')):
+            _write(os.path.join(self.directory, 'index.html'),
+                   '<!DOCTYPE html><meta http-equiv="refresh" content="0; url=today.html">')
+        _write(os.path.join(self.directory, STATE_FILE), json.dumps(self.state))
+        return rendered
+
+    def _key(self, stamp, start, end):
+        return json.dumps([SNAPSHOT_FORMAT, self.cdn, stamp, str(start), str(end)], default=str)
+
+    def _load_state(self):
+        try:
+            with open(os.path.join(self.directory, STATE_FILE)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Snapshot HTML statis halaman Dashboard')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('render', help='render snapshot yang datanya berubah')
+    p.add_argument('--force', action='store_true', help='render ulang walau data tidak berubah')
+    p.add_argument('--cdn', action='store_true', help='muat plotly.js dari CDN (file jauh lebih kecil)')
+    p.add_argument('--today', type=date.fromisoformat, help='anggap hari ini tanggal ini (YYYY-MM-DD)')
+    p = sub.add_parser('watch', help='render terus setiap ada perubahan data')
+    p.add_argument('--interval', type=float, default=30, help='detik antar pengecekan')
+    p.add_argument('--cdn', action='store_true')
+    p = sub.add_parser('serve', help='sajikan folder snapshot sebagai file statis')
+    p.add_argument('--host', default='0.0.0.0')
+    p.add_argument('--port', type=int, default=8504)
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        handler = partial(SimpleHTTPRequestHandler, directory=SNAPSHOT_DIR)
+        print(f"Snapshot disajikan di http://{args.host}:{args.port}/ dari {SNAPSHOT_DIR}")
+        ThreadingHTTPServer((args.host, args.port), handler).serve_forever()
+        return
+
+    snapshots = Snapshots(cdn=args.cdn)
+    while True:
+        started = time.perf_counter()
+        try:
+            rendered = snapshots.render(force=getattr(args, 'force', False), today=getattr(args, 'today', None))
+            if rendered or args.command == 'render':
+                print(f"{time.strftime('%H:%M:%S')} dirender: {', '.join(rendered) or '-'}"
+                      f" ({time.perf_counter() - started:.2f} detik)")
+        except Exception as e:
+            if args.command == 'render':
+                raise
+            print(f"{time.strftime('%H:%M:%S')} gagal: {e}")
+        if args.command == 'render':
+            return
+        time.sleep(args.interval)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,14 @@
+# tests/conftest.py
+# Test hanya untuk logika murni (tanpa MySQL/Streamlit). Cache, arsip dan file state
+# diarahkan ke folder sementara sebelum modul aplikasi di-import.
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_scratch = tempfile.mkdtemp(prefix='resto_test_')
+os.environ.setdefault('RESTO_CACHE_DIR', os.path.join(_scratch, 'cache'))
+os.environ.setdefault('RESTO_ARCHIVE_DIR', os.path.join(_scratch, 'archive'))
+os.environ.setdefault('RESTO_BRANCHES_FILE', os.path.join(_scratch, 'branches.json'))
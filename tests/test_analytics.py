@@ -0,0 +1,99 @@
+# tests/test_analytics.py
+import pandas as pd
+import pytest
+
+import analytics
+
+
+@pytest.fixture
+def orders():
+    return pd.DataFrame({
+        'order_id': [1, 2, 3, 4],
+        'order_status': ['Completed', 'Cancelled', 'Completed', 'Completed'],
+        'service_type': ['Dine In', 'Take Away', 'Dine In', 'Dine In'],
+        'order_date': pd.to_datetime(['2024-01-01', '2024-01-01', '2024-01-02', '2024-01-05']),
+    })
+
+@pytest.fixture
+def details():
+    return pd.DataFrame({
+        'order_id': [1, 1, 3, 4],
+        'quantity': [2, 1, 3, 1],
+        'total_price': [20000.0, 15000.0, 30000.0, 10000.0],
+        'order_date': pd.to_datetime(['2024-01-01', '2024-01-01', '2024-01-02', '2024-01-05']),
+    })
+
+
+def test_filter_date_is_inclusive(orders):
+    start, end = pd.Timestamp('2024-01-01').date(), pd.Timestamp('2024-01-02').date()
+    assert analytics.filter_date(orders, 'order_date', start, end)['order_id'].tolist() == [1, 2, 3]
+    assert len(analytics.filter_date(orders, 'order_date')) == 4
+
+def test_order_kpis(orders, details):
+    kpis = analytics.order_kpis(orders, details)
+    assert kpis == {'total_orders': 4, 'total_revenue': 75000.0, 'avg_order_value': 18750.0}
+    assert analytics.order_kpis(orders.iloc[:0], details.iloc[:0])['avg_order_value'] == 0
+
+def test_detail_kpis_counts_orders_with_details(details):
+    kpis = analytics.detail_kpis(details)
+    assert kpis['total_qty'] == 7
+    assert kpis['total_transaksi'] == 3
+    assert kpis['avg_per_order'] == pytest.approx(25000.0)
+
+def test_branch_kpis_network_average_is_weighted():
+    summary = pd.DataFrame({
+        'branch': ['A', 'B'], 'order_date': pd.to_datetime(['2024-01-01', '2024-01-01']),
+        'orders': [1, 3], 'revenue': [100.0, 100.0],
+    })
+    table = analytics.branch_kpis(summary).set_index('branch')
+    assert table.at['Semua Cabang', 'orders'] == 4
+    assert table.at['Semua Cabang', 'avg_order_value'] == 50.0
+
+def test_order_status_counts(orders):
+    assert analytics.order_status_counts(orders) == {
+        'total': 4, 'completed': 3, 'cancelled': 1, 'dine_in': 3, 'take_away': 1}
+
+def test_sample_total_full_sample_is_exact(details):
+    total, error = analytics.sample_total(details['quantity'], details['order_id'], 1.0)
+    assert (total, error) == (7, 0)
+
+def test_sample_total_scales_and_bounds(details):
+    total, error = analytics.sample_total(details['total_price'], details['order_id'], 0.5)
+    assert total == pytest.approx(150000.0)
+    # Varians Horvitz-Thompson dari total per order: 35rb, 30rb, 10rb
+    assert error == pytest.approx(1.96 * (0.5 / 0.25 * (35000 ** 2 + 30000 ** 2 + 10000 ** 2)) ** 0.5)
+
+def test_sample_kpis_count_same_orders_as_exact(details):
+    exact = analytics.detail_kpis(details)
+    sample = analytics.sample_detail_kpis(details, 1.0)
+    assert sample['total_transaksi'] == exact['total_transaksi'] == 3
+    assert sample['total_transaksi_error'] == 0
+    assert analytics.sample_detail_kpis(details, 0.1)['total_transaksi'] == pytest.approx(30)
+
+def test_comparison_windows_same_length_and_weekday():
+    start, end = pd.Timestamp('2024-03-04').date(), pd.Timestamp('2024-03-10').date()
+    windows = analytics.comparison_windows(start, end)
+    assert windows['previous'] == (pd.Timestamp('2024-02-26').date(), pd.Timestamp('2024-03-03').date())
+    assert windows['last_year'][0].weekday() == start.weekday()
+
+@pytest.mark.parametrize('start, end', [('2024-01-02', '2024-01-05'), ('2024-01-01', '2024-01-01')])
+def test_window_comparisons_match_single_period_kpis(orders, details, start, end):
+    start, end = pd.Timestamp(start).date(), pd.Timestamp(end).date()
+    windows = analytics.comparison_windows(start, end)
+    order_cmp = analytics.order_comparison(orders, details, start, end)
+    status_cmp = analytics.status_comparison(orders, start, end)
+    detail_cmp = analytics.detail_comparison(details, start, end)
+    for window, (first, last) in windows.items():
+        o = analytics.filter_date(orders, 'order_date', first, last)
+        d = analytics.filter_date(details, 'order_date', first, last)
+        assert order_cmp.loc[window].to_dict() == pytest.approx(analytics.order_kpis(o, d))
+        assert status_cmp.loc[window].to_dict() == pytest.approx(analytics.order_status_counts(o))
+        expected = analytics.detail_kpis(d) if not d.empty else {
+            'total_qty': 0, 'total_revenue': 0, 'avg_per_order': 0, 'total_transaksi': 0}
+        assert detail_cmp.loc[window].to_dict() == pytest.approx(expected)
+
+def test_change_ratio_without_base_is_none(orders, details):
+    start = end = pd.Timestamp('2024-01-02').date()
+    comparison = analytics.order_comparison(orders, details, start, end)
+    assert analytics.change_ratio(comparison, 'total_orders') == -0.5
+    assert analytics.change_ratio(comparison, 'total_orders', against='last_year') is None
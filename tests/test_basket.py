@@ -0,0 +1,67 @@
+# tests/test_basket.py
+import threading
+
+import pandas as pd
+import pytest
+
+import basket
+
+
+@pytest.fixture
+def details():
+    # Nasi + Teh di 3 dari 4 order, Kopi sendirian
+    rows = [(1, 10, 'Nasi'), (1, 20, 'Teh'), (2, 10, 'Nasi'), (2, 20, 'Teh'), (2, 20, 'Teh'),
+            (3, 10, 'Nasi'), (3, 20, 'Teh'), (4, 30, 'Kopi')]
+    df = pd.DataFrame(rows, columns=['order_id', 'menu_id', 'item_name'])
+    df['order_date'] = pd.Timestamp('2024-01-01')
+    return df
+
+
+def test_incidence_matrix_counts_menu_once_per_order(details):
+    matrix, menu_ids = basket.incidence_matrix(details)
+    assert matrix.shape == (4, 3)
+    assert menu_ids.tolist() == [10, 20, 30]
+    assert matrix.toarray()[1].tolist() == [1, 1, 0]
+
+def test_co_occurrence_support_confidence_lift(details):
+    pairs = basket.co_occurrence(details)
+    assert len(pairs) == 1
+    pair = pairs.iloc[0]
+    assert (pair['item_a'], pair['item_b'], pair['orders']) == ('Nasi', 'Teh', 3)
+    assert pair['support'] == pytest.approx(0.75)
+    assert pair['confidence_ab'] == pytest.approx(1.0)
+    assert pair['lift'] == pytest.approx(3 * 4 / (3 * 3))
+
+def test_min_orders_filters_rare_pairs(details):
+    assert basket.co_occurrence(details, min_orders=4).empty
+    assert basket.co_occurrence(details.iloc[:0]).empty
+
+def test_basket_pairs_cache_keyed_on_stamp(details, monkeypatch):
+    monkeypatch.setattr(basket, '_cache', basket.OrderedDict())
+    calls = []
+    real = basket.co_occurrence
+    monkeypatch.setattr(basket, 'co_occurrence', lambda *args: calls.append(1) or real(*args))
+    basket.basket_pairs(details, stamp=(0, (1,)))
+    basket.basket_pairs(details, stamp=(0, (1,)))
+    basket.basket_pairs(details.iloc[:3], stamp=(0, (2,)))
+    assert len(calls) == 2
+
+def test_basket_pairs_cache_is_bounded_under_threads(details, monkeypatch):
+    monkeypatch.setattr(basket, '_cache', basket.OrderedDict())
+    monkeypatch.setattr(basket, 'MAX_CACHE', 4)
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(50):
+                basket.basket_pairs(details, stamp=(offset + i) % 7)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert len(basket._cache) <= 4
@@ -0,0 +1,42 @@
+# tests/test_cache.py
+import cache
+
+
+def test_get_or_compute_memoizes_per_arguments(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, '_backend', cache.DiskCache(str(tmp_path)))
+    calls = []
+
+    def compute(x):
+        calls.append(x)
+        return x * 2
+
+    assert cache.get_or_compute('q', lambda: compute(1), (1,)) == 2
+    assert cache.get_or_compute('q', lambda: compute(1), (1,)) == 2
+    assert cache.get_or_compute('q', lambda: compute(2), (2,)) == 4
+    assert calls == [1, 2]
+
+def test_invalidate_forces_recompute(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, '_backend', cache.DiskCache(str(tmp_path)))
+    calls = []
+    cache.get_or_compute('q', lambda: calls.append(1) or 1)
+    cache.invalidate()
+    cache.get_or_compute('q', lambda: calls.append(1) or 1)
+    assert len(calls) == 2
+
+def test_new_stamp_discards_old_entries(monkeypatch):
+    backend = cache.MemoryCache()
+    monkeypatch.setattr(cache, '_backend', backend)
+    cache.get_or_compute('q', lambda: 'lama', stamp=(1,))
+    assert cache.get_or_compute('q', lambda: 'baru', stamp=(2,)) == 'baru'
+    assert [key for key in backend._data if '@' in key] == [cache.make_key('q', stamp=(2,))]
+
+def test_shared_cache_exposes_stamp(monkeypatch):
+    monkeypatch.setattr(cache, '_backend', cache.MemoryCache())
+    stamp = lambda: (1,)
+
+    @cache.shared_cache('view_x', stamp=stamp)
+    def view_x(n):
+        return [n]
+
+    assert view_x(3) == [3]
+    assert view_x.stamp is stamp
@@ -0,0 +1,54 @@
+# tests/test_charts.py
+from collections import OrderedDict
+
+import pandas as pd
+import pytest
+
+import charts
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(charts, '_figures', OrderedDict())
+    monkeypatch.setattr(charts, '_figure_stats', {'hits': 0, 'misses': 0})
+
+@pytest.fixture
+def top_menu():
+    return pd.DataFrame({'Menu': ['Nasi', 'Teh', 'Kopi'], 'Terjual': [10, 7, 3]})
+
+
+def test_same_data_returns_cached_spec(top_menu):
+    first = charts.create_bar_chart(top_menu, 'Menu', 'Terjual', 'Top')
+    second = charts.create_bar_chart(top_menu.copy(), 'Menu', 'Terjual', 'Top')
+    assert isinstance(first, dict) and second is first
+    assert charts.chart_cache_info()['hits'] == 1
+
+def test_to_figure_leaves_cached_spec_untouched(top_menu):
+    fig = charts.to_figure(charts.create_bar_chart(top_menu, 'Menu', 'Terjual', 'Top'))
+    fig.update_layout(title_text='diubah pemanggil')
+    assert charts.create_bar_chart(top_menu, 'Menu', 'Terjual', 'Top')['layout']['title']['text'] == 'Top'
+
+def test_parameters_are_part_of_key(top_menu):
+    charts.create_bar_chart(top_menu, 'Menu', 'Terjual', 'Top')
+    charts.create_bar_chart(top_menu, 'Menu', 'Terjual', 'Top', horizontal=True)
+    charts.create_bar_chart(top_menu.assign(Terjual=[10, 7, 4]), 'Menu', 'Terjual', 'Top')
+    assert charts.chart_cache_info()['misses'] == 3
+
+def test_heatmap_labels_from_index_are_hashed():
+    values = [[1, 2], [3, 4]]
+    first = charts.create_heatmap_chart(pd.DataFrame(values, index=['Nasi', 'Teh'], columns=[10, 11]))
+    second = charts.create_heatmap_chart(pd.DataFrame(values, index=['Kopi', 'Roti'], columns=[10, 11]))
+    assert list(first['data'][0]['y']) == ['Nasi', 'Teh']
+    assert list(second['data'][0]['y']) == ['Kopi', 'Roti']
+
+def test_series_index_is_hashed():
+    a = pd.Series([1.0, 2.0], index=pd.to_datetime(['2024-01-01', '2024-01-02']))
+    b = pd.Series([1.0, 2.0], index=pd.to_datetime(['2024-02-01', '2024-02-02']))
+    assert charts._fingerprint(a) != charts._fingerprint(b)
+    assert charts._fingerprint(a) == charts._fingerprint(a.copy())
+
+def test_lru_is_bounded(top_menu, monkeypatch):
+    monkeypatch.setattr(charts, 'MAX_FIGURES', 2)
+    for title in ['a', 'b', 'c']:
+        charts.create_pie_chart(top_menu['Terjual'], top_menu['Menu'], title)
+    assert charts.chart_cache_info()['size'] == 2
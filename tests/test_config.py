@@ -0,0 +1,161 @@
+# tests/test_config.py
+import os
+import sys
+import subprocess
+
+import pytest
+
+import config
+from config import BRANCH_ID_STRIDE
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def two_branches(monkeypatch):
+    monkeypatch.setattr(config, 'BRANCHES', [{'name': 'Pusat'}, {'name': 'Timur'}])
+    monkeypatch.setattr(config, 'BRANCH_NAMES', ['Pusat', 'Timur'])
+
+
+def per_branch(rows):
+    """View palsu: hasil tergantung cabang aktif"""
+    return lambda *args: rows[config.current_branch()]
+
+
+def test_fan_out_sum_merges_by_key(two_branches):
+    view = config.fan_out('sum', keys=(0,), sums=(2,), order_by=2)(per_branch([
+        [(1, 'Nasi', 10), (2, 'Teh', 4)],
+        [(2, 'Teh', 9), (3, 'Kopi', 1)],
+    ]))
+    assert view() == [(2, 'Teh', 13), (1, 'Nasi', 10), (3, 'Kopi', 1)]
+
+def test_fan_out_concat_namespaces_ids(two_branches):
+    view = config.fan_out('concat', ids=(0, 1), order_by=2)(per_branch([
+        [(5, None, '2024-01-02')],
+        [(5, 7, '2024-01-03'), (6, 8, None)],
+    ]))
+    assert view() == [(BRANCH_ID_STRIDE + 5, BRANCH_ID_STRIDE + 7, '2024-01-03'), (5, None, '2024-01-02'),
+                      (BRANCH_ID_STRIDE + 6, BRANCH_ID_STRIDE + 8, None)]
+
+def test_fan_out_label_and_branch_value(two_branches):
+    view = config.fan_out('label')(lambda after: [('Orders', config.branch_value(after))])
+    assert view((3, 9)) == [('Pusat', 'Orders', 3), ('Timur', 'Orders', 9)]
+
+def test_single_branch_calls_view_directly(monkeypatch):
+    monkeypatch.setattr(config, 'BRANCHES', [{'name': 'Pusat'}])
+    view = config.fan_out('concat', ids=(0,), order_by=0)(lambda: [(1,), (3,), (2,)])
+    assert view() == [(1,), (3,), (2,)]
+
+def test_on_branch_restores_previous_branch():
+    with config.on_branch(1):
+        with config.on_branch(0):
+            assert config.current_branch() == 0
+        assert config.current_branch() == 1
+    assert config.current_branch() == 0
+
+def test_version_triggers_for_every_table_and_event():
+    statements = config.version_setup_statements()
+    triggers = [sql.split()[2] for sql in statements if sql.startswith('CREATE TRIGGER')]
+    assert len(triggers) == len(config.VERSIONED_TABLES) * 3
+    assert 'order_details_version_delete' in triggers
+
+def test_version_triggers_spread_over_slots(monkeypatch):
+    statements = config.version_setup_statements(migrate=True)
+    assert statements[1].startswith('ALTER TABLE Data_Versions ADD COLUMN slot')
+    assert all(f'CONNECTION_ID() % {config.VERSION_SLOTS}' in sql for sql in statements if 'CREATE TRIGGER' in sql)
+    # Database lama tanpa kolom slot dimigrasikan, yang baru tidak
+    monkeypatch.setattr(config, 'BRANCHES', [{'name': 'Pusat'}, {'name': 'Timur'}])
+    monkeypatch.setattr(config, 'run_query', lambda sql: [('table_name',), ('version',)] if config.current_branch()
+                        else [('table_name',), ('slot',), ('version',)])
+    assert sum(sql.startswith('ALTER TABLE Data_Versions') for sql in config.setup_versions(dry_run=True)) == 1
+
+def test_table_versions_poll_once_per_interval(two_branches, monkeypatch):
+    polls = []
+    rows = [('Pusat', 'Menu', 3), ('Pusat', 'Orders', 10), ('Timur', 'Menu', 3), ('Timur', 'Orders', 7)]
+    monkeypatch.setattr(config, 'view_data_versions', lambda: polls.append(1) or rows)
+    versions = config.TableVersions(interval=60)
+    assert versions.stamp(['Orders', 'Menu']) == (10, 3, 7, 3)
+    assert versions.branch_versions(1) == {'Menu': 3, 'Orders': 7}
+    # Versi baru di database belum terlihat sampai interval poll lewat
+    rows[1] = ('Pusat', 'Orders', 11)
+    assert versions.stamp(['Orders']) == (10, 7)
+    assert len(polls) == 1
+
+def test_table_versions_without_data_versions(monkeypatch):
+    def missing():
+        raise RuntimeError("Table 'Data_Versions' doesn't exist")
+    monkeypatch.setattr(config, 'view_data_versions', missing)
+    versions = config.TableVersions(interval=0)
+    assert versions.stamp(['Menu']) is None
+    assert versions.branch_versions(0) is None
+    assert versions._next_poll > config.time.time() + config.VERSION_RETRY_INTERVAL - 5
+
+
+class FakeReplicas:
+    """Pool palsu per replika: Data_Versions dan Seconds_Behind_Source bisa diatur per replika"""
+
+    def __init__(self, monkeypatch, versions, primary):
+        self.versions = versions      # replika -> {tabel: versi}
+        self.lag = {}
+        self.reads = []
+        monkeypatch.setattr(config, 'BRANCHES', [{'name': 'Pusat', 'replicas': [{}] * len(versions)}])
+        monkeypatch.setattr(config, 'get_pool', lambda index=None, replica=None: ('pool', replica))
+        monkeypatch.setattr(config.table_versions, 'branch_versions', lambda index: primary)
+        monkeypatch.setattr(config, '_fetch_all', self.fetch_all)
+        monkeypatch.setattr(config, '_seconds_behind', lambda pool: self.lag[pool[1]])
+
+    def fetch_all(self, pool, sql, params=()):
+        replica = pool[1]
+        if 'Data_Versions' in sql:
+            return list(self.versions[replica].items())
+        self.reads.append(replica)
+        return [('hasil', replica)]
+
+
+def test_router_round_robins_caught_up_replicas(monkeypatch):
+    FakeReplicas(monkeypatch, [{'Orders': 5}, {'Orders': 5}], primary={'Orders': 5})
+    router = config.ReplicaRouter()
+    assert [router.pick(0) for _ in range(3)] == [0, 1, 0]
+    assert router.metrics()['replica_reads'] == 3
+
+def test_router_skips_lagging_replica_and_falls_back_to_primary(monkeypatch):
+    fake = FakeReplicas(monkeypatch, [{'Orders': 4}, {'Orders': 5}], primary={'Orders': 5})
+    router = config.ReplicaRouter()
+    assert [router.pick(0) for _ in range(2)] == [1, 1]
+    fake.versions[1] = {'Orders': 4}
+    router._caught_up.clear()
+    assert router.pick(0) is None
+    assert router.metrics()['primary_fallbacks'] == 1
+    assert router.status[(0, 0)] == '1 tabel tertinggal'
+
+def test_router_uses_seconds_behind_without_data_versions(monkeypatch):
+    fake = FakeReplicas(monkeypatch, [{}, {}], primary=None)
+    fake.lag = {0: config.MAX_REPLICA_LAG + 1, 1: None}
+    assert config.ReplicaRouter().pick(0) is None
+    fake.lag = {0: 0.0, 1: None}
+    assert config.ReplicaRouter().pick(0) == 0
+
+def test_run_query_reads_replica_only_inside_replica_read(monkeypatch):
+    fake = FakeReplicas(monkeypatch, [{'Orders': 5}], primary={'Orders': 5})
+    monkeypatch.setattr(config, 'replica_router', config.ReplicaRouter())
+    assert config.run_query('SELECT 1') == [('hasil', None)]
+    assert config.replica_read(lambda: config.run_query('SELECT 1'))() == [('hasil', 0)]
+    assert fake.reads == [None, 0]
+
+def test_failed_replica_read_marks_down_and_uses_primary(monkeypatch):
+    fake = FakeReplicas(monkeypatch, [{'Orders': 5}], primary={'Orders': 5})
+    router = config.ReplicaRouter()
+    monkeypatch.setattr(config, 'replica_router', router)
+
+    def fetch_all(pool, sql, params=()):
+        if pool[1] == 0 and 'Data_Versions' not in sql:
+            raise ConnectionError("replika mati")
+        return fake.fetch_all(pool, sql, params)
+    monkeypatch.setattr(config, '_fetch_all', fetch_all)
+    assert config.replica_read(lambda: config.run_query('SELECT 1'))() == [('hasil', None)]
+    assert router.pick(0) is None and router.metrics()['errors'] == 1
+
+def test_import_does_not_connect():
+    code = "import sys, config; print('mysql.connector' in sys.modules, len(config._pools))"
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ['False', '0']
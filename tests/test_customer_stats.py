@@ -0,0 +1,116 @@
+# tests/test_customer_stats.py
+import pandas as pd
+import pytest
+
+import customer_stats
+from config import BRANCH_ID_STRIDE
+
+
+def orders_frame(rows):
+    return pd.DataFrame(rows, columns=customer_stats.ORDER_COLUMNS)
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(customer_stats, 'BRANCHES', [{'name': 'Pusat'}])
+    monkeypatch.setattr(customer_stats, 'BRANCH_NAMES', ['Pusat'])
+    return customer_stats.CustomerStats(path=str(tmp_path / 'stats.pkl'))
+
+
+def test_spending_segment_edges_are_right_inclusive():
+    assert customer_stats.spending_segment([100000, 100001, 6000000]).tolist() == ['< 100rb', '100rb-500rb', '> 5jt']
+
+def test_quintile_score_ties_share_a_score():
+    assert customer_stats.quintile_score([1, 1, 1, 1, 9]).tolist() == [3, 3, 3, 3, 5]
+    assert customer_stats.quintile_score([1, 2, 3, 4, 5], reverse=True).tolist() == [5, 4, 3, 2, 1]
+
+def test_advance_high_water_per_branch():
+    ids = [5, 3, BRANCH_ID_STRIDE + 7]
+    assert customer_stats.advance_high_water((4, 9), ids) == (5, 9)
+
+def test_split_settled_stops_at_first_recent_order():
+    cutoff = pd.Timestamp('2024-01-10')
+    orders = orders_frame([
+        (1, 1, '2024-01-01 00:00:00', 10), (2, 1, '2024-01-10 08:00:00', 10),
+        (3, 2, '2024-01-09 00:00:00', 10), (BRANCH_ID_STRIDE + 1, 2, '2024-01-09 00:00:00', 10),
+    ])
+    settled, recent = customer_stats.split_settled(orders, cutoff)
+    # Order 3 lebih lama dari cutoff tapi id-nya di atas order 2 yang masih baru
+    assert settled['order_id'].tolist() == [1, BRANCH_ID_STRIDE + 1]
+    assert recent['order_id'].tolist() == [2, 3]
+
+def test_table_includes_recent_orders(store):
+    store.apply(orders_frame([(1, 7, '2024-01-01', 100.0), (2, None, '2024-01-02', 50.0)]))
+    store.recent = orders_frame([(3, 7, '2024-01-05', 25.0)])
+    table = store.table()
+    assert store.last_order_ids == (2,)
+    assert table.loc[7, 'lifetime_spend'] == 125.0
+    assert table.loc[7, 'order_count'] == 2
+    assert table.loc[7, 'last_visit'] == pd.Timestamp('2024-01-05')
+
+def table_changes(monkeypatch, versions):
+    """view_table_changes palsu: daftar (versi, baris baru, id terbesar) per tabel, satu per refresh.
+    Tabel tanpa daftar tidak pernah berubah."""
+    def view_table_changes(table, id_column, after):
+        rows = versions.get(table)
+        return [('Pusat',) + (rows.pop(0) if rows else (1, 0, 1))]
+    monkeypatch.setattr(customer_stats, 'view_table_changes', view_table_changes)
+    return versions
+
+def test_refresh_refolds_window_and_rebuilds_on_update(store, monkeypatch):
+    now = pd.Timestamp.now()
+    history = [(1, 7, now - pd.Timedelta(days=3), 100.0), (2, 8, now - pd.Timedelta(hours=1), 40.0)]
+    calls = []
+
+    def view_order_totals(after):
+        calls.append(after)
+        return [row for row in history if row[0] > after[0]]
+
+    # (versi, baris baru, id terbesar) Order_Details; refresh pertama hanya mencatat baseline
+    table_changes(monkeypatch, {'Order_Details': [(10, 0, 5), (12, 2, 7), (15, 0, 7)]})
+    monkeypatch.setattr(customer_stats, 'view_order_totals', view_order_totals)
+
+    store.refresh(force=True)
+    assert store.last_order_ids == (1,)
+    assert store.table().loc[8, 'lifetime_spend'] == 40.0
+
+    # Item menyusul untuk order 2 (masih di jendela): cukup dibaca ulang
+    history[1] = (2, 8, history[1][2], 55.0)
+    store.refresh(force=True)
+    assert calls[-1] == (1,)
+    assert store.table().loc[8, 'lifetime_spend'] == 55.0
+
+    # Harga order lama diedit: versi naik tanpa baris baru -> rebuild dari awal
+    history[0] = (1, 7, history[0][2], 90.0)
+    store.refresh(force=True)
+    assert calls[-1] == (0,)
+    assert store.table().loc[7, 'lifetime_spend'] == 90.0
+
+def test_detect_changes_without_data_versions(monkeypatch):
+    def missing(*args):
+        raise RuntimeError("Table 'Data_Versions' doesn't exist")
+    monkeypatch.setattr(customer_stats, 'view_table_changes', missing)
+    assert customer_stats.detect_changes(((1, 1),), 'Order_Details', 'order_detail_id') == (False, None)
+
+def test_remap_merges_customers(store):
+    store.apply(orders_frame([(1, 7, '2024-01-01', 100.0), (2, 9, '2024-02-01', 50.0)]))
+    store.remap({9: 7})
+    table = store.table()
+    assert table.index.tolist() == [7]
+    assert table.loc[7, 'order_count'] == 2
+
+@pytest.mark.parametrize('table', ['Orders', 'Customers'])
+def test_refresh_rebuilds_when_orders_or_customers_change(store, monkeypatch, table):
+    history = [(1, 7, pd.Timestamp('2024-01-01'), 100.0)]
+    calls = []
+
+    def view_order_totals(after):
+        calls.append(after)
+        return [row for row in history if row[0] > after[0]]
+    monkeypatch.setattr(customer_stats, 'view_order_totals', view_order_totals)
+    # Versi naik tanpa baris baru: order dipindah ke customer lain / customer dihapus
+    table_changes(monkeypatch, {table: [(4, 0, 9), (5, 0, 9)]})
+    store.refresh(force=True)
+    history[0] = (1, 8, history[0][2], 100.0)
+    store.refresh(force=True)
+    assert calls == [(0,), (0,)]
+    assert store.table().index.tolist() == [8]
@@ -0,0 +1,44 @@
+# tests/test_data.py
+from collections import OrderedDict
+
+import pandas as pd
+import pytest
+
+import analytics
+import data
+
+ORDERS = [
+    (1, 7, None, 'Dine In', 3, 1, 'Completed', '2024-01-01 12:00:00', 'Tunai', 3, 'Budi', '2024-01-01'),
+    (2, None, 'Tamu', 'Take Away', None, 1, 'Cancelled', '2024-01-02 19:30:00', 'Tunai', None, None, '2024-01-02'),
+]
+
+
+@pytest.fixture
+def orders_view(monkeypatch):
+    state = {'stamp': (1,), 'calls': 0}
+
+    def view_orders(start=None, end=None):
+        state['calls'] += 1
+        return ORDERS
+    view_orders.stamp = lambda: state['stamp']
+    monkeypatch.setitem(data.LOADERS, 'orders', view_orders)
+    monkeypatch.setattr(data, '_frames', OrderedDict())
+    return state
+
+
+def test_frame_shared_until_stamp_changes(orders_view):
+    first = data.load_table('orders')
+    assert data.load_table('orders') is first
+    orders_view['stamp'] = (2,)
+    assert data.load_table('orders') is not first
+    assert orders_view['calls'] == 2
+
+def test_page_derivations_leave_shared_frame_untouched(orders_view):
+    base = data.load_table('orders')
+    before = base.copy()
+    # Pola halaman: filter tanpa .copy(), lalu kolom turunan ditulis ke hasil filter
+    view = analytics.filter_date(base, 'order_date', pd.Timestamp('2024-01-01').date(), pd.Timestamp('2024-01-01').date())
+    view['order_status'] = 'Diubah'
+    view.loc[:, 'order_id'] = 99
+    analytics.orders_hourly(base)
+    pd.testing.assert_frame_equal(data.load_table('orders'), before)
@@ -0,0 +1,109 @@
+# tests/test_dedup.py
+import os
+import datetime
+
+import pandas as pd
+import pytest
+
+import config
+import dedup
+import partitions
+
+
+CUSTOMERS = ['customer_id', 'customer_name', 'email', 'phone']
+
+
+def customers(rows):
+    return pd.DataFrame(rows, columns=dedup.CUSTOMER_COLUMNS)
+
+
+def test_normalize_names_drops_affixes_and_punctuation():
+    names = pd.Series(['Mary Vega DDS', '  mary   vega ', 'Dr. John O\'Neil Jr', None])
+    assert dedup.normalize_names(names).tolist() == ['mary vega', 'mary vega', 'john o neil', '']
+
+def test_normalize_emails_keeps_domain_and_only_folds_gmail():
+    emails = pd.Series(['Mary.Vega+promo@Gmail.com', 'maryvega@googlemail.com', 'mary.vega@yahoo.com',
+                        'maryvega@yahoo.com', 'tanpa-at', None])
+    normalized = dedup.normalize_emails(emails)
+    assert normalized[:4].tolist() == ['maryvega@gmail.com', 'maryvega@gmail.com',
+                                       'mary.vega@yahoo.com', 'maryvega@yahoo.com']
+    assert normalized[4:].isna().all()
+
+def test_normalize_phones_matches_local_and_international():
+    phones = pd.Series(['0812-3456-7890', '+62 812 3456 7890', '123', None])
+    normalized = dedup.normalize_phones(phones)
+    assert normalized[0] == normalized[1] == '234567890'
+    assert normalized[2:].isna().all()
+
+def test_soundex():
+    assert [dedup.soundex(t) for t in ['robert', 'rupert', 'ashcraft', 'tymczak', '']] == \
+        ['R163', 'R163', 'A261', 'T522', '']
+
+def test_same_local_part_on_other_domain_is_not_a_contact_match():
+    df = customers([(1, 'Andi Wijaya', 'andi@yahoo.com', None), (2, 'Anda Wijoyo', 'andi@hotmail.com', None)])
+    keys = dedup.blocking_keys(df)
+    name, contact, score = dedup.score_pairs(keys, [0], [1])
+    assert not contact[0]
+    assert score[0] == pytest.approx(name[0] - dedup.CONFLICT_PENALTY)
+
+def test_find_duplicates_groups_and_keeps_smallest_id():
+    df = customers([
+        (3, 'Mary Vega DDS', 'mary.vega@gmail.com', None),
+        (7, 'mary vega', 'maryvega+resto@gmail.com', '0812 1111 2222'),
+        (9, 'Marry Vega', None, '+62 812 1111 2222'),
+        (4, 'John Smith', 'john@mail.id', None),
+    ])
+    proposals, stats = dedup.find_duplicates(df)
+    assert proposals[['customer_id', 'keep_id']].values.tolist() == [[7, 3], [9, 3]]
+    assert stats['groups'] == 1 and stats['customers'] == 4
+
+def test_apply_merges_runs_every_branch_first_branch_last(monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(dedup, 'BRANCHES', [{'name': 'Pusat'}, {'name': 'Timur'}])
+    monkeypatch.setattr(dedup, 'merge_batch', lambda batch, branch: calls.append((branch, batch)) or
+                        {'Orders': 1, 'Reservations': 0, 'Reviews': 0, 'Customers': len(batch)})
+    monkeypatch.setattr(dedup, 'CustomerStats', lambda: type('Stats', (), {'remap': lambda self, batch: None})())
+    monkeypatch.setattr(dedup, 'record_customer_merges', lambda batch, branch: None)
+    proposals = pd.DataFrame({'customer_id': [7, 9, 12], 'keep_id': [3, 3, 5]})
+    totals = dedup.apply_merges(proposals, batch_size=2)
+    assert [branch for branch, _ in calls] == [1, 0, 1, 0]
+    assert calls[0][1] == {7: 3, 9: 3}
+    assert totals == {'Orders': 4, 'Reservations': 0, 'Reviews': 0, 'Customers': 6}
+
+def test_apply_merges_reports_failing_branch(monkeypatch):
+    monkeypatch.setattr(dedup, 'BRANCHES', [{'name': 'Pusat'}, {'name': 'Timur'}])
+    monkeypatch.setattr(dedup, 'BRANCH_NAMES', ['Pusat', 'Timur'])
+
+    def merge_batch(batch, branch):
+        raise ConnectionError("server hilang")
+    monkeypatch.setattr(dedup, 'merge_batch', merge_batch)
+    monkeypatch.setattr(dedup, 'record_customer_merges', lambda batch, branch: None)
+    with pytest.raises(RuntimeError, match='Timur'):
+        dedup.apply_merges(pd.DataFrame({'customer_id': [7], 'keep_id': [3]}))
+
+def test_merged_customer_keeps_archived_orders(tmp_path, monkeypatch):
+    monkeypatch.setattr(partitions, 'ARCHIVE_DIR', str(tmp_path))
+    monkeypatch.setattr(partitions, 'BRANCH_NAMES', ['Pusat'])
+    monkeypatch.setattr(dedup, 'BRANCHES', [{'name': 'Pusat'}])
+    monkeypatch.setattr(dedup, 'merge_batch', lambda batch, branch: {})
+    monkeypatch.setattr(dedup, 'CustomerStats', lambda: type('Stats', (), {'remap': lambda self, batch: None})())
+    # Di MySQL customer 7 dan 9 sudah dihapus setelah merge; yang tersisa 3
+    monkeypatch.setattr(partitions, '_master', lambda sql, columns: pd.DataFrame(
+        [(3, 'Mary Vega', 'mary@gmail.com', None)], columns=CUSTOMERS).reindex(columns=columns))
+    path = partitions.archive_path('Orders', datetime.date(2023, 1, 1), 0)
+    os.makedirs(os.path.dirname(path))
+    pd.DataFrame({'order_id': [1, 2, 3], 'customer_id': [7, 9, None],
+                  'order_time': pd.to_datetime(['2023-01-02', '2023-01-03', '2023-01-04'])}).to_parquet(path)
+
+    dedup.apply_merges(pd.DataFrame({'customer_id': [7], 'keep_id': [9]}))
+    dedup.apply_merges(pd.DataFrame({'customer_id': [9], 'keep_id': [3]}))
+    assert partitions.customer_merges(0) == {7: 3, 9: 3}
+    with config.on_branch(0):
+        assert [row[0] for row in partitions._archive_customers()] == [3]
+        assert [row[1] for row in partitions._archive_order_totals()] == [3, 3, None]
+        assert partitions._archive_review_customers([1, 2]) == [(1, 'Mary Vega'), (2, 'Mary Vega')]
+
+def test_no_merge_map_without_archive(tmp_path, monkeypatch):
+    monkeypatch.setattr(partitions, 'ARCHIVE_DIR', str(tmp_path / 'belum-ada'))
+    partitions.record_customer_merges({7: 3}, 0)
+    assert not (tmp_path / 'belum-ada').exists()
@@ -0,0 +1,66 @@
+# tests/test_forecast.py
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import forecast
+
+MONDAY = date(2024, 1, 1)
+COLUMNS = ['menu_id', 'order_date', 'order_hour', 'quantity']
+
+
+def sales(rows):
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+@pytest.fixture
+def model(tmp_path):
+    return forecast.DemandModel(path=str(tmp_path / 'demand_model.pkl'), alpha=0.5)
+
+HISTORY = [(1, '2024-01-01', 12, 10), (1, '2024-01-08', 12, 20), (2, '2024-01-08', 19, 4),
+           (1, '2024-01-02', 9, 3), (1, '2024-01-15', 12, 30)]
+
+
+def test_ewma_weights_recent_weeks_more(model):
+    model.update(sales(HISTORY[:2]))
+    # (0.5 * 0.5 * 10 + 0.5 * 20) / (0.5 * 0.5 + 0.5)
+    assert model.forecast(date(2024, 1, 22)).at[1, 12] == pytest.approx(12.5 / 0.75)
+    assert model.forecast(date(2024, 1, 23)).to_numpy().sum() == 0
+
+def test_incremental_update_matches_single_fit(model, tmp_path):
+    for day_rows in [HISTORY[:1], HISTORY[1:4], HISTORY[4:]]:
+        model.update(sales(day_rows))
+    whole = forecast.DemandModel(path=str(tmp_path / 'lain.pkl'), alpha=0.5)
+    whole.update(sales(HISTORY))
+    for day in [date(2024, 1, 22), date(2024, 1, 23)]:
+        pd.testing.assert_frame_equal(model.forecast(day), whole.forecast(day).reindex(model.menu_ids))
+    assert model.days_fitted == whole.days_fitted == 4
+
+def test_menu_without_sales_decays_to_zero(model):
+    model.update(sales([(2, '2024-01-01', 19, 8)]))
+    model.update(sales([(1, '2024-01-08', 12, 5)]))
+    assert model.forecast(date(2024, 1, 15)).at[2, 19] == pytest.approx(0.5 * 0.5 * 8 / 0.75)
+
+def test_accuracy_recorded_before_new_day_is_added(model):
+    model.update(sales([(1, '2024-01-01', 12, 10)]))
+    model.update(sales([(1, '2024-01-08', 12, 6), (1, '2024-01-09', 12, 1)]))
+    frame = model.accuracy_frame()
+    assert frame.index.tolist() == [pd.Timestamp('2024-01-08')]
+    assert frame.iloc[0].tolist() == pytest.approx([4 / 6, 6.0, 10.0])
+
+def test_refresh_reads_only_new_days_and_persists(model, monkeypatch):
+    calls = []
+
+    def view_item_hourly(start, end):
+        calls.append((start, end))
+        return [row for row in HISTORY if (start is None or pd.Timestamp(row[1]).date() >= start)
+                and pd.Timestamp(row[1]).date() <= end]
+    monkeypatch.setattr(forecast, 'view_item_hourly', view_item_hourly)
+    model.refresh(force=True, today=date(2024, 1, 9))
+    model.refresh(force=True, today=date(2024, 1, 16))
+    assert calls == [(None, date(2024, 1, 8)), (date(2024, 1, 9), date(2024, 1, 15))]
+    loaded = forecast.DemandModel(path=model.path, alpha=0.5)
+    loaded._load()
+    assert loaded.last_date == date(2024, 1, 15)
+    assert np.array_equal(loaded.sums, model.sums)
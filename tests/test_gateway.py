@@ -0,0 +1,74 @@
+# tests/test_gateway.py
+import threading
+
+import pytest
+
+import cache
+import config
+import gateway
+
+
+def test_identical_calls_are_coalesced():
+    gw = gateway.QueryGateway(1, 1)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'hasil'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(gw.run('k', slow)))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(gw.run('k', slow)))
+    follower.start()
+    while gw.metrics()['coalesced'] == 0:
+        pass
+    release.set()
+    leader.join(5)
+    follower.join(5)
+    assert results == ['hasil', 'hasil']
+    assert calls == [1]
+    assert gw.metrics()['executed'] == 1
+
+def test_error_is_shared_and_key_released():
+    gw = gateway.QueryGateway(1, 1)
+    with pytest.raises(ZeroDivisionError):
+        gw.run('k', lambda: 1 / 0)
+    assert gw.run('k', lambda: 2) == 2
+    assert gw.metrics()['inflight'] == 0
+
+def test_full_queue_raises_query_rejected(monkeypatch):
+    monkeypatch.setattr(gateway, 'QUEUE_TIMEOUT', 0.01)
+    gw = gateway.QueryGateway(1, 1)
+    inside = threading.Event()
+    release = threading.Event()
+    holder = threading.Thread(target=gw.run, args=('a', lambda: inside.set() or release.wait(5)))
+    holder.start()
+    inside.wait(5)
+    with pytest.raises(gateway.QueryRejected):
+        gw.run('b', lambda: 1)
+    # Query ringan punya slot sendiri
+    assert gw.run('c', lambda: 3, heavy=False) == 3
+    release.set()
+    holder.join(5)
+    assert gw.metrics()['rejected'] == 1
+
+def test_cache_hit_skips_admission(monkeypatch):
+    monkeypatch.setattr(cache, '_backend', cache.MemoryCache())
+    monkeypatch.setattr(config, 'table_versions', config.TableVersions())
+    gw = gateway.QueryGateway(1, 1)
+    monkeypatch.setattr(gateway, 'gateway', gw)
+
+    def fake_query(sql, params=()):
+        if 'Data_Versions' in sql:
+            raise RuntimeError('tanpa Data_Versions')
+        return [(1, 'T1', 4)]
+
+    monkeypatch.setattr(config, 'run_query', fake_query)
+    assert config.view_tables() == [(1, 'T1', 4)]
+    assert config.view_tables() == [(1, 'T1', 4)]
+    assert gw.metrics()['executed'] == 1
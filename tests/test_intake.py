@@ -0,0 +1,156 @@
+# tests/test_intake.py
+import pytest
+
+import intake
+from intake import OrderRejected
+
+
+class FakeDims:
+    menu = {1: (15000.0, False), 2: (5000.0, True)}
+    tables = {3}
+    payments = {1}
+
+
+class FakeCursor:
+    """Orders di memori; INSERT multi-baris memberi id dengan langkah `step` mulai dari `next_id`"""
+
+    def __init__(self, db):
+        self.db = db
+        self.lastrowid = None
+        self._result = []
+
+    def executemany(self, sql, rows):
+        rows = list(rows)
+        if sql == intake.ORDER_SQL:
+            self.lastrowid = self.db.next_id
+            for row in rows:
+                self.db.orders[self.db.next_id] = row[:5]
+                self.db.next_id += self.db.step + self.db.gap
+        else:
+            self.db.details.extend(rows)
+
+    def execute(self, sql, params=()):
+        if '@@auto_increment_increment' in sql:
+            self._result = [(self.db.step,)]
+        else:
+            self._result = [(order_id,) + self.db.orders[order_id] for order_id in params if order_id in self.db.orders]
+
+    def fetchone(self):
+        return self._result[0]
+
+    def fetchall(self):
+        return self._result
+
+    def close(self):
+        pass
+
+
+class FakeDB:
+    def __init__(self, step=1, gap=0):
+        self.next_id, self.step, self.gap = 100, step, gap
+        self.orders, self.details = {}, []
+        self.commits = self.rollbacks = 0
+
+    def get_connection(self):
+        return self
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        pass
+
+
+def order(**changes):
+    base = {'service_type': 'Dine In', 'table_id': 3, 'payment_id': 1, 'guest_name': 'Budi',
+            'items': [{'menu_id': 1, 'quantity': 2}]}
+    return dict(base, **changes)
+
+def pendings(count, branch=0):
+    return [intake._Pending(branch, *intake.validate(order(guest_name=f'Tamu {i}'), FakeDims)) for i in range(count)]
+
+
+def test_validate_prices_items_from_menu():
+    row, details, total = intake.validate(order(items=[{'menu_id': 1, 'quantity': '2', 'note': 'pedas'}]), FakeDims)
+    assert row[:5] == (None, 'Budi', 'Dine In', 3, 1)
+    assert details == [(1, 2, 30000.0, 'pedas')]
+    assert total == 30000.0
+
+@pytest.mark.parametrize('bad, message', [
+    (1, 'order harus objek'),
+    (order(items=[1]), 'item harus objek'),
+    (order(items='nasi'), 'items harus list'),
+    (order(items=[]), 'tanpa item'),
+    (order(table_id=None), 'wajib memakai table_id'),
+    (order(table_id='abc'), 'table_id harus angka'),
+    (order(payment_id=9), 'payment_id 9 tidak ada'),
+    (order(items=[{'menu_id': 1, 'quantity': 0}]), 'quantity'),
+    (order(items=[{'menu_id': 2, 'quantity': 1}]), 'khusus member'),
+    (order(guest_name={'nama': 'Budi'}), 'guest_name harus teks'),
+    (order(order_time='kemarin'), 'order_time harus berformat'),
+    (order(order_time='2024-02-30 10:00:00'), 'order_time harus berformat'),
+])
+def test_validate_rejects(bad, message):
+    with pytest.raises(OrderRejected, match=message):
+        intake.validate(bad, FakeDims)
+
+def test_validate_normalizes_order_time():
+    row, _, _ = intake.validate(order(order_time='2024-01-05T08:30'), FakeDims)
+    assert row[5] == '2024-01-05 08:30:00'
+
+def test_parse_orders_single_and_many():
+    assert intake.parse_orders(order()) == (False, [order()])
+    assert intake.parse_orders({'orders': [order(), 1]}) == (True, [order(), 1])
+    assert intake.parse_orders([order()]) == (True, [order()])
+    for bad in ({'orders': None}, {'orders': 'x'}, 5):
+        with pytest.raises(OrderRejected, match='orders harus list'):
+            intake.parse_orders(bad)
+
+def test_submit_many_rejects_per_order(monkeypatch):
+    service = intake.OrderIntake()
+    monkeypatch.setattr(service.dimensions[0], 'current', lambda: FakeDims)
+    results = service.submit_many([order(), 1, order(items=[1])])
+    assert not isinstance(results[0], OrderRejected)
+    assert [str(r) for r in results[1:]] == ['order harus objek JSON', 'item harus objek JSON']
+    assert service.metrics()['rejected'] == 2
+
+@pytest.mark.parametrize('step', [1, 2])
+def test_commit_batches_orders_and_maps_ids(monkeypatch, step):
+    db = FakeDB(step=step)
+    monkeypatch.setattr(intake, 'get_pool', lambda branch=None: db)
+    order_ids = intake.OrderIntake()._commit(pendings(3))
+    assert order_ids == [100, 100 + step, 100 + 2 * step]
+    assert [detail[0] for detail in db.details] == order_ids
+    assert db.commits == 1
+
+def test_non_consecutive_ids_fall_back_per_order(monkeypatch):
+    db = FakeDB(gap=1)
+    monkeypatch.setattr(intake, 'get_pool', lambda branch=None: db)
+    batch = pendings(3)
+    intake.OrderIntake()._write(batch)
+    acks = [pending.future.result(timeout=1) for pending in batch]
+    assert db.rollbacks == 1 and db.commits == 3
+    assert [ack['batch_size'] for ack in acks] == [1, 1, 1]
+    assert [db.orders[ack['order_id']][1] for ack in acks] == ['Tamu 0', 'Tamu 1', 'Tamu 2']
+
+def test_orders_routed_to_branch_pool(monkeypatch):
+    monkeypatch.setattr(intake, 'BRANCHES', [{'name': 'Pusat'}, {'name': 'Timur'}])
+    monkeypatch.setattr(intake, 'BRANCH_NAMES', ['Pusat', 'Timur'])
+    pools = {0: FakeDB(), 1: FakeDB(step=2)}
+    monkeypatch.setattr(intake, 'get_pool', lambda branch=None: pools[branch])
+    service = intake.OrderIntake()
+    for dims in service.dimensions:
+        monkeypatch.setattr(dims, 'current', lambda: FakeDims)
+    results = service.submit_many([order(branch='Timur'), order(), order(branch='Barat'), order(branch='Timur')])
+    assert str(results[2]) == 'branch Barat tidak ada'
+    batch = [service._queue.get_nowait() for _ in range(3)]
+    service._write(batch)
+    assert [pending.future.result(timeout=1)['order_id'] for pending in batch] == [100, 100, 102]
+    assert len(pools[0].orders) == 1 and len(pools[1].orders) == 2
+    assert pools[0].commits == pools[1].commits == 1
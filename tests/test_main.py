@@ -0,0 +1,24 @@
+# tests/test_main.py
+import os
+import sys
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Jalankan main.py sampai penanda LOAD DATA (sidebar sudah digambar) di proses baru, lalu cetak
+# library berat yang di-import sesudah streamlit. Streamlit sendiri sudah memuat paket plotly
+# dasar, jadi yang dibandingkan hanya modul tambahan dari main.py.
+SIDEBAR_ONLY = """
+import sys
+import streamlit
+before = set(sys.modules)
+source = open('main.py').read()
+exec(compile(source[:source.index('# LOAD DATA')], 'main.py', 'exec'), {'__name__': '__main__'})
+heavy = {name.split('.')[0] for name in set(sys.modules) - before} & {'pandas', 'numpy', 'plotly', 'scipy', 'pyarrow'}
+print(' '.join(sorted(heavy)) or '-', 'mysql.connector' in sys.modules)
+"""
+
+
+def test_sidebar_imports_no_heavy_modules():
+    result = subprocess.run([sys.executable, '-c', SIDEBAR_ONLY], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ['-', 'False']
@@ -0,0 +1,129 @@
+# tests/test_order_feed.py
+import datetime
+
+import pytest
+
+import config
+import order_feed
+from config import BRANCH_ID_STRIDE
+
+
+class FakeBranches:
+    """Orders / Order_Details / Order_Changes per cabang untuk run_query order_feed"""
+
+    def __init__(self, change_table):
+        self.change_table = change_table        # per cabang: punya tabel Order_Changes atau tidak
+        self.orders = [{} for _ in change_table]
+        self.items = [{} for _ in change_table]
+        self.changes = [[] for _ in change_table]
+
+    def add(self, branch, order_id, status='Pending', items=('1x Nasi',)):
+        self.orders[branch][order_id] = (order_id, datetime.datetime(2024, 1, 1, 12, order_id % 60),
+                                         'Dine In', status, 3, 'Budi')
+        self.items[branch][order_id] = list(items)
+        self.changes[branch].append(order_id)
+
+    def delete(self, branch, order_id):
+        del self.orders[branch][order_id]
+        self.changes[branch].append(order_id)
+
+    def run_query(self, sql, params=()):
+        branch = config.current_branch()
+        if 'MAX(change_id)' in sql:
+            if not self.change_table[branch]:
+                raise RuntimeError("Table 'Order_Changes' doesn't exist")
+            return [(len(self.changes[branch]),)]
+        if 'MAX(order_id)' in sql:
+            return [(max(self.orders[branch], default=0),)]
+        if 'FROM Order_Changes' in sql:
+            after, limit = params
+            return [(i + 1, order_id) for i, order_id in enumerate(self.changes[branch]) if i + 1 > after][:limit]
+        if 'FROM Order_Details' in sql:
+            return [(order_id, *item.split('x ', 1), None) for order_id in params
+                    for item in self.items[branch].get(order_id, [])]
+        orders = self.orders[branch]
+        if 'order_status =' in sql:
+            return [row for row in orders.values() if row[3] == 'Pending']
+        if 'o.order_id > %s' in sql:
+            after, ids = params[0], set(params[1:])
+            return [row for order_id, row in orders.items() if order_id > after or order_id in ids]
+        return [orders[order_id] for order_id in params if order_id in orders]
+
+
+@pytest.fixture
+def branches(monkeypatch):
+    def make(*change_table):
+        names = [f'Cabang {i}' for i in range(len(change_table))]
+        for module in (config, order_feed):
+            monkeypatch.setattr(module, 'BRANCHES', [{'name': name} for name in names])
+            monkeypatch.setattr(module, 'BRANCH_NAMES', names)
+        fake = FakeBranches(change_table)
+        monkeypatch.setattr(order_feed, 'run_query', fake.run_query)
+        return fake
+    return make
+
+def poll(feed):
+    for index in range(len(order_feed.BRANCHES)):
+        with config.on_branch(index):
+            if feed.use_change_table[index] is None:
+                feed._bootstrap(index)
+            else:
+                feed._poll(index)
+
+
+def test_setup_has_triggers_for_every_change():
+    statements = order_feed.setup_statements()
+    for name in ['orders_change_delete', 'order_details_change_update', 'order_details_change_delete']:
+        assert f"DROP TRIGGER IF EXISTS {name}" in statements
+        assert any(sql.startswith(f"CREATE TRIGGER {name} ") for sql in statements)
+
+def test_queue_covers_all_branches_with_namespaced_ids(branches):
+    fake = branches(True, False)
+    fake.add(0, 5)
+    fake.add(1, 5, items=('2x Teh',))
+    fake.add(1, 6, status='Completed')
+    feed = order_feed.OrderFeed()
+    poll(feed)
+    _, orders = feed.snapshot()
+    assert sorted(order['order_id'] for order in orders) == [5, BRANCH_ID_STRIDE + 5]
+    assert feed.orders[BRANCH_ID_STRIDE + 5]['branch'] == 'Cabang 1'
+    assert feed.orders[BRANCH_ID_STRIDE + 5]['items'] == ('2x Teh',)
+
+def test_change_table_removes_deleted_and_voided_orders(branches):
+    fake = branches(True, True)
+    fake.add(1, 7)
+    fake.add(1, 8)
+    feed = order_feed.OrderFeed()
+    poll(feed)
+    version = feed.version
+    # Item order 7 di-void (trigger DELETE Order_Details), order 8 dihapus (trigger DELETE Orders)
+    fake.items[1][7] = []
+    fake.changes[1].append(7)
+    fake.delete(1, 8)
+    poll(feed)
+    assert feed.version == version + 1
+    _, orders = feed.snapshot()
+    assert [(order['order_id'], order['items']) for order in orders] == [(BRANCH_ID_STRIDE + 7, ())]
+
+def test_high_water_mode_rechecks_active_orders_per_branch(branches):
+    fake = branches(False, False)
+    fake.add(0, 1)
+    fake.add(1, 1)
+    feed = order_feed.OrderFeed()
+    poll(feed)
+    fake.add(1, 2)
+    fake.orders[0][1] = fake.orders[0][1][:3] + ('Completed',) + fake.orders[0][1][4:]
+    poll(feed)
+    assert sorted(feed.orders) == [BRANCH_ID_STRIDE + 1, BRANCH_ID_STRIDE + 2]
+    assert feed._cursors == [1, 2]
+
+def test_version_unchanged_without_real_changes(branches):
+    fake = branches(True)
+    fake.add(0, 3)
+    feed = order_feed.OrderFeed()
+    poll(feed)
+    version = feed.version
+    # Order disentuh (change tercatat) tapi isinya sama
+    fake.changes[0].append(3)
+    poll(feed)
+    assert feed.version == version
@@ -0,0 +1,131 @@
+# tests/test_partitions.py
+import os
+import inspect
+import datetime
+
+import pandas as pd
+import pytest
+
+import config
+import partitions
+
+MASTER = {
+    'Menu': pd.DataFrame({'menu_id': [10, 20], 'item_name': ['Nasi', 'Teh'], 'unit_price': [20000.0, 5000.0],
+                          'category_id': [1, 2]}),
+    'Categories': pd.DataFrame({'category_id': [1, 2], 'category_name': ['Makanan', 'Minuman']}),
+    'Payment_Methods': pd.DataFrame({'payment_id': [1], 'method_name': ['Tunai']}),
+    'Customers': pd.DataFrame({'customer_id': [7], 'customer_name': ['Budi'], 'email': ['b@x.id'], 'phone': ['1']}),
+    'Tables': pd.DataFrame({'table_id': [3], 'table_number': [3], 'capacity': [4]}),
+}
+
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch):
+    """Arsip Januari 2025: order 1 (2 item) dan order 2 (tamu, tanpa item, dibatalkan)"""
+    monkeypatch.setattr(partitions, 'ARCHIVE_DIR', str(tmp_path))
+    monkeypatch.setattr(partitions, '_master', lambda sql, columns: next(
+        df for table, df in MASTER.items() if f'FROM {table}' in sql).reindex(columns=columns))
+    month = datetime.date(2025, 1, 1)
+    orders = pd.DataFrame({
+        'order_id': [1, 2], 'customer_id': [7, None], 'guest_name': [None, 'Tamu'],
+        'service_type': ['Dine-in', 'Takeaway'], 'table_id': [3, None], 'payment_id': [1, 1],
+        'order_status': ['Completed', 'Cancelled'],
+        'order_time': pd.to_datetime(['2025-01-05 12:30', '2025-01-20 19:00']),
+    })
+    details = pd.DataFrame({
+        'order_detail_id': [100, 101], 'order_id': [1, 1], 'menu_id': [10, 20], 'quantity': [2, 1],
+        'total_price': [40000.0, 5000.0], 'request_note': [None, None],
+        'order_time': pd.to_datetime(['2025-01-05 12:30'] * 2),
+    })
+    for table, df in [('Orders', orders), ('Order_Details', details)]:
+        path = partitions.archive_path(table, month)
+        os.makedirs(os.path.dirname(path))
+        df.to_parquet(path, index=False)
+    return tmp_path
+
+
+def test_month_helpers():
+    assert partitions.next_month(datetime.date(2024, 12, 9)) == datetime.date(2025, 1, 1)
+    assert list(partitions.months_between(datetime.date(2024, 11, 15), datetime.date(2025, 1, 1))) == [
+        datetime.date(2024, 11, 1), datetime.date(2024, 12, 1), datetime.date(2025, 1, 1)]
+    assert partitions.partition_name(datetime.date(2025, 3, 1)) == 'p202503'
+
+def test_archive_bounds(archive, tmp_path, monkeypatch):
+    assert partitions.archive_bounds() == (datetime.date(2025, 1, 1), datetime.date(2025, 1, 31))
+    monkeypatch.setattr(partitions, 'ARCHIVE_DIR', str(tmp_path / 'kosong'))
+    assert partitions.archive_bounds() == (None, None)
+
+def test_archive_rows_keep_integer_ids_and_nulls(archive):
+    rows = partitions.read_archive('view_orders')
+    assert [row[0] for row in rows] == [2, 1]
+    guest = dict(zip(partitions.ORDER_VIEW_COLUMNS, rows[0]))
+    assert guest['customer_id'] is None and guest['customer_name'] is None
+    assert isinstance(rows[1][1], int)
+
+def test_archive_range_filters_by_order_time(archive):
+    assert partitions.read_archive('view_orders', datetime.date(2025, 1, 10), datetime.date(2025, 1, 31))[0][0] == 2
+    assert partitions.read_archive('view_orders', datetime.date(2025, 2, 1), None) == []
+
+def test_archive_aggregates(archive):
+    assert sorted(partitions.read_archive('view_categories')) == [
+        (1, 'Makanan', 2, datetime.date(2025, 1, 5)), (2, 'Minuman', 1, datetime.date(2025, 1, 5))]
+    # Order tanpa item tetap dihitung dengan total 0, seperti LEFT JOIN di MySQL
+    assert sorted(partitions.read_archive('view_order_totals')) == [
+        (1, 7, pd.Timestamp('2025-01-05 12:30'), 45000.0), (2, None, pd.Timestamp('2025-01-20 19:00'), 0.0)]
+    assert partitions.read_archive('view_order_totals', 1) == [(2, None, pd.Timestamp('2025-01-20 19:00'), 0.0)]
+    assert partitions.read_archive('view_customers') == [(7, 'Budi', 'b@x.id', '1', 45000.0)]
+    assert sorted(partitions.read_archive('view_branch_summary')) == [
+        (datetime.date(2025, 1, 5), 1, 45000.0), (datetime.date(2025, 1, 20), 1, 0.0)]
+
+def test_archive_item_hourly_skips_cancelled(archive):
+    assert sorted(partitions.read_archive('view_item_hourly')) == [
+        (10, datetime.date(2025, 1, 5), 12, 2), (20, datetime.date(2025, 1, 5), 12, 1)]
+
+@pytest.fixture
+def two_branches(monkeypatch):
+    branches = [dict(name='Pusat'), dict(name='Cabang Timur')]
+    for module in (config, partitions):
+        monkeypatch.setattr(module, 'BRANCHES', branches)
+        monkeypatch.setattr(module, 'BRANCH_NAMES', [b['name'] for b in branches])
+
+def test_archive_is_scoped_per_branch(archive, two_branches):
+    assert partitions.archive_path('Orders', datetime.date(2025, 1, 1), 1).startswith(
+        os.path.join(str(archive), 'Cabang Timur'))
+    with config.on_branch(1):
+        assert partitions.read_archive('view_orders') == []
+    assert partitions.archive_bounds() == (datetime.date(2025, 1, 1), datetime.date(2025, 1, 31))
+
+def test_fan_out_counts_archive_once(archive, two_branches, monkeypatch):
+    monkeypatch.setattr(config, 'run_query', lambda sql, params=(): [])
+    # Lewati shared_cache dan single_flight; yang diuji penggabungan fan_out
+    view = config.view_order_totals.__wrapped__.__wrapped__
+    assert sorted(row[0] for row in view(0)) == [1, 2]
+
+def test_unknown_view_rejected():
+    with pytest.raises(ValueError):
+        partitions.read_archive('view_reservations')
+
+def test_archive_sample_uses_same_hash_as_mysql(archive):
+    # MOD(1 * 2654435761, 10000) = 5761: order 1 terpilih di rate 0.6, tidak di rate 0.5
+    assert partitions.read_archive('view_order_details_sample', None, None, 0.5) == []
+    assert sorted(row[0] for row in partitions.read_archive('view_order_details_sample', None, None, 0.6)) == [100, 101]
+
+def test_order_details_range_only_after_partition_setup(monkeypatch):
+    queries = []
+
+    def run_query(sql, params=()):
+        if 'information_schema' in sql:
+            return [(1,)] if config.current_branch() == 1 else []
+        queries.append((sql, params))
+        return []
+    monkeypatch.setattr(config, 'run_query', run_query)
+    monkeypatch.setattr(config, 'archived_rows', lambda *args: [])
+    monkeypatch.setattr(config, '_detail_order_time', {})
+    view = inspect.unwrap(config.view_menu)
+    start, end = datetime.date(2025, 1, 1), datetime.date(2025, 1, 31)
+    for branch in (0, 1):
+        with config.on_branch(branch):
+            view(start, end)
+            view()
+    assert ['od.order_time' in sql for sql, _ in queries] == [False, False, True, False]
+    assert queries[2][1] == (start, end, start, end)
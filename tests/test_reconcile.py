@@ -0,0 +1,76 @@
+# tests/test_reconcile.py
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import partitions
+import reconcile
+
+DAY = datetime.date(2024, 1, 1)
+
+
+def test_compare_classifies_mismatches():
+    rows = [
+        (1, 10, 5, DAY, 2, 3000000, 1500000),    # cocok
+        (2, 10, 5, DAY, 2, 2800000, 1500000),    # harga lama 14.000
+        (3, 11, 6, DAY, 3, 1000001, 500000),     # lain-lain
+        (4, 11, 6, DAY, 0, 0, 500000),           # cocok walau quantity 0
+        (5, 12, 6, DAY, 0, 100, 500000),         # quantity
+    ]
+    report, summary = reconcile.compare(rows)
+    assert report['order_detail_id'].tolist() == [2, 3, 5]
+    assert report['kind'].tolist() == ['price_changed', 'other', 'quantity']
+    assert report['implied_unit_price'].iloc[0] == 14000.0
+    assert summary.loc[(5, np.datetime64(DAY))].tolist() == [2, 1, 0, 6000000, 5800000, -200000]
+
+def test_compare_tolerance_in_cents():
+    rows = [(1, 10, 5, DAY, 1, 1500050, 1500000)]
+    assert len(reconcile.compare(rows)[0]) == 1
+    assert reconcile.compare(rows, tolerance_cents=50)[0].empty
+
+def test_compare_reports_orphans_without_counting_their_price():
+    rows = [
+        (1, 10, 5, DAY, 2, 3000000, 1500000),
+        (2, 10, 99, DAY, 1, 700000, None),       # menu sudah dihapus
+        (3, 77, 5, None, 1, 1500000, 1500000),   # order tidak ada
+    ]
+    report, summary = reconcile.compare(rows)
+    assert report[['order_detail_id', 'kind']].values.tolist() == [[2, 'orphan_menu'], [3, 'orphan_order']]
+    assert np.isnan(report['expected_price'].iloc[0]) and report['total_price'].iloc[0] == 7000.0
+    assert summary['rows'].sum() == 3 and summary['orphans'].sum() == 2
+    assert summary['total_price'].sum() == 4500000 and summary['difference'].sum() == 0
+    assert pd.isna(summary.loc[5].index).tolist() == [False, True]
+
+def test_archive_chunks_match_chunk_sql_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(partitions, 'ARCHIVE_DIR', str(tmp_path))
+    monkeypatch.setattr(partitions, 'BRANCH_NAMES', ['Pusat'])
+    month = datetime.date(2024, 1, 1)
+    details = pd.DataFrame({
+        'order_detail_id': [3, 1, 2], 'order_id': [2, 1, 9], 'menu_id': [5, 5, 99], 'quantity': [1, 2, 1],
+        'total_price': [15000.0, 28000.0, 7000.0], 'request_note': [None] * 3,
+        'order_time': pd.to_datetime(['2024-01-02 10:00', '2024-01-01 12:00', '2024-01-03 09:00']),
+    })
+    orders = pd.DataFrame({'order_id': [1, 2], 'order_time': pd.to_datetime(['2024-01-01 12:00', '2024-01-02 10:00'])})
+    for table, df in [('Order_Details', details), ('Orders', orders)]:
+        path = partitions.archive_path(table, month, 0)
+        (tmp_path / 'Pusat' / table.lower()).mkdir(parents=True)
+        df.to_parquet(path, index=False)
+    chunks = list(reconcile.archive_chunks(0, month, {5: 1500000}, chunk_size=2))
+    assert chunks == [
+        [(1, 1, 5, datetime.date(2024, 1, 1), 2, 2800000, 1500000), (2, 9, 99, None, 1, 700000, None)],
+        [(3, 2, 5, datetime.date(2024, 1, 2), 1, 1500000, 1500000)],
+    ]
+    report, _ = reconcile.compare(chunks[0])
+    assert report['kind'].tolist() == ['price_changed', 'orphan_menu']
+
+def test_summaries_keep_orphan_order_rows(tmp_path):
+    job = reconcile.Reconciliation(str(tmp_path))
+    _, summary = reconcile.compare([(1, 77, 5, None, 1, 1500000, 1500000)])
+    job._parts.append(pd.concat({'Pusat': summary}, names=['branch']))
+    job._consolidate()
+    job._write_summaries()
+    menu = pd.read_csv(tmp_path / 'summary_menu.csv')
+    assert menu[['rows', 'orphans']].values.tolist() == [[1, 1]]
+    assert len(pd.read_csv(tmp_path / 'summary_day.csv')) == 1
@@ -0,0 +1,77 @@
+# tests/test_reports.py
+import datetime
+
+import pandas as pd
+import pytest
+
+import data
+import reports
+
+
+@pytest.fixture
+def payment():
+    return {'payment': pd.DataFrame({
+        'payment_id': [1, 2], 'method_name': ['Tunai', 'QRIS'], 'revenue': [50000.0, 20000.0],
+        'order_date': pd.to_datetime(['2024-01-01', '2024-01-02']),
+    })}
+
+@pytest.fixture
+def stamps(monkeypatch):
+    current = {}
+    monkeypatch.setattr(data, 'frame_stamp', lambda name: current.get(name))
+    return current
+
+
+def test_fingerprint_without_stamp_sees_in_place_edits(payment, stamps):
+    before = reports.fingerprint(payment)
+    # Jumlah baris dan tanggal sama, hanya nilainya yang dikoreksi
+    edited = {'payment': payment['payment'].assign(revenue=[45000.0, 20000.0])}
+    assert reports.fingerprint(edited) != before
+    assert reports.fingerprint({'payment': payment['payment'].copy()}) == before
+
+def test_fingerprint_follows_data_versions_stamp(payment, stamps):
+    stamps['payment'] = (1, (10, 4))
+    before = reports.fingerprint(payment)
+    # Dengan stempel, isi tidak perlu di-hash: rentang muat yang berbeda tetap memakai bundle yang sama
+    assert reports.fingerprint({'payment': payment['payment'].iloc[:1]}) == before
+    stamps['payment'] = (1, (11, 4))
+    assert reports.fingerprint(payment) != before
+
+def test_bundle_round_trip_and_stale_fingerprint(payment, stamps, tmp_path, monkeypatch):
+    monkeypatch.setattr(reports, 'REPORT_DIR', str(tmp_path))
+    start, end = datetime.date(2024, 1, 1), datetime.date(2024, 1, 2)
+    current = reports.fingerprint(payment)
+    reports.save_bundle('Payment Methods', start, end, reports.build_payment(payment, start, end), current)
+    bundle = reports.load_bundle('Payment Methods', start, end, current)
+    assert bundle['summary']['Revenue'].sum() == 70000.0
+    assert isinstance(bundle['figures']['bar'], dict)
+    assert reports.load_bundle('Payment Methods', start, end, 'lama') is None
+
+def test_period_range_clamps_to_first_day():
+    first, last = datetime.date(2024, 1, 30), datetime.date(2024, 2, 3)
+    assert reports.period_range('mingguan', first, last) == (first, last)
+    assert reports.period_range('bulanan', first, last) == (datetime.date(2024, 2, 1), last)
+    assert reports.period_range('harian', first, last) == (last, last)
+
+def test_generated_bundle_matches_page_slice(payment, stamps, tmp_path, monkeypatch):
+    monkeypatch.setattr(reports, 'REPORT_DIR', str(tmp_path))
+    history = pd.concat([payment['payment'].assign(order_date=pd.to_datetime('2023-12-15')), payment['payment']])
+
+    def load_table(name, start=None, end=None):
+        dates = history['order_date'].dt.date
+        return history[((start is None) | (dates >= start)) & ((end is None) | (dates <= end))]
+    monkeypatch.setattr(data, 'load_table', load_table)
+    # Arsip mulai 15 Desember, MySQL mulai 1 Januari
+    first, live_first, last = datetime.date(2023, 12, 15), datetime.date(2024, 1, 1), datetime.date(2024, 1, 2)
+    monkeypatch.setattr(data, 'history_bounds', lambda: (first, live_first, last))
+    written = dict((period, (start, end)) for period, start, end in reports.generate_page('Payment Methods')[1])
+    assert written['semua'] == (live_first, last)
+    for start, end in written.values():
+        page_data = {'payment': load_table('payment', *reports.page_load_range('Payment Methods', start, end))}
+        assert reports.load_bundle('Payment Methods', start, end, reports.fingerprint(page_data)) is not None
+
+def test_page_load_range_follows_page():
+    day = datetime.date(2024, 3, 15)
+    assert reports.page_load_range('Menu', day, day) == (day, day)
+    assert reports.page_load_range('Dashboard', day, day) == (day - datetime.timedelta(weeks=52), day)
+    assert reports.page_load_range('Reviews', day, day) == (None, None)
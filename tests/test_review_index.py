@@ -0,0 +1,76 @@
+# tests/test_review_index.py
+import datetime
+
+import pandas as pd
+import pytest
+
+import customer_stats
+import review_index
+
+COLUMNS = ['review_id', 'rating', 'comment', 'review_date']
+
+
+def reviews(rows):
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    for module in (customer_stats, review_index):
+        monkeypatch.setattr(module, 'BRANCHES', [{'name': 'Pusat'}])
+    monkeypatch.setattr(customer_stats, 'BRANCH_NAMES', ['Pusat'])
+    return review_index.ReviewIndex(path=str(tmp_path / 'review_index.pkl'))
+
+
+def test_tokenize_keeps_words_and_bigrams():
+    terms = review_index.tokenize(pd.Series(['Pelayanan LAMA, tapi makanan enak!', None]))
+    assert terms[0] == ['pelayanan', 'lama', 'tapi', 'makanan', 'enak',
+                        'pelayanan lama', 'lama tapi', 'tapi makanan', 'makanan enak']
+    assert terms[1] == []
+
+def test_incremental_apply_matches_single_build(index):
+    rows = [(1, 5, 'Makanan enak sekali', '2024-01-01'), (2, 2, 'Pelayanan lama', '2024-01-02'),
+            (3, 4, 'makanan enak, pelayanan cepat', '2024-01-03'), (4, 1, 'Lama dan dingin', '2024-01-03')]
+    index.apply(reviews(rows[:2]))
+    index.apply(reviews(rows[2:]))
+    whole = review_index.ReviewIndex(path=index.path)
+    whole.apply(reviews(rows))
+    for query in ['enak', 'pelayanan', 'lama', 'makanan enak']:
+        assert index.search(query)[0].tolist() == whole.search(query)[0].tolist()
+    assert index.last_review_ids == (4,)
+    assert index.term_days.sort_index().equals(whole.term_days.sort_index())
+
+def test_search_filters_and_orders_newest_first(index):
+    index.apply(reviews([(1, 5, 'Makanan enak', '2024-01-01'), (2, 3, 'enak tapi mahal', '2024-01-05'),
+                         (3, 5, 'kopi enak', '2024-01-03')]))
+    ids, total = index.search('enak')
+    assert (ids.tolist(), total) == ([2, 3, 1], 3)
+    assert index.search('enak', ratings=[5])[0].tolist() == [3, 1]
+    assert index.search('enak', start=datetime.date(2024, 1, 2), end=datetime.date(2024, 1, 4))[0].tolist() == [3]
+    assert index.search('makanan enak')[0].tolist() == [1]
+    assert index.search('tidak ada')[1] == 0
+
+def test_top_terms_and_trend(index):
+    index.apply(reviews([(1, 1, 'pelayanan lama', '2024-01-01'), (2, 1, 'pelayanan lama sekali', '2024-01-02'),
+                         (3, 5, 'pelayanan ramah', '2024-01-02')]))
+    top = index.top_terms(n=1)
+    assert top[top['rating'] == 1]['term'].tolist() == ['lama']
+    trend = index.trend(['lama'])
+    assert trend['reviews'].tolist() == [1, 1]
+
+def test_refresh_rebuilds_when_old_review_changes(index, monkeypatch):
+    stored = {1: (5, 'enak', '2024-01-01'), 2: (2, 'lama', '2024-01-02')}
+    monkeypatch.setattr(review_index, 'view_review_texts', lambda after: [
+        (review_id, *stored[review_id]) for review_id in sorted(stored) if review_id > after[0]])
+    changes = [[('Pusat', 2, 0, 2)], [('Pusat', 3, 0, 2)], [('Pusat', 3, 0, 2)]]
+    monkeypatch.setattr(customer_stats, 'view_table_changes', lambda *args: changes.pop(0))
+
+    index.refresh(force=True)
+    assert index.search('lama')[0].tolist() == [2]
+    # Review 2 diedit (versi naik tanpa review baru): indeks dibangun ulang dari awal
+    stored[2] = (4, 'cepat', '2024-01-02')
+    index.refresh(force=True)
+    assert index.search('lama')[1] == 0
+    assert index.search('cepat')[0].tolist() == [2]
+    # Store lain yang membaca file yang sama melihat hasil rebuild
+    other = review_index.ReviewIndex(path=index.path).refresh(force=True)
+    assert other.search('cepat')[0].tolist() == [2] and other.baseline == ((3, 2),)
@@ -0,0 +1,75 @@
+# tests/test_seating.py
+import datetime
+
+import pandas as pd
+
+import seating
+
+
+def tables(*capacities):
+    return pd.DataFrame({'table_id': range(1, len(capacities) + 1), 'table_number': range(1, len(capacities) + 1),
+                         'capacity': capacities, 'status': 'Available'})
+
+def parties(rows):
+    """(party, kind, party_size, start menit, duration menit, booked_table)"""
+    df = pd.DataFrame(rows, columns=['party', 'kind', 'party_size', 'start', 'duration', 'booked_table'])
+    return df.assign(name=df['party'])
+
+def placed(result, table_ids):
+    return dict(zip(result['party'], [table_ids[i] if i >= 0 else None for i in result['table_index']]))
+
+
+def test_smallest_fitting_table_keeps_big_table_free():
+    t = tables(4, 2)
+    result = seating.assign_tables(t, parties([('A', 'Walk-in', 2, 600, 60, None),
+                                               ('B', 'Walk-in', 4, 610, 60, None)]))
+    assert placed(result, t['table_id'].tolist()) == {'A': 2, 'B': 1}
+
+def test_reservation_before_walk_in_for_last_table():
+    t = tables(4)
+    result = seating.assign_tables(t, parties([('W', 'Walk-in', 4, 600, 60, None),
+                                               ('R', 'Reservasi', 2, 600, 60, None)]))
+    assert placed(result, [1]) == {'W': None, 'R': 1}
+
+def test_party_waits_for_table_within_max_wait():
+    t = tables(2)
+    result = seating.assign_tables(t, parties([('A', 'Walk-in', 2, 600, 30, None),
+                                               ('B', 'Walk-in', 2, 620, 60, None),
+                                               ('C', 'Walk-in', 2, 625, 60, None)]), max_wait=10)
+    assert placed(result, [1]) == {'A': 1, 'B': 1, 'C': None}
+    assert result['seated'].tolist()[:2] == [600, 630]
+
+def test_booked_table_kept_when_equally_good():
+    t = tables(4, 4)
+    result = seating.assign_tables(t, parties([('R', 'Reservasi', 3, 600, 60, 2)]))
+    assert placed(result, [1, 2]) == {'R': 2}
+
+def test_parties_for_date_skips_cancelled_and_reservation_orders():
+    day = pd.Timestamp('2024-01-01')
+    reservations = pd.DataFrame({
+        'reservation_id': [1, 2], 'customer_id': [7, 8], 'customer_name': ['Budi', 'Sari'],
+        'reservation_date': [day, day], 'check_in': ['18:00:00', '19:00:00'], 'check_out': ['19:30:00', None],
+        'party_size': [4, 2], 'status': ['Confirmed', 'Cancelled'], 'table_id': [3, 4],
+    })
+    orders = pd.DataFrame({
+        'order_id': [10, 11, 12], 'customer_id': [7, None, None], 'customer_name': ['Budi', None, None],
+        'guest_name': [None, 'Tamu', 'Bawa'], 'service_type': ['Dine In', 'Dine In', 'Take Away'],
+        'order_date': [day] * 3, 'table_id': [3, 5, None],
+        'order_time': pd.to_datetime(['2024-01-01 18:05', '2024-01-01 12:30', '2024-01-01 13:00']),
+    })
+    result = seating.parties_for_date(reservations, orders, datetime.date(2024, 1, 1))
+    assert result[['party', 'name', 'start', 'duration']].values.tolist() == [
+        ['R1', 'Budi', 1080.0, 90.0], ['W11', 'Tamu', 750, seating.WALK_IN_MINUTES]]
+
+def test_seating_plan_summary():
+    day = pd.Timestamp('2024-01-01')
+    reservations = pd.DataFrame({
+        'reservation_id': [1], 'customer_id': [7], 'customer_name': ['Budi'], 'reservation_date': [day],
+        'check_in': ['18:00:00'], 'check_out': ['19:00:00'], 'party_size': [2], 'status': ['Confirmed'],
+        'table_id': [1],
+    })
+    orders = pd.DataFrame(columns=['order_id', 'customer_id', 'customer_name', 'guest_name', 'service_type',
+                                   'order_date', 'table_id', 'order_time'])
+    plan, summary = seating.seating_plan(tables(6, 2), reservations, orders, day)
+    assert plan[['table_id', 'seated', 'end', 'wasted']].values.tolist() == [[2, '18:00', '19:00', 0]]
+    assert summary['moved'] == 1 and summary['current_wasted_seats'] == 4 and summary['wasted_seats'] == 0
@@ -0,0 +1,100 @@
+# tests/test_sketches.py
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import customer_stats
+import sketches
+
+
+def orders_frame(rows):
+    return pd.DataFrame(rows, columns=sketches.ORDER_COLUMNS)
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    for module in (customer_stats, sketches):
+        monkeypatch.setattr(module, 'BRANCHES', [{'name': 'Pusat'}])
+    monkeypatch.setattr(customer_stats, 'BRANCH_NAMES', ['Pusat'])
+    return sketches.DailySketches(path=str(tmp_path / 'sketches.pkl'))
+
+
+def test_hyperloglog_estimate_within_bound():
+    hll = sketches.HyperLogLog()
+    hll.add(np.arange(50000))
+    estimate = hll.count()
+    assert abs(estimate - 50000) <= hll.error_bound(estimate)
+
+def test_hyperloglog_merge_is_union():
+    a, b, both = sketches.HyperLogLog(), sketches.HyperLogLog(), sketches.HyperLogLog()
+    a.add(range(0, 3000))
+    b.add(range(2000, 5000))
+    both.add(range(0, 5000))
+    assert a.merge(b).count() == both.count()
+
+def test_hyperloglog_small_counts_use_linear_counting():
+    hll = sketches.HyperLogLog()
+    hll.add([1, 2, 3, 3, None])
+    assert round(hll.count()) == 3
+
+def test_tdigest_quantiles_and_merge():
+    rng = np.random.default_rng(1)
+    values = rng.exponential(100000, 20000)
+    left, right = sketches.TDigest(), sketches.TDigest()
+    left.add(values[:10000])
+    right.add(values[10000:])
+    digest = left.merge(right)
+    assert digest.total == 20000
+    assert (digest.min, digest.max) == (values.min(), values.max())
+    for q in (0.5, 0.9):
+        # Rank perkiraan harus ada di dalam error rank t-digest
+        rank = np.mean(values <= digest.quantile(q))
+        assert abs(rank - q) <= digest.rank_error(q) * 2
+    assert np.isnan(sketches.TDigest().quantile(0.5))
+
+def test_combined_merges_days_in_range(store):
+    store.apply(orders_frame([
+        (1, 7, '2024-01-01 10:00:00', 100.0), (2, 8, '2024-01-01 11:00:00', 50.0),
+        (3, 7, '2024-01-02 10:00:00', 30.0), (4, None, '2024-01-03 10:00:00', 20.0),
+    ]))
+    total = store.combined(datetime.date(2024, 1, 1), datetime.date(2024, 1, 2))
+    assert (total.orders, total.revenue) == (3, 180.0)
+    assert round(total.customers.count()) == 2
+    assert store.last_order_ids == (4,)
+    assert store.date_bounds() == (datetime.date(2024, 1, 1), datetime.date(2024, 1, 3))
+
+def test_recent_orders_counted_without_changing_stored_days(store):
+    store.apply(orders_frame([(1, 7, '2024-01-01 10:00:00', 100.0)]))
+    store.recent = orders_frame([(2, 8, '2024-01-01 12:00:00', 40.0), (3, 8, '2024-01-02 12:00:00', 10.0)])
+    store._all_days = None
+    assert store.daily_totals()['total_orders'].tolist() == [2, 1]
+    assert store.days[datetime.date(2024, 1, 1)].orders == 1
+
+def test_refresh_refolds_window_and_rebuilds_on_update(store, monkeypatch):
+    now = pd.Timestamp.now()
+    history = [(1, 7, now - pd.Timedelta(days=3), 100.0), (2, 8, now - pd.Timedelta(hours=1), 40.0)]
+    calls = []
+
+    def view_order_totals(after):
+        calls.append(after)
+        return [row for row in history if row[0] > after[0]]
+
+    changes = [[('Pusat', 10, 0, 5)], [('Pusat', 12, 2, 7)], [('Pusat', 15, 0, 7)]]
+    monkeypatch.setattr(sketches, 'view_order_totals', view_order_totals)
+    monkeypatch.setattr(customer_stats, 'view_table_changes', lambda *args: changes.pop(0))
+
+    store.refresh(force=True)
+    assert store.last_order_ids == (1,)
+    assert store.combined().revenue == 140.0
+
+    # Item menyusul untuk order di jendela re-fold
+    history[1] = (2, 8, history[1][2], 55.0)
+    store.refresh(force=True)
+    assert store.combined().revenue == 155.0
+
+    # Harga order lama diedit: sketch dibangun ulang
+    history[0] = (1, 7, history[0][2], 90.0)
+    store.refresh(force=True)
+    assert calls[-1] == (0,)
+    assert store.combined().revenue == 145.0
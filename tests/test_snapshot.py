@@ -0,0 +1,66 @@
+# tests/test_snapshot.py
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import snapshot
+
+TODAY = date(2024, 3, 15)
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    """Tabel Dashboard palsu: stempel dan isi bisa diubah, jumlah pemuatan dan render dicatat"""
+    state = {'stamp': [0, [(1,)]], 'revenue': 100.0, 'loads': 0}
+
+    def load_table(name):
+        state['loads'] += 1
+        return pd.DataFrame({'total_price': [state['revenue']]})
+
+    def build_dashboard(data, start, end):
+        return {'kpis': {'total_revenue': float(data['details']['total_price'].sum())}, 'figures': {}}
+
+    monkeypatch.setattr(snapshot, 'TABLES', ['details'])
+    monkeypatch.setattr(snapshot, 'data_stamp', lambda: state['stamp'])
+    monkeypatch.setattr(snapshot, 'load_table', load_table)
+    monkeypatch.setattr(snapshot, 'build_dashboard', build_dashboard)
+    return state
+
+
+def test_period_range():
+    assert snapshot.period_range('today', TODAY) == (TODAY, TODAY)
+    assert snapshot.period_range('month', TODAY) == (date(2024, 3, 1), TODAY)
+
+def test_render_skips_loading_when_stamp_unchanged(sources, tmp_path):
+    snaps = snapshot.Snapshots(str(tmp_path))
+    assert snaps.render(today=TODAY) == ['today', 'month']
+    assert snaps.render(today=TODAY) == []
+    assert sources['loads'] == 1
+    # Proses baru membaca state dari disk
+    assert snapshot.Snapshots(str(tmp_path)).render(today=TODAY) == []
+    sources['stamp'] = [0, [(2,)]]
+    assert snaps.render(today=TODAY) == ['today', 'month']
+    assert 'Rp 100' in (tmp_path / 'today.html').read_text()
+
+def test_new_day_rerenders_even_with_same_stamp(sources, tmp_path):
+    snaps = snapshot.Snapshots(str(tmp_path))
+    snaps.render(today=TODAY)
+    assert snaps.render(today=date(2024, 3, 16)) == ['today', 'month']
+
+def test_without_stamp_compares_data_fingerprint(sources, tmp_path):
+    sources['stamp'] = None
+    snaps = snapshot.Snapshots(str(tmp_path))
+    snaps.render(today=TODAY)
+    assert snaps.render(today=TODAY) == []
+    sources['revenue'] = 250.0
+    assert snaps.render(today=TODAY) == ['today', 'month']
+    assert 'Rp 250' in (tmp_path / 'month.html').read_text()
+
+def test_render_html_shows_delta_and_escapes():
+    comparison = pd.DataFrame({'total_orders': [12, 10, 0]}, index=['current', 'previous', 'last_year'])
+    page = snapshot.render_html('today', {'kpis': {'total_orders': 12}, 'comparison': comparison, 'figures': {}},
+                                TODAY, TODAY)
+    assert '+20.0% vs periode lalu' in page
+    assert 'Belum ada order' in page
+    assert snapshot._kpi_card('<b>', '1').count('&lt;b&gt;') == 1